@@ -3,5 +3,5 @@
 
 __all__ = [
     'string_tool', 'net_tool', 'file_tool', 'import_tool', 'run_tool', 'exception_tool',
-    'debug_tool', 'test_tool', 'call_chain_tool', 'value_tool', 'validate_tool'
+    'debug_tool', 'test_tool', 'call_chain_tool', 'trace_context', 'value_tool', 'validate_tool'
 ]
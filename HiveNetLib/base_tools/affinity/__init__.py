@@ -8,6 +8,7 @@
 # www.enfoldsystems.com
 # info@enfoldsystems.com
 
+import os
 import sys
 
 if sys.platform in ('win32',):
@@ -46,8 +47,30 @@ if sys.platform in ('win32',):
         except win32process.error as e:
             raise ValueError
 
-elif sys.platform in ('linux2'):
-    from _affinity import set_process_affinity_mask, get_process_affinity_mask
+elif sys.platform.startswith('linux'):
+    # Use sched_setaffinity from os module, pid may also be a native thread id
+    def _mask_to_cpus(value):
+        return set(i for i in range(value.bit_length()) if value & (1 << i))
+
+    def _cpus_to_mask(cpus):
+        value = 0
+        for cpu in cpus:
+            value |= (1 << cpu)
+        return value
+
+    def set_process_affinity_mask(pid, value):
+        try:
+            current = _cpus_to_mask(os.sched_getaffinity(pid))
+            os.sched_setaffinity(pid, _mask_to_cpus(value))
+        except OSError:
+            raise ValueError
+        return current
+
+    def get_process_affinity_mask(pid):
+        try:
+            return _cpus_to_mask(os.sched_getaffinity(pid))
+        except OSError:
+            raise ValueError
 
 else:
     def set_process_affinity_mask(pid, value):
@@ -55,3 +78,33 @@ else:
 
     def get_process_affinity_mask(pid):
         raise NotImplementedError
+
+
+def get_available_cpus():
+    """Return the sorted list of cpu ids the current process may run on."""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def get_cpu_topology(cpus=None):
+    """
+    Return {cpu id: (physical package id, core id)} for the given cpus.
+    Topology is read from sysfs on linux, other platforms treat every cpu
+    as an independent core of package 0.
+    """
+    if cpus is None:
+        cpus = get_available_cpus()
+    topology = dict()
+    for cpu in cpus:
+        package_id, core_id = 0, cpu
+        base = '/sys/devices/system/cpu/cpu%d/topology/' % cpu
+        try:
+            with open(base + 'physical_package_id') as f:
+                package_id = int(f.read().strip())
+            with open(base + 'core_id') as f:
+                core_id = int(f.read().strip())
+        except (OSError, ValueError):
+            pass
+        topology[cpu] = (package_id, core_id)
+    return topology
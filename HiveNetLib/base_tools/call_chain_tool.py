@@ -27,6 +27,7 @@ import copy
 sys.path.append(os.path.abspath(os.path.join(
     os.path.dirname(__file__), os.path.pardir, os.path.pardir)))
 from HiveNetLib.base_tools.run_tool import RunTool
+from HiveNetLib.base_tools.trace_context import TraceContext
 from HiveNetLib.base_tools.import_tool import ImportTool
 from HiveNetLib.base_tools.string_tool import StringTool
 from HiveNetLib.base_tools.exception_tool import ExceptionTool
@@ -80,16 +81,18 @@ class CallChainTool(object):
                           **kwargs):
         """
         模块方法调用链修饰符
+        注: 调用链信息通过调用链上下文(TraceContext)在嵌套调用间传递，所修饰函数可以为async def定义的协程函数；
+            如需在新线程中延续调用链，线程函数需通过TraceContext.bind绑定
 
         @param {object} logger=None - 日志对象，如果为None代表不需要输出日志，传入对象需满足:
             1、标准logging的logger对象
             2、自定义的日志类对象，但应实现info、warning、error等标准方法
-        @param {string} trace_id=None - 调用链追踪ID，None代表沿用上一调用函数传递的ID；传入值则以该值向下传递
+        @param {string} trace_id=None - 调用链追踪ID，None代表沿用调用链上下文(TraceContext)的ID；传入值则以该值向下传递
             注：如果找不到上一调用函数传递的ID，并且修饰符也没有传入值，则自动生成一个唯一的trace_id
         @param {int[]} trace_level=None - 函数调用层级，是一个只有一个int变量的数组，trace_level[0]为当前的执行层级
             注：该变量每执行一次函数应该+1
         @param {string} call_id=None - 当前函数的执行ID，如果未传入，则自动生成一个执行ID
-        @param {string} parent_id=None - 上一函数的执行ID，由上一函数传入，或自动获取
+        @param {string} parent_id=None - 上一函数的执行ID，由上一函数传入，或从调用链上下文(TraceContext)获取
         @param {tuple} key_para=() - 定义业务层面唯一标识业务的入参参数名列表，从所修饰函数中获取对应的参数值进行打印
             注意：如果列表中的对象是string，则从函数入参的kwargs参数中获取；如果对象是int，则从args中取指定位置的值
         @param {tuple} print_in_para=() - 定义需要打印的入参参数值
@@ -116,6 +119,8 @@ class CallChainTool(object):
         @example
 
         """
+        _id_kwargs = kwargs  # id的资源池的get_id传入参数
+
         def wrapper1(func):
             """
             第一层修饰函数，设置两层的目的是支持参数传入
@@ -123,119 +128,156 @@ class CallChainTool(object):
             @param {function} func - 所修饰的函数
 
             """
-            def wrapper2(*args, **kwargs):
+            # 在修饰时一次性获取函数的文件名、函数名及调用计划，避免每次调用重复处理
+            _file_path, _file_name = os.path.split(inspect.getabsfile(func))
+            _fun_name = RunTool.get_function_name(func)
+            _call_plan = CallChainTool.__generate_call_plan(func, is_standard_def)
+            _call_fun_level = 2  # 日志对应的输出函数名调整为调用所修饰函数的函数
+
+            def get_logger():
                 """
-                第二层修饰函数，用于向所修饰函数传入参数
+                获取日志对象，如果为None代表不需要输出日志
                 """
-                # 处理日志对象和trace_id
                 _logger = logger
                 if _logger is None and is_use_global_logger:
                     # 使用全局logger
                     _logger = RunTool.get_global_logger()
+                return _logger
 
-                if _logger is None:
-                    # 没有配置日志类，不做任何封装处理，直接调用和返回
-                    return CallChainTool.__call_func(func, args, kwargs, is_standard_def)
-                else:
-                    # 获取各类信息
-                    _start_time = datetime.datetime.now()
-                    _call_id = call_id
-                    if _call_id is None:
-                        _call_id = CallChainTool.generate_trace_id(
-                            idpool=idpool, get_id_overtime=get_id_overtime, **kwargs)  # 生成执行ID
-                    # 获取日志函数名及文件名
-                    _call_fun_level = 1  # 日志对应的输出函数名调整为methon_call_chain
-                    _file_path, _file_name = os.path.split(inspect.getabsfile(func))
-                    _fun_name = RunTool.get_function_name(func)
-                    _trace_id = trace_id
-
-                    # 处理trace_id，优先获取当前函数参数，没有则找修饰函数传参，没有再找父函数的参数，再没有则自己创建
-                    _parent_fun = sys._getframe().f_back
-                    _parent_fun_name = str(_parent_fun.f_code.co_name)
-                    if 'trace_id' in kwargs.keys():
-                        _trace_id = kwargs['trace_id']  # 从上一个函数调用传入了追踪ID，优先使用这个
-
-                    if _trace_id == '' or _trace_id is None and _parent_fun_name != '<module>':
-                        # 尝试获取上一个调用函数参数中的trace_id
-                        _trace_id = CallChainTool.__get_parent_fun_para_value(
-                            _parent_fun, 'trace_id')
-
-                    if _trace_id == '' or _trace_id is None:
-                        # 都没有找到，只能当作自己是第1个调用的函数
-                        _trace_id = _call_id
-
-                    # 处理trace_level
-                    _trace_level = trace_level
-                    if 'trace_level' in kwargs.keys():
-                        _trace_level = kwargs['trace_level']  # 从上一个函数调用传入了追踪层级，优先使用这个
-
-                    if _trace_level is None and _parent_fun_name != '<module>':
-                        # 尝试获取上一个调用函数参数中的trace_level
-                        _trace_level = CallChainTool.__get_parent_fun_para_value(
-                            _parent_fun, 'trace_level')
-
-                    if _trace_level is None:
-                        # 都没有找到，只能当作自己是第1个调用的函数
-                        _trace_level = [0]
-                    # 自加1
-                    _trace_level[0] = _trace_level[0] + 1
-
-                    # 处理parent_call_id
-                    _parent_call_id = parent_id
-                    if 'parent_id' in kwargs.keys():
-                        _parent_call_id = kwargs['parent_id']  # 从上一个函数调用传入了追踪层级，优先使用这个
-                    if _parent_call_id is None and _parent_fun_name != '<module>':
-                        _parent_call_id = CallChainTool.__get_parent_fun_para_value(
-                            _parent_fun, 'call_id')
-                    if _parent_call_id is None:
-                        _parent_call_id = ''
-
-                    # 生成trace日志信息项
-                    _trace_item = '%s:%s:%s:%s:%s:%s' % (
-                        _trace_id, _call_id, _parent_call_id, str(_trace_level[0]), _file_name, _fun_name)
-
-                    # 生成日志信息
-                    _log_obj = {'key': {}, 'para': {}}
-                    for _key in key_para:
-                        _log_obj['key'][_key] = str(
-                            CallChainTool.__get_value_from_para(_key, args, kwargs))
-                    for _key in print_in_para:
-                        _log_obj['para'][_key] = str(
-                            CallChainTool.__get_value_from_para(_key, args, kwargs))
+            def before_call(_logger, args, kwargs):
+                """
+                执行所修饰函数前的处理：获取调用链信息、登记开始日志，并设置调用链上下文
 
-                    # 打印调用信息
-                    _log_str = '[TRACE:%s]%s' % (_trace_item, str(_log_obj))
+                @returns {tuple} - (调用链日志信息项, 开始时间, 调用链上下文令牌)
+                """
+                # 获取各类信息
+                _start_time = datetime.datetime.now()
+                _call_id = call_id
+                if _call_id is None:
+                    _call_id = CallChainTool.generate_trace_id(
+                        idpool=idpool, get_id_overtime=get_id_overtime, **_id_kwargs)  # 生成执行ID
+
+                # 调用链信息优先获取当前函数参数，没有则找修饰函数传参，没有再找调用链上下文，再没有则自己创建
+                _trace_info = TraceContext.get_trace_info()
+
+                # 处理trace_id
+                _trace_id = kwargs.get('trace_id', trace_id)
+                if (_trace_id == '' or _trace_id is None) and _trace_info is not None:
+                    _trace_id = _trace_info.trace_id
+                if _trace_id == '' or _trace_id is None:
+                    # 都没有找到，只能当作自己是第1个调用的函数
+                    _trace_id = _call_id
+
+                # 处理trace_level
+                _trace_level = kwargs.get('trace_level', trace_level)
+                if _trace_level is None and _trace_info is not None:
+                    _trace_level = _trace_info.trace_level
+                if _trace_level is None:
+                    # 都没有找到，只能当作自己是第1个调用的函数
+                    _trace_level = [0]
+                elif not isinstance(_trace_level, list):
+                    # 兼容传入int的情况(例如gRPC服务端传入的调用层级)
+                    _trace_level = [int(_trace_level)]
+                # 自加1
+                _trace_level[0] = _trace_level[0] + 1
+
+                # 处理parent_call_id
+                _parent_call_id = kwargs.get('parent_id', parent_id)
+                if _parent_call_id is None and _trace_info is not None:
+                    _parent_call_id = _trace_info.call_id
+                if _parent_call_id is None:
+                    _parent_call_id = ''
+
+                # 生成trace日志信息项
+                _trace_item = '%s:%s:%s:%s:%s:%s' % (
+                    _trace_id, _call_id, _parent_call_id, str(_trace_level[0]), _file_name, _fun_name)
+
+                # 生成日志信息
+                _log_obj = {'key': {}, 'para': {}}
+                for _key in key_para:
+                    _log_obj['key'][_key] = str(
+                        CallChainTool.__get_value_from_para(_key, args, kwargs))
+                for _key in print_in_para:
+                    _log_obj['para'][_key] = str(
+                        CallChainTool.__get_value_from_para(_key, args, kwargs))
+
+                # 打印调用信息
+                _log_str = '[TRACE:%s]%s' % (_trace_item, str(_log_obj))
+                _logger.log(log_level, _log_str, extra={'callFunLevel': _call_fun_level})
+
+                # 把调用链信息放入参数中，同时设置调用链上下文供下一层调用获取
+                kwargs['trace_id'] = _trace_id
+                kwargs['trace_level'] = _trace_level
+                kwargs['call_id'] = _call_id
+                kwargs['parent_id'] = _parent_call_id
+                _token = TraceContext.set_trace_info(_trace_id, _call_id, _trace_level)
+                return _trace_item, _start_time, _token
+
+            def after_call(_logger, args, kwargs, trace_item, start_time, back=None, error=None):
+                """
+                执行所修饰函数后的处理：登记完成日志或异常日志
+                """
+                _use = (datetime.datetime.now() - start_time).total_seconds()
+                if error is not None:
+                    # 记录异常日志
+                    _log_str = '[TRACE:%s][USE:%ss][EX:%s]%s' % (
+                        trace_item, str(_use), str(type(error)), traceback.format_exc())
                     _logger.log(log_level, _log_str, extra={'callFunLevel': _call_fun_level})
+                    return
+
+                # 执行完成
+                _log_back = ''
+                if is_print_back:
+                    _log_obj = {'return': str(back), 'out_para': {}}
+                    for _key in print_out_para:
+                        _log_obj['out_para'][_key] = str(
+                            CallChainTool.__get_value_from_para(_key, args, kwargs))
+                    _log_back = str(_log_obj)
+                # 打印调用信息
+                _log_str = '[TRACE:%s][USE:%ss]%s' % (trace_item, str(_use), _log_back)
+                _logger.log(log_level, _log_str, extra={'callFunLevel': _call_fun_level})
+
+            if inspect.iscoroutinefunction(func):
+                async def wrapper2(*args, **kwargs):
+                    """
+                    第二层修饰函数，用于向所修饰函数传入参数(协程函数)
+                    """
+                    _logger = get_logger()
+                    if _logger is None:
+                        # 没有配置日志类，不做任何封装处理，直接调用和返回
+                        return await CallChainTool.__call_func(func, args, kwargs, _call_plan)
+
+                    _trace_item, _start_time, _token = before_call(_logger, args, kwargs)
+                    try:
+                        _back = await CallChainTool.__call_func(func, args, kwargs, _call_plan)
+                    except Exception as e:
+                        after_call(_logger, args, kwargs, _trace_item, _start_time, error=e)
+                        raise e
+                    finally:
+                        TraceContext.reset_trace_info(_token)
 
-                    # 执行函数，把trace_id和trace_level放入参数中
-                    kwargs['trace_id'] = _trace_id
-                    kwargs['trace_level'] = _trace_level
-                    kwargs['call_id'] = _call_id
-                    kwargs['parent_id'] = _parent_call_id
+                    after_call(_logger, args, kwargs, _trace_item, _start_time, back=_back)
+                    return _back
+            else:
+                def wrapper2(*args, **kwargs):
+                    """
+                    第二层修饰函数，用于向所修饰函数传入参数
+                    """
+                    _logger = get_logger()
+                    if _logger is None:
+                        # 没有配置日志类，不做任何封装处理，直接调用和返回
+                        return CallChainTool.__call_func(func, args, kwargs, _call_plan)
+
+                    _trace_item, _start_time, _token = before_call(_logger, args, kwargs)
                     try:
-                        _back = CallChainTool.__call_func(func, args, kwargs, is_standard_def)
+                        _back = CallChainTool.__call_func(func, args, kwargs, _call_plan)
                     except Exception as e:
-                        # 记录异常日志
-                        _end_time = datetime.datetime.now()
-                        _use = (_end_time - _start_time).total_seconds()
-                        _log_str = '[TRACE:%s][USE:%ss][EX:%s]%s' % (
-                            _trace_item, str(_use), str(type(e)), traceback.format_exc())
-                        _logger.log(log_level, _log_str, extra={'callFunLevel': _call_fun_level})
+                        after_call(_logger, args, kwargs, _trace_item, _start_time, error=e)
                         raise e
+                    finally:
+                        TraceContext.reset_trace_info(_token)
 
-                    # 执行完成
-                    _end_time = datetime.datetime.now()
-                    _use = (_end_time - _start_time).total_seconds()
-                    _log_back = ''
-                    if is_print_back:
-                        _log_obj = {'return': str(_back), 'out_para': {}}
-                        for _key in print_out_para:
-                            _log_obj['out_para'][_key] = str(
-                                CallChainTool.__get_value_from_para(_key, args, kwargs))
-                        _log_back = str(_log_obj)
-                    # 打印调用信息
-                    _log_str = '[TRACE:%s][USE:%ss]%s' % (_trace_item, str(_use), _log_back)
-                    _logger.log(log_level, _log_str, extra={'callFunLevel': _call_fun_level})
+                    after_call(_logger, args, kwargs, _trace_item, _start_time, back=_back)
                     return _back
             return wrapper2
         return wrapper1
@@ -669,39 +711,71 @@ class CallChainTool(object):
     # 内部函数
     #############################
     @staticmethod
-    def __call_func(func, args, kwargs, is_standard_def):
+    def __generate_call_plan(func, is_standard_def):
+        """
+        内部函数，生成所修饰函数的调用计划（在修饰时执行一次）
+
+        @param {function} func - 所修饰的函数
+        @param {bool} is_standard_def - 是否标准定义的修饰符函数
+
+        @returns {tuple} - 调用计划，None代表直接传入全部参数调用，否则为三项的数组:
+            [0] {bool} - 函数是否有类似**kwargs的参数
+            [1] {list} - 可按位置传入的参数名列表
+            [2] {set} - 可按key传入的参数名集合
+        """
+        if is_standard_def:
+            # 标准修饰符函数，直接调用无需特殊处理
+            return None
+
+        try:
+            _parameters = inspect.signature(func).parameters.values()
+        except (TypeError, ValueError):
+            # 无法获取函数定义，直接传入全部参数
+            return None
+
+        _has_var_keyword = False
+        _pos_names = list()
+        _kw_names = set()
+        for _para in _parameters:
+            if _para.kind == inspect.Parameter.VAR_KEYWORD:
+                _has_var_keyword = True
+            elif _para.kind == inspect.Parameter.KEYWORD_ONLY:
+                _kw_names.add(_para.name)
+            elif _para.kind != inspect.Parameter.VAR_POSITIONAL:
+                _pos_names.append(_para.name)
+                if _para.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD:
+                    _kw_names.add(_para.name)
+
+        if _has_var_keyword and len(_pos_names) == 0:
+            # 与func(*args, **kwargs)的标准定义一致
+            return None
+
+        return (_has_var_keyword, _pos_names, _kw_names)
+
+    @staticmethod
+    def __call_func(func, args, kwargs, call_plan):
         """
-        内部函数，根据传入参数处理实际的函数调用
+        内部函数，根据调用计划处理实际的函数调用
+        注: 非标准定义的函数，只传入函数可接收且未通过位置传入的key参数（例如函数没有trace_id等调用链参数时不传入）
 
         @param {function} func - 要执行的函数
         @param {tuple} args - 不带参数名的参数列表
         @param {dict} kwargs - 带参数名的参数列表
-        @param {bool} is_standard_def - 是否标准定义的修饰符函数
+        @param {tuple} call_plan - 通过__generate_call_plan生成的调用计划
 
         @returns {object} - 返回函数的执行结果
 
         """
-        if is_standard_def:
-            # 标准修饰符函数，直接调用无需特殊处理
+        if call_plan is None:
             return func(*args, **kwargs)
-        else:
-            # 非标准修饰符函数，通过动态参数传入执行
-            _exec_str = 'func('
-            # 拼接
-            _i = 0
-            while _i < len(args):
-                _exec_str = _exec_str + ('args[%s],' % (str(_i)))
-                _i = _i + 1
-            _exec_str_2 = _exec_str.rstrip(',') + ')'  # 这个脚本用于在参数传入执行出错的情况下重新执行
-            for _key in kwargs.keys():
-                _exec_str = _exec_str + ('%s=kwargs[\'%s\'],' % (_key, _key))
-            # 去掉最后一个逗号
-            _exec_str = _exec_str.rstrip(',') + ')'
-            # 执行并返回
-            try:
-                return eval(_exec_str)
-            except TypeError:
-                return eval(_exec_str_2)
+
+        _has_var_keyword, _pos_names, _kw_names = call_plan
+        _bound_names = _pos_names[0: len(args)]
+        _kwargs = {
+            _key: _value for _key, _value in kwargs.items()
+            if _key not in _bound_names and (_has_var_keyword or _key in _kw_names)
+        }
+        return func(*args, **_kwargs)
 
     @staticmethod
     def __get_value_from_para(index, args, kwargs):
@@ -723,25 +797,6 @@ class CallChainTool(object):
         except Exception:
             return None
 
-    @staticmethod
-    def __get_parent_fun_para_value(parent_fun_frame, para_name):
-        """
-        从父函数堆栈获取参数值
-
-        @param {object} parent_fun_frame - 父函数堆栈（sys._getframe().f_back）
-        @param {string} para_name - 参数名
-
-        @returns {object} - 获取到的参数值，如果找不到返回None
-
-        """
-        _para_value = None
-        if hasattr(parent_fun_frame, 'f_locals'):
-            if para_name in parent_fun_frame.f_locals.keys():
-                _para_value = parent_fun_frame.f_locals[para_name]
-            elif 'kwargs' in parent_fun_frame.f_locals.keys() and para_name in parent_fun_frame.f_locals['kwargs']:
-                _para_value = parent_fun_frame.f_locals['kwargs'][para_name]
-        return _para_value
-
     @staticmethod
     def __get_msg_para_value(para_name, value=None, msg=None, proto_msg=None, api_mapping=dict()):
         """
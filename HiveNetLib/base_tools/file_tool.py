@@ -23,19 +23,14 @@ import platform
 import subprocess
 import shutil
 import hashlib
+import zlib
 from io import FileIO
+from collections import deque
+import importlib
+from concurrent.futures import ThreadPoolExecutor
 # 根据当前文件路径将包路径纳入, 在非安装的情况下可以引用到
 sys.path.append(os.path.abspath(os.path.join(
     os.path.dirname(__file__), os.path.pardir, os.path.pardir)))
-# 动态添加包安装
-import HiveNetLib.deps_tool as deps_tool
-try:
-    import chardet
-except ImportError:
-    deps_tool.install_package('chardet')
-    import chardet
-# 引用自有模块
-import HiveNetLib.base_tools.myzipfile as zipfile
 
 
 __MOUDLE__ = 'file_tool'  # 模块名
@@ -45,6 +40,34 @@ __AUTHOR__ = u'黎慧剑'  # 作者
 __PUBLISH__ = '2018.08.29'  # 发布日期
 
 
+# 压缩方法, 与myzipfile中的定义一致(避免导入本模块时装载myzipfile)
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+
+# 延迟装载的依赖包, key为模块属性名, value为实际导入的包名
+# 注: 仅在首次使用时才导入, 避免导入本模块时装载chardet、myzipfile
+_LAZY_MODULES = {
+    'chardet': 'chardet',
+    'zipfile': 'HiveNetLib.base_tools.myzipfile',
+}
+
+
+def __getattr__(name):
+    """
+    延迟装载依赖包的模块属性访问(兼容file_tool.zipfile等原有访问方式)
+
+    @param {str} name - 属性名
+
+    @returns {module} - 导入的依赖包
+    """
+    if name in _LAZY_MODULES:
+        _module = importlib.import_module(_LAZY_MODULES[name])
+        globals()[name] = _module
+        return _module
+
+    raise AttributeError("module '%s' has no attribute '%s'" % (__name__, name))
+
+
 class EnumFileSizeUnit(Enum):
     """
     文件大小单位
@@ -57,6 +80,29 @@ class EnumFileSizeUnit(Enum):
     TB = 1024 * 1024 * 1024 * 1024
 
 
+def _deflate_chunk(data: bytes, level: int, zdict: bytes, is_last: bool) -> bytes:
+    """
+    以raw deflate方式压缩数据块(供并行压缩使用, 需为模块级函数以支持进程池)
+
+    @param {bytes} data - 要压缩的数据块
+    @param {int} level - 压缩级别
+    @param {bytes} zdict - 预置字典(前一数据块的最后32KB), 第一个数据块为None
+    @param {bool} is_last - 是否文件的最后一个数据块
+        注: 非最后一块通过Z_SYNC_FLUSH按字节对齐结束, 使各数据块可直接拼接为一个完整的压缩流
+
+    @returns {bytes} - 压缩后的数据
+    """
+    if zdict:
+        _compressor = zlib.compressobj(
+            level, zlib.DEFLATED, -15, zlib.DEF_MEM_LEVEL, zlib.Z_DEFAULT_STRATEGY, zdict
+        )
+    else:
+        _compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return _compressor.compress(data) + _compressor.flush(
+        zlib.Z_FINISH if is_last else zlib.Z_SYNC_FLUSH
+    )
+
+
 class FileTool(object):
     """
     文件处理工具
@@ -471,6 +517,7 @@ class FileTool(object):
                 return f.read()
         else:
             # 使用chardet判断编码
+            import chardet
             with open(filename, 'rb') as f:
                 _bytes = f.read()
                 _encoding = chardet.detect(_bytes)['encoding']
@@ -522,7 +569,7 @@ class FileTool(object):
     #############################
     @staticmethod
     def zip(src_path, dest_path=None, dest_filename=None, mode='w',
-            compression=zipfile.ZIP_DEFLATED, allowZip64=True, pwd=None, **kwargs):
+            compression=ZIP_DEFLATED, allowZip64=True, pwd=None, **kwargs):
         """
         压缩指定文件或路径
 
@@ -539,6 +586,15 @@ class FileTool(object):
         @param {bytes} pwd=None - 解压密码(该密码设置无效)
             示例: pwd='123456'.encode('utf-8')
         @param {kwargs} - 动态参数, 支持后续兼容性的扩展
+            dest_obj {object} - 直接将压缩包写入的文件对象(需支持write方法)或socket对象, 传入后忽略dest_path和dest_filename
+                注: 支持不可seek的流(例如管道、socket), 此时压缩包将使用数据描述符(data descriptor)方式记录文件的CRC及大小
+            compresslevel {int} - 压缩级别, 默认为None(使用zlib的默认级别)
+            workers {int} - 并行压缩的线程数, 默认为0(不并行压缩, 在当前线程逐个文件压缩)
+                注: 仅compression为ZIP_DEFLATED时有效, zlib压缩时会释放GIL, 多线程可利用多核并行压缩
+            executor {concurrent.futures.Executor} - 指定并行压缩使用的线程池或进程池, 默认为None
+                注: 传入后忽略workers参数, 由调用方负责关闭; 也可以传入ProcessPoolExecutor使用多进程压缩
+            chunk_size {int} - 并行压缩时每个压缩数据块的大小, 默认为1MB, 大文件将拆分为多个数据块并行压缩
+            max_pending {int} - 并行压缩时最多同时提交的数据块数量, 默认为并行数的4倍, 用于控制内存占用
 
         @throws {FileNotFoundError} - src_path指定的文件或目录不存在时抛出该异常
         """
@@ -548,50 +604,71 @@ class FileTool(object):
         # 处理目标文件路径
         _src_realpath = os.path.realpath(src_path)
         _src_path, _src_file = os.path.split(_src_realpath)
-        if dest_path is None:
-            dest_path = _src_path
-        else:
-            # 尝试先创建目录
-            FileTool.create_dir(dest_path, exist_ok=True)
-
-        if dest_filename is None:
-            dest_filename = _src_file + '.zip'
+        _dest_obj = kwargs.get('dest_obj', None)
+        _sock_file = None
+        if _dest_obj is None:
+            if dest_path is None:
+                dest_path = _src_path
+            else:
+                # 尝试先创建目录
+                FileTool.create_dir(dest_path, exist_ok=True)
+
+            if dest_filename is None:
+                dest_filename = _src_file + '.zip'
+
+            _dest_obj = os.path.join(dest_path, dest_filename)
+        elif not hasattr(_dest_obj, 'write') and hasattr(_dest_obj, 'makefile'):
+            # socket对象, 转换为文件对象写入
+            _sock_file = _dest_obj.makefile('wb')
+            _dest_obj = _sock_file
+
+        # 并行压缩参数
+        import HiveNetLib.base_tools.myzipfile as zipfile
+        _compresslevel = kwargs.get('compresslevel', None)
+        _executor = kwargs.get('executor', None)
+        _workers = kwargs.get('workers', 0)
+        _parallel = compression == zipfile.ZIP_DEFLATED and (
+            _executor is not None or _workers > 0
+        )
 
         # 创建zip文件
-        _zip = zipfile.ZipFile(os.path.join(dest_path, dest_filename), mode=mode,
-                               compression=compression, allowZip64=allowZip64)
-
-        # 设置密码
-        if pwd is not None:
-            _zip.setpassword(pwd)
-
-        if os.path.isfile(src_path):
-            # 文件
-            _zip.write(os.path.realpath(src_path), _src_file)
-        else:
-            # 遍历目录并写入文件
-            _src_realpath = _src_realpath.replace('\\', '/')
-            for root, dirs, files in os.walk(src_path):
-                # 获取相对路径
-                _abs_path = os.path.realpath(root).replace('\\', '/').replace(_src_realpath, '', 1)
-
-                # 确保相对路径不能是'/'开头, 否则解压检索的文件信息会有问题
-                if len(_abs_path) > 0 and _abs_path[0] == '/':
-                    _abs_path = _abs_path[1:]
-
-                if len(files) == 0:
-                    # 空目录, 写入目录信息
-                    _zip.writestr('./' + _abs_path + '/', '')
-
-                # 写入文件
-                for _filename in files:
-                    _zip.write(
-                        os.path.join(root, _filename),
-                        os.path.join('./', _abs_path, _filename)
+        _zip = zipfile.ZipFile(_dest_obj, mode=mode, compression=compression,
+                               allowZip64=allowZip64, compresslevel=_compresslevel)
+        try:
+            # 设置密码
+            if pwd is not None:
+                _zip.setpassword(pwd)
+
+            if not _parallel:
+                # 逐个文件压缩写入
+                for _file, _arcname in FileTool._iter_zip_members(src_path):
+                    if _file is None:
+                        # 空目录, 写入目录信息
+                        _zip.writestr(_arcname, '')
+                    else:
+                        _zip.write(_file, _arcname)
+            else:
+                # 并行压缩后按顺序写入
+                _own_executor = _executor is None
+                if _own_executor:
+                    _executor = ThreadPoolExecutor(max_workers=_workers)
+                else:
+                    _workers = getattr(_executor, '_max_workers', os.cpu_count() or 1)
+                try:
+                    FileTool._zip_parallel(
+                        _zip, FileTool._iter_zip_members(src_path), _executor,
+                        compresslevel=_compresslevel,
+                        chunk_size=kwargs.get('chunk_size', 1024 * 1024),
+                        max_pending=kwargs.get('max_pending', _workers * 4)
                     )
-
-        # 保存压缩包
-        _zip.close()
+                finally:
+                    if _own_executor:
+                        _executor.shutdown(wait=True)
+        finally:
+            # 保存压缩包
+            _zip.close()
+            if _sock_file is not None:
+                _sock_file.close()
 
     @staticmethod
     def unzip(filename, dest_path=None, members=None, pwd=None, **kwargs):
@@ -606,6 +683,8 @@ class FileTool(object):
         @param {bytes} pwd=None - 解压密码
             示例: pwd='123456'.encode('utf-8')
         @param {kwargs} - 动态参数, 支持后续兼容性的扩展
+            use_mmap {bool} - 是否使用内存映射方式读取压缩包(缓存中央目录、无锁并发读取), 默认为False
+            workers {int} - 并行解压的线程数, 默认为0(逐个文件解压), 大于1时自动使用内存映射方式读取
 
         @throws {FileNotFoundError} - src_path指定的文件或目录不存在时抛出该异常
         """
@@ -622,9 +701,15 @@ class FileTool(object):
             dest_path = _src_path + '/' + _file_no_ext
 
         # 读取文件
-        _zip = zipfile.ZipFile(filename)
-        _zip.extractall(dest_path, members=members, pwd=pwd)
-        _zip.close()
+        import HiveNetLib.base_tools.myzipfile as zipfile
+        _workers = kwargs.get('workers', 0)
+        if _workers > 1 or kwargs.get('use_mmap', False):
+            with zipfile.MmapZipFile(filename) as _zip:
+                _zip.extractall(dest_path, members=members, pwd=pwd, workers=_workers)
+        else:
+            _zip = zipfile.ZipFile(filename)
+            _zip.extractall(dest_path, members=members, pwd=pwd)
+            _zip.close()
 
     @staticmethod
     def read_zip_file(filename, member, pwd=None, **kwargs):
@@ -636,6 +721,8 @@ class FileTool(object):
         @param {bytes} pwd=None - 解压密码
             示例: pwd='123456'.encode('utf-8')
         @param {kwargs} - 动态参数, 支持后续兼容性的扩展
+            use_mmap {bool} - 是否使用内存映射方式读取压缩包, 默认为False
+                注: 内存映射方式会按文件路径缓存中央目录, 重复读取同一压缩包的不同文件时无需重新解析, 且支持多线程并发读取
 
         @return {bytes} - 读取到文件的二进制数据
 
@@ -645,7 +732,11 @@ class FileTool(object):
             raise FileNotFoundError('file [%s] not found!' % filename)
 
         # 读取文件
-        _zip = zipfile.ZipFile(filename)
+        import HiveNetLib.base_tools.myzipfile as zipfile
+        if kwargs.get('use_mmap', False):
+            _zip = zipfile.MmapZipFile(filename)
+        else:
+            _zip = zipfile.ZipFile(filename)
         _bytes = _zip.read(member, pwd=pwd)
         _zip.close()
         return _bytes
@@ -663,6 +754,7 @@ class FileTool(object):
             raise FileNotFoundError('file [%s] not found!' % filename)
 
         # 读取信息
+        import HiveNetLib.base_tools.myzipfile as zipfile
         _zip = zipfile.ZipFile(filename)
         for _zinfo in _zip.infolist():
             _is_encrypted = _zinfo.flag_bits & 0x1
@@ -673,6 +765,120 @@ class FileTool(object):
 
         return False
 
+    #############################
+    # zip文件处理内部函数
+    #############################
+    @staticmethod
+    def _iter_zip_members(src_path):
+        """
+        遍历要压缩的文件清单
+
+        @param {string} src_path - 要压缩的文件或目录
+
+        @returns {iterator} - 按顺序返回(文件路径, 压缩包内文件名)的迭代器, 文件路径为None代表空目录
+        """
+        _src_realpath = os.path.realpath(src_path)
+        if os.path.isfile(src_path):
+            # 文件
+            yield _src_realpath, os.path.split(_src_realpath)[1]
+            return
+
+        # 遍历目录
+        _src_realpath = _src_realpath.replace('\\', '/')
+        for root, dirs, files in os.walk(src_path):
+            # 获取相对路径
+            _abs_path = os.path.realpath(root).replace('\\', '/').replace(_src_realpath, '', 1)
+
+            # 确保相对路径不能是'/'开头, 否则解压检索的文件信息会有问题
+            if len(_abs_path) > 0 and _abs_path[0] == '/':
+                _abs_path = _abs_path[1:]
+
+            if len(files) == 0:
+                # 空目录
+                yield None, './' + _abs_path + '/'
+
+            for _filename in files:
+                yield os.path.join(root, _filename), os.path.join('./', _abs_path, _filename)
+
+    @staticmethod
+    def _zip_parallel(zip_file, members, executor, compresslevel=None,
+                      chunk_size=1024 * 1024, max_pending=4):
+        """
+        通过线程池(或进程池)并行压缩文件, 并按顺序写入压缩包
+
+        @param {zipfile.ZipFile} zip_file - 已打开的压缩包对象
+        @param {iterator} members - 要压缩的(文件路径, 压缩包内文件名)迭代器, 文件路径为None代表空目录
+        @param {concurrent.futures.Executor} executor - 执行压缩的线程池或进程池
+        @param {int} compresslevel=None - 压缩级别
+        @param {int} chunk_size=1024*1024 - 数据块大小, 大文件拆分为多个数据块并行压缩
+        @param {int} max_pending=4 - 最多同时提交的数据块数量
+        """
+        import HiveNetLib.base_tools.myzipfile as zipfile
+
+        _level = zlib.Z_DEFAULT_COMPRESSION if compresslevel is None else compresslevel
+        _max_pending = max(max_pending, 1)
+        # 待写入任务队列, 元素为(任务类型, 参数...), 任务类型包括dir/file/chunk/end
+        _pending = deque()
+        _state = {'chunks': 0, 'dest': None}
+
+        def _write_pending(limit):
+            # 按顺序写入已完成的任务, 直到未写入的数据块数量不超过limit
+            while len(_pending) > 0:
+                _item = _pending[0]
+                if _item[0] == 'chunk':
+                    if _state['chunks'] <= limit:
+                        break
+                    _state['dest'].write_compressed(_item[2].result(), _item[1])
+                    _state['chunks'] -= 1
+                elif _item[0] == 'file':
+                    _state['dest'] = zip_file.open(_item[1], mode='w')
+                elif _item[0] == 'end':
+                    _state['dest'].close()
+                    _state['dest'] = None
+                else:
+                    zip_file.writestr(_item[1], '')
+                _pending.popleft()
+
+        try:
+            for _file, _arcname in members:
+                if _file is None:
+                    _pending.append(('dir', _arcname))
+                    continue
+
+                _zinfo = zipfile.ZipInfo.from_file(_file, _arcname)
+                _zinfo.compress_type = zipfile.ZIP_DEFLATED
+                _zinfo._compresslevel = compresslevel
+                _pending.append(('file', _zinfo))
+                with open(_file, 'rb') as _f:
+                    _data = _f.read(chunk_size)
+                    _zdict = None
+                    while True:
+                        # 预读下一块以判断是否最后一块
+                        _next = _f.read(chunk_size) if len(_data) == chunk_size else b''
+                        _is_last = len(_next) == 0
+                        _pending.append((
+                            'chunk', _data,
+                            executor.submit(_deflate_chunk, _data, _level, _zdict, _is_last)
+                        ))
+                        _state['chunks'] += 1
+                        _write_pending(_max_pending)
+                        if _is_last:
+                            break
+                        _zdict = _data[-32768:]
+                        _data = _next
+                _pending.append(('end', ))
+
+            # 写入剩余的任务
+            _write_pending(-1)
+        except:
+            # 取消未执行的任务, 并关闭正在写入的文件, 确保压缩包可以正常关闭
+            for _item in _pending:
+                if _item[0] == 'chunk':
+                    _item[2].cancel()
+            if _state['dest'] is not None:
+                _state['dest'].close()
+            raise
+
     #############################
     # 目录比较功能
     #############################
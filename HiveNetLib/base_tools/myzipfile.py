@@ -2,6 +2,8 @@
 Read and write ZIP files.
 
 change by 黎慧剑 2019.11.14 : 解决中文文件名乱码问题
+change by 黎慧剑 2026.10.19 : 写入文件支持直接写入外部已压缩的数据(write_compressed)
+change by 黎慧剑 2026.10.19 : 增加内存映射方式读取的MmapZipFile(缓存中央目录、支持多线程并发读取及并行解压)
 
 XXX references to utf-8 need further investigation.
 """
@@ -15,6 +17,9 @@ import shutil
 import struct
 import binascii
 import threading
+import mmap
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     import zlib # We may need its compression method
@@ -40,7 +45,8 @@ except:
 
 __all__ = ["BadZipFile", "BadZipfile", "error",
            "ZIP_STORED", "ZIP_DEFLATED", "ZIP_BZIP2", "ZIP_LZMA",
-           "is_zipfile", "ZipInfo", "ZipFile", "PyZipFile", "LargeZipFile"]
+           "is_zipfile", "ZipInfo", "ZipFile", "PyZipFile", "LargeZipFile",
+           "MmapZipFile"]
 
 
 class BadZipFile(Exception):
@@ -736,7 +742,10 @@ class _SharedFile:
         self._lock = lock
         self._writing = writing
         self.seekable = file.seekable
-        self.tell = file.tell
+
+    def tell(self):
+        # 返回自身的读取位置, 不能直接使用共享文件句柄的tell(多线程时会破坏文件句柄的位置缓存)
+        return self._pos
 
     def seek(self, offset, whence=0):
         with self._lock:
@@ -766,6 +775,46 @@ class _SharedFile:
             self._close(fileobj)
 
 
+class _MmapFile:
+    """
+    基于内存映射的压缩包成员读取对象, 每个对象有独立的读取位置, 多线程读取无需加锁
+    """
+
+    def __init__(self, mm, file, pos, close):
+        self._mmap = mm
+        self._file = file
+        self._pos = pos
+        self._close = close
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self._pos
+        elif whence == 2:
+            offset += len(self._mmap)
+        self._pos = offset
+        return self._pos
+
+    def read(self, n=-1):
+        if n is None or n < 0:
+            end = len(self._mmap)
+        else:
+            end = self._pos + n
+        data = self._mmap[self._pos:end]
+        self._pos += len(data)
+        return data
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap = None
+            self._close(self._file)
+
+
 # Provide the tell method for unseekable stream
 class _Tellable:
     def __init__(self, fp):
@@ -1095,6 +1144,7 @@ class _ZipWriteFile(io.BufferedIOBase):
         self._file_size = 0
         self._compress_size = 0
         self._crc = 0
+        self._precompressed = False
 
     @property
     def _fileobj(self):
@@ -1115,12 +1165,39 @@ class _ZipWriteFile(io.BufferedIOBase):
         self._fileobj.write(data)
         return nbytes
 
+    def write_compressed(self, compress_data, data):
+        """
+        写入已在外部压缩好的数据(例如在线程池中并行压缩的数据块)
+
+        @param {bytes} compress_data - 已按文件头的压缩方式及压缩级别压缩的数据
+            注: 所有数据块拼接后必须为完整的压缩流, 例如deflate方式除最后一块外需通过Z_SYNC_FLUSH结束
+        @param {bytes} data - 压缩前的原始数据, 用于计算CRC和文件大小
+
+        @returns {int} - 写入的原始数据大小
+        """
+        if self.closed:
+            raise ValueError('I/O operation on closed file.')
+        if not self._precompressed:
+            if self._file_size > 0:
+                raise ValueError("Can't mix write and write_compressed on the same file.")
+            # 数据已在外部压缩, 不再使用内部压缩器
+            self._precompressed = True
+            self._compressor = None
+        nbytes = len(data)
+        self._file_size += nbytes
+        self._crc = crc32(data, self._crc)
+        self._compress_size += len(compress_data)
+        self._fileobj.write(compress_data)
+        return nbytes
+
     def close(self):
         if self.closed:
             return
         super().close()
         # Flush any data from the compressor, and update header info
-        if self._compressor:
+        if self._precompressed:
+            self._zinfo.compress_size = self._compress_size
+        elif self._compressor:
             buf = self._compressor.flush()
             self._compress_size += len(buf)
             self._fileobj.write(buf)
@@ -1499,8 +1576,7 @@ class ZipFile:
 
         # Open for reading:
         self._fileRefCnt += 1
-        zef_file = _SharedFile(self.fp, zinfo.header_offset,
-                               self._fpclose, self._lock, lambda: self._writing)
+        zef_file = self._open_member_file(zinfo)
         try:
             # Skip the file header:
             fheader = zef_file.read(sizeFileHeader)
@@ -1572,6 +1648,17 @@ class ZipFile:
             zef_file.close()
             raise
 
+    def _open_member_file(self, zinfo):
+        """
+        获取读取指定成员的文件对象(定位在成员的文件头)
+
+        @param {ZipInfo} zinfo - 要读取的成员信息
+
+        @returns {object} - 读取成员的文件对象
+        """
+        return _SharedFile(self.fp, zinfo.header_offset,
+                           self._fpclose, self._lock, lambda: self._writing)
+
     def _open_to_write(self, zinfo, force_zip64=False):
         if force_zip64 and not self._allowZip64:
             raise ValueError(
@@ -1686,13 +1773,14 @@ class ZipFile:
         targetpath = os.path.normpath(targetpath)
 
         # Create all upper directories if necessary.
+        # 使用exist_ok, 支持多线程并行解压时同时创建目录
         upperdirs = os.path.dirname(targetpath)
         if upperdirs and not os.path.exists(upperdirs):
-            os.makedirs(upperdirs)
+            os.makedirs(upperdirs, exist_ok=True)
 
         if member.is_dir():
             if not os.path.isdir(targetpath):
-                os.mkdir(targetpath)
+                os.makedirs(targetpath, exist_ok=True)
             return targetpath
 
         with self.open(member, pwd=pwd) as source, open(targetpath, "wb") as target:
@@ -1947,6 +2035,144 @@ class ZipFile:
             fp.close()
 
 
+class MmapZipFile(ZipFile):
+    """
+    以内存映射(mmap)方式只读打开的压缩包
+
+    z = MmapZipFile(file)
+
+    与ZipFile的只读模式相比:
+        1、解析后的中央目录按文件路径缓存(通过修改时间、大小及inode判断文件是否变化), 重复打开同一压缩包无需重新解析
+        2、各成员的读取对象直接从内存映射中读取数据, 不再通过共享文件句柄加锁读取, 多线程可并发读取及解压
+        3、extractall支持通过线程池并行解压
+    注: 传入的文件对象不支持fileno时(例如BytesIO), 按ZipFile的原有方式读取
+    """
+
+    CENTRAL_DIR_CACHE_SIZE = 128  # 中央目录缓存的最大压缩包数量
+    _central_dir_cache = OrderedDict()  # 中央目录缓存, key为文件路径, value为(文件标识, 中央目录信息)
+    _central_dir_cache_lock = threading.Lock()
+
+    def __init__(self, file):
+        """
+        以只读方式打开压缩包
+
+        @param {str|PathLike|object} file - 压缩包文件路径或已打开的文件对象
+        """
+        self._mmap = None
+        super().__init__(file, mode='r')
+        try:
+            self._mmap = mmap.mmap(self.fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+            # 不支持内存映射的文件对象, 使用原有方式读取
+            self._mmap = None
+
+    @classmethod
+    def clear_central_dir_cache(cls):
+        """
+        清除中央目录缓存
+        """
+        with cls._central_dir_cache_lock:
+            cls._central_dir_cache.clear()
+
+    def _get_cache_key(self):
+        """
+        获取当前压缩包的缓存key及文件标识
+
+        @returns {tuple} - (key, 文件标识), 不支持缓存时返回(None, None)
+        """
+        if not isinstance(self.filename, str):
+            return None, None
+        try:
+            _stat = os.fstat(self.fp.fileno())
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return None, None
+        return os.path.realpath(self.filename), (_stat.st_mtime_ns, _stat.st_size, _stat.st_ino)
+
+    def _RealGetContents(self):
+        """
+        读取中央目录, 优先使用缓存
+        """
+        _key, _stamp = self._get_cache_key()
+        if _key is not None:
+            with self._central_dir_cache_lock:
+                _cached = self._central_dir_cache.get(_key, None)
+                if _cached is not None and _cached[0] == _stamp:
+                    self._central_dir_cache.move_to_end(_key)
+                else:
+                    _cached = None
+            if _cached is not None:
+                self.start_dir, self._comment, _filelist, _name_to_info = _cached[1]
+                self.filelist = list(_filelist)
+                self.NameToInfo = dict(_name_to_info)
+                return
+
+        super()._RealGetContents()
+
+        if _key is not None:
+            with self._central_dir_cache_lock:
+                self._central_dir_cache[_key] = (
+                    _stamp,
+                    (self.start_dir, self._comment, tuple(self.filelist), dict(self.NameToInfo))
+                )
+                self._central_dir_cache.move_to_end(_key)
+                while len(self._central_dir_cache) > self.CENTRAL_DIR_CACHE_SIZE:
+                    self._central_dir_cache.popitem(last=False)
+
+    def open(self, name, mode="r", pwd=None, *, force_zip64=False):
+        """
+        获取读取成员的文件对象, 仅支持'r'模式
+
+        @param {str|ZipInfo} name - 成员名或成员信息
+        @param {str} mode='r' - 打开模式
+        @param {bytes} pwd=None - 解压密码
+        """
+        # 引用计数的修改需加锁, 成员数据的读取不加锁
+        with self._lock:
+            return super().open(name, mode=mode, pwd=pwd, force_zip64=force_zip64)
+
+    def _open_member_file(self, zinfo):
+        """
+        获取读取指定成员的文件对象, 使用内存映射时每个成员使用独立读取位置
+        """
+        if self._mmap is None:
+            return super()._open_member_file(zinfo)
+        return _MmapFile(self._mmap, self.fp, zinfo.header_offset, self._fpclose)
+
+    def extractall(self, path=None, members=None, pwd=None, workers=0):
+        """
+        解压所有(或指定)成员到指定路径
+
+        @param {str} path=None - 解压路径, 默认为当前工作目录
+        @param {list} members=None - 要解压的成员清单, 默认为所有成员
+        @param {bytes} pwd=None - 解压密码
+        @param {int} workers=0 - 并行解压的线程数, 0代表在当前线程逐个解压
+        """
+        if workers <= 1:
+            return super().extractall(path=path, members=members, pwd=pwd)
+
+        if members is None:
+            members = self.namelist()
+
+        if path is None:
+            path = os.getcwd()
+        else:
+            path = os.fspath(path)
+
+        with ThreadPoolExecutor(max_workers=workers) as _executor:
+            for _future in [
+                _executor.submit(self._extract_member, _member, path, pwd) for _member in members
+            ]:
+                _future.result()
+
+    def _fpclose(self, fp):
+        with self._lock:
+            super()._fpclose(fp)
+            if not self._fileRefCnt and self._mmap is not None:
+                # 已没有使用者, 关闭内存映射
+                self._mmap.close()
+                self._mmap = None
+
+
 class PyZipFile(ZipFile):
     """Class to create ZIP archives with Python library files and packages."""
 
@@ -16,6 +16,7 @@
 import os
 import sys
 import copy
+import uuid
 from functools import wraps
 from inspect import isawaitable
 from typing import List, Callable, Any, Union
@@ -23,6 +24,7 @@ from typing import List, Callable, Any, Union
 sys.path.append(os.path.abspath(os.path.join(
     os.path.dirname(__file__), os.path.pardir, os.path.pardir)))
 from HiveNetLib.base_tools.run_tool import RunTool
+from HiveNetLib.base_tools.trace_context import TraceContext
 # 动态安装包
 import HiveNetLib.deps_tool as deps_tool
 # opentracing
@@ -120,6 +122,10 @@ class OpenTracerFW(opentracing.Tracer):
         # key为Span对应的request对象的string格式，value为包含Span的Scope对象
         self._current_scopes = {}
 
+        # 存储调用链上下文令牌的字典，用于请求处理完成后恢复调用链上下文
+        # key为请求对象的id，value为TraceContext.set_trace_info返回的令牌
+        self._current_trace_tokens = {}
+
         if self._trace_all_requests:
             # 追踪app的所有请求
             self._set_all_request_trace_middleware()
@@ -253,6 +259,9 @@ class OpenTracerFW(opentracing.Tracer):
                         trace_exceptions=trace_exceptions
                     )
                     raise
+                finally:
+                    # 无论处理是否成功都需恢复调用链上下文，避免令牌泄漏
+                    self._reset_trace_context(request_obj)
             return decorated_function
 
         return decorator
@@ -364,19 +373,19 @@ class OpenTracerFW(opentracing.Tracer):
         self._current_scopes[id(request_obj)] = scope
 
         span = scope.span
+        self._set_trace_context(request_obj, span)
+
         # 设置Tags，覆盖实例默认要设置的参数
-        tag_paras = copy.deepcopy(self._request_tag_paras).update(
-            {} if self_tag_paras is None else self_tag_paras
-        )
+        tag_paras = copy.deepcopy(self._request_tag_paras)
+        tag_paras.update({} if self_tag_paras is None else self_tag_paras)
         for tag_name, tag_para in tag_paras.items():
             tag_value = self._get_obj_info_inner('req', request_obj, tag_para)
             if tag_value is not None:
                 span.set_tag(tag_name, tag_value)
 
         # 设置Baggage，覆盖实例默认要设置的参数
-        baggage_paras = copy.deepcopy(self._request_baggage_paras).update(
-            {} if self_baggage_paras is None else self_baggage_paras
-        )
+        baggage_paras = copy.deepcopy(self._request_baggage_paras)
+        baggage_paras.update({} if self_baggage_paras is None else self_baggage_paras)
         for baggage_name, baggage_para in baggage_paras.items():
             baggage_value = self._get_obj_info_inner('req', request_obj, baggage_para)
             if baggage_value is not None:
@@ -408,12 +417,16 @@ class OpenTracerFW(opentracing.Tracer):
             函数定义为 func(request_obj, open_tracer), open_tracer传入当前OpenTracer的实例对象
         @param {Union[Exception, str]} error=None - 错误信息，如果有传值进来代表响应为失败的情况
         """
-        # 执行通用的请求结束执行函数
-        if self_after_func is not None:
-            self_after_func(request_obj, response_obj, self)
+        try:
+            # 执行通用的请求结束执行函数
+            if self_after_func is not None:
+                self_after_func(request_obj, response_obj, self)
 
-        if self._custom_after_request_func is not None:
-            self._custom_after_request_func(request_obj, response_obj, self)
+            if self._custom_after_request_func is not None:
+                self._custom_after_request_func(request_obj, response_obj, self)
+        finally:
+            # 恢复调用链上下文
+            self._reset_trace_context(request_obj)
 
         # 执行Span的关闭处理
         scope = self._current_scopes.pop(id(request_obj), None)
@@ -423,9 +436,8 @@ class OpenTracerFW(opentracing.Tracer):
         if response_obj is not None:
             span = scope.span
             # 设置Tags，覆盖实例默认要设置的参数
-            tag_paras = copy.deepcopy(self._response_tag_paras).update(
-                {} if self_tag_paras is None else self_tag_paras
-            )
+            tag_paras = copy.deepcopy(self._response_tag_paras)
+            tag_paras.update({} if self_tag_paras is None else self_tag_paras)
             for tag_name, tag_para in tag_paras.items():
                 tag_value = self._get_obj_info_inner('resp', response_obj, tag_para)
                 if tag_value is not None:
@@ -435,13 +447,55 @@ class OpenTracerFW(opentracing.Tracer):
         if error is not None:
             scope.span.set_tag(tags.ERROR, True)
             if type(error) == str:
-                scope.span.lo_kv({{"message": error}})
+                scope.span.log_kv({"message": error})
             else:
                 scope.span.log_kv({"event": tags.ERROR, "error.object": error})
 
         # 关闭span
         scope.close()
 
+    def _set_trace_context(self, request_obj: Any, span: opentracing.Span):
+        """
+        设置请求处理的调用链上下文(TraceContext)
+        注: 请求处理中通过CallChainTool.methon_call_chain修饰的函数将沿用该调用链，
+            如果已有调用链则延续原调用链，否则使用Span的trace_id(如Tracer实现支持)作为调用链追踪ID
+
+        @param {Any} request_obj - 请求信息对象
+        @param {opentracing.Span} span - 当前请求的Span对象
+        """
+        _parent_info = TraceContext.get_trace_info()
+        _call_id = getattr(span.context, 'span_id', None)
+        if _call_id is None:
+            _call_id = str(uuid.uuid1()).replace('-', '')
+        elif isinstance(_call_id, int):
+            _call_id = '%x' % _call_id
+
+        if _parent_info is not None:
+            _trace_id = _parent_info.trace_id
+            _trace_level = _parent_info.trace_level
+        else:
+            _trace_id = getattr(span.context, 'trace_id', None)
+            if _trace_id is None:
+                _trace_id = _call_id
+            elif isinstance(_trace_id, int):
+                _trace_id = '%x' % _trace_id
+            _trace_level = [0]
+
+        self._current_trace_tokens[id(request_obj)] = TraceContext.set_trace_info(
+            _trace_id, _call_id, _trace_level
+        )
+
+    def _reset_trace_context(self, request_obj: Any):
+        """
+        恢复请求处理前的调用链上下文(TraceContext)
+        注: 可重复调用，令牌已恢复的情况直接忽略
+
+        @param {Any} request_obj - 请求信息对象
+        """
+        token = self._current_trace_tokens.pop(id(request_obj), None)
+        if token is not None:
+            TraceContext.reset_trace_info(token)
+
     def _trace_all_request_middleware_request(
         self, request_obj: Any, operation_name_para: str = 'const:unknow', self_tag_paras: dict = None,
         self_baggage_paras: dict = None, self_before_func: Callable = None
@@ -518,14 +572,16 @@ class OpenTracerFW(opentracing.Tracer):
         _trace_all_exception = trace_all_exception if trace_all_exception is not None else self._trace_all_exception
         exceptions_to_trace = []
         if not _trace_all_exception:
-            exceptions_to_trace = copy.copy(self._exceptions_to_trace).extend(
-                trace_exceptions
-            )
+            exceptions_to_trace = copy.copy(self._exceptions_to_trace)
+            exceptions_to_trace.extend(trace_exceptions)
         if _trace_all_exception or (exceptions_to_trace and type(exception) in exceptions_to_trace):
             # 遇到需要追踪的特定错误时，需要记录问题
             self._after_request_fn(
                 request_obj, None, error=exception
             )
+        else:
+            # 不追踪的错误也需恢复调用链上下文
+            self._reset_trace_context(request_obj)
 
     def _get_obj_info_inner(self, obj_type: str, obj: Any, para_str: str, default: Any = None) -> Any:
         """
@@ -23,25 +23,15 @@ import subprocess
 import traceback
 import logging
 import platform
+import time
 from contextlib import contextmanager
-import asyncio
 from inspect import isawaitable
 from typing import Any
-try:
-    # 支持嵌套异步调用处理
-    import nest_asyncio
-    nest_asyncio.apply()
-except ImportError:
-    pass
 
 # 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
 sys.path.append(os.path.abspath(os.path.join(
     os.path.dirname(__file__), os.path.pardir, os.path.pardir)))
 from HiveNetLib.base_tools.file_tool import FileTool
-try:
-    from gevent import sleep
-except ImportError:
-    from time import sleep
 
 
 __MOUDLE__ = 'run_tool'  # 模块名
@@ -369,11 +359,15 @@ class RunTool(object):
     def sleep(cls, seconds=0):
         """
         休眠一段时间
-        注: 如果有安装gevent则会使用gevent.sleep替代time.sleep
+        注: 如果已导入gevent(使用协程处理)则会使用gevent.sleep替代time.sleep
 
         @param {int} seconds=0 - 休眠时间，单位为秒
         """
-        return sleep(seconds=seconds)
+        _gevent = sys.modules.get('gevent', None)
+        if _gevent is None:
+            return time.sleep(seconds)
+
+        return _gevent.sleep(seconds=seconds)
 
     @classmethod
     def async_raise(cls, tid, exctype):
@@ -1014,9 +1008,12 @@ class AsyncTools(object):
     def set_thread_event_loop(cls):
         """
         设置线程的协程参数, 让线程正常运行协程
+        注: 将同时对循环事件对象应用nest_asyncio(如有安装), 支持嵌套异步调用处理
 
         @returns {io_loop} - 返回协程循环事件对象
         """
+        import asyncio
+
         try:
             loop = asyncio.get_running_loop()
         except:
@@ -1026,8 +1023,26 @@ class AsyncTools(object):
                 loop = asyncio.new_event_loop()
 
         asyncio.set_event_loop(loop)
+        cls._apply_nest_asyncio(loop)
         return loop
 
+    @classmethod
+    def _apply_nest_asyncio(cls, loop):
+        """
+        对循环事件对象应用nest_asyncio, 支持嵌套异步调用处理
+        注: 在首次使用时才导入nest_asyncio, 未安装或不支持的循环事件类型(例如uvloop)不做处理
+
+        @param {io_loop} loop - 循环事件对象
+        """
+        if getattr(loop, '_nest_patched', False):
+            return
+
+        try:
+            import nest_asyncio
+            nest_asyncio.apply(loop)
+        except (ImportError, ValueError):
+            pass
+
     @classmethod
     def sync_call(cls, func, *args, **kwargs) -> Any:
         """
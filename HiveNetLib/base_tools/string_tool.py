@@ -19,22 +19,11 @@ import os
 import sys
 import json
 import re
+import importlib
 from random import Random
 # 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
 sys.path.append(os.path.abspath(os.path.join(
     os.path.dirname(__file__), os.path.pardir, os.path.pardir)))
-# 动态添加包安装
-import HiveNetLib.deps_tool as deps_tool
-try:
-    import dicttoxml
-except ImportError:
-    deps_tool.install_package('dicttoxml')
-    import dicttoxml
-try:
-    from lxml import etree
-except ImportError:
-    deps_tool.install_package('lxml')
-    from lxml import etree
 
 
 __MOUDLE__ = 'string_tool'  # 模块名
@@ -44,6 +33,30 @@ __AUTHOR__ = u'黎慧剑'  # 作者
 __PUBLISH__ = '2018.08.29'  # 发布日期
 
 
+# 延迟装载的依赖包, key为模块属性名, value为实际导入的包名
+# 注: 仅在首次使用时才导入, 避免导入本模块时装载lxml、dicttoxml
+_LAZY_MODULES = {
+    'dicttoxml': 'dicttoxml',
+    'etree': 'lxml.etree',
+}
+
+
+def __getattr__(name):
+    """
+    延迟装载依赖包的模块属性访问(兼容string_tool.etree等原有访问方式)
+
+    @param {str} name - 属性名
+
+    @returns {module} - 导入的依赖包
+    """
+    if name in _LAZY_MODULES:
+        _module = importlib.import_module(_LAZY_MODULES[name])
+        globals()[name] = _module
+        return _module
+
+    raise AttributeError("module '%s' has no attribute '%s'" % (__name__, name))
+
+
 class StringTool(object):
     """
     字符串处理通用类
@@ -438,6 +451,8 @@ class StringTool(object):
 
         @return {string} - 转换后的XML字符串
         """
+        import dicttoxml
+
         if item_func is None:
             item_func = dicttoxml.default_item_func
         _dict = json.loads(json_str)
@@ -457,6 +472,8 @@ class StringTool(object):
 
         @return {string} - 转换后的dict字典
         """
+        from lxml import etree
+
         _has_xml_def = False
         if xml_str[0:5] == "<?xml":
             _has_xml_def = True
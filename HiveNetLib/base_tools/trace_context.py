@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2018 黎慧剑
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+调用链上下文工具
+基于contextvars保存当前执行的调用链信息, 在同一线程/协程任务(asyncio.Task)内的嵌套调用间共享
+
+@module trace_context
+@file trace_context.py
+
+"""
+
+import contextvars
+from collections import namedtuple
+from contextlib import contextmanager
+
+
+__MOUDLE__ = 'trace_context'  # 模块名
+__DESCRIPT__ = u'调用链上下文工具'  # 模块描述
+__VERSION__ = '0.1.0'  # 版本
+__AUTHOR__ = u'黎慧剑'  # 作者
+__PUBLISH__ = '2026.10.19'  # 发布日期
+
+
+"""
+调用链信息
+@attr {string} trace_id - 调用链追踪ID
+@attr {string} call_id - 当前执行的执行ID(下一层调用的parent_id)
+@attr {int[]} trace_level - 函数调用层级，是一个只有一个int变量的数组，trace_level[0]为当前的执行层级
+    注: 同一调用链共享该数组对象, 每执行一次被修饰的函数+1
+"""
+TraceInfo = namedtuple('TraceInfo', ('trace_id', 'call_id', 'trace_level'))
+
+
+# 当前执行的调用链信息, 协程任务创建时会自动复制当前值, 新线程的初始值为None
+_TRACE_INFO = contextvars.ContextVar('hivenet_trace_info', default=None)
+
+
+class TraceContext(object):
+    """
+    调用链上下文工具类
+    注: CallChainTool.methon_call_chain修饰符、gRPC服务端及OpenTracing请求追踪均通过该类共享调用链信息
+    """
+
+    @staticmethod
+    def get_trace_info():
+        """
+        获取当前执行的调用链信息
+
+        @returns {TraceInfo} - 调用链信息, 如果没有则返回None
+        """
+        return _TRACE_INFO.get()
+
+    @staticmethod
+    def set_trace_info(trace_id, call_id, trace_level):
+        """
+        设置当前执行的调用链信息
+
+        @param {string} trace_id - 调用链追踪ID
+        @param {string} call_id - 当前执行的执行ID
+        @param {int[]|int} trace_level - 函数调用层级, 如果传入int将转换为数组
+
+        @returns {contextvars.Token} - 用于恢复原调用链信息的令牌, 通过reset_trace_info恢复
+        """
+        if not isinstance(trace_level, list):
+            trace_level = [int(trace_level)]
+        return _TRACE_INFO.set(TraceInfo(trace_id, call_id, trace_level))
+
+    @staticmethod
+    def reset_trace_info(token):
+        """
+        恢复设置前的调用链信息
+
+        @param {contextvars.Token} token - set_trace_info返回的令牌
+        """
+        try:
+            _TRACE_INFO.reset(token)
+        except ValueError:
+            # 令牌不是在当前上下文中创建(例如跨协程任务), 直接清除
+            _TRACE_INFO.set(None)
+
+    @staticmethod
+    @contextmanager
+    def trace_info_context(trace_id, call_id, trace_level):
+        """
+        在with范围内设置调用链信息, 退出时恢复原调用链信息
+
+        @param {string} trace_id - 调用链追踪ID
+        @param {string} call_id - 当前执行的执行ID
+        @param {int[]|int} trace_level - 函数调用层级
+
+        @example
+            with TraceContext.trace_info_context(trace_id, call_id, 1):
+                do_something()
+        """
+        _token = TraceContext.set_trace_info(trace_id, call_id, trace_level)
+        try:
+            yield
+        finally:
+            TraceContext.reset_trace_info(_token)
+
+    @staticmethod
+    def bind(func):
+        """
+        将函数绑定到当前的上下文, 用于将调用链信息传递到新线程中执行
+        注: 新线程不会继承创建线程的上下文, 需将线程函数通过该方法绑定
+
+        @param {function} func - 要绑定的函数
+
+        @returns {function} - 在当前上下文副本中执行的函数
+
+        @example
+            threading.Thread(target=TraceContext.bind(thread_fun)).start()
+        """
+        _context = contextvars.copy_context()
+
+        def _run(*args, **kwargs):
+            return _context.run(func, *args, **kwargs)
+
+        return _run
+
+
+if __name__ == '__main__':
+    # 当程序自己独立运行时执行的操作
+    # 打印版本信息
+    print(('模块名：%s  -  %s\n'
+           '作者：%s\n'
+           '发布日期：%s\n'
+           '版本：%s' % (__MOUDLE__, __DESCRIPT__, __AUTHOR__, __PUBLISH__, __VERSION__)))
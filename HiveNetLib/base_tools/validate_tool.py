@@ -19,6 +19,7 @@ import re
 import datetime
 import traceback
 import copy
+import inspect
 # 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
 sys.path.append(os.path.abspath(os.path.join(
     os.path.dirname(__file__), os.path.pardir, os.path.pardir)))
@@ -55,11 +56,21 @@ VALIDATE_ERR_MSG = {
 
 }
 
+# 预编译的校验正则表达式
+_STR_IS_INT_REGEX = re.compile('^[+-]{0,1}\\d{1,}$')
+_STR_IS_FLOAT_REGEX = re.compile('^[+-]{0,1}\\d{1,}\\.{0,1}\\d{0,}$')
+_STR_IS_EMAIL_REGEX = re.compile('^[^@.]+@[^@]+$')
+
 # 标识组合逻辑验证函数名清单(And/Or)，如果需要自定义组合函逻辑函数，可修改该list
 VALIDATE_LOGIC_FUN_NAME = [
     'And', 'Or', 'List'
 ]
 
+# 组合逻辑验证函数由校验处理自动传入的参数名
+_LOGIC_FUN_INNER_PARAS = (
+    'obj_id', 'i18n_obj', 'ignore_list_miss_value', 'is_use_pre_obj_id', 'pre_obj_id'
+)
+
 
 class ValidateTool(object):
     """
@@ -122,6 +133,44 @@ class ValidateTool(object):
         # 返回结果
         return _format_str
 
+    @classmethod
+    def datetime_fmt_to_regex(cls, format_str):
+        """
+        将类Oracle格式的日期时间格式化字符串转换为匹配该格式的正则表达式
+
+        @param {string} format_str - 类Oracle格式的日期时间格式，支持的格式参考datetime_fmt_to_py
+
+        @return {string} - 转换后的正则表达式字符串
+        """
+        _regstr = format_str.replace('\\', '\\\\')  # 将\替换为转义后的\\
+        # _regstr = format_str
+
+        def re_group_replace(text):
+            # 通过正则表达式替换匹配到的组的字符串，增加转义符
+            return '\\%s' % text.group()
+
+        # 替换转义符
+        _regstr = re.sub(r'[\$\(\)\*\+\.\[\]\?\/\^\{\}\|]', re_group_replace, _regstr)
+        _regstr = re.sub(r'yyyy', '[0-9]{4,4}', _regstr)  # 四位年份, 剔除有转义符的情况
+        _regstr = re.sub(r'yy', '[0-9]{2,2}', _regstr)  # 两位年份, 剔除有转义符的情况
+        _regstr = re.sub(r'MM', '((0[0-9])|(1[012]))', _regstr)  # 两位月份，0－9月前面需补0
+        _regstr = re.sub(r'M', '([0-9]|(1[012]))', _regstr)  # 一位月份，0-9月不能补0
+        _regstr = re.sub(r'dd', '(([012][0-9])|(3[01]))', _regstr)  # 两位日期，这里限制到不能超过31
+        _regstr = re.sub(r'd', '(([12]{0,1}[0-9])|(3[01]))', _regstr)  # 一位日期，这里限制到不能超过31
+        _regstr = re.sub(r'hh24', '(([01][0-9])|(2[0-3]))', _regstr)  # 两位小时，这里限制到不能超过23
+        _regstr = re.sub(r'hh', '(([01][0-2]))', _regstr)  # 两位小时，这里限制到不能超过12
+        _regstr = re.sub(r'h24', '((1{0,1}[0-9])|(2[0-3]))', _regstr)  # 一位小时，这里限制到不能超过23
+        _regstr = re.sub(r'h', '(([0-9]|[1][0-2]))', _regstr)  # 一位小时，这里限制到不能超过12
+        _regstr = re.sub(r'mm', '(([0-5][0-9]))', _regstr)  # 两位分钟，这里限制到不能超过59
+        _regstr = re.sub(r'm', '(([0-9]|[1-5][0-9]))', _regstr)  # 一位分钟，这里限制到不能超过59
+        _regstr = re.sub(r'ss', '(([0-5][0-9]))', _regstr)  # 两位分钟，这里限制到不能超过59
+        _regstr = re.sub(r's', '(([0-9]|[1-5][0-9]))', _regstr)  # 一位分钟，这里限制到不能超过59
+        _regstr = re.sub(r'p', '(AM|PM)', _regstr)  # 一位分钟，这里限制到不能超过59
+        _regstr = '^%s$' % _regstr
+
+        # 返回结果
+        return _regstr
+
     #############################
     # 字符串基础校验函数
     #############################
@@ -196,7 +245,7 @@ class ValidateTool(object):
         if not cls.str_not_null(obj):
             return True
 
-        _rep = re.search('^[+-]{0,1}\\d{1,}$', obj)
+        _rep = _STR_IS_INT_REGEX.search(obj)
         return False if _rep is None else True
 
     @classmethod
@@ -212,7 +261,7 @@ class ValidateTool(object):
         if not cls.str_not_null(obj):
             return True
 
-        _rep = re.search('^[+-]{0,1}\\d{1,}\\.{0,1}\\d{0,}$', obj)
+        _rep = _STR_IS_FLOAT_REGEX.search(obj)
         return False if _rep is None else True
 
     @classmethod
@@ -228,7 +277,7 @@ class ValidateTool(object):
         if not cls.str_not_null(obj):
             return True
 
-        _rep = re.search('^[^@.]+@[^@]+$', obj)
+        _rep = _STR_IS_EMAIL_REGEX.search(obj)
         return False if _rep is None else True
 
     @classmethod
@@ -260,33 +309,7 @@ class ValidateTool(object):
         if not cls.str_not_null(obj):
             return True
 
-        _regstr = format_str.replace('\\', '\\\\')  # 将\替换为转义后的\\
-        # _regstr = format_str
-
-        def re_group_replace(text):
-            # 通过正则表达式替换匹配到的组的字符串，增加转义符
-            return '\\%s' % text.group()
-
-        # 替换转义符
-        _regstr = re.sub(r'[\$\(\)\*\+\.\[\]\?\/\^\{\}\|]', re_group_replace, _regstr)
-        _regstr = re.sub(r'yyyy', '[0-9]{4,4}', _regstr)  # 四位年份, 剔除有转义符的情况
-        _regstr = re.sub(r'yy', '[0-9]{2,2}', _regstr)  # 两位年份, 剔除有转义符的情况
-        _regstr = re.sub(r'MM', '((0[0-9])|(1[012]))', _regstr)  # 两位月份，0－9月前面需补0
-        _regstr = re.sub(r'M', '([0-9]|(1[012]))', _regstr)  # 一位月份，0-9月不能补0
-        _regstr = re.sub(r'dd', '(([012][0-9])|(3[01]))', _regstr)  # 两位日期，这里限制到不能超过31
-        _regstr = re.sub(r'd', '(([12]{0,1}[0-9])|(3[01]))', _regstr)  # 一位日期，这里限制到不能超过31
-        _regstr = re.sub(r'hh24', '(([01][0-9])|(2[0-3]))', _regstr)  # 两位小时，这里限制到不能超过23
-        _regstr = re.sub(r'hh', '(([01][0-2]))', _regstr)  # 两位小时，这里限制到不能超过12
-        _regstr = re.sub(r'h24', '((1{0,1}[0-9])|(2[0-3]))', _regstr)  # 一位小时，这里限制到不能超过23
-        _regstr = re.sub(r'h', '(([0-9]|[1][0-2]))', _regstr)  # 一位小时，这里限制到不能超过12
-        _regstr = re.sub(r'mm', '(([0-5][0-9]))', _regstr)  # 两位分钟，这里限制到不能超过59
-        _regstr = re.sub(r'm', '(([0-9]|[1-5][0-9]))', _regstr)  # 一位分钟，这里限制到不能超过59
-        _regstr = re.sub(r'ss', '(([0-5][0-9]))', _regstr)  # 两位分钟，这里限制到不能超过59
-        _regstr = re.sub(r's', '(([0-9]|[1-5][0-9]))', _regstr)  # 一位分钟，这里限制到不能超过59
-        _regstr = re.sub(r'p', '(AM|PM)', _regstr)  # 一位分钟，这里限制到不能超过59
-        _regstr = '^%s$' % _regstr
-
-        _rep = re.search(_regstr, obj)
+        _rep = re.search(cls.datetime_fmt_to_regex(format_str), obj)
         if _rep is None:
             return False
         else:
@@ -1051,11 +1074,144 @@ class ValidateTool(object):
         # 全部校验成功
         return CResult(code='00000', i18n_obj=i18n_obj)
 
+    #############################
+    # 预编译校验函数
+    #############################
+    @classmethod
+    def _prepare_str_is_int(cls):
+        """
+        生成预编译的str_is_int校验函数
+
+        @return {function} - 校验函数，格式为 fun(obj) -> bool
+        """
+        _search = _STR_IS_INT_REGEX.search
+        return lambda obj: type(obj) != str or obj == '' or _search(obj) is not None
+
+    @classmethod
+    def _prepare_str_is_float(cls):
+        """
+        生成预编译的str_is_float校验函数
+
+        @return {function} - 校验函数，格式为 fun(obj) -> bool
+        """
+        _search = _STR_IS_FLOAT_REGEX.search
+        return lambda obj: type(obj) != str or obj == '' or _search(obj) is not None
+
+    @classmethod
+    def _prepare_str_is_email(cls):
+        """
+        生成预编译的str_is_email校验函数
+
+        @return {function} - 校验函数，格式为 fun(obj) -> bool
+        """
+        _search = _STR_IS_EMAIL_REGEX.search
+        return lambda obj: type(obj) != str or obj == '' or _search(obj) is not None
+
+    @classmethod
+    def _prepare_str_check_regex(cls, regex_str, flags='0'):
+        """
+        生成预编译的str_check_regex校验函数
+
+        @param {string} regex_str - 正则表达式
+        @param {string} flags='0' - 正则表达处理标记生成字符串
+
+        @return {function} - 校验函数，格式为 fun(obj) -> bool
+        """
+        _search = re.compile(regex_str, flags=eval(flags)).search
+        return lambda obj: type(obj) != str or obj == '' or _search(obj) is not None
+
+    @classmethod
+    def _prepare_str_is_datetime(cls, format_str='yyyy-MM-dd'):
+        """
+        生成预编译的str_is_datetime校验函数
+
+        @param {string} format_str='yyyy-MM-dd' - 时间日期格式
+
+        @return {function} - 校验函数，格式为 fun(obj) -> bool
+        """
+        _search = re.compile(cls.datetime_fmt_to_regex(format_str)).search
+        _format_str = cls.datetime_fmt_to_py(format_str)
+        _strptime = datetime.datetime.strptime
+
+        def _check(obj):
+            if type(obj) != str or obj == '':
+                return True
+            if _search(obj) is None:
+                return False
+            try:
+                _strptime(obj, _format_str)
+                return True
+            except:
+                return False
+
+        return _check
+
+    @classmethod
+    def _prepare_str_check_date(cls, format_str='yyyy-MM-dd'):
+        """
+        生成预编译的str_check_date校验函数
+
+        @param {string} format_str='yyyy-MM-dd' - 日期时间格式
+
+        @return {function} - 校验函数，格式为 fun(obj) -> bool
+        """
+        _format_str = cls.datetime_fmt_to_py(format_str)
+        _strptime = datetime.datetime.strptime
+
+        def _check(obj):
+            if type(obj) != str or obj == '':
+                return True
+            try:
+                _strptime(obj, _format_str)
+                return True
+            except:
+                return False
+
+        return _check
+
+    @classmethod
+    def _prepare_check_time_btween(cls, min_date, max_date, format_str='yyyy-MM-dd',
+                                   is_eq_min=True, is_eq_max=True):
+        """
+        生成预编译的check_time_btween校验函数
+
+        @param {string|datetime} min_date - 比较的最小日期时间，None代表不比较
+        @param {string|datetime} max_date - 比较的最大日期时间，None代表不比较
+        @param {string} format_str='yyyy-MM-dd' - 日期时间格式
+        @param {bool} is_eq_min=True - 是否可以等于最小值
+        @param {bool} is_eq_max=True - 是否可以等于最大值
+
+        @return {function} - 校验函数，格式为 fun(obj) -> bool
+        """
+        _format_str = cls.datetime_fmt_to_py(format_str)
+        _strptime = datetime.datetime.strptime
+        _min_date = _strptime(min_date, _format_str) if type(min_date) == str else min_date
+        _max_date = _strptime(max_date, _format_str) if type(max_date) == str else max_date
+
+        def _check(obj):
+            if obj is None:
+                return True
+            try:
+                _obj = _strptime(obj, _format_str) if type(obj) == str else obj
+                if _min_date is not None and not(
+                    _obj > _min_date or (_obj == _min_date and is_eq_min)
+                ):
+                    return False
+                if _max_date is not None and not(
+                    _obj < _max_date or (_obj == _max_date and is_eq_max)
+                ):
+                    return False
+                return True
+            except:
+                return False
+
+        return _check
+
     #############################
     # 实例化对象的处理
     #############################
     def __init__(self, rule, ignore_list_miss_value=True, ignore_extra_keys=True, i18n_obj=None,
-                 is_use_pre_obj_id=True):
+                 is_use_pre_obj_id=True, option_rule=None, is_compile=True):
         """
         构造函数，创建指定规则进行校验的实例对象
 
@@ -1065,12 +1221,26 @@ class ValidateTool(object):
         @param {SimpleI18N} i18n_obj=None - 国际化类的实例对象，如不传入会尝试自动加载全局的国际化控件
         @param {bool} is_use_pre_obj_id=True - 是否使用前置obj_id，当指定为True时会根据dict的层级以及列表
             中的位置修改obj_id的显示
+        @param {dict} option_rule=None - 指示字段是否可忽略，详细定义见check_by_rule
+        @param {bool} is_compile=True - 是否将规则预编译为检查计划
+            注1：预编译时会一次性完成规则标准化、校验函数名解析、错误信息模版获取，以及正则表达式和日期
+                格式的转换，检查时直接执行检查计划，检查结果与check_by_rule一致;
+            注2：预编译后修改VALIDATE_ERR_MSG不会影响已创建的实例对象，规则中的校验函数名无法解析时将在
+                构造时直接抛出异常;
+            注3：检查成功时返回实例共享的成功结果对象，调用方不应修改该对象
         """
         self._rule = copy.deepcopy(rule)
         self._ignore_list_miss_value = ignore_list_miss_value
         self._ignore_extra_keys = ignore_extra_keys
         self._i18n_obj = i18n_obj
         self._is_use_pre_obj_id = is_use_pre_obj_id
+        self._option_rule = copy.deepcopy(option_rule)
+
+        # 预编译检查计划
+        self._check_plan = None
+        if is_compile:
+            self._success_result = CResult(code='00000', i18n_obj=i18n_obj)
+            self._check_plan = self._compile_rule(self._rule, option_rule=self._option_rule)
 
     def check(self, obj, obj_id='object'):
         """
@@ -1083,11 +1253,423 @@ class ValidateTool(object):
 
         @return {CResult} - 检查结果，'00000' - 检查成功，其他 - 检查失败
         """
+        if self._check_plan is not None:
+            return self._check_plan(obj, obj_id, '')
+
         return self.check_by_rule(
             self._rule, obj, obj_id=obj_id,
             ignore_list_miss_value=self._ignore_list_miss_value,
             ignore_extra_keys=self._ignore_extra_keys,
+            option_rule=self._option_rule,
+            i18n_obj=self._i18n_obj,
+            is_use_pre_obj_id=self._is_use_pre_obj_id
+        )
+
+    #############################
+    # 规则预编译的内部函数
+    #############################
+    def _compile_rule(self, rule, option_rule=None):
+        """
+        编译校验规则(对应check_by_rule的处理)
+
+        @param {dict|list|tuple|object} rule - 校验规则
+        @param {dict} option_rule=None - 指示字段是否可忽略
+
+        @return {function} - 检查函数，格式为 fun(obj, obj_id, pre_obj_id) -> CResult
+        """
+        if type(rule) == dict:
+            return self._compile_dict_rule(rule, option_rule, self._ignore_extra_keys)
+        else:
+            return self._compile_rule_list(rule)
+
+    def _compile_dict_rule(self, rule, option_rule, ignore_extra_keys):
+        """
+        编译字典校验规则, 检查对象为列表时按列表逐个检查字典
+
+        @param {dict} rule - 校验规则
+        @param {dict} option_rule - 指示字段是否可忽略
+        @param {bool} ignore_extra_keys - 是否忽略数据中不存在的key
+
+        @return {function} - 检查函数，格式为 fun(obj, obj_id, pre_obj_id) -> CResult
+        """
+        _check_dict = self._compile_dict_items(rule, option_rule, ignore_extra_keys)
+        # 与check_by_rule保持一致，拆分列表检查时不使用option_rule
+        _check_list_item = _check_dict if option_rule is None else self._compile_dict_items(
+            rule, None, ignore_extra_keys
+        )
+        _success_result = self._success_result
+        _is_use_pre_obj_id = self._is_use_pre_obj_id
+
+        def _check(obj, obj_id, pre_obj_id):
+            if type(obj) not in (list, tuple):
+                return _check_dict(obj, obj_id, pre_obj_id)
+
+            # 字典规则对列表时，拆分列表检查
+            _index = 0
+            for _obj_item in obj:
+                _obj_id = obj_id if not _is_use_pre_obj_id else ('%s~%d' % (obj_id, _index))
+                _result = _check_list_item(_obj_item, _obj_id, pre_obj_id)
+                if _result is not _success_result and not _result.is_success():
+                    return _result
+                _index += 1
+
+            return _success_result
+
+        return _check
+
+    def _compile_dict_items(self, rule, option_rule, ignore_extra_keys):
+        """
+        编译字典校验规则的各个key, 形成扁平的检查清单
+
+        @param {dict} rule - 校验规则
+        @param {dict} option_rule - 指示字段是否可忽略
+        @param {bool} ignore_extra_keys - 是否忽略数据中不存在的key
+
+        @return {function} - 检查函数，格式为 fun(obj, obj_id, pre_obj_id) -> CResult
+        """
+        _plan = list()
+        for _key, _value in rule.items():
+            # 检查对象不存在key时是否要返回失败
+            _is_must = not (
+                ignore_extra_keys and (
+                    option_rule is None or _key not in option_rule.keys() or option_rule[_key][0] != 'M'
+                )
+            )
+            if type(_value) == dict:
+                _check_fun = self._compile_dict_rule(
+                    _value, None if option_rule is None else option_rule[_key][1], ignore_extra_keys
+                )
+            else:
+                _check_fun = self._compile_rule_list(_value)
+            _plan.append((_key, _is_must, _check_fun))
+        _plan = tuple(_plan)
+
+        _success_result = self._success_result
+        _i18n_obj = self._i18n_obj
+        _is_use_pre_obj_id = self._is_use_pre_obj_id
+
+        def _check(obj, obj_id, pre_obj_id):
+            _pre_obj_id = '' if obj_id == '' else ('%s%s->' % (pre_obj_id, obj_id))
+            if type(obj) != dict:
+                _show_obj_id = obj_id if not _is_use_pre_obj_id else (_pre_obj_id + obj_id)
+                return CResult(code='19999', msg=VALIDATE_ERR_MSG['OBJ_MUST_DICT'],
+                               i18n_obj=_i18n_obj, i18n_msg_paras=(obj, _show_obj_id, ''))
+
+            for _key, _is_must, _check_fun in _plan:
+                if _key not in obj:
+                    if not _is_must:
+                        continue
+                    _show_obj_id = _key if not _is_use_pre_obj_id else (_pre_obj_id + _key)
+                    return CResult(code='19999', msg=VALIDATE_ERR_MSG['OBJ_MISS_KEY'],
+                                   i18n_obj=_i18n_obj, i18n_msg_paras=(obj, _show_obj_id, ''))
+
+                _result = _check_fun(obj[_key], _key, _pre_obj_id)
+                if _result is not _success_result and not _result.is_success():
+                    return _result
+
+            return _success_result
+
+        return _check
+
+    def _compile_rule_list(self, rules):
+        """
+        编译规则列表(对应_check_by_rule_list的处理)
+
+        @param {list|object} rules - 规则列表, 不是列表时视为单个规则
+
+        @return {function} - 检查函数，格式为 fun(obj, obj_id, pre_obj_id) -> CResult
+        """
+        if type(rules) != list:
+            return self._compile_single_rule(rules)
+
+        # 与_check_by_rule_list保持一致，列表中的字典规则使用默认的ignore_extra_keys=True
+        _plan = tuple(
+            self._compile_dict_rule(_rule, None, True) if type(_rule) == dict else self._compile_single_rule(_rule)
+            for _rule in rules
+        )
+        _rules_len = len(_plan)
+        _success_result = self._success_result
+        _i18n_obj = self._i18n_obj
+        _is_use_pre_obj_id = self._is_use_pre_obj_id
+        _ignore_list_miss_value = self._ignore_list_miss_value
+
+        def _check(obj, obj_id, pre_obj_id):
+            _check_obj = obj if type(obj) in (list, tuple) else [obj, ]
+            _obj_len = len(_check_obj)
+            if not _ignore_list_miss_value and _obj_len < _rules_len:
+                return CResult(code='19999', msg=VALIDATE_ERR_MSG['NOT_ENOUGH_VALUES'], i18n_obj=_i18n_obj,
+                               i18n_msg_paras=(obj, obj_id, '', _rules_len))
+
+            _index = 0
+            while _index < _obj_len:
+                _show_obj_id = obj_id if not _is_use_pre_obj_id else ('%s~%d' % (obj_id, _index))
+                _result = _plan[_index](_check_obj[_index], _show_obj_id, pre_obj_id)
+                if _result is not _success_result and not _result.is_success():
+                    return _result
+                _index += 1
+
+            return _success_result
+
+        return _check
+
+    def _compile_single_rule(self, rule):
+        """
+        编译单个校验规则(对应_check_by_single_rule的处理)
+
+        @param {tuple|object} rule - 单个校验规则
+
+        @return {function} - 检查函数，格式为 fun(obj, obj_id, pre_obj_id) -> CResult
+        """
+        _success_result = self._success_result
+        if rule is None or rule == '':
+            # 没有规则，直接返回成功
+            return lambda obj, obj_id, pre_obj_id: _success_result
+
+        # 将校验规则标准化
+        _check_fun_str = ''  # 校验函数名，用来匹配固定错误信息
+        _args = None  # 函数的args参数
+        _kwargs = None  # 函数的kwargs参数
+        _err_msg = None  # 自定义错误信息
+        if type(rule) == tuple:
+            _check_fun = rule[0]
+            _args = None if len(rule) < 2 else rule[1]
+            _kwargs = None if len(rule) < 3 else rule[2]
+            _err_msg = None if len(rule) < 4 else str(rule[3])
+            if _args is not None and type(_args) != tuple:
+                _args = (rule[1], )
+        elif type(rule) == str or callable(rule):
+            _check_fun = rule
+        else:
+            _check_fun = str(rule)
+
+        if type(_check_fun) == str:
+            _check_fun_str = _check_fun
+            _check_fun = getattr(type(self), _check_fun_str)
+        else:
+            _check_fun_str = getattr(_check_fun, '__name__', '')
+
+        if _check_fun_str in VALIDATE_LOGIC_FUN_NAME:
+            return self._compile_logic_rule(_check_fun, _check_fun_str, _args, _kwargs, _err_msg)
+
+        # 预先获取失败时的错误信息和占位参数
+        _fail_msg = _err_msg
+        if _fail_msg is None:
+            _fail_msg = VALIDATE_ERR_MSG.get(_check_fun_str, VALIDATE_ERR_MSG['DEFAULT'])
+        _call_args = () if _args is None else _args
+        _call_kwargs = dict() if _kwargs is None else _kwargs
+        _i18n_msg_paras_ext = tuple(_call_args) + tuple(_call_kwargs.values())
+
+        # 内置的正则和日期校验函数, 预编译正则表达式及日期格式
+        _fast_fun = self._prepare_check_fun(_check_fun, _check_fun_str, _call_args, _call_kwargs)
+        if _fast_fun is None:
+            _fast_fun = lambda obj: _check_fun(obj, *_call_args, **_call_kwargs)
+
+        _i18n_obj = self._i18n_obj
+        _is_use_pre_obj_id = self._is_use_pre_obj_id
+        _get_except_result = self._get_except_result
+
+        def _check(obj, obj_id, pre_obj_id):
+            try:
+                _rep = _fast_fun(obj)
+                if type(_rep) == CResult:
+                    return _rep
+                elif _rep:
+                    return _success_result
+
+                _show_obj_id = obj_id if not _is_use_pre_obj_id else (pre_obj_id + obj_id)
+                return CResult(
+                    code='19999', msg=_fail_msg, i18n_obj=_i18n_obj,
+                    i18n_msg_paras=(obj, _show_obj_id, _check_fun_str) + _i18n_msg_paras_ext
+                )
+            except:
+                return _get_except_result(
+                    obj, obj_id, pre_obj_id, _check_fun_str, _err_msg, _args, _kwargs
+                )
+
+        return _check
+
+    def _compile_logic_rule(self, check_fun, check_fun_str, args, kwargs, err_msg):
+        """
+        编译组合逻辑校验规则(And/Or/List)
+
+        @param {function} check_fun - 组合逻辑校验函数
+        @param {string} check_fun_str - 校验函数名
+        @param {tuple} args - 函数的args参数
+        @param {dict} kwargs - 函数的kwargs参数
+        @param {string} err_msg - 自定义错误信息
+
+        @return {function} - 检查函数，格式为 fun(obj, obj_id, pre_obj_id) -> CResult
+        """
+        _success_result = self._success_result
+        _get_except_result = self._get_except_result
+        _get_logic_kwargs = self._get_logic_kwargs
+        _call_args = () if args is None else args
+
+        # 判断是否可直接编译的内置组合逻辑函数
+        _base_fun = ValidateTool.__dict__.get(check_fun_str, None)
+        _is_inner_fun = (
+            isinstance(_base_fun, classmethod) and
+            getattr(check_fun, '__func__', None) is _base_fun.__func__ and len(_call_args) == 1 and
+            (kwargs is None or set(kwargs.keys()).issubset(_LOGIC_FUN_INNER_PARAS))
         )
+        if _is_inner_fun and check_fun_str in ('And', 'Or'):
+            _plan = tuple(self._compile_rule_list(_rule) for _rule in _call_args[0])
+            _is_inner_fun = len(_plan) > 0 or check_fun_str == 'And'
+
+        if not _is_inner_fun:
+            # 自定义的组合逻辑函数, 按原方式调用
+            _i18n_obj = self._i18n_obj
+            _is_use_pre_obj_id = self._is_use_pre_obj_id
+
+            def _check(obj, obj_id, pre_obj_id):
+                _kwargs = _get_logic_kwargs(kwargs, obj_id, pre_obj_id)
+                try:
+                    _rep = check_fun(obj, *_call_args, **_kwargs)
+                    if type(_rep) == CResult:
+                        return _rep
+                    elif _rep:
+                        return _success_result
+
+                    _show_obj_id = obj_id if not _is_use_pre_obj_id else (pre_obj_id + obj_id)
+                    return CResult(
+                        code='19999', i18n_obj=_i18n_obj,
+                        msg=err_msg if err_msg is not None else VALIDATE_ERR_MSG.get(
+                            check_fun_str, VALIDATE_ERR_MSG['DEFAULT']
+                        ),
+                        i18n_msg_paras=(obj, _show_obj_id, check_fun_str) + tuple(_call_args) +
+                        tuple(_kwargs.values())
+                    )
+                except:
+                    return _get_except_result(
+                        obj, obj_id, pre_obj_id, check_fun_str, err_msg, _call_args, _kwargs
+                    )
+
+            return _check
+
+        if check_fun_str == 'List':
+            _plan = self._compile_rule_list(_call_args[0])
+            _is_use_pre_obj_id = self._is_use_pre_obj_id
+
+            def _check(obj, obj_id, pre_obj_id):
+                try:
+                    _index = 0
+                    for _item in (obj if type(obj) in (list, tuple) else [obj, ]):
+                        _show_obj_id = obj_id if not _is_use_pre_obj_id else ('%s~%d' % (obj_id, _index))
+                        _result = _plan(_item, _show_obj_id, pre_obj_id)
+                        if _result is not _success_result and not _result.is_success():
+                            return _result
+                        _index += 1
+                    return _success_result
+                except:
+                    return _get_except_result(
+                        obj, obj_id, pre_obj_id, check_fun_str, err_msg, _call_args,
+                        _get_logic_kwargs(kwargs, obj_id, pre_obj_id)
+                    )
+        elif check_fun_str == 'And':
+            def _check(obj, obj_id, pre_obj_id):
+                try:
+                    for _check_fun in _plan:
+                        _result = _check_fun(obj, obj_id, pre_obj_id)
+                        if _result is not _success_result and not _result.is_success():
+                            return _result
+                    return _success_result
+                except:
+                    return _get_except_result(
+                        obj, obj_id, pre_obj_id, check_fun_str, err_msg, _call_args,
+                        _get_logic_kwargs(kwargs, obj_id, pre_obj_id)
+                    )
+        else:
+            def _check(obj, obj_id, pre_obj_id):
+                try:
+                    for _check_fun in _plan:
+                        _result = _check_fun(obj, obj_id, pre_obj_id)
+                        if _result is _success_result or _result.is_success():
+                            return _result
+                    # 最后一个结果一定是不成功的
+                    return _result
+                except:
+                    return _get_except_result(
+                        obj, obj_id, pre_obj_id, check_fun_str, err_msg, _call_args,
+                        _get_logic_kwargs(kwargs, obj_id, pre_obj_id)
+                    )
+
+        return _check
+
+    def _get_logic_kwargs(self, kwargs, obj_id, pre_obj_id):
+        """
+        生成调用组合逻辑函数的kwargs参数
+
+        @param {dict} kwargs - 规则中的kwargs参数
+        @param {string} obj_id - 检查对象的id
+        @param {string} pre_obj_id - 前置对象id
+
+        @return {dict} - 调用组合逻辑函数的kwargs参数
+        """
+        _kwargs = dict() if kwargs is None or type(kwargs) != dict else dict(kwargs)
+        _kwargs['obj_id'] = obj_id
+        _kwargs['i18n_obj'] = self._i18n_obj
+        _kwargs['ignore_list_miss_value'] = self._ignore_list_miss_value
+        _kwargs['is_use_pre_obj_id'] = self._is_use_pre_obj_id
+        _kwargs['pre_obj_id'] = pre_obj_id
+        return _kwargs
+
+    def _prepare_check_fun(self, check_fun, check_fun_str, args, kwargs):
+        """
+        为内置的正则和日期校验函数生成预编译的校验函数
+
+        @param {function} check_fun - 校验函数
+        @param {string} check_fun_str - 校验函数名
+        @param {tuple} args - 函数的args参数
+        @param {dict} kwargs - 函数的kwargs参数
+
+        @return {function} - 预编译的校验函数 fun(obj) -> bool, 不支持预编译时返回None
+        """
+        _base_fun = ValidateTool.__dict__.get(check_fun_str, None)
+        if not (isinstance(_base_fun, classmethod) and
+                getattr(check_fun, '__func__', None) is _base_fun.__func__):
+            return None
+
+        _prepare_fun = getattr(ValidateTool, '_prepare_' + check_fun_str, None)
+        if _prepare_fun is None:
+            return None
+
+        try:
+            # 按校验函数的定义对齐参数, 参数不匹配或预编译失败时在检查时按原方式调用
+            _paras = inspect.signature(check_fun).bind(None, *args, **kwargs).arguments
+            _paras.pop(next(iter(_paras)))
+            return _prepare_fun(**_paras)
+        except:
+            return None
+
+    def _get_except_result(self, obj, obj_id, pre_obj_id, check_fun_str, err_msg, args, kwargs):
+        """
+        生成校验出现异常时的检查结果
+
+        @param {object} obj - 检查对象
+        @param {string} obj_id - 检查对象的id
+        @param {string} pre_obj_id - 前置对象id
+        @param {string} check_fun_str - 校验函数名
+        @param {string} err_msg - 自定义错误信息
+        @param {tuple} args - 函数的args参数
+        @param {dict} kwargs - 函数的kwargs参数
+
+        @return {CResult} - 检查结果
+        """
+        _error = str(sys.exc_info()[0])
+        _trace_str = traceback.format_exc()
+        _show_obj_id = obj_id if not self._is_use_pre_obj_id else (pre_obj_id + obj_id)
+        _i18n_msg_paras = (obj, _show_obj_id, check_fun_str)
+        if err_msg is None:
+            _i18n_msg_paras = _i18n_msg_paras + (_error, _trace_str)
+            err_msg = VALIDATE_ERR_MSG['DEFAULT_EXCEPT']
+        else:
+            if args is not None:
+                _i18n_msg_paras = _i18n_msg_paras + tuple(args)
+            if kwargs is not None:
+                _i18n_msg_paras = _i18n_msg_paras + tuple(kwargs.values())
+
+        return CResult(code='29999', msg=err_msg, i18n_obj=self._i18n_obj, error=_error,
+                       trace_str=_trace_str, i18n_msg_paras=_i18n_msg_paras)
 
 
 if __name__ == '__main__':
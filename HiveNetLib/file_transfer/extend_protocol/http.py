@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright 2019 黎慧剑
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Http传输协议模块(通过Range请求分段下载)
+
+@module http
+@file http.py
+"""
+
+import os
+import sys
+import re
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+# 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
+sys.path.append(os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.path.pardir, os.path.pardir, os.path.pardir)))
+from HiveNetLib.file_transfer.saver import TransferSaver
+from HiveNetLib.file_transfer.protocol import LocalProtocol
+from HiveNetLib.file_transfer.exceptions import FileDataPosMatchError
+
+
+__MOUDLE__ = 'http'  # 模块名
+__DESCRIPT__ = u'Http传输协议模块'  # 模块描述
+__VERSION__ = '0.1.0'  # 版本
+__AUTHOR__ = u'黎慧剑'  # 作者
+__PUBLISH__ = '2026.10.19'  # 发布日期
+
+
+class HttpPullProtocol(LocalProtocol):
+    """
+    通过Http(s)下载网络文件至本地的传输协议
+    注：服务器支持Range请求时，每个处理线程使用独立的requests.Session(保持长连接)并行下载不同的文件区间,
+        并支持通过TransferSaver的存储索引断点续传; 服务器不支持Range请求时自动降为单线程下载
+    """
+
+    def __init__(self, src_file: str, dest_file: str, is_resume: bool = True, is_overwrite: bool = False,
+                 thread_num: int = 1, block_size: int = 4096, cache_size: int = 1024, auto_expand: bool = True,
+                 **kwargs):
+        """
+        初始化文件传输协议类
+
+        @param {str} src_file - 要下载的文件url
+        @param {str} dest_file - 目标文件路径
+        @param {bool} is_resume=True - 指定是否续传（自动查找已下载的信息）, 如果不指定续传将自动删除原来已下载临时文件
+        @param {bool} is_overwrite=False - 是否覆盖已有文件，如果为否，则目标文件已存在的情况下抛出异常
+        @param {int} thread_num=1 - 并行下载的线程(连接)数量
+        @param {int} block_size=4096 - 每次传输块大小，单位为byte
+            注：每个线程对所分配的区间只发起一次Range请求并连续读取，块大小仅影响写入缓存的粒度, 建议设置为64kb以上
+        @param {int} cache_size=1024 - 单线程缓存大小，单位为kb（注意：真实缓存大小还需要乘以处理线程数量）
+        @param {bool} auto_expand=True - 是否自动扩展文件大小（否则在初始化时会自动创建指定大小的文件）
+        @param {kwargs} - 扩展参数，重载类自行扩展处理所需的参数
+            headers {dict} - 要带上的http协议头
+            params {dict} - 请求url的参数
+            cookies {dict} - cookies参数
+            proxies {dict} - 代理服务器, 例如 {"http": "http://1.192.242.107:9999"}
+            verify {bool} - ssl证书验证是否跳过, 可设置为False跳过, 默认为True
+            connect_timeout {float} - 连接超时时间, 单位为秒, 默认为None
+            read_timeout {float} - 读取数据超时时间, 单位为秒, 默认为None
+            retry {int} - 读取数据失败时的自动重试次数, 默认为0
+            md5 {str} - 文件的md5值, 传入时下载完成后进行校验
+        """
+        # 自定义的参数
+        self.headers = kwargs.get('headers', None)
+        self.params = kwargs.get('params', None)
+        self.cookies = kwargs.get('cookies', None)
+        self.proxies = kwargs.get('proxies', None)
+        self.verify = kwargs.get('verify', True)
+        self.timeout = (kwargs.get('connect_timeout', None), kwargs.get('read_timeout', None))
+        self.retry = kwargs.get('retry', 0)
+        self.md5 = kwargs.get('md5', None)
+
+        # 远端文件信息, 在获取文件大小时更新
+        self.support_range = False
+        self.etag = ''
+        self.last_modified = ''
+
+        # 执行父类的初始化函数
+        super().__init__(
+            src_file, dest_file, is_resume=is_resume, is_overwrite=is_overwrite,
+            thread_num=thread_num, block_size=block_size, cache_size=cache_size,
+            auto_expand=auto_expand, **kwargs
+        )
+
+    #############################
+    # 文件读取的工具函数
+    #############################
+
+    def get_file_size(self) -> int:
+        """
+        获取文件的大小, 同时检查服务器是否支持Range请求
+
+        @returns {int} - 文件大小，如果不支持获取文件大小返回 None
+        """
+        with self._new_session() as _session:
+            _res = self._request(_session, 0, end=0)
+            try:
+                if _res.status_code == 416 and re.match(
+                        r'^bytes\s+\*/0$', _res.headers.get('Content-Range', '')) is not None:
+                    # 空文件无法满足bytes=0-0的请求
+                    self.support_range = True
+                    self.etag = _res.headers.get('ETag', '')
+                    self.last_modified = _res.headers.get('Last-Modified', '')
+                    return 0
+
+                _res.raise_for_status()
+                self.etag = _res.headers.get('ETag', '')
+                self.last_modified = _res.headers.get('Last-Modified', '')
+                _match = None
+                if _res.status_code == 206:
+                    _match = re.match(r'^bytes\s+0-0/(\d+)$', _res.headers.get('Content-Range', ''))
+
+                if _match is not None:
+                    self.support_range = True
+                    return int(_match.group(1))
+
+                # 不支持Range请求
+                self.support_range = False
+                if 'Content-Length' in _res.headers.keys():
+                    return int(_res.headers['Content-Length'])
+                return None
+            finally:
+                _res.close()
+
+    def get_file_md5(self) -> str:
+        """
+        获取文件的md5值
+
+        @returns {str} - 文件md5值, 如果获取不到md5值返回None
+        """
+        return self.md5
+
+    #############################
+    # 文件读取的工具函数(需继承类实现)
+    #############################
+    def open_file(self, index: int = 0):
+        """
+        打开文件并返回文件对象
+
+        @param {int} index=0 - 当前的数据处理线程索引
+
+        @returns {dict} - 打开的文件对象属性字典
+            {'handle': requests.Session, 'close_able': 是否可关闭, lock: 锁对象, response: 当前读取中的响应对象,
+            pos: 响应对象当前的读取位置, end: 响应对象请求区间的结束位置(包含), None代表到文件结尾}
+        """
+        self._mutiple_read = True
+        with self._file_handles_lock:
+            _file_dict = self._file_handles.get(index, None)
+            if _file_dict is None:
+                # 每个线程使用独立的Session, 暂停后重新启动可以继续复用连接, 在关闭协议对象时才关闭
+                _file_dict = {
+                    'handle': self._new_session(), 'close_able': False, 'lock': threading.RLock(),
+                    'response': None, 'pos': -1, 'end': None
+                }
+                self._file_handles[index] = _file_dict
+
+        # 返回结果
+        return _file_dict
+
+    def close_file(self, index: int, is_force: bool = False):
+        """
+        关闭打开的文件
+
+        @param {int} index - 要关闭的文件对象对应的处理线程索引
+        @param {bool} is_force=False - 指示是否强制关闭
+        """
+        with self._file_handles_lock:
+            _file_dict = self._file_handles.get(index, None)
+            if _file_dict is not None and (is_force or _file_dict['close_able']):
+                # 允许关闭或强制关闭
+                self._file_handles.pop(index, None)
+                self._close_response(_file_dict)
+                _file_dict['handle'].close()
+
+    def read_file_data(self, index: int, handle: requests.Session, start: int, size: int,
+                       lock: threading.RLock) -> bytes:
+        """
+        获取文件指定位置数据
+        注：从start开始到线程所分配区间的结束位置发起Range请求并保留响应对象，
+            后续请求的位置与响应读取位置连续且未超出请求区间时直接继续读取
+
+        @param {int} index - 处理读取的线程索引
+        @param {requests.Session} handle - 线程对应的Session
+        @param {int} start - 要获取的数据开始位置
+        @param {int} size - 要获取的数据大小
+        @param {threading.RLock} lock - 读取数据的锁对象
+
+        @returns {bytes} - 获取到的数据字典
+            注：如果开始位置超过文件大小，将返回b''; 如果要获取的数据大小超过文件，则返回真实的数据大小
+        """
+        _file_dict = self._file_handles[index]
+        _retry_time = 0
+        with lock:
+            while True:
+                try:
+                    if _file_dict['response'] is None or _file_dict['pos'] != start or \
+                            (_file_dict['end'] is not None and start > _file_dict['end']):
+                        # 位置不连续或超出请求区间, 重新发起请求
+                        self._open_response(_file_dict, start, end=self._get_range_end(index, start))
+
+                    _data = self._read_response(_file_dict['response'], size)
+                    _file_dict['pos'] += len(_data)
+                    return _data
+                except (requests.RequestException, Urllib3HTTPError, OSError):
+                    # 网络异常, 关闭响应对象后重试
+                    self._close_response(_file_dict)
+                    if _retry_time < self.retry:
+                        _retry_time += 1
+                        continue
+                    raise
+
+    #############################
+    # 写入对象的工具函数
+    #############################
+    def init_saver(self):
+        """
+        初始化数据保存对象
+        """
+        # 处理源文件信息
+        self._file_size = self.get_file_size()
+        if self._file_size is None:
+            raise AttributeError('http server not return file size: %s' % self.src_file)
+
+        self._file_md5 = self.get_file_md5()
+        if not self.support_range:
+            # 不支持Range请求，只能单线程下载
+            self.thread_num = 1
+
+        # 处理文件传输接收对象
+        self._saver = TransferSaver(
+            self.dest_file, is_resume=self.is_resume, file_size=self._file_size, md5=self._file_md5,
+            is_overwrite=self.is_overwrite, thread_num=self.thread_num, block_size=self.block_size,
+            cache_size=self.cache_size, auto_expand=self.auto_expand,
+            extend_info={'url': self.src_file, 'etag': self.etag, 'last_modified': self.last_modified}
+        )
+        self.thread_num = self._saver._thread_num  # 线程数有可能被改变
+
+        # 续传时检查远端文件是否已变化
+        _extend_info = self._saver.get_extend_info()
+        for _key in ('etag', 'last_modified'):
+            _old = _extend_info.get(_key, '')
+            _now = getattr(self, _key)
+            if _old != '' and _now != '' and _old != _now:
+                self._saver.close()
+                raise AttributeError('resume info [%s] inconsistency, info file [%s], now [%s]' % (
+                    _key, _old, _now
+                ))
+
+    #############################
+    # 内部函数
+    #############################
+    def _new_session(self) -> requests.Session:
+        """
+        创建新的Session对象
+
+        @returns {requests.Session} - Session对象
+        """
+        _session = requests.Session()
+        # 每个Session只供单个线程使用, 保持一个长连接即可
+        _adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+        _session.mount('http://', _adapter)
+        _session.mount('https://', _adapter)
+        if self.headers is not None:
+            _session.headers.update(self.headers)
+        # 分段下载需要原始字节, 不能使用压缩传输
+        _session.headers['Accept-Encoding'] = 'identity'
+        if self.cookies is not None:
+            _session.cookies.update(self.cookies)
+        if self.proxies is not None:
+            _session.proxies.update(self.proxies)
+        _session.verify = self.verify
+        return _session
+
+    def _request(self, session: requests.Session, start: int, end: int = None) -> requests.Response:
+        """
+        发起Range请求
+
+        @param {requests.Session} session - 使用的Session
+        @param {int} start - 开始位置
+        @param {int} end=None - 结束位置(包含), None代表到文件结尾
+
+        @returns {requests.Response} - 响应对象(流模式)
+        """
+        return session.get(
+            self.src_file, params=self.params, stream=True, timeout=self.timeout,
+            headers={'Range': 'bytes=%d-%s' % (start, '' if end is None else str(end))}
+        )
+
+    def _get_range_end(self, index: int, start: int):
+        """
+        获取线程当前分配区间的结束位置
+
+        @param {int} index - 处理读取的线程索引
+        @param {int} start - 要获取的数据开始位置
+
+        @returns {int} - 结束位置(包含), 不支持Range请求或无法确定时返回None
+        """
+        if not self.support_range:
+            return None
+        _cache = self._saver._cache.get(index, None)
+        if _cache is None or _cache['end_pos'] < start:
+            return None
+        return _cache['end_pos']
+
+    def _open_response(self, file_dict: dict, start: int, end: int = None):
+        """
+        从指定位置开始发起请求, 并登记到文件对象属性字典
+
+        @param {dict} file_dict - 文件对象属性字典
+        @param {int} start - 开始位置
+        @param {int} end=None - 结束位置(包含), None代表到文件结尾
+
+        @throws {FileDataPosMatchError} - 服务器返回的数据范围与请求不一致时抛出异常
+        """
+        self._close_response(file_dict)
+        _res = self._request(file_dict['handle'], start, end=end)
+        file_dict['response'] = _res
+        _res.raise_for_status()
+        if _res.status_code == 206:
+            _content_range = _res.headers.get('Content-Range', '')
+            if not _content_range.startswith('bytes %d-' % start):
+                raise FileDataPosMatchError(
+                    'content range not match: request [%d], response [%s]' % (start, _content_range)
+                )
+        elif start > 0:
+            # 服务器忽略了Range请求，跳过已下载的数据
+            _left = start
+            while _left > 0:
+                _skip = _res.raw.read(min(_left, 1024 * 1024))
+                if not _skip:
+                    raise FileDataPosMatchError('file size less than start position [%d]' % start)
+                _left -= len(_skip)
+
+        file_dict['pos'] = start
+        file_dict['end'] = end if _res.status_code == 206 else None
+
+    def _read_response(self, response: requests.Response, size: int) -> bytes:
+        """
+        从响应对象读取指定大小的数据
+
+        @param {requests.Response} response - 响应对象
+        @param {int} size - 要读取的大小
+
+        @returns {bytes} - 读取到的数据, 如果已到结尾返回的数据会小于size
+        """
+        _data = response.raw.read(size)
+        if len(_data) in (0, size):
+            return _data
+
+        _datas = [_data]
+        _left = size - len(_data)
+        while _left > 0:
+            _data = response.raw.read(_left)
+            if not _data:
+                break
+            _datas.append(_data)
+            _left -= len(_data)
+        return b''.join(_datas)
+
+    def _close_response(self, file_dict: dict):
+        """
+        关闭文件对象属性字典中的响应对象
+
+        @param {dict} file_dict - 文件对象属性字典
+        """
+        if file_dict['response'] is not None:
+            file_dict['response'].close()
+            file_dict['response'] = None
+            file_dict['pos'] = -1
+            file_dict['end'] = None
+
+
+if __name__ == '__main__':
+    # 当程序自己独立运行时执行的操作
+    # 打印版本信息
+    print(('模块名：%s  -  %s\n'
+           '作者：%s\n'
+           '发布日期：%s\n'
+           '版本：%s' % (__MOUDLE__, __DESCRIPT__, __AUTHOR__, __PUBLISH__, __VERSION__)))
@@ -154,12 +154,12 @@ class TransferSaver(object):
                     'md5': '' if md5 is None else md5,  # md5校验值
                     'extend_info': {} if extend_info is None else extend_info,  # 传入的扩展信息
                     # 存储索引，按位置顺序在数组中登记未写入区间，数组每一项登记未写入数据的开始位置和结束位置
-                    'store_index': [[0, file_size - 1]]
+                    'store_index': [] if file_size == 0 else [[0, file_size - 1]]
                 }
 
                 # 生成临时文件
                 self._tmp_file_handle = open(self._temp_file, 'wb')
-                if not auto_expand and file_size is not None:
+                if not auto_expand and file_size is not None and file_size > 0:
                     # 直接生成指定大小的文件
                     self._tmp_file_handle.seek(file_size - 1)   # 跳到指定位置
                     self._tmp_file_handle.write(b'\x00')  # 一定要写入一个字符，否则无效
@@ -171,6 +171,9 @@ class TransferSaver(object):
 
             # 合并存储索引，把碎片合并成为大块
             self._info['store_index'] = self._f_merge_store_index(self._info['store_index'])
+            if self._info['file_size'] != -1 and len(self._info['store_index']) == 0:
+                # 没有要写入的区块（例如空文件），直接设置完成标志
+                self._is_finished = True
 
             # 初始化缓存等信息
             if self._info['file_size'] == -1:
@@ -19,11 +19,9 @@
 import sys
 import os
 import json
-import re
 # 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
 from HiveNetLib.base_tools.run_tool import RunTool
-from HiveNetLib.base_tools.string_tool import StringTool
 from HiveNetLib.simple_i18n import SimpleI18N, _, set_global_i18n, get_global_i18n
 
 
@@ -121,6 +119,7 @@ class NullObj(object):
 class CResult(NullObj):
     """
     通用错误类定义，便于规范所有的错误信息返回判断标准，可直接在该类的实例对象上直接添加其他返回值
+    注：标准属性使用__slots__存储，msg在首次访问时才进行国际化及占位符替换处理
 
     @example
         def fun():
@@ -134,11 +133,17 @@ class CResult(NullObj):
     #############################
     # 内部变量
     #############################
-
-    _i18n_obj = None  # 国际化类实例化对象
-    i18n_error_type_msg_id = ''  # 国际化记录下来的错误类型ID串（第1位的错误说明）
-    i18n_msg_id = ''  # 国际化记录下来的错误明细编码ID串
-    i18n_msg_paras = None  # 国际化记录下来的可替换参数变量
+    __slots__ = (
+        'code',  # 错误码
+        'error',  # 发生异常时的异常类型type的字符串
+        'trace_str',  # 错误追踪堆栈日志
+        'i18n_error_type_msg_id',  # 国际化记录下来的错误类型ID串（第1位的错误说明）
+        'i18n_msg_id',  # 国际化记录下来的错误明细编码ID串
+        'i18n_msg_paras',  # 国际化记录下来的可替换参数变量
+        '_i18n_obj',  # 国际化类实例化对象
+        '_msg',  # 错误信息描述
+        '_is_msg_rendered',  # 错误信息描述是否已生成
+    )
 
     def __init__(self, code='00000', msg=None, error='', trace_str='',
                  i18n_obj=None, i18n_msg_paras=()):
@@ -155,7 +160,6 @@ class CResult(NullObj):
 
         """
         self.code = code
-        self.msg = msg
         self.i18n_msg_id = msg
         self.i18n_msg_paras = i18n_msg_paras
         self._i18n_obj = i18n_obj
@@ -166,8 +170,31 @@ class CResult(NullObj):
             self._i18n_obj = get_global_i18n()
         # 如果msg为None，需重新设置i18n_msg_id和i18n_error_type_msg_id的值
         self.__get_i18n_msg_id()
-        # 重新设置msg
-        self.reset_msg()
+        # 延迟到访问msg时才生成
+        self._msg = None
+        self._is_msg_rendered = False
+
+    @property
+    def msg(self):
+        """
+        错误信息描述，首次访问时根据国际化信息生成
+
+        @property {string}
+        """
+        if not self._is_msg_rendered:
+            self._msg = self.__render_msg()
+            self._is_msg_rendered = True
+        return self._msg
+
+    @msg.setter
+    def msg(self, value):
+        """
+        直接设置错误信息描述
+
+        @param {string} value - 错误信息描述
+        """
+        self._msg = value
+        self._is_msg_rendered = True
 
     def is_success(self):
         """
@@ -179,35 +206,9 @@ class CResult(NullObj):
     def reset_msg(self):
         """
         重新设置错误对象的msg显示值（例如修改了国际化控件默认语言后处理）
+        注：实际的处理延迟到下一次访问msg时执行
         """
-        if self._i18n_obj is None:
-            # 没有国际化，只是通过i18n_msg_id重新设置值
-            self.msg = self.i18n_msg_id
-            if self.msg != '':
-                # 替换占位参数
-                i = 1  # 记录是第几个
-                for para in self.i18n_msg_paras:
-                    if self.msg.find('$' + str(i)) >= 0:
-                        # 找到需要替换才处理，提升效率
-                        self.msg = re.sub(r'\$' + str(i), str(para), self.msg)
-                    i = i + 1
-            # 补充错误类型位
-            if self.i18n_error_type_msg_id != '':
-                if self.msg != '':
-                    self.msg = '%s: %s' % (self.i18n_error_type_msg_id, self.msg)
-                else:
-                    self.msg = self.i18n_error_type_msg_id
-        else:
-            # 国际化处理
-            self.msg = ''
-            if self.i18n_error_type_msg_id != '':
-                self.msg = self._i18n_obj.translate(self.i18n_error_type_msg_id)
-                if self.i18n_msg_id != '':
-                    self.msg = self.msg + ': '
-
-            if self.i18n_msg_id != '':
-                self.msg = self.msg + \
-                    self._i18n_obj.translate(self.i18n_msg_id, self.i18n_msg_paras)
+        self._is_msg_rendered = False
 
     def reset_msg_by_code(self):
         """
@@ -232,7 +233,6 @@ class CResult(NullObj):
 
         """
         self.code = code
-        self.msg = msg
         self.i18n_msg_id = msg
         if i18n_msg_paras is not None:
             self.i18n_msg_paras = i18n_msg_paras
@@ -258,6 +258,37 @@ class CResult(NullObj):
         dest_obj.i18n_msg_paras = self.i18n_msg_paras
         dest_obj.i18n_error_type_msg_id = self.i18n_error_type_msg_id
 
+    def __render_msg(self):
+        """
+        根据国际化信息生成msg的显示值
+
+        @return {string} - msg的显示值
+        """
+        if self._i18n_obj is None:
+            # 没有国际化，只是通过i18n_msg_id设置值
+            _msg = self.i18n_msg_id
+            if _msg != '':
+                # 替换占位参数
+                _msg = SimpleI18N.replace_paras(_msg, self.i18n_msg_paras)
+            # 补充错误类型位
+            if self.i18n_error_type_msg_id != '':
+                if _msg != '':
+                    _msg = '%s: %s' % (self.i18n_error_type_msg_id, _msg)
+                else:
+                    _msg = self.i18n_error_type_msg_id
+        else:
+            # 国际化处理
+            _msg = ''
+            if self.i18n_error_type_msg_id != '':
+                _msg = self._i18n_obj.translate(self.i18n_error_type_msg_id)
+                if self.i18n_msg_id != '':
+                    _msg = _msg + ': '
+
+            if self.i18n_msg_id != '':
+                _msg = _msg + self._i18n_obj.translate(self.i18n_msg_id, self.i18n_msg_paras)
+
+        return _msg
+
     def __get_i18n_msg_id(self):
         """
         获取并设置i18n_msg_id的值
@@ -266,17 +297,11 @@ class CResult(NullObj):
         _map_error_code = self.__get_map_error_code()
 
         # 获取代码表，区分错误类型及错误明细编码
-        if self.code[0] in _map_error_code.keys():
-            self.i18n_error_type_msg_id = _map_error_code[self.code[0]]
-        else:
-            self.i18n_error_type_msg_id = 'unknow'  # 没有定义国际化时使用未知代替
+        self.i18n_error_type_msg_id = _map_error_code.get(self.code[0], 'unknow')  # 没有定义国际化时使用未知代替
 
         if self.i18n_msg_id is None or self.i18n_msg_id == '':
             # 只有原来没有设置过才通过标准错误码映射修改，否则保持不变
-            if self.code[1:] in _map_error_code.keys():
-                self.i18n_msg_id = _map_error_code[self.code[1:]]
-            else:
-                self.i18n_msg_id = ''
+            self.i18n_msg_id = _map_error_code.get(self.code[1:], '')
 
     def __get_map_error_code(self):
         """
@@ -302,12 +327,12 @@ class CResult(NullObj):
         # 其他属性
         _attr_dir = dir(self)
         for _item in _attr_dir:
-            if _item[0: 2] != '__' and not callable(getattr(self, _item)) and _item not in ['_i18n_obj', 'i18n_msg_paras', 'i18n_msg_id', 'error']:
+            if _item[0: 2] != '__' and not callable(getattr(self, _item)) and _item not in ['_i18n_obj', '_msg', '_is_msg_rendered', 'i18n_msg_paras', 'i18n_msg_id', 'error']:
                 _str += '  (attr).%s=%s\n' % (_item, str(getattr(self, _item)))
         # __dict__上的属性
         if hasattr(self, '__dict__'):
             for _item in self.__dict__.items():
-                if _item[0] not in _attr_dir and _item[0] not in ['_i18n_obj', 'i18n_msg_paras', 'i18n_msg_id', 'error']:
+                if _item[0] not in _attr_dir and _item[0] not in ['_i18n_obj', '_msg', '_is_msg_rendered', 'i18n_msg_paras', 'i18n_msg_id', 'error']:
                     _str += '  (dict).%s=%s\n' % (_item[0], str(_item[1]))
 
         return _str
@@ -321,7 +346,7 @@ class CResult(NullObj):
 
         @return {string} - 转换后的json字符串
         """
-        return json.dumps(NullObj.get_object_attr_dict(self, ignored_key=['_i18n_obj', ]), ensure_ascii=False)
+        return json.dumps(NullObj.get_object_attr_dict(self, ignored_key=['_i18n_obj', '_msg', '_is_msg_rendered']), ensure_ascii=False)
 
     @staticmethod
     def __fromjson__(json_str):
@@ -15,6 +15,8 @@ html代码解析器
 
 import sys
 import os
+import re
+import bisect
 # 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
 # 动态安装包
@@ -202,8 +204,12 @@ class HtmlParser(object):
     """
     Html解析器
     基于lxml实现的html文档的解析，元素查找方式与 WebDriver 相似，以便解析功能的兼容
+    注：id、name、class_name、tag_name、link_text的查找通过元素索引处理，索引在首次查找时创建
     """
 
+    _INDEX_OPS = ('id', 'name', 'class_name', 'tag_name', 'link_text')  # 支持通过索引查找的指令
+    _SIMPLE_TAG_RE = re.compile(r'^[A-Za-z_][\w\-\.]*$')  # 可通过索引查找的标签名
+
     def __init__(self, html: str, use_xpath2=False):
         """
         html解析器
@@ -214,6 +220,17 @@ class HtmlParser(object):
         self.html_doc = SimpleXml(
             html, obj_type=EnumXmlObjType.String, parser='html', use_xpath2=use_xpath2
         )
+        self._index = None  # 元素索引，首次使用时创建
+
+    #############################
+    # 元素索引
+    #############################
+    def clear_index(self):
+        """
+        清除元素索引
+        注：如果直接修改了html_doc中的元素，需调用该函数，下次查找时将重新创建索引
+        """
+        self._index = None
 
     #############################
     # 元素查找
@@ -304,6 +321,12 @@ class HtmlParser(object):
         # 处理查找操作
         _elements = list()
         _op = step[0]  # 查找指令
+        if _op in self._INDEX_OPS:
+            # 优先通过索引查找
+            _elements = self._find_elements_by_index(_op, step[1], parent=parent)
+            if _elements is not None:
+                return _elements
+
         if _op == 'children':
             # 获取所有子元素
             _elements = self._find_elements_by_xpath('.//*', parent=parent)
@@ -318,7 +341,8 @@ class HtmlParser(object):
             _elements = self._find_elements_by_xpath('.//%s' % step[1], parent=parent)
         elif _op == 'class_name':
             _elements = self._find_elements_by_xpath(
-                './/*[@class="{0}" or starts-with(@class, "{0} ") or contains(@class, " {0} ") or ends-with(@class, " {0}")]'.format(step[1]), parent=parent
+                './/*[contains(concat(" ", normalize-space(@class), " "), " %s ")]' % step[1],
+                parent=parent
             )
         elif _op == 'link_text':
             _elements = self._find_elements_by_xpath(
@@ -338,6 +362,99 @@ class HtmlParser(object):
 
         return _elements
 
+    def _get_index(self) -> dict:
+        """
+        获取元素索引（不存在则创建）
+
+        @returns {dict} - 元素索引字典，key为查找指令，value为该指令的索引字典:
+            key为查找值，value为(元素先序序号列表, 元素列表)，均按文档顺序排列
+            其中'pos'为元素的位置字典，key为元素，value为[先序序号, 最后一个子孙元素的先序序号]
+        """
+        if self._index is not None:
+            return self._index
+
+        _index = {'pos': dict()}
+        for _op in self._INDEX_OPS:
+            _index[_op] = dict()
+        _pos = _index['pos']
+
+        def _add(op, key, seq, element):
+            _item = _index[op].get(key, None)
+            if _item is None:
+                _item = ([], [])
+                _index[op][key] = _item
+            _item[0].append(seq)
+            _item[1].append(element)
+
+        # 按文档顺序遍历所有元素（不含注释）
+        _seq = 0
+        for _event, _element in ET.iterwalk(self.html_doc.root, events=('start', 'end')):
+            if _event == 'end':
+                _pos[_element][1] = _seq - 1
+                continue
+
+            _pos[_element] = [_seq, _seq]
+            _add('tag_name', _element.tag, _seq, _element)
+            _attrib = _element.attrib
+            _value = _attrib.get('id', None)
+            if _value is not None:
+                _add('id', _value, _seq, _element)
+            _value = _attrib.get('name', None)
+            if _value is not None:
+                _add('name', _value, _seq, _element)
+            _value = _attrib.get('class', None)
+            if _value is not None:
+                for _class in set(_value.split()):
+                    _add('class_name', _class, _seq, _element)
+            if 'href' in _attrib:
+                # 元素的直接文本节点
+                _texts = set([_element.text])
+                for _child in _element:
+                    _texts.add(_child.tail)
+                _texts.discard(None)
+                for _text in _texts:
+                    _add('link_text', _text, _seq, _element)
+            _seq += 1
+
+        self._index = _index
+        return _index
+
+    def _find_elements_by_index(self, op: str, value: str, parent: ET._Element = None) -> list:
+        """
+        通过元素索引查找元素
+
+        @param {str} op - 查找指令
+        @param {str} value - 查找值
+        @param {lxml.etree.Element} parent=None - 父节点，如果不传代表全局搜索（不含根节点）
+
+        @returns {list} - 返回查找到的对象列表，如果无法通过索引查找返回None
+            注：对象类型为 lxml.etree.Element
+        """
+        if op == 'class_name':
+            _classes = value.split()
+            if len(_classes) != 1:
+                # 多个class的情况无法通过索引查找
+                return None
+            value = _classes[0]
+        elif op == 'tag_name' and self._SIMPLE_TAG_RE.match(value) is None:
+            return None
+
+        _index = self._get_index()
+        _range = _index['pos'].get(self.html_doc.root if parent is None else parent, None)
+        if _range is None:
+            # 不是当前文档的元素
+            return None
+
+        _item = _index[op].get(value, None)
+        if _item is None:
+            return list()
+
+        # 只返回父节点的子孙元素
+        _seqs = _item[0]
+        return _item[1][
+            bisect.bisect_right(_seqs, _range[0]): bisect.bisect_right(_seqs, _range[1])
+        ]
+
     def _find_elements_by_xpath(self, xpath: str, parent: ET._Element = None) -> list:
         """
         通过XPath获取元素
@@ -17,7 +17,10 @@ json报文处理模块
 
 import os
 import sys
+import re
 import json
+import threading
+from collections import OrderedDict
 # 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
 sys.path.append(os.path.abspath(os.path.join(
     os.path.dirname(__file__), os.path.pardir, os.path.pardir)))
@@ -42,11 +45,20 @@ __AUTHOR__ = u'黎慧剑'  # 作者
 __PUBLISH__ = '2018.09.13'  # 发布日期
 
 
+# 可直接遍历对象处理的简单路径，例如 '$.foo.bar[0].baz'，仅包含字段名和非负数索引
+_SIMPLE_PATH_RE = re.compile(r'^(?:\$\.)?[a-zA-Z_@][a-zA-Z0-9_@\-]*(?:\.[a-zA-Z_@][a-zA-Z0-9_@\-]*|\[\d+\])*$')
+_SIMPLE_PATH_TOKEN_RE = re.compile(r'([a-zA-Z_@][a-zA-Z0-9_@\-]*)|\[(\d+)\]')
+
+
 class MsgJSON(MsgXML):
     """
     JSON报文信息处理类（message）
     注意：当传入字符串为''时，报文处理对象为None
     """
+    JSONPATH_CACHE_SIZE = 1024  # 已编译路径的缓存数量上限
+    _jsonpath_cache = OrderedDict()  # 已编译路径的缓存（LRU），key为路径字符串（强制编译时为路径元组），value为键值元组或jsonpath对象
+    _jsonpath_cache_lock = threading.Lock()
+
     #############################
     # 静态函数
     #############################
@@ -92,6 +104,39 @@ class MsgJSON(MsgXML):
 
         return _left_string
 
+    @staticmethod
+    def get_jsonpath_location_keys(find_full_path_obj):
+        """
+        获取通过jsonpath匹配到对象的定位键值列表
+
+        @param {object} find_full_path_obj - jsonpath_expr.find函数匹配到的对象的full_path对象
+
+        @return {list} - 定位键值列表（字典的key或列表的索引）
+
+        @example
+            与get_jsonpath_location_string的示例相同，得到的值为 ['foo', 0, 'baz']
+        """
+        _keys = list()
+        if hasattr(find_full_path_obj, 'left'):
+            _keys.extend(MsgJSON.get_jsonpath_location_keys(find_full_path_obj.left))
+        if hasattr(find_full_path_obj, 'right'):
+            _keys.extend(MsgJSON.get_jsonpath_location_keys(find_full_path_obj.right))
+
+        if hasattr(find_full_path_obj, 'fields'):
+            _keys.extend(find_full_path_obj.fields)
+        elif hasattr(find_full_path_obj, 'index'):
+            _keys.append(find_full_path_obj.index)
+
+        return _keys
+
+    @classmethod
+    def clear_jsonpath_cache(cls):
+        """
+        清空已编译路径的缓存
+        """
+        with cls._jsonpath_cache_lock:
+            cls._jsonpath_cache.clear()
+
     #############################
     # 重载MsgFW的函数
     #############################
@@ -185,18 +230,13 @@ class MsgJSON(MsgXML):
             raise NameError
 
         _msg = msg
-        _jsonpath_expr = parse(search_path)
-        _nodes = _jsonpath_expr.find(_msg)
-        if len(_nodes) == 0:
+        _keys_list = cls._find_location_keys(_msg, search_path)
+        if len(_keys_list) == 0:
             raise NameError
         else:
-            for _item in _nodes:
+            for _keys in _keys_list:
                 # 修改对象值
-                exec(
-                    '_msg%s = str(value)' % (
-                        MsgJSON.get_jsonpath_location_string(_item.full_path)
-                    )
-                )
+                cls._set_value_by_keys(_msg, _keys, str(value))
         return _msg
 
     @classmethod
@@ -219,8 +259,18 @@ class MsgJSON(MsgXML):
             raise NameError
 
         _get_value = None
-        _jsonpath_expr = parse(search_path)
-        _nodes = _jsonpath_expr.find(msg)
+        _path = cls._get_compiled_path(search_path)
+        if type(_path) == tuple:
+            # 简单路径，直接遍历对象
+            _found, _get_value = cls._walk_simple_path(msg, _path)
+            if _found is None:
+                _path = cls._get_compiled_path(search_path, is_jsonpath=True)
+            elif not _found:
+                raise NameError
+            else:
+                return _get_value
+
+        _nodes = _path.find(msg)
         if len(_nodes) == 0:
             raise NameError
         else:
@@ -249,16 +299,11 @@ class MsgJSON(MsgXML):
             raise NameError
 
         _msg = msg
-        _jsonpath_expr = parse(search_path)
-        _nodes = _jsonpath_expr.find(msg)
-        if len(_nodes) == 0:
+        _keys_list = cls._find_location_keys(_msg, search_path)
+        if len(_keys_list) == 0:
             raise NameError
         else:
-            exec(
-                '_msg%s = submsg' % (
-                    MsgJSON.get_jsonpath_location_string(_nodes[0].full_path)
-                )
-            )
+            cls._set_value_by_keys(_msg, _keys_list[0], submsg)
         return _msg
 
     @classmethod
@@ -318,6 +363,112 @@ class MsgJSON(MsgXML):
         _msg_bytes = bytes(_str_ret, _encoding)
         return _msg_bytes
 
+    #############################
+    # 内部函数
+    #############################
+    @classmethod
+    def _get_compiled_path(cls, search_path, is_jsonpath=False):
+        """
+        获取编译后的搜索路径（优先从缓存中获取）
+
+        @param {string} search_path - 搜索路径，符合jsonPath规范
+        @param {bool} is_jsonpath=False - 是否强制获取jsonpath_rw编译后的对象（简单路径无法直接遍历对象时使用）
+
+        @returns {tuple|object} - 简单路径返回定位键值元组，其他路径返回jsonpath_rw编译后的对象
+        """
+        _cache = cls._jsonpath_cache
+        # 强制编译的简单路径使用独立的缓存键，避免与定位键值元组冲突
+        _cache_key = (search_path, ) if is_jsonpath else search_path
+        with cls._jsonpath_cache_lock:
+            _path = _cache.get(_cache_key, None)
+            if _path is not None:
+                _cache.move_to_end(_cache_key)
+                return _path
+
+        if is_jsonpath or _SIMPLE_PATH_RE.match(search_path) is None:
+            _path = parse(search_path)
+        else:
+            _path = tuple(
+                _field if _index == '' else int(_index)
+                for _field, _index in _SIMPLE_PATH_TOKEN_RE.findall(
+                    search_path[2:] if search_path.startswith('$.') else search_path
+                )
+            )
+            if 'where' in _path:
+                # 保留字，按jsonpath规范处理（抛出解析异常）
+                _path = parse(search_path)
+
+        with cls._jsonpath_cache_lock:
+            _cache[_cache_key] = _path
+            if len(_cache) > cls.JSONPATH_CACHE_SIZE:
+                _cache.popitem(last=False)
+        return _path
+
+    @staticmethod
+    def _walk_simple_path(msg, keys):
+        """
+        按定位键值直接遍历对象，结果与jsonpath_rw的匹配结果一致
+
+        @param {object} msg - 报文对象（python对象，json.loads得到的对象）
+        @param {tuple} keys - 定位键值元组
+
+        @returns {(bool, object)} - (是否找到, 找到的值)，如果遇到非dict/list的对象无法确定结果，返回(None, None)
+        """
+        _value = msg
+        for _key in keys:
+            if type(_key) == int:
+                if not isinstance(_value, list):
+                    return None, None
+                if _key >= len(_value):
+                    return False, None
+            elif not isinstance(_value, dict):
+                return None, None
+            elif _key not in _value:
+                return False, None
+            _value = _value[_key]
+        return True, _value
+
+    @classmethod
+    def _find_location_keys(cls, msg, search_path):
+        """
+        查找搜索路径匹配到的所有节点的定位键值
+
+        @param {object} msg - 报文对象（python对象，json.loads得到的对象）
+        @param {string} search_path - 搜索路径，符合jsonPath规范
+
+        @returns {list} - 定位键值列表的清单，每个匹配节点对应一个定位键值列表
+        """
+        _path = cls._get_compiled_path(search_path)
+        if type(_path) == tuple:
+            _found, _value = cls._walk_simple_path(msg, _path)
+            if _found is None:
+                _path = cls._get_compiled_path(search_path, is_jsonpath=True)
+            elif not _found:
+                return list()
+            else:
+                return [_path]
+
+        return [
+            cls.get_jsonpath_location_keys(_item.full_path) for _item in _path.find(msg)
+        ]
+
+    @staticmethod
+    def _set_value_by_keys(msg, keys, value):
+        """
+        按定位键值设置对象的值
+
+        @param {object} msg - 报文对象（python对象，json.loads得到的对象）
+        @param {list|tuple} keys - 定位键值
+        @param {object} value - 要设置的值
+        """
+        if len(keys) == 0:
+            # 匹配到根节点，无法替换调用方持有的对象
+            return
+        _parent = msg
+        for _key in keys[0: -1]:
+            _parent = _parent[_key]
+        _parent[keys[-1]] = value
+
 
 if __name__ == '__main__':
     # 当程序自己独立运行时执行的操作
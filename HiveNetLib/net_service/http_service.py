@@ -18,16 +18,15 @@ Http协议服务
 import os
 import sys
 import datetime
-import copy
 import traceback
 import logging
+from collections.abc import Iterator
 # 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
 sys.path.append(os.path.abspath(os.path.join(
     os.path.dirname(__file__), os.path.pardir, os.path.pardir)))
-from HiveNetLib.base_tools.run_tool import RunTool
 from HiveNetLib.simple_i18n import _, SimpleI18N
 from HiveNetLib.simple_server_fw import EnumServerRunStatus
-from HiveNetLib.net_service.tcpip_service import TcpIpService
+from HiveNetLib.net_service.tcpip_service import TcpIpService, SocketFileRegion
 from HiveNetLib.generic import NullObj, CResult
 from HiveNetLib.base_tools.exception_tool import ExceptionTool
 from HiveNetLib.interface_tool.msg_fw import EnumMsgObjType, EnumMsgSRType
@@ -41,6 +40,96 @@ __AUTHOR__ = u'黎慧剑'  # 作者
 __PUBLISH__ = '2018.09.14'  # 发布日期
 
 
+class HttpChunkedReader(object):
+    """
+    Http分块传输(Transfer-Encoding: chunked)报文体的流式读取对象
+    报文体不会一次全部读入内存，通过迭代逐块获取数据
+
+    @param {object} net_info - 要读取数据的网络信息对象
+    @param {dict} recv_para={} - 获取参数，与TcpIpService.recv_data一致
+
+    @example
+        for _chunk in reader:
+            f.write(_chunk)
+    """
+
+    def __init__(self, net_info, recv_para={}):
+        """
+        构造函数
+
+        @param {object} net_info - 要读取数据的网络信息对象
+        @param {dict} recv_para={} - 获取参数，与TcpIpService.recv_data一致
+        """
+        self.net_info = net_info
+        self.recv_para = dict(recv_para)
+        self.is_finished = False  # 是否已读取完成
+
+    def __iter__(self):
+        """
+        逐块迭代报文体数据
+        """
+        while True:
+            _chunk = self.read_chunk()
+            if _chunk is None:
+                return
+            yield _chunk
+
+    def read_chunk(self):
+        """
+        读取下一个数据块
+
+        @returns {bytes} - 数据块，已读取完成返回None
+
+        @throws {ConnectionError} - 获取数据失败时抛出异常
+        """
+        if self.is_finished:
+            return None
+
+        # 块大小行: 16进制长度[;扩展参数]\r\n
+        _line = self._check_result(TcpIpService.recv_until(self.net_info, self.recv_para))
+        _size = int(_line.split(b';', 1)[0].strip(), 16)
+        if _size == 0:
+            # 最后一个块，丢弃尾部参数直到空行
+            while self._check_result(TcpIpService.recv_until(self.net_info, self.recv_para)).strip() != b'':
+                pass
+            self.is_finished = True
+            return None
+
+        _recv_para = dict(self.recv_para)
+        _recv_para['recv_len'] = _size + 2  # 块数据后有\r\n
+        return self._check_result(TcpIpService.recv_data(self.net_info, _recv_para))[0:_size]
+
+    def read(self):
+        """
+        读取剩余的全部报文体数据
+
+        @returns {bytes} - 报文体数据
+        """
+        return b''.join(self)
+
+    def drain(self):
+        """
+        丢弃剩余未读取的报文体数据（长连接处理下一个请求前需保证报文体已读完）
+        """
+        for _chunk in self:
+            pass
+
+    #############################
+    # 内部函数
+    #############################
+    def _check_result(self, result):
+        """
+        检查获取结果，失败抛出异常
+
+        @param {CResult} result - 获取结果
+
+        @returns {bytes} - 获取到的数据
+        """
+        if not result.is_success():
+            raise ConnectionError('recv chunked data error: %s - %s' % (result.code, result.msg))
+        return result.data
+
+
 class HttpService(TcpIpService):
     """
     Http协议服务
@@ -75,6 +164,8 @@ class HttpService(TcpIpService):
             msg {bytes} - 要返回的报文体，如果没有数据传None
             proto_msg {MsgHTTP} - 要返回的协议头，如果不返回传None
         注意：该参数传入代表使用服务自带的服务端监听处理线程函数，server_connect_deal_fun将失效
+        注意：服务自带的处理函数支持长连接及流水线请求，客户端要求关闭连接(Connection: close或HTTP/1.0未要求keep-alive)时，
+            处理完成后将关闭连接；分块传输的请求报文体msg为HttpChunkedReader对象，处理完成后未读取的数据将自动丢弃
     @param {bool} is_print_msg_log=True - 是否打印报文日志，仅server_http_deal_fun传入时有效
     @param {string} default_data_encoding='utf-8' - 打印报文的默认字符集
 
@@ -142,13 +233,35 @@ class HttpService(TcpIpService):
     #############################
     # 补充的公开函数
     #############################
+    @classmethod
+    def is_keep_alive(cls, proto_msg):
+        """
+        判断报文是否要求保持连接
+
+        @param {MsgHTTP} proto_msg - http报文头
+
+        @returns {bool} - 是否保持连接，HTTP/1.1默认保持连接，HTTP/1.0需指定Connection: keep-alive
+
+        """
+        _connection = proto_msg.get_value('Connection')
+        if _connection is not None:
+            _connection = _connection.strip().lower()
+            if 'close' in _connection:
+                return False
+            elif 'keep-alive' in _connection:
+                return True
+        return proto_msg.base_object.ver.strip().upper() == 'HTTP/1.1'
+
     @classmethod
     def recv_http_head(cls, net_info, recv_para={}):
         """
         获取http报文头对象
+        数据批量预读到连接的接收缓存中查找报文头结束符(空行)，报文头后的数据保留在接收缓存中
 
         @param {object} net_info -  要读取数据的网络信息对象
-        @param {dict} recv_para - 获取参数，暂未使用
+        @param {dict} recv_para - 获取参数，包括:
+            overtime {int} - 获取超时时间，单位为毫秒，非必要参数
+            max_head_len {int} - 允许的报文头最大长度，默认为65536
 
         @returns {CResult} - 数据获取结果:
             result.code ：'00000'-成功，'20403'-获取数据超时，其他为获取失败
@@ -158,9 +271,6 @@ class HttpService(TcpIpService):
         """
         if type(recv_para) != dict:
             recv_para = {}
-        _result = CResult('00000')
-        _result.data = None
-        _result.recv_time = datetime.datetime.now()
         _overtime = 10000
         if 'overtime' in recv_para.keys():
             # 外部有传入，优先使用该超时时间
@@ -168,46 +278,20 @@ class HttpService(TcpIpService):
         elif hasattr(net_info, 'recv_timeout'):
             # 如果net_info有超时的设置
             _overtime = net_info.recv_timeout
-        _result.overtime = _overtime
 
-        _recv_para = copy.deepcopy(recv_para)
-        _recv_para['recv_len'] = 1
+        _result = cls.recv_until(net_info, {
+            'sep': (b'\r\n\r\n', b'\n\n'), 'max_len': recv_para.get('max_head_len', 65536),
+            'overtime': _overtime
+        })
+        if not _result.is_success():
+            _result.data = None
+            return _result
 
         with ExceptionTool.ignored_cresult(
             _result
         ):
-            # 循环获取所有报文头内容
-            _get_line_bytes = b''
-            _last_is_ln = False  # 标记上一个字符是否回车换行
-            while True:
-                # 检查是否超时
-                if (datetime.datetime.now() - _result.recv_time).total_seconds() * 1000 > _overtime:
-                    # 已超时
-                    _result.change_code(code='20403')
-                    break
-
-                _read_result = TcpIpService.recv_data(net_info, _recv_para)
-                if not _read_result.is_success():
-                    # 出现异常，直接返回失败
-                    _read_result.data = None
-                    _read_result.recv_time = _result.recv_time
-                    return _read_result
-                # 获取成功，判断是否回车换行
-                _get_line_bytes = _get_line_bytes + _read_result.data
-                if str(_read_result.data, "ascii") == "\n" and _last_is_ln:
-                    # 已经连续遇到两次回车换行，说明报文头已收齐退出循环
-                    break
-                elif str(_read_result.data, "ascii") == "\n":
-                    _last_is_ln = True
-                    continue
-                elif str(_read_result.data, "ascii") == "\r":
-                    continue
-                else:
-                    # 其他字符，不是连续换行
-                    _last_is_ln = False
-                    continue
             # 取完报文头数据，转换为结构对象
-            _result.data = MsgHTTP(_get_line_bytes, msg_id=None, obj_type=EnumMsgObjType.Bytes)
+            _result.data = MsgHTTP(_result.data, msg_id=None, obj_type=EnumMsgObjType.Bytes)
         return _result
 
     @classmethod
@@ -217,23 +301,30 @@ class HttpService(TcpIpService):
 
         @param {object} net_info -  要读取数据的网络信息对象
         @param {MsgHTTP} proto_msg - http报文头
-        @param {dict} recv_para - 获取参数，暂未使用
+        @param {dict} recv_para - 获取参数，与TcpIpService.recv_data一致
 
         @returns {CResult} - 数据获取结果:
             result.code ：'00000'-成功，'20403'-获取数据超时，其他为获取失败
-            result.msg ：获取到的数据对象，类型为bytes
+            result.data ：获取到的数据对象，类型为bytes；如果是分块传输(Transfer-Encoding: chunked)，
+                返回HttpChunkedReader对象，通过迭代流式获取报文体数据
             result.recv_time : datetime 实际开始接受数据时间
 
         """
         if type(recv_para) != dict:
             recv_para = {}
-        _recv_para = copy.deepcopy(recv_para)
+        _recv_para = dict(recv_para)
         _result = CResult('00000')
         _result.data = None
         _result.recv_time = datetime.datetime.now()
         with ExceptionTool.ignored_cresult(
             _result
         ):
+            _transfer_encoding = proto_msg.get_value(search_path='Transfer-Encoding')
+            if _transfer_encoding is not None and 'chunked' in _transfer_encoding.lower():
+                # 分块传输，返回流式读取对象
+                _result.data = HttpChunkedReader(net_info, _recv_para)
+                return _result
+
             _get_value = proto_msg.get_value(search_path='Content-Length')
             if _get_value is not None:
                 _len = int(_get_value)
@@ -255,6 +346,7 @@ class HttpService(TcpIpService):
             result.data ：获取到的数据对象，为一个二元数组
                 (proto_msg, msg) - MsgHTTP报文头，二进制报文数据
             result.recv_time : datetime 实际开始接受数据时间
+            result.is_recv_empty : bool 获取失败时是否未收到任何数据(例如长连接空闲超时或对端关闭)
 
         """
         # 子类必须定义该功能
@@ -263,16 +355,20 @@ class HttpService(TcpIpService):
         _result = CResult('00000')
         _result.data = None
         _result.recv_time = datetime.datetime.now()
+        _result.is_recv_empty = False
         with ExceptionTool.ignored_cresult(
             _result
         ):
             _head_result = cls.recv_http_head(net_info, recv_para)
             if not _head_result.is_success():
+                # 未收到的报文头数据会保留在接收缓存中
+                _head_result.is_recv_empty = (len(cls.get_recv_buffer(net_info)) == 0)
                 return _head_result
             _proto_msg = _head_result.data
 
             _body_result = cls.recv_http_body(net_info, _proto_msg, recv_para)
             if not _body_result.is_success():
+                _body_result.is_recv_empty = False
                 return _body_result
 
             _result.data = (_proto_msg, _body_result.data)
@@ -286,7 +382,11 @@ class HttpService(TcpIpService):
         @param {object} net_info - 要写入数据的网络信息对象（例如socket对象）
         @param {tuple} data - 要写入的数据对象，(proto_msg, msg)
             proto_msg : MsgHTTP报文头
-            msg : 二进制数据
+            msg : 二进制数据，可以为以下类型:
+                bytes-like对象(bytes/bytearray/memoryview)
+                SocketFileRegion对象 - 文件区域，通过os.sendfile发送文件内容
+                list/tuple - 多个bytes-like对象或SocketFileRegion对象组成的报文体分段，与报文头一起通过sendmsg发送，不合并复制
+                返回bytes的迭代器(例如生成器) - 将以分块传输(Transfer-Encoding: chunked)方式逐块发送
         @param {dict} send_para - 写入数据的参数
 
         @returns {CResult} - 发送结果:
@@ -302,19 +402,53 @@ class HttpService(TcpIpService):
         with ExceptionTool.ignored_cresult(
             _result
         ):
-            # 先要更新报文头的长度
-            _len = 0
-            if data[1] is not None:
-                _len = len(data[1])
-            data[0].set_value('Content-Length', str(_len))
-            _send_result = TcpIpService.send_data(net_info, data[0].to_bytes(), send_para)
-            if not _send_result.is_success():
-                return _send_result
-            if _len > 0:
-                _send_result = TcpIpService.send_data(net_info, data[1], send_para)
-                _result = _send_result
+            _parts = data[1]
+            if _parts is None:
+                _parts = []
+            elif isinstance(_parts, (bytes, bytearray, memoryview, SocketFileRegion)):
+                _parts = [_parts]
+            elif isinstance(_parts, Iterator):
+                # 分块传输
+                return cls._send_chunked_data(net_info, data, send_para)
+            elif not isinstance(_parts, (list, tuple)):
+                raise TypeError('unsupported http body type: %s' % str(type(_parts)))
+            else:
+                _parts = list(_parts)
+
+            # 先要更新报文头的长度，报文头与报文体一起发送
+            data[0].set_value('Content-Length', str(sum([len(_part) for _part in _parts])))
+            _result = TcpIpService.send_data(net_info, [data[0].to_bytes()] + _parts, send_para)
         return _result
 
+    @classmethod
+    def _send_chunked_data(cls, net_info, data, send_para):
+        """
+        以分块传输方式发送数据
+
+        @param {object} net_info - 要写入数据的网络信息对象
+        @param {tuple} data - 要写入的数据对象，(proto_msg, msg)，msg为返回bytes的可迭代对象
+        @param {dict} send_para - 写入数据的参数
+
+        @returns {CResult} - 发送结果
+
+        """
+        if data[0].get_value('Content-Length') is not None:
+            data[0].set_value('Content-Length', None)
+        data[0].set_value('Transfer-Encoding', 'chunked')
+        _result = TcpIpService.send_data(net_info, data[0].to_bytes(), send_para)
+        if not _result.is_success():
+            return _result
+        for _chunk in data[1]:
+            if len(_chunk) == 0:
+                # 空块代表结束, 不能发送
+                continue
+            _result = TcpIpService.send_data(
+                net_info, [b'%x\r\n' % len(_chunk), _chunk, b'\r\n'], send_para
+            )
+            if not _result.is_success():
+                return _result
+        return TcpIpService.send_data(net_info, b'0\r\n\r\n', send_para)
+
     @classmethod
     def get_print_str(cls, proto_msg, msg):
         """
@@ -337,8 +471,11 @@ class HttpService(TcpIpService):
             if _index != -1:
                 _encoding = _content_type[_index + 8]
         _body_str = ''
-        if _encoding is not None and msg is not None:
-            _body_str = msg.decode(_encoding)
+        if not isinstance(msg, (bytes, bytearray, memoryview, type(None))):
+            # 流式报文体或文件
+            _body_str = '<%s>' % type(msg).__name__
+        elif _encoding is not None and msg is not None:
+            _body_str = bytes(msg).decode(_encoding)
         return _head_str + _body_str
 
     #############################
@@ -352,6 +489,8 @@ class HttpService(TcpIpService):
         @param {[type]} server_opts - 服务的启动参数
         @param {[type]} net_info - 具体实现的连接信息（例如Socket对象）
         @param {[type]} self_tag - 用于发起端传入自身的识别标识
+            注：支持长连接及流水线请求；事件循环模式下处理完接收缓存中已到达的请求后返回，
+                长连接的后续请求由事件循环重新调度
 
         """
         while True:
@@ -370,7 +509,18 @@ class HttpService(TcpIpService):
 
             # 获取报文信息
             _result = self.recv_data(net_info, {})
-            if not _result.is_success():
+            if _result.code in ('20403', '20405') and _result.is_recv_empty:
+                # 长连接空闲超时或客户端已关闭连接(未收到任何数据)
+                self._logger.log(
+                    self._log_level,
+                    '[LIS-HTTP][NAME:%s][IP:%s][PORT:%s]%s: %s' % (
+                        self_tag, str(net_info.raddr[0]), str(net_info.raddr[1]),
+                        _('close remote connection because idle or closed by remote'), _result.code
+                    )
+                )
+                self.close_connect(net_info)
+                return
+            elif not _result.is_success():
                 self._logger.log(
                     logging.ERROR,
                     '[LIS-HTTP][NAME:%s][IP:%s][PORT:%s][EX:%s]%s: %s - %s\n%s' % (
@@ -410,11 +560,16 @@ class HttpService(TcpIpService):
                     )
                 )
                 # 组织一个异常的返回报文
-                _rproto_msg = MsgHTTP('%s 500 Internal Server Error' % (_proto_msg.ver),
+                _rproto_msg = MsgHTTP('%s 500 Internal Server Error' % (_proto_msg.base_object.ver),
                                       obj_type=EnumMsgObjType.String)
 
+            # 客户端没有要求保持连接，处理完成后关闭
+            _is_close = _is_close or not self.is_keep_alive(_proto_msg)
+
             # 组织回包
             if _rproto_msg is not None:
+                if _rproto_msg.get_value('Connection') is None:
+                    _rproto_msg.set_value('Connection', 'close' if _is_close else 'keep-alive')
                 _result = self.send_data(net_info, (_rproto_msg, _rmsg), {})
                 if not _result.is_success():
                     self._logger.log(
@@ -442,8 +597,24 @@ class HttpService(TcpIpService):
                 self.close_connect(net_info)
                 return
 
-            # 睡眠一下，继续处理下一个请求
-            RunTool.sleep(0.001)
+            if isinstance(_msg, HttpChunkedReader):
+                # 丢弃处理函数未读取的分块报文体，保证下一个请求的读取位置正确
+                try:
+                    _msg.drain()
+                except Exception as e:
+                    self._logger.log(
+                        logging.ERROR,
+                        '[LIS-HTTP][NAME:%s][IP:%s][PORT:%s][EX:%s]%s: %s' % (
+                            self_tag, str(net_info.raddr[0]), str(net_info.raddr[1]),
+                            str(type(e)), _('recv data from remote error'), str(e)
+                        )
+                    )
+                    self.close_connect(net_info)
+                    return
+
+            if getattr(server_opts, 'use_event_loop', False) and len(self.get_recv_buffer(net_info)) == 0:
+                # 事件循环模式，没有已到达的流水线请求，返回后由事件循环等待下一个请求到达再处理
+                return
 
 
 if __name__ == '__main__':
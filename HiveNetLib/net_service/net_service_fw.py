@@ -176,6 +176,24 @@ class NetServiceFW(SimpleServerFW):
         @param {object} server_opts - 网络服务的启动参数
         @param {object} net_info - 网络的接入参数（例如socket对象）
 
+        """
+        self._server_connect_deal(thread_id, server_opts, net_info)
+        # 结束处理
+        self.__server_connect_thread_end(thread_id)
+
+    #############################
+    # 私有函数 - 子类可直接使用的函数
+    #############################
+
+    def _server_connect_deal(self, thread_id, server_opts, net_info):
+        """
+        执行外围传入的网络连接处理函数，并屏蔽处理函数的异常
+        注：供实现类自行调度连接处理时使用（例如事件循环模式下由工作线程调用）
+
+        @param {int} thread_id - 线程ID（事件循环模式下为连接ID）
+        @param {object} server_opts - 网络服务的启动参数
+        @param {object} net_info - 网络的接入参数（例如socket对象）
+
         """
         with ExceptionTool.ignored_all(
             logger=self._logger,
@@ -184,8 +202,6 @@ class NetServiceFW(SimpleServerFW):
             force_log_level=logging.ERROR
         ):
             self.__server_connect_deal_fun(thread_id, server_opts, net_info, self.self_tag)
-        # 结束处理
-        self.__server_connect_thread_end(thread_id)
 
     #############################
     # 公共属性
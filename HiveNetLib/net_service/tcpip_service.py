@@ -20,8 +20,13 @@ import sys
 # import platform
 import datetime
 import time
+import errno
 import socket
+import select
+import selectors
+import threading
 import logging
+from collections import deque
 # 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
 sys.path.append(os.path.abspath(os.path.join(
     os.path.dirname(__file__), os.path.pardir, os.path.pardir)))
@@ -29,7 +34,8 @@ from HiveNetLib.simple_i18n import _, SimpleI18N
 from HiveNetLib.net_service.net_service_fw import NetServiceFW
 from HiveNetLib.generic import NullObj, CResult
 from HiveNetLib.base_tools.exception_tool import ExceptionTool
-from HiveNetLib.base_tools.run_tool import RunTool
+from HiveNetLib.simple_server_fw import EnumServerRunStatus
+from HiveNetLib.simple_parallel import ParallelPool, ThreadParallel
 
 __MOUDLE__ = 'tcpip_service'  # 模块名
 __DESCRIPT__ = u'TcpIp协议服务'  # 模块描述
@@ -38,6 +44,159 @@ __AUTHOR__ = u'黎慧剑'  # 作者
 __PUBLISH__ = '2018.09.14'  # 发布日期
 
 
+# sendmsg一次可发送的最大数据段数
+try:
+    _IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = -1
+if _IOV_MAX <= 0:
+    _IOV_MAX = 1024
+
+
+class SocketRecvBuffer(object):
+    """
+    连接的接收缓存
+    小数据量的读取会一次从socket预读一批数据到缓存，后续的读取直接从缓存获取，多余的数据在多次读取间保留；
+    缓存数据读完后释放内存，空闲连接不占用缓存
+
+    @param {int} size=16384 - 预读缓存大小
+    """
+
+    def __init__(self, size=16384):
+        """
+        构造函数
+
+        @param {int} size=16384 - 预读缓存大小
+        """
+        self.size = size
+        self._buffer = None  # 缓存对象, bytearray
+        self._view = None  # 缓存的memoryview对象
+        self._start = 0  # 未读数据的开始位置
+        self._end = 0  # 未读数据的结束位置
+
+    def __len__(self):
+        """
+        缓存中未读数据的长度
+        """
+        return self._end - self._start
+
+    def fill(self, csocket):
+        """
+        从socket预读一次数据到缓存
+
+        @param {socket} csocket - 要读取的socket对象
+
+        @returns {int} - 本次读取到的数据长度，0代表对端已关闭连接
+
+        @throws {BlockingIOError} - socket没有可读数据时抛出异常
+        """
+        if self._buffer is None:
+            self._buffer = bytearray(self.size)
+            self._view = memoryview(self._buffer)
+            self._start = self._end = 0
+        elif self._start > 0:
+            # 将未读数据移动到缓存开头
+            _len = self._end - self._start
+            self._view[0:_len] = self._view[self._start:self._end]
+            self._start = 0
+            self._end = _len
+
+        if self._end == len(self._buffer):
+            # 缓存已满（查找分隔符时数据超过缓存大小），扩大缓存
+            _buffer = bytearray(len(self._buffer) * 2)
+            _buffer[0:self._end] = self._view[0:self._end]
+            self._buffer = _buffer
+            self._view = memoryview(self._buffer)
+
+        _len = csocket.recv_into(self._view[self._end:])
+        self._end += _len
+        return _len
+
+    def read_into(self, view):
+        """
+        将缓存数据复制到指定的缓冲区
+
+        @param {memoryview} view - 要写入的缓冲区
+
+        @returns {int} - 复制的数据长度
+        """
+        _len = min(len(view), self._end - self._start)
+        if _len > 0:
+            view[0:_len] = self._view[self._start:self._start + _len]
+            self.consume(_len)
+        return _len
+
+    def read(self, size):
+        """
+        从缓存读取指定长度的数据
+
+        @param {int} size - 要读取的长度，超过未读数据长度时只返回未读数据
+
+        @returns {bytes} - 读取到的数据
+        """
+        _len = min(size, self._end - self._start)
+        _data = bytes(self._view[self._start:self._start + _len]) if _len > 0 else b''
+        self.consume(_len)
+        return _data
+
+    def find(self, sub, start=0):
+        """
+        在未读数据中查找指定内容
+
+        @param {bytes} sub - 要查找的内容
+        @param {int} start=0 - 开始查找的位置(相对于未读数据开头)
+
+        @returns {int} - 找到的位置(相对于未读数据开头)，-1代表没有找到
+        """
+        if self._buffer is None:
+            return -1
+        _index = self._buffer.find(sub, self._start + start, self._end)
+        return -1 if _index == -1 else _index - self._start
+
+    def consume(self, size):
+        """
+        丢弃指定长度的未读数据，数据读完后释放缓存
+
+        @param {int} size - 要丢弃的长度
+        """
+        self._start += size
+        if self._start >= self._end:
+            self._buffer = None
+            self._view = None
+            self._start = self._end = 0
+
+
+class SocketFileRegion(object):
+    """
+    文件区域，作为TcpIpService.send_data的发送数据时，通过os.sendfile直接由内核发送文件内容
+    注：不支持os.sendfile的平台或文件对象，将按块读取文件后发送
+
+    @param {object} file - 以二进制方式打开的文件对象
+    @param {int} offset=0 - 要发送的开始位置
+    @param {int} count=None - 要发送的长度，None代表发送到文件结尾
+    """
+
+    def __init__(self, file, offset=0, count=None):
+        """
+        构造函数
+
+        @param {object} file - 以二进制方式打开的文件对象
+        @param {int} offset=0 - 要发送的开始位置
+        @param {int} count=None - 要发送的长度，None代表发送到文件结尾
+        """
+        self.file = file
+        self.offset = offset
+        if count is None:
+            count = file.seek(0, os.SEEK_END) - offset
+        self.count = count
+
+    def __len__(self):
+        """
+        要发送的长度
+        """
+        return self.count
+
+
 class TcpIpService(NetServiceFW):
     """
     TcpIp协议服务
@@ -49,6 +208,19 @@ class TcpIpService(NetServiceFW):
         _server_opts.max_connect = 20  # 允许最大连接数
         _server_opts.recv_timeout = 10000  # 数据接收的超时时间，单位为毫秒
         _server_opts.send_timeout = 10000  # 数据发送的超时时间，单位为毫秒
+        _server_opts.use_event_loop = False  # 是否使用事件循环模式
+        _server_opts.worker_num = 10  # 事件循环模式下处理连接的工作线程数
+    事件循环模式说明：
+        默认模式每接受一个连接启动一个线程执行server_connect_deal_fun；事件循环模式通过selectors(epoll/kqueue等)
+        在单一线程中监听所有连接，连接有数据可读时才将server_connect_deal_fun提交到工作线程池执行，
+        空闲连接不占用线程，可支撑数千个连接：
+        1、server_connect_deal_fun的定义不变，thread_id传入的是连接ID（同一连接保持不变）；
+        2、推荐处理函数每次被调用只处理当前已到达的请求后返回，如果处理函数未关闭连接，连接将重新放入监听，
+            有新数据到达时再次调用（长连接无需在处理函数中循环等待）；
+        3、兼容原有在处理函数中循环处理长连接的方式：处理函数执行超过recv_timeout时，该工作线程将被视为
+            连接的专用线程（写入超时日志），线程池自动创建新的工作线程替代，不影响其他连接的处理；
+            但每个这样的连接仍会占用一个线程，大量长连接应按第2点的方式处理；
+        4、处理函数关闭连接（close_connect）代表结束该连接的处理；对端关闭的连接由框架自动关闭。
     net_info定义：
         net_info = NullObj()
         net_info.csocket - socket对象
@@ -56,11 +228,27 @@ class TcpIpService(NetServiceFW):
         net_info.raddr 远端地址，地址对象，("IP地址",打开端口)
         net_info.send_timeout 发送超时时间，单位为毫秒
         net_info.recv_timeout 收取超时时间，单位为毫秒
+        net_info.recv_buffer 连接的接收缓存(SocketRecvBuffer)，缓存预读的数据，在recv_data中自动创建
 
     """
 
+    #############################
+    # 内部变量
+    #############################
+    _selector = None  # 事件循环模式的selector对象
+    _worker_pool = None  # 事件循环模式处理连接的工作线程池
+    _connect_id = 0  # 事件循环模式的连接ID序列
+    _server_socket = None  # 事件循环模式服务端监听的socket对象
+    _connect_num = 0  # 事件循环模式当前打开的连接数
+    _accept_paused = False  # 事件循环模式是否因达到最大连接数暂停接受连接
+    _busy_connects = None  # 事件循环模式正在工作线程处理的连接, key为连接ID
+    _rearm_connects = None  # 事件循环模式处理完成需重新放入监听的连接
+    _wakeup_sockets = None  # 唤醒事件循环的socket对, (读端, 写端)
+    _event_loop_lock = None  # 事件循环连接登记的同步锁
+
     @staticmethod
-    def generate_server_opts(ip='', port=8080, max_connect=20, recv_timeout=10000, send_timeout=10000):
+    def generate_server_opts(ip='', port=8080, max_connect=20, recv_timeout=10000, send_timeout=10000,
+                             use_event_loop=False, worker_num=10):
         """
         生成默认服务启动参数
 
@@ -69,6 +257,8 @@ class TcpIpService(NetServiceFW):
         @param {int} max_connect=20 - 允许最大连接数
         @param {int} recv_timeout=10000 - 数据接收的超时时间，单位为毫秒
         @param {int} send_timeout=10000 - 数据发送的超时时间，单位为毫秒
+        @param {bool} use_event_loop=False - 是否使用事件循环模式，具体说明见类说明
+        @param {int} worker_num=10 - 事件循环模式下处理连接的工作线程数
 
         @returns {object} - 返回带参数属性的对象，例如对象为ret：
             ret.ip = ''
@@ -81,8 +271,140 @@ class TcpIpService(NetServiceFW):
         _server_opts.max_connect = max_connect  # 允许最大连接数
         _server_opts.recv_timeout = recv_timeout  # 数据接收的超时时间，单位为毫秒
         _server_opts.send_timeout = send_timeout  # 数据发送的超时时间，单位为毫秒
+        _server_opts.use_event_loop = use_event_loop  # 是否使用事件循环模式
+        _server_opts.worker_num = worker_num  # 事件循环模式下处理连接的工作线程数
         return _server_opts
 
+    @staticmethod
+    def wait_socket(csocket, is_read=True, timeout=0):
+        """
+        等待socket可读或可写（阻塞等待，不占用CPU）
+
+        @param {socket} csocket - 要等待的socket对象
+        @param {bool} is_read=True - True-等待可读，False-等待可写
+        @param {float} timeout=0 - 最长等待时间，单位为秒
+
+        @returns {bool} - 在超时时间内是否已可读（可写）
+
+        """
+        if timeout < 0:
+            timeout = 0
+        if hasattr(select, 'poll'):
+            # 优先使用poll, 不受文件描述符数量1024的限制
+            _poll = select.poll()
+            _poll.register(csocket, select.POLLIN if is_read else select.POLLOUT)
+            return len(_poll.poll(timeout * 1000)) > 0
+        else:
+            if is_read:
+                _ready = select.select([csocket], [], [csocket], timeout)
+            else:
+                _ready = select.select([], [csocket], [csocket], timeout)
+            return len(_ready[0]) + len(_ready[1]) + len(_ready[2]) > 0
+
+    #############################
+    # 重载NetServiceFW的处理函数
+    #############################
+
+    def _server_run_self(self, tid, server_info):
+        """
+        自定义服务处理函数，事件循环模式下执行一次事件监听及分发
+
+        @param {int} tid - 线程id
+        @param {object} server_info - _start_server_self函数生成的server_info信息
+
+        @returns {CResult} - 处理结果:
+            result.code ：'00000'-成功，其他值为失败
+            result.is_finished ：处理是否已完成，True - 已处理完成，False - 未完成，需循环再处理
+
+        """
+        if self._selector is None:
+            # 非事件循环模式，每个连接一个线程
+            return NetServiceFW._server_run_self(self, tid, server_info)
+
+        _result = CResult(code='00000')  # 成功
+        _result.is_finished = False
+        with ExceptionTool.ignored_cresult(
+            _result,
+            logger=self._logger,
+            self_log_msg='[%s][NAME:%s]%s: ' % (
+                self._server_log_prefix, self._server_name, _('service run error')),
+            force_log_level=logging.ERROR
+        ):
+            # 超时时间不宜过长, 需要及时响应服务停止指令
+            for _key, _mask in self._selector.select(timeout=0.1):
+                if _key.data is None:
+                    # 监听端口, 接受所有已到达的连接
+                    self._event_loop_accept(server_info)
+                elif _key.data == 'wakeup':
+                    # 唤醒信号, 将处理完成的连接重新放入监听
+                    with ExceptionTool.ignored(expect=(BlockingIOError, InterruptedError)):
+                        self._wakeup_sockets[0].recv(4096)
+                    self._event_loop_rearm()
+                else:
+                    # 连接有数据可读, 分发到工作线程处理
+                    self._event_loop_dispatch(_key.fileobj, _key.data)
+        return _result
+
+    def _stop_server_predeal_self(self, tid, server_info):
+        """
+        自定义服务停止前处理函数
+        事件循环模式下关闭所有空闲连接，并等待工作线程中的连接处理完成
+
+        @param {int} tid - 线程id
+        @param {object} server_info - _start_server_self函数生成的server_info信息
+
+        @returns {CResult} - 处理结果:
+            result.code ：'00000'-成功，其他值为失败
+            result.is_finished ：处理是否已完成，True - 已处理完成，False - 未完成，需循环再处理
+
+        """
+        if self._selector is None:
+            return NetServiceFW._stop_server_predeal_self(self, tid, server_info)
+
+        _result = CResult(code='00000')  # 成功
+        _result.is_finished = True
+        with ExceptionTool.ignored_cresult(
+            _result,
+            logger=self._logger,
+            self_log_msg='[%s][NAME:%s]%s: ' % (
+                self._server_log_prefix, self._server_name, _('service run error')),
+            force_log_level=logging.ERROR
+        ):
+            # 关闭在监听中的空闲连接
+            for _key in list(self._selector.get_map().values()):
+                if _key.data is None or _key.data == 'wakeup':
+                    continue
+                self._selector.unregister(_key.fileobj)
+                self._event_loop_close_connect(_key.data[1])
+
+            # 已处理完成的连接直接关闭
+            self._event_loop_rearm()
+            if len(self._busy_connects) > 0:
+                _result.is_finished = False
+        return _result
+
+    def _stop_server_end_self(self, tid):
+        """
+        自定义服务停止后处理函数，事件循环模式下关闭工作线程池及selector
+
+        @param {int} tid - 线程id
+
+        """
+        NetServiceFW._stop_server_end_self(self, tid)
+        if self._selector is None:
+            return
+
+        with ExceptionTool.ignored_all(logger=self._logger, self_log_msg='_stop_server_end_self exception:'):
+            self._worker_pool.stop(overtime=10)
+        with ExceptionTool.ignored_all(logger=self._logger, self_log_msg='_stop_server_end_self exception:'):
+            self._selector.close()
+            for _socket in self._wakeup_sockets:
+                _socket.close()
+        self._selector = None
+        self._server_socket = None
+        self._worker_pool = None
+        self._wakeup_sockets = None
+
     def _start_server_without_accept(self, server_opts):
         """
         启动服务但不接受请求服务，该方法只做到启动端口层面，轮询监听不在该方法中实现:
@@ -112,6 +434,9 @@ class TcpIpService(NetServiceFW):
             # _sys_str = platform.system()
             _server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             _server_socket.setblocking(False)   # 将socket设置为非阻塞. 在创建socket对象后就进行该操作.
+            if sys.platform != 'win32':
+                # 服务重启时允许重用处于TIME_WAIT状态的端口(windows下该选项含义不同, 不设置)
+                _server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             _server_socket.bind((server_opts.ip, server_opts.port))
             _server_socket.listen(server_opts.max_connect)
             # 改为用非阻塞模式支持，因此超时自行实现
@@ -133,6 +458,10 @@ class TcpIpService(NetServiceFW):
             _result.net_info.send_timeout = server_opts.send_timeout
             _result.net_info.recv_timeout = server_opts.recv_timeout
 
+            if getattr(server_opts, 'use_event_loop', False):
+                # 事件循环模式，准备selector及工作线程池
+                self._event_loop_init(_server_socket, server_opts)
+
         return _result
 
     def _accept_one(self, server_opts, net_info):
@@ -149,6 +478,28 @@ class TcpIpService(NetServiceFW):
 
         """
         # 子类必须定义该功能
+        _result = self._accept_client(server_opts, net_info)
+        if not _result.is_success():
+            # 没有连接，阻塞等待监听端口可读，有新连接时马上返回进行下一次获取
+            with ExceptionTool.ignored_all(logger=None):
+                self.wait_socket(net_info.csocket, is_read=True, timeout=0.1)
+        return _result
+
+    #############################
+    # 内部函数
+    #############################
+    def _accept_client(self, server_opts, net_info):
+        """
+        获取一个已到达的客户端连接（不等待）
+
+        @param {objcet} server_opts - 网络服务启动参数
+        @param {objcet} net_info - 网络连接信息对象，_start_server_without_accept中获取到的结果
+
+        @returns {CResult} - 获取网络连接结果:
+            result.code ：'00000'-成功，'20407'-没有已到达的客户端连接请求
+            result.net_info ：客户端连接信息对象
+
+        """
         _result = CResult('00000')
         _result.net_info = None
         with ExceptionTool.ignored_cresult(
@@ -186,23 +537,372 @@ class TcpIpService(NetServiceFW):
                     self._server_name, _('accept one client connection'), str(_addr), str(_csocket)
                 )
             )
-        if not _result.is_success():
-            # 出现异常，睡眠一段时间
-            RunTool.sleep(0.01)
+        return _result
+
+    @classmethod
+    def _wait_recv(cls, csocket, end_time):
+        """
+        阻塞等待socket可读直到指定的超时时间点
+
+        @param {socket} csocket - 要等待的socket对象
+        @param {float} end_time - 超时时间点(time.monotonic)
+
+        @returns {bool} - 是否已可读，False代表已超时
+
+        """
+        _wait_time = end_time - time.monotonic()
+        return _wait_time > 0 and cls.wait_socket(csocket, is_read=True, timeout=_wait_time)
+
+    @classmethod
+    def _wait_send(cls, csocket, end_time):
+        """
+        阻塞等待socket可写直到指定的超时时间点
+
+        @param {socket} csocket - 要等待的socket对象
+        @param {float} end_time - 超时时间点(time.monotonic)
+
+        @returns {bool} - 是否已可写，False代表已超时
+
+        """
+        _wait_time = end_time - time.monotonic()
+        return _wait_time > 0 and cls.wait_socket(csocket, is_read=False, timeout=_wait_time)
+
+    @classmethod
+    def _send_buffers(cls, csocket, views, end_time):
+        """
+        发送多段数据，支持socket.sendmsg的平台一次系统调用发送多段数据
+
+        @param {socket} csocket - 要发送的socket对象
+        @param {list} views - 要发送的memoryview列表（处理过程中会修改该列表）
+        @param {float} end_time - 超时时间点(time.monotonic)
+
+        @returns {bool} - 是否发送完成，False代表已超时
+
+        """
+        _index = 0
+        _count = len(views)
+        _use_sendmsg = _count > 1 and hasattr(csocket, 'sendmsg')
+        while _index < _count:
+            try:
+                if _use_sendmsg:
+                    _sent = csocket.sendmsg(views[_index:_index + _IOV_MAX])
+                else:
+                    _sent = csocket.send(views[_index])
+            except (BlockingIOError, InterruptedError):
+                # 发送缓存已满，阻塞等待socket可写
+                if not cls._wait_send(csocket, end_time):
+                    return False
+                continue
+
+            # 跳过已发送的数据，部分发送的数据段通过memoryview定位剩余部分
+            while _sent > 0:
+                _len = len(views[_index])
+                if _sent >= _len:
+                    _sent -= _len
+                    _index += 1
+                else:
+                    views[_index] = views[_index][_sent:]
+                    _sent = 0
+        return True
+
+    @classmethod
+    def _send_file_region(cls, csocket, region, end_time):
+        """
+        发送文件区域，优先使用os.sendfile由内核直接发送
+
+        @param {socket} csocket - 要发送的socket对象
+        @param {SocketFileRegion} region - 要发送的文件区域
+        @param {float} end_time - 超时时间点(time.monotonic)
+
+        @returns {bool} - 是否发送完成，False代表已超时
+
+        @throws {EOFError} - 文件长度不足时抛出异常
+
+        """
+        _offset = region.offset
+        _rest = region.count
+        _fd = None
+        if hasattr(os, 'sendfile'):
+            try:
+                _fd = region.file.fileno()
+            except (AttributeError, OSError):
+                # 非真实文件(例如BytesIO)
+                _fd = None
+
+        while _rest > 0:
+            if _fd is not None:
+                try:
+                    _sent = os.sendfile(csocket.fileno(), _fd, _offset, _rest)
+                except (BlockingIOError, InterruptedError):
+                    if not cls._wait_send(csocket, end_time):
+                        return False
+                    continue
+                except OSError as e:
+                    if e.errno not in (errno.EINVAL, errno.ENOSYS, errno.ENOTSOCK, errno.EOPNOTSUPP):
+                        raise
+                    # 文件类型不支持sendfile，改为读取文件发送
+                    _fd = None
+                    continue
+            else:
+                region.file.seek(_offset)
+                _block = region.file.read(min(_rest, 262144))
+                if not cls._send_buffers(csocket, [memoryview(_block)], end_time):
+                    return False
+                _sent = len(_block)
+
+            if _sent == 0:
+                raise EOFError('file region out of file size')
+            _offset += _sent
+            _rest -= _sent
+        return True
+
+    def _event_loop_init(self, server_socket, server_opts):
+        """
+        初始化事件循环模式的selector及工作线程池
+
+        @param {socket} server_socket - 服务端监听的socket对象
+        @param {object} server_opts - 服务参数
+
+        """
+        self._connect_id = 0
+        self._server_socket = server_socket
+        self._connect_num = 0
+        self._accept_paused = False
+        self._busy_connects = dict()
+        self._rearm_connects = deque()
+        self._event_loop_lock = threading.RLock()
+        self._wakeup_sockets = socket.socketpair()
+        for _socket in self._wakeup_sockets:
+            _socket.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(server_socket, selectors.EVENT_READ, data=None)
+        self._selector.register(self._wakeup_sockets[0], selectors.EVENT_READ, data='wakeup')
+        # 处理函数执行超过recv_timeout视为循环处理的长连接，创建新的工作线程替代，避免线程池被占满
+        self._worker_pool = ParallelPool(
+            None, parallel_class=ThreadParallel, logger=self._logger, is_use_global_logger=False,
+            maxsize=getattr(server_opts, 'worker_num', 10), daemon_thread_time=1,
+            worker_overtime=max(server_opts.recv_timeout / 1000, 0), replace_overtime_worker=True
+        )
+        self._worker_pool.start()
+
+    def _event_loop_accept(self, server_info):
+        """
+        事件循环模式接受所有已到达的连接并放入监听
+        达到最大连接数(server_opts.max_connect)时暂停接受连接, 新连接保留在系统的监听队列中, 有连接关闭后恢复
+
+        @param {object} server_info - 服务端网络连接信息对象
+
+        """
+        while True:
+            if self._connect_num >= self._server_opts.max_connect:
+                if not self._accept_paused:
+                    self._selector.unregister(self._server_socket)
+                    self._accept_paused = True
+                break
+
+            _accept_result = self._accept_client(self._server_opts, server_info)
+            if not _accept_result.is_success():
+                if _accept_result.code != '20407' and self._logger is not None:
+                    self._logger.log(
+                        logging.ERROR,
+                        "[%s][NAME:%s][EX:%s]%s: %s\n%s" % (
+                            self._server_log_prefix,
+                            self._server_name, str(type(_accept_result.error)),
+                            _('accept net connection error'), _accept_result.msg,
+                            _accept_result.trace_str
+                        )
+                    )
+                break
+
+            self._connect_id += 1
+            self._connect_num += 1
+            self._selector.register(
+                _accept_result.net_info.csocket, selectors.EVENT_READ,
+                data=(self._connect_id, _accept_result.net_info)
+            )
+
+    def _event_loop_dispatch(self, csocket, connect_info):
+        """
+        事件循环模式下将有数据可读的连接分发到工作线程处理
+
+        @param {socket} csocket - 连接的socket对象
+        @param {tuple} connect_info - 连接信息, (连接ID, net_info)
+
+        """
+        self._selector.unregister(csocket)
+        _net_info = connect_info[1]
+        try:
+            _data = csocket.recv(1, socket.MSG_PEEK)
+        except (BlockingIOError, InterruptedError):
+            # 没有实际数据, 继续监听
+            self._selector.register(csocket, selectors.EVENT_READ, data=connect_info)
+            return
+        except OSError:
+            _data = b''
+
+        if len(_data) == 0:
+            # 对端已关闭连接
+            self._event_loop_close_connect(_net_info)
+            return
+
+        with self._event_loop_lock:
+            self._busy_connects[connect_info[0]] = connect_info
+        self._worker_pool.submit(self._event_loop_deal, connect_info)
+
+    def _event_loop_deal(self, connect_info):
+        """
+        事件循环模式的工作线程处理函数，执行连接处理函数后通知事件循环重新监听连接
+
+        @param {tuple} connect_info - 连接信息, (连接ID, net_info)
+
+        """
+        try:
+            self._server_connect_deal(connect_info[0], self._server_opts, connect_info[1])
+        finally:
+            with self._event_loop_lock:
+                self._busy_connects.pop(connect_info[0], None)
+                self._rearm_connects.append(connect_info)
+            with ExceptionTool.ignored(expect=(BlockingIOError, InterruptedError, OSError)):
+                self._wakeup_sockets[1].send(b'\0')
+
+    def _event_loop_rearm(self):
+        """
+        将工作线程处理完成的连接重新放入监听（已关闭的连接不再处理）
+
+        """
+        while True:
+            try:
+                _connect_info = self._rearm_connects.popleft()
+            except IndexError:
+                break
+            _csocket = _connect_info[1].csocket
+            if _csocket.fileno() == -1:
+                # 处理函数已关闭连接
+                self._event_loop_close_connect(_connect_info[1], is_closed=True)
+                continue
+            if self.server_run_status != EnumServerRunStatus.Running:
+                self._event_loop_close_connect(_connect_info[1])
+                continue
+            _recv_buffer = getattr(_connect_info[1], 'recv_buffer', None)
+            if _recv_buffer is not None and len(_recv_buffer) > 0:
+                # 接收缓存中已有下一个请求的数据（流水线请求），直接分发处理
+                with self._event_loop_lock:
+                    self._busy_connects[_connect_info[0]] = _connect_info
+                self._worker_pool.submit(self._event_loop_deal, _connect_info)
+                continue
+            self._selector.register(_csocket, selectors.EVENT_READ, data=_connect_info)
+
+    def _event_loop_close_connect(self, net_info, is_closed=False):
+        """
+        事件循环模式关闭连接并减少连接数, 如果因达到最大连接数暂停了接受连接则恢复
+
+        @param {object} net_info - 要关闭的网络连接信息对象
+        @param {bool} is_closed=False - 连接是否已被关闭(只需减少连接数)
+
+        """
+        if not is_closed:
+            self.close_connect(net_info)
+        self._connect_num -= 1
+        if self._accept_paused and self._connect_num < self._server_opts.max_connect:
+            self._selector.register(self._server_socket, selectors.EVENT_READ, data=None)
+            self._accept_paused = False
+
+    @staticmethod
+    def get_recv_buffer(net_info):
+        """
+        获取连接的接收缓存，如果不存在则创建
+
+        @param {object} net_info - 网络连接信息对象
+
+        @returns {SocketRecvBuffer} - 接收缓存对象
+
+        """
+        _recv_buffer = getattr(net_info, 'recv_buffer', None)
+        if _recv_buffer is None:
+            _recv_buffer = SocketRecvBuffer()
+            net_info.recv_buffer = _recv_buffer
+        return _recv_buffer
+
+    @classmethod
+    def recv_until(cls, net_info, recv_para={}):
+        """
+        从指定的网络连接中读取数据，直到遇到指定的分隔符
+        数据按批预读到连接的接收缓存中查找，分隔符之后的数据保留在接收缓存中
+
+        @param {object} net_info - 要读取数据的网络信息对象
+        @param {dict} recv_para - 读取数据的参数, 包括：
+            sep {bytes|tuple} - 分隔符，可以传入多个分隔符的tuple(遇到任意一个即返回)，默认为b'\r\n'
+            max_len {int} - 允许的最大数据长度，超过抛出异常，默认为65536
+            overtime {int} - 获取超时时间，单位为毫秒，非必要参数
+
+        @returns {CResult} - 数据获取结果:
+            result.code ：'00000'-成功，'20403'-获取数据超时，'20405'-对端已关闭连接，其他为获取失败
+            result.data ：获取到的数据（包含分隔符）
+            result.recv_time : datetime 实际开始接受数据时间
+            result.overtime : int 超时时间（毫秒）
+
+        """
+        if type(recv_para) != dict:
+            recv_para = {}
+        _result = CResult('00000')
+        _result.data = b''
+        _result.recv_time = datetime.datetime.now()
+        _overtime = recv_para.get('overtime', getattr(net_info, 'recv_timeout', 10000))
+        _result.overtime = _overtime
+
+        with ExceptionTool.ignored_cresult(
+            _result
+        ):
+            _seps = recv_para.get('sep', b'\r\n')
+            if type(_seps) != tuple:
+                _seps = (_seps, )
+            _max_len = recv_para.get('max_len', 65536)
+            _recv_buffer = cls.get_recv_buffer(net_info)
+            _csocket = net_info.csocket
+            _end_time = time.monotonic() + _overtime / 1000
+            _scan = 0  # 已查找过的位置, 避免重复查找
+            while True:
+                _index = -1
+                for _sep in _seps:
+                    _find = _recv_buffer.find(_sep, max(0, _scan - len(_sep) + 1))
+                    if _find != -1 and (_index == -1 or _find + len(_sep) < _index):
+                        _index = _find + len(_sep)
+                if _index != -1:
+                    _result.data = _recv_buffer.read(_index)
+                    break
+
+                _scan = len(_recv_buffer)
+                if _scan > _max_len:
+                    raise ValueError('data length exceeds max_len %d' % _max_len)
+                try:
+                    _size = _recv_buffer.fill(_csocket)
+                except (BlockingIOError, InterruptedError):
+                    if not cls._wait_recv(_csocket, _end_time):
+                        _result.change_code(code='20403')
+                        break
+                    continue
+                if _size == 0:
+                    # 对端已关闭连接
+                    _result.change_code(code='20405')
+                    break
         return _result
 
     @classmethod
     def recv_data(cls, net_info, recv_para={}):
         """
         从指定的网络连接中读取数据
+        数据直接读取到预分配的缓冲区（recv_into），小数据量的读取通过连接的接收缓存(net_info.recv_buffer)预读，
+        多读取的数据保留在接收缓存中供下一次读取使用
 
         @param {object} net_info - 要读取数据的网络信息对象（例如socket对象）
         @param {dict} recv_para - 读取数据的参数, 包括：
             recv_len {int} - 要获取的数据长度, 必要参数
             overtime {int} - 获取超时时间，单位为毫秒，非必要参数
+            buffer {bytearray|memoryview} - 调用方提供的可写缓冲区，非必要参数
+                注：传入时数据直接写入该缓冲区（不产生复制），result.data返回该缓冲区对应长度的memoryview对象
 
         @returns {CResult} - 数据获取结果:
-            result.code ：'00000'-成功，'20403'-获取数据超时，其他为获取失败
+            result.code ：'00000'-成功，'20403'-获取数据超时，'20405'-对端已关闭连接，其他为获取失败
             result.data ：获取到的数据对象（具体类型和定义，由实现类自定义）
             result.recv_time : datetime 实际开始接受数据时间
             result.overtime : int 超时时间（毫秒），当返回结果为超时，可获取超时时间信息
@@ -226,33 +926,62 @@ class TcpIpService(NetServiceFW):
         with ExceptionTool.ignored_cresult(
             _result
         ):
-            _rest_bytes = recv_para['recv_len']
-            while _rest_bytes > 0:
-                # 检查是否超时
-                if (datetime.datetime.now() - _result.recv_time).total_seconds() * 1000 > _overtime:
-                    # 已超时
-                    _result.change_code(code='20403')
-                    break
+            _len = recv_para['recv_len']
+            _buffer = recv_para.get('buffer', None)
+            if _buffer is None:
+                _data = bytearray(_len)
+                _view = memoryview(_data)
+            else:
+                _view = memoryview(_buffer)[0:_len]
+
+            _recv_buffer = cls.get_recv_buffer(net_info)
 
-                _buffer = b''
-                with ExceptionTool.ignored(expect=(BlockingIOError)):
-                    # 获取数据
-                    _buffer = net_info.csocket.recv(_rest_bytes)
-                    if len(_buffer) > 0:
-                        _result.data = _result.data + _buffer
-                        _rest_bytes = _rest_bytes - len(_buffer)
+            # 先取接收缓存中的数据
+            _pos = _recv_buffer.read_into(_view)
+            _csocket = net_info.csocket
+            _end_time = time.monotonic() + _overtime / 1000  # 超时时间点, 只在需要等待时检查
+            while _pos < _len:
+                try:
+                    if _len - _pos >= _recv_buffer.size:
+                        # 大数据直接读入目标缓冲区
+                        _size = _csocket.recv_into(_view[_pos:])
                     else:
-                        # 休眠一下
-                        RunTool.sleep(0.001)
+                        # 小数据先预读到接收缓存
+                        _size = _recv_buffer.fill(_csocket)
+                        if _size > 0:
+                            _size = _recv_buffer.read_into(_view[_pos:])
+                except (BlockingIOError, InterruptedError):
+                    # 没有数据，阻塞等待socket可读，不占用CPU
+                    if not cls._wait_recv(_csocket, _end_time):
+                        # 已超时
+                        _result.change_code(code='20403')
+                        break
+                    continue
+
+                if _size == 0:
+                    # 对端已关闭连接
+                    _result.change_code(code='20405')
+                    break
+                _pos += _size
+
+            if _buffer is not None:
+                _result.data = _view[0:_pos]
+            elif _pos == _len:
+                _result.data = bytes(_data)
+            else:
+                _result.data = bytes(_view[0:_pos])
         return _result
 
     @classmethod
     def send_data(cls, net_info, data, send_para={}):
         """
         向指定的网络连接发送数据
+        支持一次传入多段数据（例如报文头、报文体分段、文件区域），多段数据通过socket.sendmsg一次发送，
+        文件区域通过os.sendfile发送，部分发送时通过memoryview定位剩余数据，不产生数据复制
 
         @param {object} net_info - 要写入数据的网络信息对象（例如socket对象）
-        @param {object} data - 要写入的数据对象（具体类型和定义，由实现类自定义）
+        @param {bytes|bytearray|memoryview|SocketFileRegion|list|tuple} data - 要写入的数据对象:
+            可以为单个bytes-like对象或SocketFileRegion对象，也可以为多个上述对象组成的list/tuple
         @param {dict} send_para - 写入数据的参数:
             overtime {int} - 发送超时时间，单位为毫秒, 非必须参数
         @returns {CResult} - 发送结果:
@@ -274,24 +1003,30 @@ class TcpIpService(NetServiceFW):
             _overtime = net_info.send_timeout
         _result.overtime = _overtime
 
-        _begin_time = datetime.datetime.now()
+        _end_time = time.monotonic() + _overtime / 1000
 
         with ExceptionTool.ignored_cresult(
             _result
         ):
-            _rest_bytes = len(data)
-            _total_bytes = _rest_bytes
-            while _rest_bytes > 0:
-                # 检查是否超时
-                if (datetime.datetime.now() - _begin_time).total_seconds() * 1000 > _overtime:
-                    # 已超时
-                    _result.change_code(code='20404')
-                    break
-                with ExceptionTool.ignored(expect=(BlockingIOError)):
-                    # 发送数据
-                    _len = net_info.csocket.send(data[_total_bytes - _rest_bytes:])
-                    if _len > 0:
-                        _rest_bytes = _rest_bytes - _len
+            _csocket = net_info.csocket
+            _views = list()  # 待发送的连续数据
+            _is_finished = True
+            for _part in (data if isinstance(data, (list, tuple)) else (data, )):
+                if isinstance(_part, SocketFileRegion):
+                    # 先发送文件区域前的数据，再发送文件
+                    _is_finished = cls._send_buffers(_csocket, _views, _end_time) and \
+                        cls._send_file_region(_csocket, _part, _end_time)
+                    _views = list()
+                    if not _is_finished:
+                        break
+                elif len(_part) > 0:
+                    _views.append(memoryview(_part).cast('B'))
+
+            if _is_finished:
+                _is_finished = cls._send_buffers(_csocket, _views, _end_time)
+            if not _is_finished:
+                # 已超时
+                _result.change_code(code='20404')
 
             _result.send_time = datetime.datetime.now()
         return _result
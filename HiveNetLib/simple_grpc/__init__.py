@@ -2,5 +2,5 @@
 # -*- coding: UTF-8 -*-
 
 __all__ = [
-    'grpc_client', 'grpc_server', 'grpc_tool', 'msg_pb2_grpc', 'msg_pb2'
+    'grpc_client', 'grpc_server', 'grpc_tool', 'grpc_codec', 'msg_pb2_grpc', 'msg_pb2'
 ]
@@ -27,6 +27,7 @@ from HiveNetLib.generic import NullObj, CResult
 from HiveNetLib.simple_grpc.grpc_tool import SimpleGRpcTools, EnumCallMode
 import HiveNetLib.simple_grpc.msg_pb2 as msg_pb2
 from HiveNetLib.base_tools.call_chain_tool import CallChainTool
+from HiveNetLib.base_tools.trace_context import TraceContext
 from HiveNetLib.base_tools.run_tool import RunTool
 from HiveNetLib.interface_tool.msg_json import MsgJSON
 from HiveNetLib.simple_pool import PoolConnectionFW
@@ -193,23 +194,8 @@ class SimpleGRpcConnection(object):
 
         @throws {ConnectionError} - 如果连接时需要检查有效性，当检查失败时抛出该异常
         """
-        # 内部变量初始化
-        self._trace_info_dict = dict()
-
         # 初始化参数
-        self._connect_para = connect_para
-        self._fill_connect_para(self._connect_para)
-        self._test_on_connect = connect_para.test_on_connect
-        self._test_use_health_check = connect_para.test_use_health_check
-        self._servicer_name = connect_para.servicer_name
-        self._logger = connect_para.logger
-        self._log_level = connect_para.log_level
-        self._timeout = connect_para.timeout
-
-        # 日志处理
-        if self._logger is None and connect_para.is_use_global_logger:
-            # 使用全局logger
-            self._logger = RunTool.get_global_logger()
+        self._init_connect_para(connect_para)
 
         # 进行连接
         self._channel = SimpleGRpcTools.generate_channel(self._connect_para)
@@ -379,6 +365,52 @@ class SimpleGRpcConnection(object):
         # 返回结果
         return _cresult
 
+    def call_many(self, rpc_requests, timeout=None, metadata=None, credentials=None,
+                  wait_for_ready=None, compression=None, max_concurrent=0, **kwargs):
+        """
+        在当前连接上并发执行多个简单模式（Simple）的gRPC远程调用（通过stub.GRpcCallSimple.future多路复用）
+
+        @param {msg_pb2.RpcRequest[]} rpc_requests - 请求对象清单
+        @param {number} timeout=None - 每个调用的超时时间，单位为秒
+        @param {object} metadata=None - 参考call
+        @param {object} credentials=None - 参考call
+        @param {object} wait_for_ready=None - 参考call
+        @param {object} compression=None - 参考call
+        @param {int} max_concurrent=0 - 同时发起的最大调用数，0代表全部同时发起
+        @param {**kwargs} kwargs - 动态参数，用于支持调用链信息
+
+        @returns {CResult[]} - 执行结果清单，顺序与rpc_requests一致，每个CResult的属性与call一致
+        """
+        _start_time = datetime.datetime.now()  # 开始处理时间
+        _timeout = timeout
+        if timeout is None or timeout <= 0:
+            _timeout = self._connect_para.timeout
+
+        # 发送之前逐个记录日志，每个调用有独立的调用链信息
+        _trace_infos = list()
+        _requests = list()
+        for _rpc_request in rpc_requests:
+            _trace_info = self._get_trace_info(**kwargs)
+            _trace_infos.append(_trace_info)
+            _requests.append(self._call_before_write_log(
+                rpc_request=_rpc_request, call_mode=EnumCallMode.Simple,
+                timeout=_timeout, trace_info=_trace_info
+            ))
+
+        # 执行调用
+        _cresults = SimpleGRpcTools.grpc_call_many_by_stub(
+            self._stub, _requests, timeout=_timeout, metadata=metadata, credentials=credentials,
+            wait_for_ready=wait_for_ready, compression=compression, max_concurrent=max_concurrent
+        )
+
+        # 接收响应后逐个记录日志
+        for _i in range(len(_cresults)):
+            self._call_after_write_log(
+                _cresults[_i], _start_time, call_mode=EnumCallMode.Simple,
+                timeout=_timeout, trace_info=_trace_infos[_i]
+            )
+        return _cresults
+
     #############################
     # 私有函数
     #############################
@@ -388,6 +420,30 @@ class SimpleGRpcConnection(object):
         """
         self.close()
 
+    def _init_connect_para(self, connect_para):
+        """
+        初始化内部变量及连接参数
+
+        @param {NullObj} connect_para - 具体参数见SimpleGRpcConnection.generate_connect_para函数的定义
+        """
+        # 内部变量初始化
+        self._trace_info_dict = dict()
+
+        # 初始化参数
+        self._connect_para = connect_para
+        self._fill_connect_para(self._connect_para)
+        self._test_on_connect = connect_para.test_on_connect
+        self._test_use_health_check = connect_para.test_use_health_check
+        self._servicer_name = connect_para.servicer_name
+        self._logger = connect_para.logger
+        self._log_level = connect_para.log_level
+        self._timeout = connect_para.timeout
+
+        # 日志处理
+        if self._logger is None and connect_para.is_use_global_logger:
+            # 使用全局logger
+            self._logger = RunTool.get_global_logger()
+
     def _fill_connect_para(self, connect_para):
         """
         补充完整connect_para的基本属性
@@ -485,22 +541,28 @@ class SimpleGRpcConnection(object):
         远程调用前写日志，并返回要调用的iterator对象
         """
         for _request in rpc_request:
-            # 增加调用链信息
-            _request.trace_id = trace_info.trace_id
-            _request.parent_id = trace_info.call_id
-            _request.trace_level = trace_info.trace_level
+            # 返回调用对象
+            yield self._call_before_write_log_stream(_request, call_mode, timeout, trace_info)
 
-            if self._logger is not None:
-                # 逐个登记调用日志
-                _info_dict = self._get_request_info_dict(
-                    _request, call_mode=call_mode, timeout=timeout, trace_info=trace_info
-                )
-                _info_dict['api_info_type'] = 'STREAM-SEND'
-                _info_dict['err_log_msg'] = 'api call chain send log error'
-                SimpleGRpcTools.write_api_call_chain_log(self._logger, _info_dict)
+    def _call_before_write_log_stream(self, request, call_mode, timeout, trace_info):
+        """
+        流模式单个请求对象的调用前日志处理，并返回增加了调用链信息的请求对象
+        """
+        # 增加调用链信息
+        request.trace_id = trace_info.trace_id
+        request.parent_id = trace_info.call_id
+        request.trace_level = trace_info.trace_level
 
-            # 返回调用对象
-            yield _request
+        if self._logger is not None:
+            # 逐个登记调用日志
+            _info_dict = self._get_request_info_dict(
+                request, call_mode=call_mode, timeout=timeout, trace_info=trace_info
+            )
+            _info_dict['api_info_type'] = 'STREAM-SEND'
+            _info_dict['err_log_msg'] = 'api call chain send log error'
+            SimpleGRpcTools.write_api_call_chain_log(self._logger, _info_dict)
+
+        return request
 
     def _call_after_write_log(self, cresult, start_time, call_mode=EnumCallMode.Simple,
                               timeout=None, trace_info=None):
@@ -534,6 +596,7 @@ class SimpleGRpcConnection(object):
     def _get_trace_info(self, **kwargs):
         """
         获取调用链信息
+        注: 如果没有传入trace_id，则沿用当前的调用链上下文(TraceContext)
 
         @param {**kwargs} kwargs - 动态参数，用于支持调用链信息
 
@@ -551,6 +614,12 @@ class SimpleGRpcConnection(object):
 
         if 'trace_id' in kwargs.keys():
             _trace_info.trace_id = kwargs['trace_id']
+        else:
+            _context_info = TraceContext.get_trace_info()
+            if _context_info is not None:
+                _trace_info.trace_id = _context_info.trace_id
+                _trace_info.parent_id = _context_info.call_id
+                _trace_info.trace_level = _context_info.trace_level[0]
         if 'parent_id' in kwargs.keys():
             _trace_info.parent_id = kwargs['parent_id']
         if 'trace_level' in kwargs.keys():
@@ -604,7 +673,7 @@ class SimpleGRpcConnection(object):
         _dict['service_name'] = request.service_name
         trace_info.service_name = request.service_name
         # 获取日志打印参数
-        _dict['logging_para'] = copy.deepcopy(self._connect_para.send_logging_para)
+        _dict['logging_para'] = self._connect_para.send_logging_para
         # 请求信息的bytes数组
         if request.para_bytes is None:
             _dict['para_bytes_len'] = 'None'
@@ -660,7 +729,7 @@ class SimpleGRpcConnection(object):
         # 请求报文信息，service_name不能正常显示
         _dict['service_name'] = trace_info.service_name
         # 获取日志打印参数
-        _dict['logging_para'] = copy.deepcopy(self._connect_para.back_logging_para)
+        _dict['logging_para'] = self._connect_para.back_logging_para
         # 请求信息的bytes数组
         if cresult.return_bytes is None:
             _dict['para_bytes_len'] = 'None'
@@ -688,6 +757,226 @@ class SimpleGRpcConnection(object):
         return _dict
 
 
+class AIOSimpleGRpcConnection(SimpleGRpcConnection):
+    """
+    封装SimpleGRpc的asyncio模式(grpc.aio)客户端连接方法，可同时发起大量并发调用而不占用线程
+    注：aio通道与事件循环绑定，因此构造时不建立连接，在事件循环中首次调用call（或主动调用connect）时才连接
+
+    @example
+        _conn = AIOSimpleGRpcConnection(connect_para)
+        _cresult = await _conn.call(rpc_request)
+        await _conn.close()
+    """
+
+    #############################
+    # 公共函数
+    #############################
+    def __init__(self, connect_para):
+        """
+        构造函数
+
+        @param {NullObj} connect_para - 具体参数见SimpleGRpcConnection.generate_connect_para函数的定义
+        """
+        self._init_connect_para(connect_para)
+
+    async def connect(self):
+        """
+        建立连接（已连接的情况不处理）
+
+        @throws {ConnectionError} - 如果连接时需要检查有效性，当检查失败时抛出该异常
+        """
+        if self._channel is not None:
+            return
+
+        self._channel = SimpleGRpcTools.generate_aio_channel(self._connect_para)
+        self._stub = SimpleGRpcTools.generate_call_stub(self._channel)
+
+        # 检查连接有效性
+        if self._test_on_connect:
+            _check_result = await self.test()
+            if _check_result.status != msg_pb2.HealthResponse.SERVING:
+                # 连接失败，打印日志后抛出异常
+                if self._logger is not None:
+                    self._logger.log(
+                        self._log_level,
+                        '[EX:%s]%s%s\n%s' % (
+                            _check_result.error,
+                            'AIOSimpleGRpcConnection connect error: ',
+                            _check_result.msg,
+                            _check_result.trace_str
+                        )
+                    )
+                await self.close()
+                raise ConnectionError(_check_result.msg)
+
+    async def test(self):
+        """
+        检测连接是否有效
+
+        @returns {CResult} - 响应对象，判断成功的方法:
+            ret.status == msg_pb2.HealthResponse.SERVING
+        """
+        _check_result = CResult()
+        if self._channel is None:
+            # 没有连接
+            _check_result.status = msg_pb2.HealthResponse.UNKNOWN
+        elif self._test_use_health_check:
+            # 使用标准健康检查
+            self._health_stub = SimpleGRpcTools.generate_health_check_stub(self._channel)
+            _check_result = await SimpleGRpcTools.aio_health_check_by_stub(
+                self._health_stub, self._servicer_name, timeout=self._timeout)
+        else:
+            # 使用自定义的健康检查
+            _check_result = await SimpleGRpcTools.aio_simple_grpc_health_check_by_stub(
+                self._stub, timeout=self._timeout
+            )
+        # 返回结果
+        return _check_result
+
+    async def close(self):
+        """
+        关闭连接
+        """
+        if self._channel is not None:
+            _channel = self._channel
+            self._channel = None
+            self._stub = None
+            self._health_stub = None
+            await _channel.close()
+
+    async def reconnect(self):
+        """
+        重新连接
+
+        @returns {CResult} - 响应对象，判断成功的方法:
+            ret.status == msg_pb2.HealthResponse.SERVING
+        """
+        # 先关闭连接
+        await self.close()
+
+        # 进行连接
+        self._channel = SimpleGRpcTools.generate_aio_channel(self._connect_para)
+        self._stub = SimpleGRpcTools.generate_call_stub(self._channel)
+
+        # 检查连接有效性
+        if self._test_on_connect:
+            return await self.test()
+        else:
+            # 不检查的情况，直接返回成功，连接状态为SERVING
+            _check_result = CResult('00000')
+            _check_result.status = msg_pb2.HealthResponse.SERVING
+            return _check_result
+
+    async def call(self, rpc_request, call_mode=EnumCallMode.Simple,
+                   timeout=None, metadata=None, credentials=None,
+                   wait_for_ready=None, compression=None, **kwargs):
+        """
+        执行gRPC远程调用（asyncio模式）
+
+        @param {msg_pb2.RpcRequest|request_iterator} rpc_request - 请求对象或产生请求对象的迭代器，应与call_mode匹配
+            注：客户端流及双向流模式可以传入普通迭代器或异步迭代器（async iterator）
+        @param {EnumCallMode} call_mode=EnumCallMode.Simple - 调用服务端的模式
+        @param {number} timeout=None - 超时时间，单位为秒
+        @param {object} metadata=None - 参考SimpleGRpcConnection.call
+        @param {object} credentials=None - 参考SimpleGRpcConnection.call
+        @param {object} wait_for_ready=None - 参考SimpleGRpcConnection.call
+        @param {object} compression=None - 参考SimpleGRpcConnection.call
+        @param {**kwargs} kwargs - 动态参数，用于支持调用链信息
+
+        @returns {CResult|async_iterator} - 执行结果CResult或执行结果的异步迭代器，与call_mode匹配
+            CResult对象有以下3个属性:
+            return_json - 返回值的json字符串
+            has_return_bytes - 是否有返回字节数组
+            return_bytes - 返回的字节数组
+        """
+        if self._channel is None:
+            await self.connect()
+
+        _start_time = datetime.datetime.now()  # 开始处理时间
+        _trace_info = self._get_trace_info(**kwargs)  # 获取调用链信息
+        _request = None
+        _timeout = timeout
+        if timeout is None or timeout <= 0:
+            _timeout = self._connect_para.timeout
+
+        # 发送之前记录日志
+        if call_mode in [EnumCallMode.Simple, EnumCallMode.ServerSideStream]:
+            _request = self._call_before_write_log(
+                rpc_request=rpc_request, call_mode=call_mode,
+                timeout=_timeout, trace_info=_trace_info
+            )
+        else:
+            _request = self._aio_call_before_write_log_iterator(
+                rpc_request=rpc_request, call_mode=call_mode,
+                timeout=_timeout, trace_info=_trace_info
+            )
+
+        # 执行调用
+        _cresult_call = await SimpleGRpcTools.aio_grpc_call_by_stub(
+            self._stub, rpc_request=_request, call_mode=call_mode,
+            timeout=_timeout, metadata=metadata, credentials=credentials,
+            wait_for_ready=wait_for_ready, compression=compression
+        )
+
+        # 接收响应后记录日志
+        if call_mode in [EnumCallMode.Simple, EnumCallMode.ClientSideStream]:
+            return self._call_after_write_log(
+                _cresult_call, _start_time, call_mode=call_mode,
+                timeout=_timeout, trace_info=_trace_info
+            )
+        else:
+            return self._aio_call_after_write_log_iterator(
+                _cresult_call, _start_time, call_mode=call_mode,
+                timeout=_timeout, trace_info=_trace_info
+            )
+
+    async def __aenter__(self):
+        """
+        支持async with的方式使用连接
+        """
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, exc_tb):
+        """
+        退出async with时关闭连接
+        """
+        await self.close()
+
+    #############################
+    # 私有函数
+    #############################
+    def __del__(self):
+        """
+        销毁函数，aio通道需在事件循环中通过close关闭，这里不处理
+        """
+        pass
+
+    async def _aio_call_before_write_log_iterator(self, rpc_request, call_mode=EnumCallMode.Simple,
+                                                  timeout=None, trace_info=None):
+        """
+        远程调用前写日志，并返回要调用的异步迭代器对象（支持传入普通迭代器或异步迭代器）
+        """
+        if hasattr(rpc_request, '__aiter__'):
+            async for _request in rpc_request:
+                yield self._call_before_write_log_stream(_request, call_mode, timeout, trace_info)
+        else:
+            for _request in rpc_request:
+                yield self._call_before_write_log_stream(_request, call_mode, timeout, trace_info)
+
+    async def _aio_call_after_write_log_iterator(self, cresult_iterator, start_time, call_mode=EnumCallMode.Simple,
+                                                 timeout=None, trace_info=None):
+        """
+        逐个登记异步迭代返回结果的日志
+        """
+        async for _cresult in cresult_iterator:
+            self._call_after_write_log(
+                _cresult, start_time, call_mode=call_mode, timeout=timeout, trace_info=trace_info
+            )
+            # 返回结果对象
+            yield _cresult
+
+
 class SimpleGRpcPoolConnection(PoolConnectionFW):
     """
     支持通过AIOConnectionPool连接池管理的连接适配器
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2018 黎慧剑
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+SimpleGRpc的紧凑二进制编解码器
+
+@module grpc_codec
+@file grpc_codec.py
+"""
+
+import os
+import sys
+import json
+import struct
+# 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
+sys.path.append(os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.path.pardir, os.path.pardir)))
+
+
+__MOUDLE__ = 'grpc_codec'  # 模块名
+__DESCRIPT__ = u'SimpleGRpc的紧凑二进制编解码器'  # 模块描述
+__VERSION__ = '0.1.0'  # 版本
+__AUTHOR__ = u'黎慧剑'  # 作者
+__PUBLISH__ = '2026.10.19'  # 发布日期
+
+
+_STRUCT_LEN = struct.Struct('<I')  # 长度字段，4字节小端无符号整数
+
+
+class SimpleGRpcBinCodec(object):
+    """
+    SimpleGRpc的紧凑二进制编解码器（不使用pickle，不会执行任何代码）
+    对象结构通过标准json库（C实现）编码，对象中的bytes/bytearray不做转换，
+    以引用标记{"{$SGB$}": 序号}占位，原始字节按序号追加在json之后，因此可以出现在任意位置、任意数量
+
+    格式：MAGIC + json长度 + json + (字节数组长度 + 字节数组) * N，长度均为4字节小端无符号整数
+    注：与json方式一致，tuple解码后为list；字典的key不支持bytes；
+        其他对象如果有__dict__属性，按__dict__进行编码
+    """
+
+    MAGIC = b'SGB\x01'  # 编码数据的固定前缀，用于识别编码格式
+    BYTES_KEY = '{$SGB$}'  # 字节数组引用标记的key
+
+    #############################
+    # 公共函数
+    #############################
+    @classmethod
+    def dumps(cls, obj):
+        """
+        将对象编码为二进制数据
+
+        @param {object} obj - 要编码的对象
+
+        @returns {bytes} - 编码后的二进制数据（带MAGIC前缀）
+
+        @throws {TypeError} - 对象类型不支持编码时抛出异常
+        """
+        _bytes_list = list()
+
+        def _default(o):
+            # json不支持的对象，字节数组转为引用标记
+            if isinstance(o, (bytes, bytearray)):
+                _bytes_list.append(o)
+                return {cls.BYTES_KEY: len(_bytes_list) - 1}
+            elif hasattr(o, '__dict__'):
+                return o.__dict__
+            raise TypeError('object of type %s is not bin codec serializable' % type(o).__name__)
+
+        _json = json.dumps(
+            obj, ensure_ascii=False, separators=(',', ':'), default=_default
+        ).encode('utf-8')
+        _parts = [cls.MAGIC, _STRUCT_LEN.pack(len(_json)), _json]
+        for _bytes in _bytes_list:
+            _parts.append(_STRUCT_LEN.pack(len(_bytes)))
+            _parts.append(_bytes)
+        return b''.join(_parts)
+
+    @classmethod
+    def loads(cls, data):
+        """
+        将二进制数据解码为对象
+
+        @param {bytes} data - 通过dumps编码的二进制数据
+
+        @returns {object} - 解码后的对象
+
+        @throws {ValueError} - 数据格式错误时抛出异常
+        """
+        if data is None or data[0: 4] != cls.MAGIC:
+            raise ValueError('data is not encode by SimpleGRpcBinCodec')
+        _view = memoryview(data)
+        _json, _pos = cls._read_block(_view, 4)
+        if _pos == len(_view):
+            # 没有字节数组，无需还原引用标记
+            return json.loads(bytes(_json))
+
+        _bytes_list = list()
+        while _pos < len(_view):
+            _bytes, _pos = cls._read_block(_view, _pos)
+            _bytes_list.append(_bytes.tobytes())
+
+        def _object_hook(d):
+            # 还原字节数组引用标记
+            if len(d) == 1 and cls.BYTES_KEY in d:
+                try:
+                    return _bytes_list[d[cls.BYTES_KEY]]
+                except (IndexError, TypeError) as e:
+                    raise ValueError('bin codec bytes reference error: %s' % str(d)) from e
+            return d
+
+        return json.loads(bytes(_json), object_hook=_object_hook)
+
+    @classmethod
+    def is_bin_data(cls, data):
+        """
+        判断数据是否通过本编解码器编码
+
+        @param {bytes} data - 要判断的数据
+
+        @returns {bool} - 是否通过本编解码器编码
+        """
+        return data is not None and data[0: len(cls.MAGIC)] == cls.MAGIC
+
+    #############################
+    # 内部函数
+    #############################
+    @staticmethod
+    def _read_block(view, pos):
+        """
+        从指定位置读取一个长度+数据的数据块
+
+        @param {memoryview} view - 数据视图
+        @param {int} pos - 开始位置
+
+        @returns {(memoryview, int)} - (数据块, 下一个数据块的开始位置)
+
+        @throws {ValueError} - 数据不完整时抛出异常
+        """
+        if pos + 4 > len(view):
+            raise ValueError('bin codec data truncated at position %d' % pos)
+        _len = _STRUCT_LEN.unpack_from(view, pos)[0]
+        pos += 4
+        if pos + _len > len(view):
+            raise ValueError('bin codec data truncated at position %d' % pos)
+        return view[pos: pos + _len], pos + _len
+
+
+if __name__ == '__main__':
+    # 当程序自己独立运行时执行的操作
+    # 打印版本信息
+    print(('模块名：%s  -  %s\n'
+           '作者：%s\n'
+           '发布日期：%s\n'
+           '版本：%s' % (__MOUDLE__, __DESCRIPT__, __AUTHOR__, __PUBLISH__, __VERSION__)))
@@ -22,12 +22,12 @@ gRPC服务应用
 import os
 import sys
 from concurrent import futures
-import json
 import traceback
 import datetime
 import threading
 import logging
 import copy
+import asyncio
 # 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
 sys.path.append(os.path.abspath(os.path.join(
     os.path.dirname(__file__), os.path.pardir, os.path.pardir)))
@@ -38,6 +38,7 @@ while True:
     try:
         import grpc
         from grpc_health.v1.health import HealthServicer
+        from grpc_health.v1.health import aio as health_aio
         from grpc_health.v1 import health_pb2
         from grpc_health.v1 import health_pb2_grpc
         break
@@ -55,9 +56,10 @@ from HiveNetLib.simple_grpc.grpc_tool import EnumCallMode, SimpleGRpcTools
 from HiveNetLib.generic import CResult, NullObj
 from HiveNetLib.simple_server_fw import SimpleServerFW
 from HiveNetLib.base_tools.exception_tool import ExceptionTool
-from HiveNetLib.base_tools.run_tool import RunTool
+from HiveNetLib.base_tools.run_tool import RunTool, AsyncTools
 from HiveNetLib.simple_i18n import _
 from HiveNetLib.base_tools.call_chain_tool import CallChainTool
+from HiveNetLib.base_tools.trace_context import TraceContext
 from HiveNetLib.interface_tool.msg_json import MsgJSON
 from HiveNetLib.simple_log import QueueHandler, Logger
 
@@ -395,8 +397,8 @@ class SimpleGRpcServicer(msg_pb2_grpc.SimpleGRpcServiceServicer):
             # 响应报文的打印参数，初始化为可用
             _resp_para = self.generate_logging_para(call_mode, 'RESP', resp_logging_para)
 
-            # 加入服务
-            _dict[name] = [fun, _recv_para, _resp_para]
+            # 加入服务，同时预先生成函数调用计划，避免每次请求都分析函数签名
+            _dict[name] = [fun, _recv_para, _resp_para, self._generate_call_plan(fun)]
             _result = CResult(code='00000')  # 成功
 
         return _result
@@ -501,98 +503,16 @@ class SimpleGRpcServicer(msg_pb2_grpc.SimpleGRpcServiceServicer):
             # 入口的初始化处理
             _start_time = datetime.datetime.now()  # 开始处理时间
             _trace_info = self._get_trace_info(request, context)  # 调用链信息获取及处理
-            _call_result = CResult(code='00000')  # 执行结果，默认先为成功
-            _return_json_obj = None
-
-            _request_info_dict = dict()
-            if self._logger is not None:
-                # 获取请求信息中与日志登记相关的信息，形成日志字典
-                _request_info_dict = self._get_request_info_dict(
-                    request, context, EnumCallMode.Simple)
-                # 补充日志字典信息
-                _request_info_dict['trace_id'] = _trace_info.trace_id
-                _request_info_dict['parent_id'] = _trace_info.parent_id
-                _request_info_dict['trace_level'] = _trace_info.trace_level
-                _request_info_dict['call_id'] = _trace_info.call_id
-                _request_info_dict['api_call_type'] = 'RECV'
-                _request_info_dict['api_info_type'] = 'RECV'
-                _request_info_dict['err_log_msg'] = 'api call chain recv log error'
-                # 打印调用链日志
-                self._write_call_chain_log(_request_info_dict)
-
-            # 开始进行处理，处理过程中要捕获异常
-            try:
-                # 执行函数
-                if request.service_name not in self._simple_service_list.keys():
-                    # 没有找到服务名，返回执行失败
-                    _call_result = CResult(code='11403', i18n_msg_paras=(request.service_name, ))
-                else:
-                    # 先形成调用参数
-                    _fun_object = self._simple_service_list[request.service_name][0]
-                    _paras = json.loads(request.para_json)
-                    _call_para_str = self._get_call_para_str(
-                        request, context, _fun_object, _paras, '_paras', '_trace_info', None
-                    )
-
-                    # 开始动态执行函数
-                    _fun_return_obj = eval(
-                        '_fun_object(%s)' % (_call_para_str))
-
-                    # 返回值转换为json
-                    _return_json_obj = SimpleGRpcTools.object_to_json_support_bytes(
-                        _fun_return_obj, is_support_bytes=True)
-            except:
-                _error = str(sys.exc_info()[0])
-                _call_result = CResult(code='21008', error=_error, trace_str=traceback.format_exc(),
-                                       i18n_msg_paras=(_error, ))
-
-            # 处理返回对象
-            if _return_json_obj is None:
-                _return_json_obj = NullObj()
-                _return_json_obj.return_json = ''
-                _return_json_obj.has_return_bytes = False
-                _return_json_obj.return_bytes = None
-
-            _return_obj = SimpleGRpcTools.generate_response_obj(
-                return_json=_return_json_obj.return_json,
-                has_return_bytes=_return_json_obj.has_return_bytes,
-                return_bytes=_return_json_obj.return_bytes,
-                call_code=_call_result.code,
-                call_msg=_call_result.i18n_msg_id,
-                call_error=_call_result.error,
-                call_msg_para=_call_result.i18n_msg_paras
+            _request_info_dict = self._write_recv_log(
+                request, context, EnumCallMode.Simple, _trace_info, 'RECV'
             )
 
-            if self._logger is not None:
-                # 在日志字典中补充返回信息内容
-                _request_info_dict['logging_para'] = copy.deepcopy(
-                    _request_info_dict['resp_logging_para'])
-                _request_info_dict['para_json'] = _return_obj.return_json
-                if _return_obj.return_bytes is None:
-                    _request_info_dict['para_bytes_len'] = 'None'
-                    _request_info_dict['para_bytes'] = 'None'
-                else:
-                    _request_info_dict['para_bytes_len'] = str(len(_return_obj.return_bytes))
-                    if 'PARA_BYTES' in _request_info_dict['logging_para']['logging_head'].keys():
-                        _request_info_dict['para_bytes'] = str(_return_obj.return_bytes)
-
-                _request_info_dict['err_log_msg'] = 'api call chain resp log error'
-                _request_info_dict['api_call_type'] = 'RECV'
-                _request_info_dict['api_info_type'] = 'RET'
-                _request_info_dict['log_level'] = self._log_level
-                _end_time = datetime.datetime.now()
-                _request_info_dict['use'] = (_end_time - _start_time).total_seconds()
-                if _call_result.code == '21008':
-                    # 异常的情况
-                    _request_info_dict['api_info_type'] = 'EX'
-                    _request_info_dict['log_level'] = logging.ERROR
-                # 异常信息
-                _request_info_dict['error'] = _call_result.error
-                _request_info_dict['trace_str'] = _call_result.trace_str
-                _request_info_dict['error'] = _call_result.error
-
-                # 打印调用链日志
-                self._write_call_chain_log(_request_info_dict)
+            # 执行函数并处理返回对象
+            _call_result, _fun_return_obj = self._call_service(
+                self._simple_service_list, request, _trace_info, None
+            )
+            _return_obj, _call_result = self._generate_return_obj(_fun_return_obj, _call_result, request)
+            self._write_resp_log(_request_info_dict, _return_obj, _call_result, _start_time, 'RET')
 
             # 返回结果
             return _return_obj
@@ -621,123 +541,36 @@ class SimpleGRpcServicer(msg_pb2_grpc.SimpleGRpcServiceServicer):
         # 正在处理报文计数+1
         self._dealing_num_addon(1)
         _start_time = datetime.datetime.now()  # 开始处理时间
-        _call_result = CResult(code='00000')  # 执行结果，默认先为成功
         _return_obj = None  # 返回对象（RpcResponse）
-        _return_json_obj = None  # 返回对象的json转换对象
-        request = None  # 从迭代器获取请求对象
-        _next_request = None  # 下一个请求对象
-        _has_next = True  # 标识是否有下一个请求对象
         try:
             request = next(request_iterator)
+            _has_next = True  # 标识是否有下一个请求对象
             while _has_next:
-                # 循环从迭代器获取请求对象进行处理
+                # 判断是否有下一个请求
                 try:
-                    # 判断是否有下一个请求
                     _next_request = next(request_iterator)
                 except StopIteration:
                     _has_next = False
 
                 # 处理当前请求
-                _return_obj = None
-                _return_json_obj = None
                 _block_start_time = datetime.datetime.now()  # 流数据块开始处理时间
                 _trace_info = self._get_trace_info(request, context)  # 调用链信息获取及处理
-                _request_info_dict = dict()
-                if self._logger is not None:
-                    # 获取请求信息中与日志登记相关的信息，形成日志字典
-                    _request_info_dict = self._get_request_info_dict(
-                        request, context, EnumCallMode.ClientSideStream)
-                    # 补充日志字典信息
-                    _request_info_dict['trace_id'] = _trace_info.trace_id
-                    _request_info_dict['parent_id'] = _trace_info.parent_id
-                    _request_info_dict['trace_level'] = _trace_info.trace_level
-                    _request_info_dict['call_id'] = _trace_info.call_id
-                    _request_info_dict['api_call_type'] = 'RECV'
-                    _request_info_dict['api_info_type'] = 'STREAM-RECV'
-                    _request_info_dict['err_log_msg'] = 'api call chain recv log error'
-
-                    # 打印调用链日志
-                    self._write_call_chain_log(_request_info_dict)
-
-                # 开始进行处理，处理过程中要捕获异常
-                try:
-                    # 执行函数
-                    if request.service_name not in self._client_side_stream_service_list.keys():
-                        # 没有找到服务名，返回执行失败
-                        _call_result = CResult(
-                            code='11403', i18n_msg_paras=(request.service_name, ))
-                    else:
-                        # 先形成调用参数
-                        _fun_object = self._client_side_stream_service_list[request.service_name][0]
-                        _paras = json.loads(request.para_json)
-                        _call_para_str = self._get_call_para_str(
-                            request, context, _fun_object, _paras, '_paras', '_trace_info', _has_next
-                        )
-
-                        # 开始动态执行函数
-                        _fun_return_obj = eval(
-                            '_fun_object(%s)' % (_call_para_str))
-
-                        # 返回值转换为json
-                        _return_json_obj = SimpleGRpcTools.object_to_json_support_bytes(
-                            _fun_return_obj, is_support_bytes=True)
-                except:
-                    _error = str(sys.exc_info()[0])
-                    _call_result = CResult(code='21008', error=_error, trace_str=traceback.format_exc(),
-                                           i18n_msg_paras=(_error, ))
-
-                # 处理返回对象
-                if _return_json_obj is None:
-                    _return_json_obj = NullObj()
-                    _return_json_obj.return_json = ''
-                    _return_json_obj.has_return_bytes = False
-                    _return_json_obj.return_bytes = None
-
-                _return_obj = SimpleGRpcTools.generate_response_obj(
-                    return_json=_return_json_obj.return_json,
-                    has_return_bytes=_return_json_obj.has_return_bytes,
-                    return_bytes=_return_json_obj.return_bytes,
-                    call_code=_call_result.code,
-                    call_msg=_call_result.i18n_msg_id,
-                    call_error=_call_result.error,
-                    call_msg_para=_call_result.i18n_msg_paras
+                _request_info_dict = self._write_recv_log(
+                    request, context, EnumCallMode.ClientSideStream, _trace_info, 'STREAM-RECV'
                 )
-
-                if self._logger is not None:
-                    # 在日志字典中补充返回信息内容
-                    _request_info_dict['logging_para'] = copy.deepcopy(
-                        _request_info_dict['resp_logging_para'])
-                    _request_info_dict['para_json'] = _return_obj.return_json
-                    if _return_obj.return_bytes is None:
-                        _request_info_dict['para_bytes_len'] = 'None'
-                        _request_info_dict['para_bytes'] = 'None'
-                    else:
-                        _request_info_dict['para_bytes_len'] = str(len(_return_obj.return_bytes))
-                        if 'PARA_BYTES' in _request_info_dict['logging_para']['logging_head'].keys():
-                            _request_info_dict['para_bytes'] = str(_return_obj.return_bytes)
-
-                    _request_info_dict['err_log_msg'] = 'api call chain resp log error'
-                    _request_info_dict['api_call_type'] = 'RECV'
-                    _request_info_dict['api_info_type'] = 'STREAM-RET'
-                    _request_info_dict['log_level'] = self._log_level
-                    _end_time = datetime.datetime.now()
-                    _request_info_dict['use'] = (_end_time - _start_time).total_seconds()
-                    if _call_result.code == '21008':
-                        # 异常的情况
-                        _request_info_dict['api_info_type'] = 'EX'
-                        _request_info_dict['log_level'] = logging.ERROR
-                    elif _has_next:
-                        # 还有下一个报文
-                        _request_info_dict['api_info_type'] = 'STREAM-DEAL'
-                        _request_info_dict['use'] = (_end_time - _block_start_time).total_seconds()
-
-                    # 异常信息
-                    _request_info_dict['error'] = _call_result.error
-                    _request_info_dict['trace_str'] = _call_result.trace_str
-                    _request_info_dict['error'] = _call_result.error
-
-                    # 打印调用链日志
-                    self._write_call_chain_log(_request_info_dict)
+                _call_result, _fun_return_obj = self._call_service(
+                    self._client_side_stream_service_list, request, _trace_info, _has_next
+                )
+                _return_obj, _call_result = self._generate_return_obj(_fun_return_obj, _call_result, request)
+                if _has_next:
+                    # 还有下一个报文
+                    self._write_resp_log(
+                        _request_info_dict, _return_obj, _call_result, _block_start_time, 'STREAM-DEAL'
+                    )
+                else:
+                    self._write_resp_log(
+                        _request_info_dict, _return_obj, _call_result, _start_time, 'STREAM-RET'
+                    )
 
                 # 判断本次处理结果，如果不是成功则直接跳出循环并返回结果
                 if not _call_result.is_success():
@@ -776,136 +609,24 @@ class SimpleGRpcServicer(msg_pb2_grpc.SimpleGRpcServiceServicer):
             # 入口的初始化处理
             _start_time = datetime.datetime.now()  # 开始处理时间
             _trace_info = self._get_trace_info(request, context)  # 调用链信息获取及处理
-            _call_result = CResult(code='00000')  # 执行结果，默认先为成功
-            _return_json_obj = None
-            _fun_iterator = None
-            _request_info_dict = dict()
-            if self._logger is not None:
-                # 获取请求信息中与日志登记相关的信息，形成日志字典
-                _request_info_dict = self._get_request_info_dict(
-                    request, context, EnumCallMode.ServerSideStream)
-                # 补充日志字典信息
-                _request_info_dict['trace_id'] = _trace_info.trace_id
-                _request_info_dict['parent_id'] = _trace_info.parent_id
-                _request_info_dict['trace_level'] = _trace_info.trace_level
-                _request_info_dict['call_id'] = _trace_info.call_id
-                _request_info_dict['api_call_type'] = 'RECV'
-                _request_info_dict['api_info_type'] = 'RECV'
-                _request_info_dict['err_log_msg'] = 'api call chain recv log error'
-
-                # 打印调用链日志
-                self._write_call_chain_log(_request_info_dict)
-
-            # 开始进行处理，处理过程中要捕获异常
-            try:
-                # 执行函数
-                if request.service_name not in self._server_side_stream_service_list.keys():
-                    # 没有找到服务名，返回执行失败
-                    _call_result = CResult(code='11403', i18n_msg_paras=(request.service_name, ))
-                else:
-                    # 先形成调用参数
-                    _fun_object = self._server_side_stream_service_list[request.service_name][0]
-                    _paras = json.loads(request.para_json)
-                    _call_para_str = self._get_call_para_str(
-                        request, context, _fun_object, _paras, '_paras', '_trace_info', None
-                    )
-
-                    # 开始动态执行函数，注意这里函数执行返回的必须是一个迭代器，由生成器函数yield返回
-                    _fun_iterator = eval(
-                        '_fun_object(%s)' % (_call_para_str))
-            except:
-                _error = str(sys.exc_info()[0])
-                _call_result = CResult(code='21008', error=_error, trace_str=traceback.format_exc(),
-                                       i18n_msg_paras=(_error, ))
-
-            if self._logger is not None:
-                # 异常信息
-                _request_info_dict['error'] = _call_result.error
-                _request_info_dict['trace_str'] = _call_result.trace_str
-                _request_info_dict['error'] = _call_result.error
+            _request_info_dict = self._write_recv_log(
+                request, context, EnumCallMode.ServerSideStream, _trace_info, 'RECV'
+            )
 
-            # 判断是否异常失败，如果是，单独返回
+            # 执行函数，注意这里函数执行返回的必须是一个迭代器，由生成器函数yield返回
+            _call_result, _fun_iterator = self._call_service(
+                self._server_side_stream_service_list, request, _trace_info, None
+            )
             if not _call_result.is_success():
-                _return_obj = SimpleGRpcTools.generate_response_obj(
-                    return_json='',
-                    has_return_bytes=False,
-                    return_bytes=None,
-                    call_code=_call_result.code,
-                    call_msg=_call_result.i18n_msg_id,
-                    call_error=_call_result.error,
-                    call_msg_para=_call_result.i18n_msg_paras
-                )
-                if self._logger is not None:
-                    # 在日志字典中补充返回信息内容
-                    _request_info_dict['logging_para'] = copy.deepcopy(
-                        _request_info_dict['resp_logging_para'])
-                    _request_info_dict['para_json'] = _return_obj.return_json
-                    if _return_obj.return_bytes is None:
-                        _request_info_dict['para_bytes_len'] = 'None'
-                        _request_info_dict['para_bytes'] = 'None'
-                    else:
-                        _request_info_dict['para_bytes_len'] = str(len(_return_obj.return_bytes))
-                        if 'PARA_BYTES' in _request_info_dict['logging_para']['logging_head'].keys():
-                            _request_info_dict['para_bytes'] = str(_return_obj.return_bytes)
-
-                    _request_info_dict['err_log_msg'] = 'api call chain resp log error'
-                    _request_info_dict['api_call_type'] = 'RECV'
-                    _request_info_dict['api_info_type'] = 'STREAM-RET'
-                    _request_info_dict['log_level'] = self._log_level
-                    _end_time = datetime.datetime.now()
-                    _request_info_dict['use'] = (_end_time - _start_time).total_seconds()
-                    if _call_result.code == '21008':
-                        # 异常的情况
-                        _request_info_dict['api_info_type'] = 'EX'
-                        _request_info_dict['log_level'] = logging.ERROR
-
-                    # 打印调用链日志
-                    self._write_call_chain_log(_request_info_dict)
-
-                # 返回处理结果
+                # 异常失败，单独返回
+                _return_obj, _call_result = self._generate_return_obj(None, _call_result, request)
+                self._write_resp_log(_request_info_dict, _return_obj, _call_result, _start_time, 'STREAM-RET')
                 yield _return_obj
             else:
                 # 迭代器处理
-                for _fun_obj in _fun_iterator:
-                    # 返回值转换为json
-                    _return_json_obj = SimpleGRpcTools.object_to_json_support_bytes(
-                        _fun_obj, is_support_bytes=True)
-
-                    _return_obj = SimpleGRpcTools.generate_response_obj(
-                        return_json=_return_json_obj.return_json,
-                        has_return_bytes=_return_json_obj.has_return_bytes,
-                        return_bytes=_return_json_obj.return_bytes,
-                        call_code=_call_result.code,
-                        call_msg=_call_result.i18n_msg_id,
-                        call_error=_call_result.error,
-                        call_msg_para=_call_result.i18n_msg_paras
-                    )
-
-                    if self._logger is not None:
-                        # 在日志字典中补充返回信息内容
-                        _request_info_dict['logging_para'] = copy.deepcopy(
-                            _request_info_dict['resp_logging_para'])
-                        _request_info_dict['para_json'] = _return_obj.return_json
-                        if _return_obj.return_bytes is None:
-                            _request_info_dict['para_bytes_len'] = 'None'
-                            _request_info_dict['para_bytes'] = 'None'
-                        else:
-                            _request_info_dict['para_bytes_len'] = str(
-                                len(_return_obj.return_bytes))
-                            if 'PARA_BYTES' in _request_info_dict['logging_para']['logging_head'].keys():
-                                _request_info_dict['para_bytes'] = str(_return_obj.return_bytes)
-
-                        _request_info_dict['err_log_msg'] = 'api call chain resp log error'
-                        _request_info_dict['api_call_type'] = 'RECV'
-                        _request_info_dict['api_info_type'] = 'STREAM-RET'
-                        _request_info_dict['log_level'] = self._log_level
-                        _end_time = datetime.datetime.now()
-                        _request_info_dict['use'] = (_end_time - _start_time).total_seconds()
-
-                        # 打印调用链日志
-                        self._write_call_chain_log(_request_info_dict)
-
-                    # 返回结果
+                for _fun_obj in self._iter_with_trace_info(_fun_iterator, _trace_info):
+                    _return_obj, _ = self._generate_return_obj(_fun_obj, _call_result, request)
+                    self._write_resp_log(_request_info_dict, _return_obj, _call_result, _start_time, 'STREAM-RET')
                     yield _return_obj
         except Exception as e:
             # 出现异常，执行打印处理
@@ -938,176 +659,49 @@ class SimpleGRpcServicer(msg_pb2_grpc.SimpleGRpcServiceServicer):
         # 正在处理报文计数+1
         self._dealing_num_addon(1)
         _start_time = datetime.datetime.now()  # 开始处理时间
-        _call_result = CResult(code='00000')  # 执行结果，默认先为成功
-        _return_obj = None  # 返回对象（RpcResponse）
-        _return_json_obj = None  # 返回对象的json转换对象
         request = None  # 从迭代器获取请求对象
         try:
             _has_next = True
             while _has_next:
                 # 循环从迭代器获取请求对象进行处理
                 try:
-                    # 获取下一个请求
                     request = next(request_iterator)
                 except StopIteration:
                     _has_next = False
+                    if request is None:
+                        # 没有任何请求
+                        break
 
                 # 处理当前请求
-                _return_obj = None
-                _return_json_obj = None
                 _block_start_time = datetime.datetime.now()  # 流数据块开始处理时间
                 _trace_info = self._get_trace_info(request, context)  # 调用链信息获取及处理
-                _request_info_dict = dict()
-                if self._logger is not None:
-                    # 获取请求信息中与日志登记相关的信息，形成日志字典
-                    _request_info_dict = self._get_request_info_dict(
-                        request, context, EnumCallMode.BidirectionalStream)
-                    # 补充日志字典信息
-                    _request_info_dict['trace_id'] = _trace_info.trace_id
-                    _request_info_dict['parent_id'] = _trace_info.parent_id
-                    _request_info_dict['trace_level'] = _trace_info.trace_level
-                    _request_info_dict['call_id'] = _trace_info.call_id
-                    _request_info_dict['api_call_type'] = 'RECV'
-                    _request_info_dict['api_info_type'] = 'STREAM-RECV'
-                    _request_info_dict['err_log_msg'] = 'api call chain recv log error'
-
-                    # 打印调用链日志
-                    self._write_call_chain_log(_request_info_dict)
-
-                # 开始进行处理，处理过程中要捕获异常
-                try:
-                    # 执行函数
-                    if request.service_name not in self._bidirectional_stream_service_list.keys():
-                        # 没有找到服务名，返回执行失败
-                        _call_result = CResult(
-                            code='11403', i18n_msg_paras=(request.service_name, ))
-                    else:
-                        # 先形成调用参数
-                        _fun_object = self._bidirectional_stream_service_list[request.service_name][0]
-                        _paras = json.loads(request.para_json)
-                        _call_para_str = self._get_call_para_str(
-                            request, context, _fun_object, _paras, '_paras', '_trace_info', _has_next
-                        )
-
-                        # 开始动态执行函数
-                        _fun_iterator = eval(
-                            '_fun_object(%s)' % (_call_para_str))
-                except:
-                    _error = str(sys.exc_info()[0])
-                    _call_result = CResult(code='21008', error=_error, trace_str=traceback.format_exc(),
-                                           i18n_msg_paras=(_error, ))
-
-                if self._logger is not None:
-                    # 异常信息
-                    _request_info_dict['error'] = _call_result.error
-                    _request_info_dict['trace_str'] = _call_result.trace_str
-                    _request_info_dict['error'] = _call_result.error
-
-                # 判断是否异常失败，如果是，单独返回
+                _request_info_dict = self._write_recv_log(
+                    request, context, EnumCallMode.BidirectionalStream, _trace_info, 'STREAM-RECV'
+                )
+                _call_result, _fun_iterator = self._call_service(
+                    self._bidirectional_stream_service_list, request, _trace_info, _has_next
+                )
                 if not _call_result.is_success():
-                    _return_obj = SimpleGRpcTools.generate_response_obj(
-                        return_json='',
-                        has_return_bytes=False,
-                        return_bytes=None,
-                        call_code=_call_result.code,
-                        call_msg=_call_result.i18n_msg_id,
-                        call_error=_call_result.error,
-                        call_msg_para=_call_result.i18n_msg_paras
+                    # 异常失败，单独返回
+                    _return_obj, _call_result = self._generate_return_obj(None, _call_result, request)
+                    self._write_resp_log(
+                        _request_info_dict, _return_obj, _call_result, _start_time, 'STREAM-RET'
                     )
-
-                    if self._logger is not None:
-                        # 在日志字典中补充返回信息内容
-                        _request_info_dict['logging_para'] = copy.deepcopy(
-                            _request_info_dict['resp_logging_para'])
-                        _request_info_dict['para_json'] = _return_obj.return_json
-                        if _return_obj.return_bytes is None:
-                            _request_info_dict['para_bytes_len'] = 'None'
-                            _request_info_dict['para_bytes'] = 'None'
-                        else:
-                            _request_info_dict['para_bytes_len'] = str(
-                                len(_return_obj.return_bytes))
-                            if 'PARA_BYTES' in _request_info_dict['logging_para']['logging_head'].keys():
-                                _request_info_dict['para_bytes'] = str(_return_obj.return_bytes)
-
-                        _request_info_dict['err_log_msg'] = 'api call chain resp log error'
-                        _request_info_dict['api_call_type'] = 'RECV'
-                        _request_info_dict['api_info_type'] = 'STREAM-RET'
-                        _request_info_dict['log_level'] = self._log_level
-                        _end_time = datetime.datetime.now()
-                        _request_info_dict['use'] = (_end_time - _start_time).total_seconds()
-                        if _call_result.code == '21008':
-                            # 异常的情况
-                            _request_info_dict['api_info_type'] = 'EX'
-                            _request_info_dict['log_level'] = logging.ERROR
-
-                        # 打印调用链日志
-                        self._write_call_chain_log(_request_info_dict)
-
-                    # 返回处理结果
                     yield _return_obj
-                else:
-                    # 迭代器处理
-                    for _fun_obj in _fun_iterator:
-                        if _fun_obj is None:
-                            # 不处理
-                            _return_obj = SimpleGRpcTools.generate_response_obj(
-                                return_json='',
-                                has_return_bytes=False,
-                                return_bytes=None,
-                                call_code=_call_result.code,
-                                call_msg=_call_result.i18n_msg_id,
-                                call_error=_call_result.error,
-                                call_msg_para=_call_result.i18n_msg_paras
-                            )
-                            _request_info_dict['api_info_type'] = 'STREAM-DEAL'
-                            _use_time = _block_start_time
-                        else:
-                            # 返回值转换为json
-                            _return_json_obj = SimpleGRpcTools.object_to_json_support_bytes(
-                                _fun_obj, is_support_bytes=True)
-
-                            _return_obj = SimpleGRpcTools.generate_response_obj(
-                                return_json=_return_json_obj.return_json,
-                                has_return_bytes=_return_json_obj.has_return_bytes,
-                                return_bytes=_return_json_obj.return_bytes,
-                                call_code=_call_result.code,
-                                call_msg=_call_result.i18n_msg_id,
-                                call_error=_call_result.error,
-                                call_msg_para=_call_result.i18n_msg_paras
-                            )
-                            _request_info_dict['api_info_type'] = 'STREAM-RET'
-                            _use_time = _start_time
-
-                        if self._logger is not None:
-                            # 在日志字典中补充返回信息内容
-                            _request_info_dict['logging_para'] = copy.deepcopy(
-                                _request_info_dict['resp_logging_para'])
-                            _request_info_dict['para_json'] = _return_obj.return_json
-                            if _return_obj.return_bytes is None:
-                                _request_info_dict['para_bytes_len'] = 'None'
-                                _request_info_dict['para_bytes'] = 'None'
-                            else:
-                                _request_info_dict['para_bytes_len'] = str(
-                                    len(_return_obj.return_bytes))
-                                if 'PARA_BYTES' in _request_info_dict['logging_para']['logging_head'].keys():
-                                    _request_info_dict['para_bytes'] = str(_return_obj.return_bytes)
-
-                            _request_info_dict['err_log_msg'] = 'api call chain resp log error'
-                            _request_info_dict['api_call_type'] = 'RECV'
-                            _request_info_dict['log_level'] = logging.INFO
-                            _end_time = datetime.datetime.now()
-                            _request_info_dict['use'] = (_end_time - _use_time).total_seconds()
-
-                            # 打印调用链日志
-                            self._write_call_chain_log(_request_info_dict)
-
-                        # 返回结果
-                        if _fun_obj is not None:
-                            yield _return_obj
-
-                # 判断本次处理结果，如果不是成功则直接跳出循环并返回结果
-                if not _call_result.is_success():
                     break
+
+                # 迭代器处理，返回None代表只处理不返回
+                for _fun_obj in self._iter_with_trace_info(_fun_iterator, _trace_info):
+                    _return_obj, _ = self._generate_return_obj(_fun_obj, _call_result, request)
+                    if _fun_obj is None:
+                        self._write_resp_log(
+                            _request_info_dict, _return_obj, _call_result, _block_start_time, 'STREAM-DEAL'
+                        )
+                    else:
+                        self._write_resp_log(
+                            _request_info_dict, _return_obj, _call_result, _start_time, 'STREAM-RET'
+                        )
+                        yield _return_obj
         except Exception as e:
             # 出现异常，执行打印处理
             if self._logger is not None:
@@ -1200,8 +794,9 @@ class SimpleGRpcServicer(msg_pb2_grpc.SimpleGRpcServiceServicer):
         # IP信息
         _dict['c-ip'] = str(context.peer()).split(':')[1]
         _dict['c-port'] = str(context.peer()).split(':')[2]
-        _dict['s-ip'] = str(context._rpc_event.call_details.host, 'utf-8').split(':')[0]
-        _dict['s-port'] = str(context._rpc_event.call_details.host, 'utf-8').split(':')[1]
+        _host = self._get_context_host(context)
+        _dict['s-ip'] = _host.split(':')[0]
+        _dict['s-port'] = _host.split(':')[1]
         # 请求报文信息
         _dict['service_name'] = request.service_name
         # 获取日志打印参数
@@ -1221,7 +816,7 @@ class SimpleGRpcServicer(msg_pb2_grpc.SimpleGRpcServiceServicer):
         else:
             _dict['recv_logging_para'] = _service_list[request.service_name][1]
             _dict['resp_logging_para'] = _service_list[request.service_name][2]
-        _dict['logging_para'] = copy.deepcopy(_dict['recv_logging_para'])
+        _dict['logging_para'] = _dict['recv_logging_para']
         # 请求信息的bytes数组
         if request.para_bytes is None:
             _dict['recv_para_bytes_len'] = 'None'
@@ -1237,9 +832,21 @@ class SimpleGRpcServicer(msg_pb2_grpc.SimpleGRpcServiceServicer):
         # 返回字典
         return _dict
 
+    def _get_context_host(self, context):
+        """
+        获取服务端上下文中客户端请求的服务端地址
+
+        @param {grpc.ServicerContext} context - 服务端的上下文
+
+        @return {string} - 服务端地址，格式为'ip:port'
+        """
+        return str(context._rpc_event.call_details.host, 'utf-8')
+
     def _get_trace_info(self, request, context):
         """
         获取调用链信息
+        注: 执行服务函数时将设置为调用链上下文(TraceContext)，服务函数中通过CallChainTool.methon_call_chain
+            修饰的函数或发起的gRPC调用可直接沿用该调用链
 
         @param {RpcRequest|StreamRpcRequest} request - 请求对象，与msg.proto定义一致
         @param {grpc.ServicerContext} context - 服务端的上下文
@@ -1261,90 +868,239 @@ class SimpleGRpcServicer(msg_pb2_grpc.SimpleGRpcServiceServicer):
             _trace_info.trace_level = 0
         else:
             _trace_info.trace_level = _trace_info.trace_level + 1
+
         # 返回信息
         return _trace_info
 
-    def _get_call_para_str(self, request, context, fun_object, paras, paras_var_name, trace_info_var_name, has_next_stream_data=None):
+    def _generate_call_plan(self, fun_object):
         """
-        获取调用实际函数的请求参数执行字符串（仅参数部分）
+        生成服务函数的调用计划（在添加服务时执行一次）
 
-        @param {RpcRequest} request - 请求对象，与msg.proto定义一致
-        @param {grpc.ServicerContext} context - 服务端的上下文
-        @param {function} fun_object - 要处理的函数
-        @param {list} paras - 参数的数组对象
-        @param {string} paras_var_name - 参数名
-        @param {string} trace_info_var_name - 调用链信息对象名
-        @param {string} has_next_stream_data=None - 流模式是否有下一个数据，如果为None则代表无这个参数
-
-        @return {string} - 返回函数调用的参数字符串
-        """
-        _call_para_str = ''
-        _i = 0
-        _has_deal_bytes = False
-        _is_function_has_var_parameter = RunTool.is_function_has_var_parameter(
+        @param {function} fun_object - 服务函数对象
+
+        @return {NullObj} - 调用计划对象，属性如下：
+            plan.fun : 服务函数对象
+            plan.has_var_keyword : 函数是否有类似**kwargs的参数，有的情况自动传入调用链参数
+        """
+        _plan = NullObj()
+        _plan.fun = fun_object
+        _plan.has_var_keyword = RunTool.is_function_has_var_parameter(
             fun_object, var_positional=False, var_keyword=True
         )
-        _has_deal_next_stream_data = False
-        if has_next_stream_data is None:
-            _has_deal_next_stream_data = True
-        _has_deal_trace_id = False
-        _has_deal_parent_id = False
-        _has_deal_trace_level = False
-
-        while _i < len(paras):
+        return _plan
+
+    def _call_service_fun(self, call_plan, request, paras, trace_info, has_next_stream_data=None):
+        """
+        按调用计划绑定参数并直接执行服务函数
+
+        @param {NullObj} call_plan - 通过_generate_call_plan生成的调用计划
+        @param {RpcRequest} request - 请求对象，与msg.proto定义一致
+        @param {list} paras - 参数的数组对象，每项为[para_name, value]，para_name为''代表位置参数
+        @param {NullObj} trace_info - 调用链信息对象
+        @param {bool} has_next_stream_data=None - 流模式是否有下一个数据，如果为None则代表无这个参数
+
+        @return {object} - 服务函数的执行结果
+        """
+        _args = list()
+        _kwargs = dict()
+        # 二进制编码的请求（para_json为空）字节数组已在参数中，无需处理占位字符
+        _has_deal_bytes = not request.has_para_bytes or request.para_json == ''
+        for _para in paras:
+            _name, _value = _para
             # 如果有传入字节数组，进行处理
-            if not _has_deal_bytes and request.has_para_bytes and paras[_i][1] == '{$SIMPLEGRPC_BYTES$}':
-                paras[_i][1] = request.para_bytes
+            if not _has_deal_bytes and _value == '{$SIMPLEGRPC_BYTES$}':
+                _value = request.para_bytes
                 _has_deal_bytes = True
 
-            # 整理参数
-            if paras[_i][0] == '':
+            if _name == '':
                 # 没有key的情况
-                _call_para_str = '%s, %s[%s][1]' % (_call_para_str, paras_var_name, str(_i))
+                _args.append(_value)
+            elif _name == 'trace_id':
+                # 调用链参数以这次调用的为准
+                _kwargs['trace_id'] = trace_info.trace_id
+            elif _name == 'parent_id':
+                _kwargs['parent_id'] = trace_info.call_id
+            elif _name == 'trace_level':
+                _kwargs['trace_level'] = trace_info.trace_level
             else:
-                # 有key
-                if not _has_deal_next_stream_data and paras[_i][0] == 'has_next_stream_data':
-                    # 如果外部已经传入这个标识，以远程函数的调用为准
-                    _has_deal_next_stream_data = True
-                    _call_para_str = '%s, %s=%s[%s][1]' % (
-                        _call_para_str, paras[_i][0], paras_var_name, str(_i))
-                elif not _has_deal_trace_id and paras[_i][0] == 'trace_id':
-                    # 以这次调用的为准
-                    _has_deal_trace_id = True
-                    _call_para_str = '%s, trace_id=%s.trace_id' % (
-                        _call_para_str, trace_info_var_name)
-                elif not _has_deal_parent_id and paras[_i][0] == 'parent_id':
-                    _has_deal_parent_id = True
-                    _call_para_str = '%s, parent_id=%s.call_id' % (
-                        _call_para_str, trace_info_var_name)
-                elif not _has_deal_trace_level and paras[_i][0] == 'trace_level':
-                    _has_deal_trace_level = True
-                    _call_para_str = '%s, trace_level=%s.trace_level' % (
-                        _call_para_str, trace_info_var_name)
-                else:
-                    _call_para_str = '%s, %s=%s[%s][1]' % (
-                        _call_para_str, paras[_i][0], paras_var_name, str(_i))
-
-            _i = _i + 1
+                # has_next_stream_data如果外部已经传入，以远程函数的调用为准
+                _kwargs[_name] = _value
 
         # 调用链参数传入
-        if _is_function_has_var_parameter:
-            if not _has_deal_next_stream_data:
-                _call_para_str = '%s, has_next_stream_data=%s' % (
-                    _call_para_str, str(has_next_stream_data))
-            if not _has_deal_trace_id:
-                _call_para_str = '%s, trace_id=%s.trace_id' % (_call_para_str, trace_info_var_name)
-            if not _has_deal_parent_id:
-                _call_para_str = '%s, parent_id=%s.call_id' % (_call_para_str, trace_info_var_name)
-            if not _has_deal_trace_level:
-                _call_para_str = '%s, trace_level=%s.trace_level' % (
-                    _call_para_str, trace_info_var_name)
-
-        # 去掉开始的', '
-        if len(_call_para_str) > 0 and _call_para_str[0] == ',':
-            _call_para_str = _call_para_str[2:]
-
-        return _call_para_str
+        if call_plan.has_var_keyword:
+            if has_next_stream_data is not None:
+                _kwargs.setdefault('has_next_stream_data', has_next_stream_data)
+            _kwargs.setdefault('trace_id', trace_info.trace_id)
+            _kwargs.setdefault('parent_id', trace_info.call_id)
+            _kwargs.setdefault('trace_level', trace_info.trace_level)
+
+        return call_plan.fun(*_args, **_kwargs)
+
+    def _call_service(self, service_list, request, trace_info, has_next_stream_data=None):
+        """
+        按服务名查找调用计划并执行服务函数，捕获执行异常
+        注：执行期间设置调用链上下文，执行完成后恢复，避免调用链信息遗留在gRPC的处理线程中
+
+        @param {dict} service_list - 对应调用模式的服务列表
+        @param {RpcRequest} request - 请求对象
+        @param {NullObj} trace_info - 调用链信息对象
+        @param {bool} has_next_stream_data=None - 流模式是否有下一个数据，如果为None则代表无这个参数
+
+        @return {(CResult, object)} - (执行结果, 服务函数返回值)，执行结果的code：
+            '00000'-成功，'11403'-服务名不存在，'21008'-执行抛出异常
+        """
+        _call_result = CResult(code='00000')  # 执行结果，默认先为成功
+        _fun_return_obj = None
+        try:
+            if request.service_name not in service_list.keys():
+                # 没有找到服务名，返回执行失败
+                _call_result = CResult(code='11403', i18n_msg_paras=(request.service_name, ))
+            else:
+                # 按调用计划直接执行函数
+                with TraceContext.trace_info_context(
+                    trace_info.trace_id, trace_info.call_id, trace_info.trace_level
+                ):
+                    _fun_return_obj = self._call_service_fun(
+                        service_list[request.service_name][3],
+                        request, SimpleGRpcTools.request_to_parameters(request), trace_info,
+                        has_next_stream_data
+                    )
+        except:
+            _error = str(sys.exc_info()[0])
+            _call_result = CResult(code='21008', error=_error, trace_str=traceback.format_exc(),
+                                   i18n_msg_paras=(_error, ))
+        return _call_result, _fun_return_obj
+
+    @staticmethod
+    def _iter_with_trace_info(iterator, trace_info):
+        """
+        遍历服务函数返回的迭代器，每次获取值期间设置调用链上下文，获取后恢复
+        注：生成器的函数体在遍历时才执行，且不能在返回值后仍保留调用链上下文
+
+        @param {iterator} iterator - 服务函数返回的迭代器
+        @param {NullObj} trace_info - 调用链信息对象
+
+        @return {iterator} - 迭代器
+        """
+        _iterator = iter(iterator)
+        _trace_level = [trace_info.trace_level]  # 同一迭代器共享调用层级
+        while True:
+            _token = TraceContext.set_trace_info(trace_info.trace_id, trace_info.call_id, _trace_level)
+            try:
+                _item = next(_iterator)
+            except StopIteration:
+                return
+            finally:
+                TraceContext.reset_trace_info(_token)
+            yield _item
+
+    def _generate_return_obj(self, fun_return_obj, call_result, request=None):
+        """
+        根据服务函数返回值生成响应对象
+
+        @param {object} fun_return_obj - 服务函数返回值
+        @param {CResult} call_result - 执行结果
+        @param {msg_pb2.RpcRequest} request=None - 对应的请求对象，请求使用二进制编码时返回值也使用二进制编码
+
+        @return {(msg_pb2.RpcResponse, CResult)} - (响应对象, 执行结果)，返回值转换失败时执行结果为'21008'
+        """
+        _return_json_obj = None
+        if call_result.is_success():
+            try:
+                # 返回值转换为json
+                _return_json_obj = SimpleGRpcTools.object_to_json_support_bytes(
+                    fun_return_obj, is_support_bytes=True,
+                    is_use_bin_codec=(request is not None and SimpleGRpcTools.is_bin_codec_data(
+                        request.para_json, request.para_bytes)))
+            except:
+                _error = str(sys.exc_info()[0])
+                call_result = CResult(code='21008', error=_error, trace_str=traceback.format_exc(),
+                                      i18n_msg_paras=(_error, ))
+
+        if _return_json_obj is None:
+            _return_json_obj = NullObj()
+            _return_json_obj.return_json = ''
+            _return_json_obj.has_return_bytes = False
+            _return_json_obj.return_bytes = None
+
+        _return_obj = SimpleGRpcTools.generate_response_obj(
+            return_json=_return_json_obj.return_json,
+            has_return_bytes=_return_json_obj.has_return_bytes,
+            return_bytes=_return_json_obj.return_bytes,
+            call_code=call_result.code,
+            call_msg=call_result.i18n_msg_id,
+            call_error=call_result.error,
+            call_msg_para=call_result.i18n_msg_paras
+        )
+        return _return_obj, call_result
+
+    def _write_recv_log(self, request, context, call_mode, trace_info, api_info_type):
+        """
+        登记请求报文的调用链日志
+
+        @param {RpcRequest} request - 请求对象
+        @param {grpc.ServicerContext|grpc.aio.ServicerContext} context - 服务端的上下文
+        @param {EnumCallMode} call_mode - 调用模式
+        @param {NullObj} trace_info - 调用链信息对象
+        @param {string} api_info_type - 接口信息类型，例如'RECV'、'STREAM-RECV'
+
+        @return {dict} - 日志字典，用于登记返回报文日志；没有logger时返回空字典
+        """
+        if self._logger is None:
+            return dict()
+
+        # 获取请求信息中与日志登记相关的信息，形成日志字典
+        _request_info_dict = self._get_request_info_dict(request, context, call_mode)
+        _request_info_dict['trace_id'] = trace_info.trace_id
+        _request_info_dict['parent_id'] = trace_info.parent_id
+        _request_info_dict['trace_level'] = trace_info.trace_level
+        _request_info_dict['call_id'] = trace_info.call_id
+        _request_info_dict['api_call_type'] = 'RECV'
+        _request_info_dict['api_info_type'] = api_info_type
+        _request_info_dict['err_log_msg'] = 'api call chain recv log error'
+        # 打印调用链日志
+        self._write_call_chain_log(_request_info_dict)
+        return _request_info_dict
+
+    def _write_resp_log(self, request_info_dict, return_obj, call_result, start_time, api_info_type):
+        """
+        登记返回报文的调用链日志
+
+        @param {dict} request_info_dict - _write_recv_log返回的日志字典
+        @param {msg_pb2.RpcResponse} return_obj - 响应对象
+        @param {CResult} call_result - 执行结果
+        @param {datetime} start_time - 计算耗时的开始时间
+        @param {string} api_info_type - 接口信息类型，执行异常时固定为'EX'
+        """
+        if self._logger is None:
+            return
+
+        # 在日志字典中补充返回信息内容
+        request_info_dict['logging_para'] = request_info_dict['resp_logging_para']
+        request_info_dict['para_json'] = return_obj.return_json
+        if return_obj.return_bytes is None:
+            request_info_dict['para_bytes_len'] = 'None'
+            request_info_dict['para_bytes'] = 'None'
+        else:
+            request_info_dict['para_bytes_len'] = str(len(return_obj.return_bytes))
+            if 'PARA_BYTES' in request_info_dict['logging_para']['logging_head'].keys():
+                request_info_dict['para_bytes'] = str(return_obj.return_bytes)
+
+        request_info_dict['err_log_msg'] = 'api call chain resp log error'
+        request_info_dict['api_call_type'] = 'RECV'
+        request_info_dict['api_info_type'] = api_info_type
+        request_info_dict['log_level'] = self._log_level
+        request_info_dict['use'] = (datetime.datetime.now() - start_time).total_seconds()
+        if call_result.code == '21008':
+            # 异常的情况
+            request_info_dict['api_info_type'] = 'EX'
+            request_info_dict['log_level'] = logging.ERROR
+        # 异常信息
+        request_info_dict['error'] = call_result.error
+        request_info_dict['trace_str'] = call_result.trace_str
+
+        # 打印调用链日志
+        self._write_call_chain_log(request_info_dict)
 
     def _dealing_num_addon(self, add_num):
         """
@@ -1685,10 +1441,10 @@ class SimpleGRpcServer(SimpleServerFW):
             if servicer_name == '':
                 # 设置所有服务
                 for _servicer_name in self._grpc_servicer_list.keys():
-                    self._grpc_health_servicer.set(_servicer_name, status_code)
+                    self._set_health_status(_servicer_name, status_code)
             else:
                 # 设置单个服务
-                self._grpc_health_servicer.set(servicer_name, status_code)
+                self._set_health_status(servicer_name, status_code)
 
     def get_service_status(self, servicer_name=''):
         """
@@ -1727,12 +1483,34 @@ class SimpleGRpcServer(SimpleServerFW):
             return _all_status
         else:
             # 获取指定服务状态
-            with self._grpc_health_servicer._lock:
-                _status = self._grpc_health_servicer._server_status.get(servicer_name)
-                if _status is None:
-                    return grpc.StatusCode.NOT_FOUND
-                else:
-                    return _status
+            _status = self._get_health_status(servicer_name)
+            if _status is None:
+                return grpc.StatusCode.NOT_FOUND
+            else:
+                return _status
+
+    #############################
+    # 健康检查状态处理
+    #############################
+    def _set_health_status(self, servicer_name, status_code):
+        """
+        设置健康检查服务中单个服务的状态
+
+        @param {string} servicer_name - 服务名
+        @param {health_pb2.HealthCheckResponse.ServingStatus} status_code - 服务状态
+        """
+        self._grpc_health_servicer.set(servicer_name, status_code)
+
+    def _get_health_status(self, servicer_name):
+        """
+        获取健康检查服务中单个服务的状态
+
+        @param {string} servicer_name - 服务名
+
+        @return {health_pb2.HealthCheckResponse.ServingStatus} - 服务状态，服务不存在返回None
+        """
+        with self._grpc_health_servicer._lock:
+            return self._grpc_health_servicer._server_status.get(servicer_name)
 
     #############################
     # 重载服务启动和关闭函数
@@ -1879,6 +1657,622 @@ class SimpleGRpcServer(SimpleServerFW):
         return
 
 
+class AIOSimpleGRpcServicer(SimpleGRpcServicer):
+    """
+    基于asyncio(grpc.aio)的SimpleGRpc服务处理对象
+    注1：与SimpleGRpcServicer使用相同的RpcRequest/RpcResponse报文，已有的客户端无需调整
+    注2：服务函数可以为async def定义的协程函数（流模式可以为异步生成器函数），也可以为普通函数；
+        普通函数直接在事件循环中执行，不应存在长时间阻塞的处理
+    注3：需配合AIOSimpleGRpcServer使用
+    """
+    #############################
+    # 内部变量
+    #############################
+    _server_host = ':'  # 服务端监听地址，格式为'ip:port'，由AIOSimpleGRpcServer启动时设置
+
+    #############################
+    # gRPC的标准接入服务接口
+    #############################
+    async def GRpcCallSimple(self, request, context):
+        """
+        简单模式(Simple)gRPC的标准接入服务接口
+
+        @param {msg_pb2.RpcRequest} request - 请求对象，与msg.proto定义一致
+        @param {grpc.aio.ServicerContext} context - 服务端的上下文
+
+        @retrun {msg_pb2.RpcResponse} - 返回调用结果信息
+        """
+        # 正在处理报文计数+1
+        self._dealing_num_addon(1)
+        try:
+            # 入口的初始化处理
+            _start_time = datetime.datetime.now()  # 开始处理时间
+            _trace_info = self._get_trace_info(request, context)  # 调用链信息获取及处理
+            _request_info_dict = self._write_recv_log(
+                request, context, EnumCallMode.Simple, _trace_info, 'RECV'
+            )
+
+            # 执行函数并处理返回对象
+            _call_result, _fun_return_obj = await self._aio_call_service(
+                self._simple_service_list, request, _trace_info, None
+            )
+            _return_obj, _call_result = self._generate_return_obj(_fun_return_obj, _call_result, request)
+            self._write_resp_log(_request_info_dict, _return_obj, _call_result, _start_time, 'RET')
+
+            # 返回结果
+            return _return_obj
+        except Exception as e:
+            # 出现异常，执行打印处理
+            if self._logger is not None:
+                self._logger.error(
+                    '[EX:%s]%s' % (str(sys.exc_info()[0]), traceback.format_exc())
+                )
+            raise e
+        finally:
+            # 正在处理报文计数-1
+            self._dealing_num_addon(-1)
+
+    async def GRpcCallClientSideStream(self, request_iterator, context):
+        """
+        客户端流模式(ClientSideStream)gRPC的标准接入服务接口
+
+        @param {async_iterator} request_iterator - 请求对象（msg_pb2.RpcRequest）的异步迭代器
+        @param {grpc.aio.ServicerContext} context - 服务端的上下文
+
+        @retrun {msg_pb2.RpcResponse} - 返回调用结果信息（最后一个请求的处理结果）
+        """
+        # 正在处理报文计数+1
+        self._dealing_num_addon(1)
+        _start_time = datetime.datetime.now()  # 开始处理时间
+        _return_obj = None  # 返回对象（RpcResponse）
+        try:
+            _iterator = request_iterator.__aiter__()
+            request = await _iterator.__anext__()
+            _has_next = True  # 标识是否有下一个请求对象
+            while _has_next:
+                # 判断是否有下一个请求
+                try:
+                    _next_request = await _iterator.__anext__()
+                except StopAsyncIteration:
+                    _has_next = False
+
+                # 处理当前请求
+                _block_start_time = datetime.datetime.now()  # 流数据块开始处理时间
+                _trace_info = self._get_trace_info(request, context)  # 调用链信息获取及处理
+                _request_info_dict = self._write_recv_log(
+                    request, context, EnumCallMode.ClientSideStream, _trace_info, 'STREAM-RECV'
+                )
+                _call_result, _fun_return_obj = await self._aio_call_service(
+                    self._client_side_stream_service_list, request, _trace_info, _has_next
+                )
+                _return_obj, _call_result = self._generate_return_obj(_fun_return_obj, _call_result, request)
+                if _has_next:
+                    # 还有下一个报文
+                    self._write_resp_log(
+                        _request_info_dict, _return_obj, _call_result, _block_start_time, 'STREAM-DEAL'
+                    )
+                else:
+                    self._write_resp_log(
+                        _request_info_dict, _return_obj, _call_result, _start_time, 'STREAM-RET'
+                    )
+
+                # 判断本次处理结果，如果不是成功则直接跳出循环并返回结果
+                if not _call_result.is_success():
+                    break
+                else:
+                    # 下一个循环处理
+                    request = _next_request
+
+            # 返回最后一个的结果
+            return _return_obj
+        except Exception as e:
+            # 出现异常，执行打印处理
+            if self._logger is not None:
+                self._logger.error(
+                    '[EX:%s]%s' % (str(sys.exc_info()[0]), traceback.format_exc())
+                )
+            raise e
+        finally:
+            # 正在处理报文计数-1
+            self._dealing_num_addon(-1)
+
+    async def GRpcCallServerSideStream(self, request, context):
+        """
+        服务器流模式(ServerSideStream)gRPC的标准接入服务接口
+
+        @param {msg_pb2.RpcRequest} request - 请求对象，与msg.proto定义一致
+        @param {grpc.aio.ServicerContext} context - 服务端的上下文
+
+        @retrun {async_iterator} - 返回调用结果信息（msg_pb2.RpcResponse）的异步迭代器
+        """
+        # 正在处理报文计数+1
+        self._dealing_num_addon(1)
+        try:
+            # 入口的初始化处理
+            _start_time = datetime.datetime.now()  # 开始处理时间
+            _trace_info = self._get_trace_info(request, context)  # 调用链信息获取及处理
+            _request_info_dict = self._write_recv_log(
+                request, context, EnumCallMode.ServerSideStream, _trace_info, 'RECV'
+            )
+
+            # 执行函数，注意这里函数执行返回的必须是一个迭代器（生成器或异步生成器）
+            _call_result, _fun_iterator = await self._aio_call_service(
+                self._server_side_stream_service_list, request, _trace_info, None
+            )
+            if not _call_result.is_success():
+                # 异常失败，单独返回
+                _return_obj, _call_result = self._generate_return_obj(None, _call_result, request)
+                self._write_resp_log(_request_info_dict, _return_obj, _call_result, _start_time, 'STREAM-RET')
+                yield _return_obj
+            else:
+                # 迭代器处理
+                async for _fun_obj in self._aio_iter(_fun_iterator, _trace_info):
+                    _return_obj, _ = self._generate_return_obj(_fun_obj, _call_result, request)
+                    self._write_resp_log(_request_info_dict, _return_obj, _call_result, _start_time, 'STREAM-RET')
+                    yield _return_obj
+        except Exception as e:
+            # 出现异常，执行打印处理
+            if self._logger is not None:
+                self._logger.error(
+                    '[EX:%s]%s' % (str(sys.exc_info()[0]), traceback.format_exc())
+                )
+            raise e
+        finally:
+            # 正在处理报文计数-1
+            self._dealing_num_addon(-1)
+
+    async def GRpcCallBidirectionalStream(self, request_iterator, context):
+        """
+        双向流模式(BidirectionalStream)gRPC的标准接入服务接口
+
+        @param {async_iterator} request_iterator - 请求对象（msg_pb2.RpcRequest）的异步迭代器
+        @param {grpc.aio.ServicerContext} context - 服务端的上下文
+
+        @retrun {async_iterator} - 返回调用结果信息（msg_pb2.RpcResponse）的异步迭代器
+        """
+        # 正在处理报文计数+1
+        self._dealing_num_addon(1)
+        _start_time = datetime.datetime.now()  # 开始处理时间
+        request = None  # 从迭代器获取请求对象
+        try:
+            _iterator = request_iterator.__aiter__()
+            _has_next = True
+            while _has_next:
+                # 循环从迭代器获取请求对象进行处理
+                try:
+                    request = await _iterator.__anext__()
+                except StopAsyncIteration:
+                    _has_next = False
+                    if request is None:
+                        # 没有任何请求
+                        break
+
+                # 处理当前请求
+                _block_start_time = datetime.datetime.now()  # 流数据块开始处理时间
+                _trace_info = self._get_trace_info(request, context)  # 调用链信息获取及处理
+                _request_info_dict = self._write_recv_log(
+                    request, context, EnumCallMode.BidirectionalStream, _trace_info, 'STREAM-RECV'
+                )
+                _call_result, _fun_iterator = await self._aio_call_service(
+                    self._bidirectional_stream_service_list, request, _trace_info, _has_next
+                )
+                if not _call_result.is_success():
+                    # 异常失败，单独返回
+                    _return_obj, _call_result = self._generate_return_obj(None, _call_result, request)
+                    self._write_resp_log(
+                        _request_info_dict, _return_obj, _call_result, _start_time, 'STREAM-RET'
+                    )
+                    yield _return_obj
+                    break
+
+                # 迭代器处理，返回None代表只处理不返回
+                async for _fun_obj in self._aio_iter(_fun_iterator, _trace_info):
+                    _return_obj, _ = self._generate_return_obj(_fun_obj, _call_result, request)
+                    if _fun_obj is None:
+                        self._write_resp_log(
+                            _request_info_dict, _return_obj, _call_result, _block_start_time, 'STREAM-DEAL'
+                        )
+                    else:
+                        self._write_resp_log(
+                            _request_info_dict, _return_obj, _call_result, _start_time, 'STREAM-RET'
+                        )
+                        yield _return_obj
+        except Exception as e:
+            # 出现异常，执行打印处理
+            if self._logger is not None:
+                self._logger.error(
+                    '[EX:%s]%s' % (str(sys.exc_info()[0]), traceback.format_exc())
+                )
+            raise e
+        finally:
+            # 正在处理报文计数-1
+            self._dealing_num_addon(-1)
+
+    async def GRpcCallHealthCheck(self, request, context):
+        """
+        自定义的健康检查服务
+
+        @param {msg_pb2.HealthRequest} request - 请求对象，与msg.proto定义一致
+        @param {grpc.aio.ServicerContext} context - 服务端的上下文
+
+        @retrun {msg_pb2.HealthResponse} - 返回调用结果信息
+        """
+        return msg_pb2.HealthResponse(status=msg_pb2.HealthResponse.SERVING)
+
+    #############################
+    # 内部函数
+    #############################
+    def _get_context_host(self, context):
+        """
+        获取服务端上下文中客户端请求的服务端地址
+        注：grpc.aio的服务端上下文不提供请求的服务端地址，使用AIOSimpleGRpcServer启动时登记的监听地址
+
+        @param {grpc.aio.ServicerContext} context - 服务端的上下文
+
+        @return {string} - 服务端地址，格式为'ip:port'
+        """
+        return self._server_host
+
+    async def _aio_call_service(self, service_list, request, trace_info, has_next_stream_data=None):
+        """
+        按调用计划执行服务函数，如果服务函数为协程函数则等待执行结果
+
+        @param {dict} service_list - 对应调用模式的服务列表
+        @param {RpcRequest} request - 请求对象
+        @param {NullObj} trace_info - 调用链信息对象
+        @param {bool} has_next_stream_data=None - 流模式是否有下一个数据，如果为None则代表无这个参数
+
+        @return {(CResult, object)} - (执行结果, 服务函数返回值)，执行结果的code：
+            '00000'-成功，'11403'-服务名不存在，'21008'-执行抛出异常
+        """
+        _call_result, _fun_return_obj = self._call_service(
+            service_list, request, trace_info, has_next_stream_data
+        )
+        if not _call_result.is_success():
+            return _call_result, None
+
+        try:
+            # 协程函数在等待时才执行，同样需设置调用链上下文
+            with TraceContext.trace_info_context(trace_info.trace_id, trace_info.call_id, trace_info.trace_level):
+                _fun_return_obj = await AsyncTools.async_run_coroutine(_fun_return_obj)
+        except asyncio.CancelledError:
+            # 调用被取消（例如客户端超时），不作为服务函数异常处理
+            raise
+        except:
+            _error = str(sys.exc_info()[0])
+            _call_result = CResult(code='21008', error=_error, trace_str=traceback.format_exc(),
+                                   i18n_msg_paras=(_error, ))
+        return _call_result, _fun_return_obj
+
+    async def _aio_iter(self, iterator, trace_info):
+        """
+        统一以异步方式遍历普通迭代器或异步迭代器，每次获取值期间设置调用链上下文，获取后恢复
+
+        @param {iterator|async_iterator} iterator - 服务函数返回的迭代器
+        @param {NullObj} trace_info - 调用链信息对象
+
+        @return {async_iterator} - 异步迭代器
+        """
+        if hasattr(iterator, '__aiter__'):
+            _iterator = iterator.__aiter__()
+            _trace_level = [trace_info.trace_level]  # 同一迭代器共享调用层级
+            while True:
+                with TraceContext.trace_info_context(trace_info.trace_id, trace_info.call_id, _trace_level):
+                    try:
+                        _item = await _iterator.__anext__()
+                    except StopAsyncIteration:
+                        return
+                yield _item
+        else:
+            for _item in self._iter_with_trace_info(iterator, trace_info):
+                yield _item
+
+
+class AIOSimpleGRpcServicerUnion(SimpleGRpcServicerUnion):
+    """
+    AIOSimpleGRpcServicer服务的整合对象（用于将多个asyncio模式的Servicer整合为一个Servicer）
+    """
+
+    #############################
+    # 重载GRpc入口函数，作为路由
+    #############################
+    async def GRpcCallSimple(self, request, context):
+        """
+        简单模式(Simple)gRPC的标准接入服务接口
+
+        @param {msg_pb2.RpcRequest} request - 请求对象，与msg.proto定义一致
+        @param {grpc.aio.ServicerContext} context - 服务端的上下文
+
+        @retrun {msg_pb2.RpcResponse} - 返回调用结果信息
+        """
+        _service = request.service_name
+        if _service not in self._mapping.keys():
+            # 没有找到服务名
+            return self._response_service_not_found_error(_service)
+
+        # 路由处理
+        return await self.servicer_list[self._mapping[_service]].GRpcCallSimple(
+            request, context
+        )
+
+    async def GRpcCallClientSideStream(self, request_iterator, context):
+        """
+        客户端流模式(ClientSideStream)gRPC的标准接入服务接口
+
+        @param {async_iterator} request_iterator - 请求对象（msg_pb2.RpcRequest）的异步迭代器
+        @param {grpc.aio.ServicerContext} context - 服务端的上下文
+
+        @retrun {msg_pb2.RpcResponse} - 返回调用结果信息
+        """
+        _iterator = request_iterator.__aiter__()
+        request = await _iterator.__anext__()
+        _service = request.service_name
+        if _service not in self._mapping.keys():
+            # 没有找到服务名
+            return self._response_service_not_found_error(_service)
+
+        # 路由处理，由于查出了第一个对象，需要重新生成迭代对象
+        return await self.servicer_list[self._mapping[_service]].GRpcCallClientSideStream(
+            self._aio_request_iterator_generater(request, _iterator), context
+        )
+
+    async def GRpcCallServerSideStream(self, request, context):
+        """
+        服务器流模式(ServerSideStream)gRPC的标准接入服务接口
+
+        @param {msg_pb2.RpcRequest} request - 请求对象，与msg.proto定义一致
+        @param {grpc.aio.ServicerContext} context - 服务端的上下文
+
+        @retrun {async_iterator} - 返回调用结果信息（msg_pb2.RpcResponse）的异步迭代器
+        """
+        _service = request.service_name
+        if _service not in self._mapping.keys():
+            # 没有找到服务名
+            yield self._response_service_not_found_error(_service)
+            return
+
+        # 路由处理
+        async for _ret_obj in self.servicer_list[self._mapping[_service]].GRpcCallServerSideStream(
+            request, context
+        ):
+            yield _ret_obj
+
+    async def GRpcCallBidirectionalStream(self, request_iterator, context):
+        """
+        双向流模式(BidirectionalStream)gRPC的标准接入服务接口
+
+        @param {async_iterator} request_iterator - 请求对象（msg_pb2.RpcRequest）的异步迭代器
+        @param {grpc.aio.ServicerContext} context - 服务端的上下文
+
+        @retrun {async_iterator} - 返回调用结果信息（msg_pb2.RpcResponse）的异步迭代器
+        """
+        _iterator = request_iterator.__aiter__()
+        request = await _iterator.__anext__()
+        _service = request.service_name
+        if _service not in self._mapping.keys():
+            # 没有找到服务名
+            yield self._response_service_not_found_error(_service)
+            return
+
+        # 路由处理，由于查出了第一个对象，需要重新生成迭代对象
+        async for _ret_obj in self.servicer_list[self._mapping[_service]].GRpcCallBidirectionalStream(
+            self._aio_request_iterator_generater(request, _iterator), context
+        ):
+            yield _ret_obj
+
+    async def GRpcCallHealthCheck(self, request, context):
+        """
+        自定义的健康检查服务
+
+        @param {msg_pb2.HealthRequest} request - 请求对象，与msg.proto定义一致
+        @param {grpc.aio.ServicerContext} context - 服务端的上下文
+
+        @retrun {msg_pb2.HealthResponse} - 返回调用结果信息
+        """
+        return msg_pb2.HealthResponse(status=msg_pb2.HealthResponse.SERVING)
+
+    #############################
+    # 内部函数
+    #############################
+    @staticmethod
+    async def _aio_request_iterator_generater(first_obj, iterator_obj):
+        """
+        将已取出的第一个请求对象与剩余的异步迭代器重新组合为异步迭代器
+
+        @param {msg_pb2.RpcRequest} first_obj - 已取出的第一个请求对象
+        @param {async_iterator} iterator_obj - 剩余请求对象的异步迭代器
+
+        @return {async_iterator} - 组合后的异步迭代器
+        """
+        yield first_obj
+        async for _next_obj in iterator_obj:
+            yield _next_obj
+
+
+class AIOSimpleGRpcServer(SimpleGRpcServer):
+    """
+    基于asyncio(grpc.aio)的gRPC服务器类，服务在独立线程的事件循环中运行
+    注1：servicer_list中的处理对象应为AIOSimpleGRpcServicer，不传时自动创建一个默认的AIOSimpleGRpcServicer
+    注2：启动参数与SimpleGRpcServer一致，其中max_workers参数在该模式下无效
+    """
+    #############################
+    # 内部变量
+    #############################
+    _aio_loop = None  # 运行grpc.aio服务的事件循环
+    _aio_thread = None  # 运行事件循环的线程
+
+    #############################
+    # 重载服务启动和关闭函数
+    #############################
+    def _start_server_self(self, tid):
+        """
+        重载自定义的服务启动处理函数
+
+        @param {int} tid - 线程id
+
+        @returns {CResult} - 启动结果:
+            result.code ：'00000'-成功，其他值为失败
+            result.server_info ：启动成功后的服务对象，用于传递到后续的服务处理函数
+
+        """
+        _result = CResult(code='00000')  # 成功
+        _result.server_info = NullObj()
+        with ExceptionTool.ignored_cresult(
+            _result,
+            logger=self._logger,
+            self_log_msg='[%s-STARTING][NAME:%s]%s: ' % (
+                self._server_log_prefix, self._server_name,
+                _('start service error')),
+            force_log_level=logging.ERROR
+        ):
+            # 初始化临时变量
+            self._server_opts = self._temp_server_opts
+            if self._temp_servicer_list is None or len(self._temp_servicer_list) == 0:
+                # 创建一个默认的服务servicer，使用服务器端的logger
+                self._grpc_servicer_list.clear()
+                self._grpc_servicer_list['SimpleGRpcServicer'] = AIOSimpleGRpcServicer()
+                self._grpc_servicer_list['SimpleGRpcServicer'].logger = self._logger
+            else:
+                self._grpc_servicer_list = self._temp_servicer_list
+
+            # 启动事件循环线程，并在事件循环中启动服务
+            self._aio_loop = asyncio.new_event_loop()
+            self._aio_thread = threading.Thread(
+                target=self._aio_loop.run_forever, name='%s-aio-loop' % self._server_name, daemon=True
+            )
+            self._aio_thread.start()
+            try:
+                self._run_in_aio_loop(self._aio_start_server())
+            except:
+                self._aio_stop_loop()
+                raise
+
+            # 设置服务状态，启动后是否自动对外提供服务
+            self.set_service_status('', health_pb2.HealthCheckResponse.UNKNOWN)
+            if self._server_opts.auto_service_when_started:
+                self.set_service_status('', health_pb2.HealthCheckResponse.SERVING)
+
+        # 返回处理结果
+        _result.server_info = None
+        return _result
+
+    def _stop_server_end_self(self, tid):
+        """
+        自定义服务停止后处理函数，实现类可重载该函数加入自己的处理逻辑
+            注意：函数应屏蔽异常
+
+        @param {int} tid - 线程id
+
+        """
+        _result = CResult(code='00000')  # 成功
+        with ExceptionTool.ignored_cresult(
+            _result,
+            logger=self._logger,
+            self_log_msg='[%s-STOPING][NAME:%s]%s: ' % (
+                self._server_log_prefix, self._server_name, _('stop service end fun error')),
+            force_log_level=logging.ERROR
+        ):
+            # 停止服务
+            self._run_in_aio_loop(self._grpc_server.stop(0))
+
+            # 停止完成更新状态为未知
+            self.set_service_status('', health_pb2.HealthCheckResponse.UNKNOWN)
+
+            # 停止事件循环
+            self._aio_stop_loop()
+
+        # 返回处理结果
+        return
+
+    #############################
+    # 健康检查状态处理
+    #############################
+    def _set_health_status(self, servicer_name, status_code):
+        """
+        设置健康检查服务中单个服务的状态（在事件循环中执行）
+
+        @param {string} servicer_name - 服务名
+        @param {health_pb2.HealthCheckResponse.ServingStatus} status_code - 服务状态
+        """
+        self._run_in_aio_loop(self._grpc_health_servicer.set(servicer_name, status_code))
+
+    def _get_health_status(self, servicer_name):
+        """
+        获取健康检查服务中单个服务的状态
+
+        @param {string} servicer_name - 服务名
+
+        @return {health_pb2.HealthCheckResponse.ServingStatus} - 服务状态，服务不存在返回None
+        """
+        return self._grpc_health_servicer._server_status.get(servicer_name)
+
+    #############################
+    # 内部函数
+    #############################
+    async def _aio_start_server(self):
+        """
+        在事件循环中创建并启动grpc.aio服务
+        """
+        self._grpc_server = grpc.aio.server(
+            maximum_concurrent_rpcs=self._server_opts.max_connect,  # 最大连接数
+            options=self._server_opts.options,
+            compression=self._server_opts.compression,
+            handlers=self._server_opts.handlers,
+            interceptors=self._server_opts.interceptors
+        )
+
+        # 注册健康检查服务
+        self._grpc_health_servicer = health_aio.HealthServicer()
+        if self._server_opts.is_health_check:
+            health_pb2_grpc.add_HealthServicer_to_server(
+                self._grpc_health_servicer, self._grpc_server)
+
+        # 向服务注册处理对象
+        msg_pb2_grpc.add_SimpleGRpcServiceServicer_to_server(
+            AIOSimpleGRpcServicerUnion(self._grpc_servicer_list), self._grpc_server
+        )
+
+        # 设置监听服务
+        _server_host_str = ('%s:%s' % (self._server_opts.ip, self._server_opts.port))
+        if self._server_opts.is_use_ssl:
+            # 使用SSL加密传输
+            self._server_credentials = grpc.ssl_server_credentials(
+                self._server_opts.private_key_certificate_chain_pairs,
+                root_certificates=self._server_opts.root_certificates,
+                require_client_auth=(self._server_opts.root_certificates is not None)
+            )
+            _port = self._grpc_server.add_secure_port(_server_host_str, self._server_credentials)
+        else:
+            # 非加密方式访问
+            _port = self._grpc_server.add_insecure_port(_server_host_str)
+
+        # 登记服务端监听地址，用于调用链日志的S-IP、S-PORT
+        for _servicer in self._grpc_servicer_list.values():
+            if isinstance(_servicer, AIOSimpleGRpcServicer):
+                _servicer._server_host = '%s:%s' % (self._server_opts.ip, _port)
+
+        await self._grpc_server.start()  # 启动服务
+
+    def _run_in_aio_loop(self, coroutine_obj):
+        """
+        在服务的事件循环中执行协程并等待返回结果
+
+        @param {coroutine} coroutine_obj - 要执行的协程
+
+        @returns {Any} - 协程的执行结果
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine_obj, self._aio_loop).result()
+
+    def _aio_stop_loop(self):
+        """
+        停止并关闭服务的事件循环
+        """
+        self._aio_loop.call_soon_threadsafe(self._aio_loop.stop)
+        self._aio_thread.join()
+        self._aio_loop.close()
+        self._aio_loop = None
+        self._aio_thread = None
+
 if __name__ == '__main__':
     # 当程序自己独立运行时执行的操作
     # 打印版本信息
@@ -18,9 +18,14 @@ import os
 import sys
 import json
 import copy
+import time
+import zlib
 import traceback
 import logging
+import threading
+import collections
 from enum import Enum
+from contextlib import contextmanager
 # 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
 sys.path.append(os.path.abspath(os.path.join(
     os.path.dirname(__file__), os.path.pardir, os.path.pardir)))
@@ -42,6 +47,7 @@ while True:
 # 自有模块引用
 import HiveNetLib.simple_grpc.msg_pb2 as msg_pb2
 import HiveNetLib.simple_grpc.msg_pb2_grpc as msg_pb2_grpc
+from HiveNetLib.simple_grpc.grpc_codec import SimpleGRpcBinCodec
 from HiveNetLib.generic import CResult, NullObj
 from HiveNetLib.base_tools.run_tool import RunTool
 from HiveNetLib.base_tools.string_tool import StringTool
@@ -180,9 +186,16 @@ class SimpleGRpcTools(object):
             如果不指定，则根据list和key遍历方式查找替换（只处理第1层）
 
         @return {CResult} - 包含转换后return_obj的CResult对象
+            注：如果服务端使用二进制编码返回（请求通过parameters_to_bin生成），将直接解码为return_obj，
+            忽略json_para_mapping_key、deal_return_bytes和bytes_location参数
         """
-        # json转换为obj
         _cresult = cresult
+        if cls.is_bin_codec_data(_cresult.return_json, _cresult.return_bytes):
+            # 服务端使用二进制编码返回，字节对象已在编码数据中，无需再处理
+            _cresult.return_obj = SimpleGRpcBinCodec.loads(_cresult.return_bytes)
+            return cresult
+
+        # json转换为obj
         _cresult.return_obj = cls.json_to_object_by_para_mapping(
             _cresult.return_json, json_para_mapping_key
         )
@@ -267,7 +280,60 @@ class SimpleGRpcTools(object):
         return para_obj
 
     @staticmethod
-    def object_to_json_support_bytes(obj, is_support_bytes=False):
+    def parameters_to_bin(para_list):
+        """
+        将参数列表转换为紧凑二进制编码（SimpleGRpcBinCodec）
+        注：参数中可以包含任意数量、任意层级的字节数组；服务端收到二进制编码的请求后，
+            返回值也会以二进制编码返回，可通过return_json_to_obj获取返回对象
+
+        @param {list} para_list - 要转换的参数列表，list的每一项为一个参数项，每个参数项如下：
+            [para_name, call_value] : para_name可以为''
+
+        @returns {object} - 返回对象，格式与parameters_to_json一致：
+            object.para_json : 固定为''
+            object.has_para_bytes : 固定为True
+            object.para_bytes : 二进制编码后的参数
+        """
+        para_obj = NullObj()
+        para_obj.para_json = ''
+        para_obj.has_para_bytes = True
+        # 将倒数第一个不指定参数名的参数前面的参数项的参数名都去掉，避免调用函数出现问题
+        _is_no_name = False
+        for _pos in range(len(para_list) - 1, -1, -1):
+            if _is_no_name:
+                para_list[_pos][0] = ''
+            elif para_list[_pos][0] == '':
+                _is_no_name = True
+        para_obj.para_bytes = SimpleGRpcBinCodec.dumps(para_list)
+        return para_obj
+
+    @staticmethod
+    def is_bin_codec_data(json_str, bytes_data):
+        """
+        判断请求或响应报文是否使用二进制编码（json字段为空，且字节数组字段为SimpleGRpcBinCodec编码）
+
+        @param {string} json_str - 请求的para_json或响应的return_json
+        @param {bytes} bytes_data - 请求的para_bytes或响应的return_bytes
+
+        @returns {bool} - 是否使用二进制编码
+        """
+        return json_str == '' and SimpleGRpcBinCodec.is_bin_data(bytes_data)
+
+    @classmethod
+    def request_to_parameters(cls, request):
+        """
+        从请求对象中解析参数列表（自动识别json及二进制编码）
+
+        @param {msg_pb2.RpcRequest} request - 请求对象
+
+        @returns {list} - 参数列表，每项为[para_name, value]
+        """
+        if cls.is_bin_codec_data(request.para_json, request.para_bytes):
+            return SimpleGRpcBinCodec.loads(request.para_bytes)
+        return json.loads(request.para_json)
+
+    @staticmethod
+    def object_to_json_support_bytes(obj, is_support_bytes=False, is_use_bin_codec=False):
         """
         对象转换为json（支持bytes的情况）
         注意：如果为存在对象属性是bytes的情况，只支持一个；此外只支持第一级属性的情况；
@@ -275,6 +341,8 @@ class SimpleGRpcTools(object):
 
         @param {object} obj - 要处理的对象
         @param {bool} is_support_bytes=False - 是否支持有bytes的情况
+        @param {bool} is_use_bin_codec=False - 是否使用二进制编码（SimpleGRpcBinCodec），
+            为True时return_json为''，编码数据放在return_bytes中，支持任意数量的bytes
 
         @return {NullObj} - 返回的对象，属性如下：
             obj.return_json : 转换后的JSON格式字符串
@@ -285,6 +353,11 @@ class SimpleGRpcTools(object):
         _ret_obj.return_json = ''
         _ret_obj.has_return_bytes = False
         _ret_obj.return_bytes = None
+        if is_use_bin_codec:
+            _ret_obj.has_return_bytes = True
+            _ret_obj.return_bytes = SimpleGRpcBinCodec.dumps(obj)
+            return _ret_obj
+
         _obj_type = type(obj)  # 对象类型
         if is_support_bytes:
             # 支持字节形式，进行判断和处理
@@ -516,6 +589,39 @@ class SimpleGRpcTools(object):
             )
         return _channel
 
+    @staticmethod
+    def generate_aio_channel(connect_para):
+        """
+        生成asyncio模式的gRPC通道(grpc.aio)，注意该通道需要后端主动关闭(await channel.close())
+        注：aio通道与创建时的事件循环绑定，应在使用该通道的事件循环中创建
+
+        @param {object} connect_para - 客户端连接参数
+
+        @return {grpc.aio.Channel} - asyncio模式的gRPC连接通道
+        """
+        _server_host_str = None
+        if connect_para.conn_str is None:
+            _server_host_str = ('%s:%s' % (connect_para.ip, connect_para.port))
+        else:
+            _server_host_str = connect_para.conn_str
+        if connect_para.is_use_ssl:
+            # 使用SSL验证
+            _credentials = grpc.ssl_channel_credentials(
+                root_certificates=connect_para.root_certificates,
+                private_key=connect_para.private_key,
+                certificate_chain=connect_para.certificate_chain
+            )
+            return grpc.aio.secure_channel(
+                _server_host_str, _credentials, options=connect_para.options,
+                compression=connect_para.compression
+            )
+        else:
+            # 不使用SSL验证
+            return grpc.aio.insecure_channel(
+                _server_host_str,
+                options=connect_para.options, compression=connect_para.compression
+            )
+
     @staticmethod
     def generate_call_stub(channel):
         """
@@ -655,10 +761,11 @@ class SimpleGRpcTools(object):
     @staticmethod
     def grpc_call(connect_para, rpc_request, call_mode=EnumCallMode.Simple,
                   timeout=None, metadata=None, credentials=None,
-                  wait_for_ready=None, compression=None):
+                  wait_for_ready=None, compression=None, is_reuse_channel=True):
         """
-        执行gRPC远程调用（自动创建channel并在完成后关闭）
-        注意：该调用方式不适合ServerSideStream、BidirectionalStream两种模式（自动关闭channel会导致处理失败）
+        执行gRPC远程调用（默认使用SimpleGRpcChannelRegistry中相同连接参数的共享channel，
+        is_reuse_channel为False时自动创建channel并在完成后关闭）
+        注意：该调用方式不适合ServerSideStream、BidirectionalStream两种模式（channel关闭会导致处理失败）
 
         @param {object} connect_para - 客户端连接参数
         @param {msg_pb2.RpcRequest|request_iterator} rpc_request - 请求对象或产生请求对象的迭代器（iterator），应与call_mode匹配
@@ -672,6 +779,7 @@ class SimpleGRpcTools(object):
             flag to enable wait for ready mechanism
         @param {object} compression=None - An element of grpc.compression, e.g.
             grpc.compression.Gzip. This is an EXPERIMENTAL option.
+        @param {bool} is_reuse_channel=True - 是否使用共享channel（避免每次调用重新建立连接）
 
         @returns {CResult|iterator} - 执行结果CResult或执行结果的迭代器（iterator），与call_mode匹配
             CResult对象有以下3个属性：
@@ -684,6 +792,16 @@ class SimpleGRpcTools(object):
         if call_mode in (EnumCallMode.ServerSideStream, EnumCallMode.BidirectionalStream):
             raise ValueError('unsupport call_mode')
 
+        if is_reuse_channel:
+            with SimpleGRpcChannelRegistry.use_channel(connect_para) as _channel_info:
+                return SimpleGRpcTools.grpc_call_by_stub(
+                    _channel_info.stub,
+                    rpc_request,
+                    call_mode=call_mode,
+                    timeout=timeout, metadata=metadata, credentials=credentials,
+                    wait_for_ready=wait_for_ready, compression=compression
+                )
+
         with SimpleGRpcTools.generate_channel(connect_para) as channel:
             return SimpleGRpcTools.grpc_call_by_channel(
                 channel,
@@ -693,6 +811,158 @@ class SimpleGRpcTools(object):
                 wait_for_ready=wait_for_ready, compression=compression
             )
 
+    @staticmethod
+    def grpc_call_many_by_stub(stub, rpc_requests, timeout=None, metadata=None, credentials=None,
+                               wait_for_ready=None, compression=None, max_concurrent=0):
+        """
+        通过同一个stub并发执行多个简单模式（Simple）的gRPC远程调用
+        通过stub.GRpcCallSimple.future发起调用，多个请求在同一个channel（HTTP/2连接）上多路复用，不占用额外线程
+
+        @param {msg_pb2.RpcRequest[]} rpc_requests - 请求对象清单
+        @param {number} timeout=None - 每个调用的超时时间，单位为秒
+        @param {object} metadata=None - 参考grpc_call_by_stub
+        @param {object} credentials=None - 参考grpc_call_by_stub
+        @param {object} wait_for_ready=None - 参考grpc_call_by_stub
+        @param {object} compression=None - 参考grpc_call_by_stub
+        @param {int} max_concurrent=0 - 同时发起的最大调用数，0代表全部同时发起
+
+        @returns {CResult[]} - 执行结果清单，顺序与rpc_requests一致，每个CResult的属性与grpc_call_by_stub一致
+        """
+        _requests = list(rpc_requests)
+        _results = list()
+        _batch_size = len(_requests) if max_concurrent <= 0 else max_concurrent
+        for _begin in range(0, len(_requests), max(_batch_size, 1)):
+            # 先发起一批调用，再逐个等待结果
+            _futures = list()
+            for _request in _requests[_begin: _begin + _batch_size]:
+                try:
+                    _futures.append(stub.GRpcCallSimple.future(
+                        _request, timeout=timeout, metadata=metadata, credentials=credentials,
+                        wait_for_ready=wait_for_ready, compression=compression
+                    ))
+                except:
+                    _futures.append(SimpleGRpcTools._call_error_to_cresult())
+
+            for _future in _futures:
+                if isinstance(_future, CResult):
+                    # 发起调用时已出现异常
+                    _results.append(_future)
+                    continue
+                try:
+                    _results.append(SimpleGRpcTools.response_obj_to_cresult(_future.result()))
+                except:
+                    _results.append(SimpleGRpcTools._call_error_to_cresult())
+        return _results
+
+    @staticmethod
+    def grpc_call_many(connect_para, rpc_requests, timeout=None, metadata=None, credentials=None,
+                       wait_for_ready=None, compression=None, max_concurrent=0):
+        """
+        通过共享channel并发执行多个简单模式（Simple）的gRPC远程调用
+
+        @param {object} connect_para - 客户端连接参数
+        @param {msg_pb2.RpcRequest[]} rpc_requests - 请求对象清单
+        @param {number} timeout=None - 每个调用的超时时间，单位为秒
+        @param {object} metadata=None - 参考grpc_call_by_stub
+        @param {object} credentials=None - 参考grpc_call_by_stub
+        @param {object} wait_for_ready=None - 参考grpc_call_by_stub
+        @param {object} compression=None - 参考grpc_call_by_stub
+        @param {int} max_concurrent=0 - 同时发起的最大调用数，0代表全部同时发起
+
+        @returns {CResult[]} - 执行结果清单，顺序与rpc_requests一致
+        """
+        with SimpleGRpcChannelRegistry.use_channel(connect_para) as _channel_info:
+            return SimpleGRpcTools.grpc_call_many_by_stub(
+                _channel_info.stub, rpc_requests, timeout=timeout, metadata=metadata,
+                credentials=credentials, wait_for_ready=wait_for_ready, compression=compression,
+                max_concurrent=max_concurrent
+            )
+
+    @staticmethod
+    async def aio_grpc_call_by_stub(stub, rpc_request, call_mode=EnumCallMode.Simple,
+                                    timeout=None, metadata=None, credentials=None,
+                                    wait_for_ready=None, compression=None):
+        """
+        基于asyncio模式的stub对象执行远程调用(stub通过generate_call_stub(aio_channel)生成)
+
+        @param {msg_pb2_grpc.SimpleGRpcServiceStub} stub - 基于aio通道的stub对象
+        @param {msg_pb2.RpcRequest|request_iterator} rpc_request - 请求对象或产生请求对象的迭代器，应与call_mode匹配
+            注：客户端流及双向流模式可以传入普通迭代器或异步迭代器（async iterator）
+        @param {EnumCallMode} call_mode=EnumCallMode.Simple - 调用服务端的模式
+        @param {number} timeout=None - 超时时间，单位为秒
+        @param {object} metadata=None - Optional :term:`metadata` to be transmitted to the
+            service-side of the RPC.
+        @param {object} credentials=None - An optional CallCredentials for the RPC. Only valid for
+            secure Channel.
+        @param {object} wait_for_ready=None - This is an EXPERIMENTAL argument. An optional
+            flag to enable wait for ready mechanism
+        @param {object} compression=None - An element of grpc.compression, e.g.
+            grpc.compression.Gzip. This is an EXPERIMENTAL option.
+
+        @returns {CResult|async_iterator} - 执行结果CResult或执行结果的异步迭代器，与call_mode匹配
+            CResult对象的属性与grpc_call_by_stub一致
+        """
+        try:
+            if call_mode in (EnumCallMode.ServerSideStream, EnumCallMode.BidirectionalStream):
+                # 流式返回，由异步迭代器处理
+                if call_mode == EnumCallMode.ServerSideStream:
+                    _call = stub.GRpcCallServerSideStream(
+                        rpc_request, timeout=timeout, metadata=metadata, credentials=credentials,
+                        wait_for_ready=wait_for_ready, compression=compression
+                    )
+                else:
+                    _call = stub.GRpcCallBidirectionalStream(
+                        rpc_request, timeout=timeout, metadata=metadata, credentials=credentials,
+                        wait_for_ready=wait_for_ready, compression=compression
+                    )
+                return SimpleGRpcTools._aio_response_iterator_to_cresults(_call)
+            elif call_mode == EnumCallMode.ClientSideStream:
+                _resp_obj = await stub.GRpcCallClientSideStream(
+                    rpc_request, timeout=timeout, metadata=metadata, credentials=credentials,
+                    wait_for_ready=wait_for_ready, compression=compression
+                )
+            else:
+                # 简单模式
+                _resp_obj = await stub.GRpcCallSimple(
+                    rpc_request, timeout=timeout, metadata=metadata, credentials=credentials,
+                    wait_for_ready=wait_for_ready, compression=compression
+                )
+            return SimpleGRpcTools.response_obj_to_cresult(_resp_obj)
+        except:
+            _result = SimpleGRpcTools._call_error_to_cresult()
+
+        # 异常情况的返回处理
+        if call_mode in (EnumCallMode.ServerSideStream, EnumCallMode.BidirectionalStream):
+            return SimpleGRpcTools._aio_generate_iterator_object(_result)
+        else:
+            return _result
+
+    @staticmethod
+    async def aio_grpc_call_by_channel(channel, rpc_request, call_mode=EnumCallMode.Simple,
+                                       timeout=None, metadata=None, credentials=None,
+                                       wait_for_ready=None, compression=None):
+        """
+        基于asyncio模式的channel对象执行远程调用
+
+        @param {grpc.aio.Channel} channel - asyncio模式的gRPC连接通道
+        @param {msg_pb2.RpcRequest|request_iterator} rpc_request - 请求对象或产生请求对象的迭代器，应与call_mode匹配
+        @param {EnumCallMode} call_mode=EnumCallMode.Simple - 调用服务端的模式
+        @param {number} timeout=None - 超时时间，单位为秒
+        @param {object} metadata=None - 参考aio_grpc_call_by_stub
+        @param {object} credentials=None - 参考aio_grpc_call_by_stub
+        @param {object} wait_for_ready=None - 参考aio_grpc_call_by_stub
+        @param {object} compression=None - 参考aio_grpc_call_by_stub
+
+        @returns {CResult|async_iterator} - 执行结果CResult或执行结果的异步迭代器，与call_mode匹配
+        """
+        return await SimpleGRpcTools.aio_grpc_call_by_stub(
+            SimpleGRpcTools.generate_call_stub(channel),
+            rpc_request,
+            call_mode=call_mode,
+            timeout=timeout, metadata=metadata, credentials=credentials,
+            wait_for_ready=wait_for_ready, compression=compression
+        )
+
     #############################
     # 自定义的健康检查
     #############################
@@ -768,6 +1038,30 @@ class SimpleGRpcTools(object):
                 timeout=timeout
             )
 
+    @staticmethod
+    async def aio_simple_grpc_health_check_by_stub(stub, timeout=None):
+        """
+        SimpleGRpc自定义的健康检查（asyncio模式）
+
+        @param {msg_pb2_grpc.SimpleGRpcServiceStub} stub - 基于aio通道的stub对象
+        @param {number} timeout=None - 超时时间，单位为秒
+
+        @returns {CResult} - 响应对象，判断成功的方法：
+            ret.status == msg_pb2.HealthResponse.SERVING
+        """
+        try:
+            _resp_obj = await stub.GRpcCallHealthCheck(
+                msg_pb2.HealthRequest(service=''),
+                timeout=timeout
+            )
+            _result = CResult(code='00000')
+            _result.status = _resp_obj.status
+        except:
+            _result = SimpleGRpcTools._call_error_to_cresult()
+            _result.status = msg_pb2.HealthResponse.UNKNOWN
+        # 返回处理结果
+        return _result
+
     #############################
     # 标准grpc的健康检查
     #############################
@@ -835,6 +1129,31 @@ class SimpleGRpcTools(object):
         # 返回处理结果
         return _result
 
+    @staticmethod
+    async def aio_health_check_by_stub(stub, servicer_name, timeout=None):
+        """
+        基于stub对象gRPC标准的服务健康检查（asyncio模式）
+
+        @param {health_pb2_grpc.HealthStub} stub - 基于aio通道的stub对象
+        @param {string} servicer_name - 要检查的服务名
+        @param {number} timeout=None - 超时时间，单位为秒
+
+        @returns {CResult} - 响应对象，判断成功的方法：
+            ret.status == msg_pb2.HealthCheckResponse.SERVING
+        """
+        try:
+            _resp_obj = await stub.Check(
+                health_pb2.HealthCheckRequest(service=servicer_name),
+                timeout=timeout
+            )
+            _result = CResult(code='00000')
+            _result.status = _resp_obj.status
+        except:
+            _result = SimpleGRpcTools._call_error_to_cresult()
+            _result.status = health_pb2.HealthCheckResponse.UNKNOWN
+        # 返回处理结果
+        return _result
+
     @staticmethod
     def health_check(connect_para, servicer_name, timeout=None):
         """
@@ -893,12 +1212,29 @@ class SimpleGRpcTools(object):
             parent_id - request.parent_id - 上一函数的执行ID
             trace_level - request.trace_level - 函数调用层级
             call_id - 当前函数的执行id
+
+            注：如果logger为SimpleGRpcCallChainLogWriter对象，日志放入队列后直接返回，由后台线程批量写入
         """
         if logger is None:
             return
 
-        # 深复制，避免影响后面的对象
-        _info_dict = copy.deepcopy(info_dict)
+        # 复制第一层，避免调用方后续修改字典内容影响日志（嵌套的logging_para只读，无需深复制）
+        _info_dict = dict(info_dict)
+        if isinstance(logger, SimpleGRpcCallChainLogWriter):
+            # 异步批量写日志
+            logger.push(_info_dict)
+        else:
+            SimpleGRpcTools._deal_api_call_chain_log(logger, _info_dict)
+
+    @staticmethod
+    def _deal_api_call_chain_log(logger, info_dict):
+        """
+        按日志对象类型（同步或异步日志）写入调用链日志
+
+        @param {simple_log.Logger} logger - 日志对象
+        @param {dict} info_dict - 信息字典
+        """
+        _info_dict = info_dict
         if hasattr(logger, '_asyn_base_logger') or hasattr(logger, '_asyn_deal_msg_fun'):
             # 使用了异步日志
             CallChainTool.call_chain_asyn_log(
@@ -993,6 +1329,66 @@ class SimpleGRpcTools(object):
         """
         yield obj
 
+    @staticmethod
+    async def _aio_generate_iterator_object(obj):
+        """
+        生成异步迭代器对象
+
+        @param {object} obj - 要转换为异步迭代器的对象
+
+        @return {async_iterator} - 生成的异步迭代器对象
+        """
+        yield obj
+
+    @staticmethod
+    def _call_error_to_cresult():
+        """
+        将asyncio模式或future方式远程调用的当前异常转换为CResult对象（在except中调用）
+
+        @return {CResult} - 异常结果对象，错误码与同步调用一致:
+            '20408'-远程调用失败，'30403'-调用超时，'21007'-其他异常
+        """
+        _err = sys.exc_info()[1]
+        if isinstance(_err, (grpc.aio.AioRpcError, grpc.Call)):
+            # 执行远程调用出现异常
+            _code = '20408'
+            if _err.code() == grpc.StatusCode.DEADLINE_EXCEEDED:
+                # 调用超时
+                _code = '30403'
+            _result = CResult(
+                code=_code,
+                error=str(type(_err)),
+                trace_str=traceback.format_exc(),
+                i18n_msg_paras=(_err.code().name, _err.details())
+            )
+        else:
+            _error = str(sys.exc_info()[0])
+            _result = CResult(
+                code='21007',
+                error=_error,
+                trace_str=traceback.format_exc(),
+                i18n_msg_paras=(_error)
+            )
+        _result.return_json = ''
+        _result.has_return_bytes = False
+        _result.return_bytes = b''
+        return _result
+
+    @staticmethod
+    async def _aio_response_iterator_to_cresults(resp_iterator):
+        """
+        将RpcResponse的异步迭代对象转换为CResult的异步迭代器，迭代过程中出现的异常作为最后一个结果返回
+
+        @param {async_iterator} resp_iterator - 响应报文RpcResponse的异步迭代对象
+
+        @return {async_iterator} - CResult的异步迭代器
+        """
+        try:
+            async for resp_obj in resp_iterator:
+                yield SimpleGRpcTools.response_obj_to_cresult(resp_obj)
+        except:
+            yield SimpleGRpcTools._call_error_to_cresult()
+
     @staticmethod
     def _update_logging_head_value(info_dict, logging_para):
         """
@@ -1041,6 +1437,461 @@ class SimpleGRpcTools(object):
         return _logging_para
 
 
+class SimpleGRpcChannelRegistry(object):
+    """
+    进程内共享的gRPC通道（channel）登记表
+    按连接参数（connect_para中与连接相关的参数）共享channel，首次使用时才创建，可以在多线程中同时使用；
+    后台线程定期关闭空闲超时的channel，并可选通过SimpleGRpc自定义健康检查剔除不可用的channel
+
+    @example
+        with SimpleGRpcChannelRegistry.use_channel(connect_para) as _channel_info:
+            _cresult = SimpleGRpcTools.grpc_call_by_stub(_channel_info.stub, rpc_request)
+    """
+
+    _lock = threading.RLock()  # 登记表的操作锁
+    _channels = dict()  # 共享的通道信息字典，key为连接参数生成的key
+    _check_thread = None  # 后台检查线程
+    _check_event = threading.Event()  # 用于唤醒后台检查线程
+    _idle_timeout = 300  # 空闲超时时间，单位为秒
+    _check_interval = 10  # 后台检查的间隔时间，单位为秒
+    _health_check_interval = 0  # 健康检查的间隔时间，单位为秒，0代表不进行健康检查
+    _health_check_timeout = 5  # 健康检查的超时时间，单位为秒
+
+    #############################
+    # 公共函数
+    #############################
+    @classmethod
+    def set_para(cls, idle_timeout=None, check_interval=None,
+                 health_check_interval=None, health_check_timeout=None):
+        """
+        设置登记表的处理参数（不传入的参数保持不变）
+
+        @param {number} idle_timeout=None - 空闲超时时间，单位为秒，超过该时间未使用的channel将被关闭，默认为300
+        @param {number} check_interval=None - 后台检查的间隔时间，单位为秒，默认为10
+        @param {number} health_check_interval=None - 健康检查的间隔时间，单位为秒，默认为0（不进行健康检查）
+        @param {number} health_check_timeout=None - 健康检查的超时时间，单位为秒，默认为5
+        """
+        with cls._lock:
+            if idle_timeout is not None:
+                cls._idle_timeout = idle_timeout
+            if check_interval is not None:
+                cls._check_interval = check_interval
+            if health_check_interval is not None:
+                cls._health_check_interval = health_check_interval
+            if health_check_timeout is not None:
+                cls._health_check_timeout = health_check_timeout
+        cls._check_event.set()
+
+    @classmethod
+    def get_channel(cls, connect_para):
+        """
+        获取连接参数对应的共享通道信息（不存在或已不可用时创建），并将使用计数+1
+        注：使用完成后必须调用release_channel，建议使用use_channel
+
+        @param {object} connect_para - 客户端连接参数，参考SimpleGRpcTools.generate_connect_para
+
+        @returns {NullObj} - 通道信息，属性如下：
+            channel - grpc.Channel对象
+            stub - SimpleGRpcService的调用stub
+        """
+        _key = cls._get_channel_key(connect_para)
+        with cls._lock:
+            _channel_info = cls._channels.get(_key, None)
+            if _channel_info is not None and (
+                not _channel_info.is_healthy or
+                _channel_info.state == grpc.ChannelConnectivity.SHUTDOWN
+            ):
+                # 通道已不可用，移出登记表，没有在使用时直接关闭
+                cls._remove_channel(_channel_info)
+                _channel_info = None
+
+            if _channel_info is None:
+                _channel_info = cls._create_channel(_key, connect_para)
+                cls._channels[_key] = _channel_info
+                cls._start_check_thread()
+
+            _channel_info.using_count += 1
+            _channel_info.last_use_time = time.monotonic()
+            return _channel_info
+
+    @classmethod
+    def release_channel(cls, channel_info):
+        """
+        释放通过get_channel获取的通道信息（使用计数-1）
+
+        @param {NullObj} channel_info - get_channel返回的通道信息
+        """
+        with cls._lock:
+            channel_info.using_count -= 1
+            channel_info.last_use_time = time.monotonic()
+            if channel_info.is_removed and channel_info.using_count <= 0:
+                # 已移出登记表的通道，不再使用时关闭
+                cls._close_channel(channel_info)
+
+    @classmethod
+    @contextmanager
+    def use_channel(cls, connect_para):
+        """
+        以with方式使用共享通道
+
+        @param {object} connect_para - 客户端连接参数，参考SimpleGRpcTools.generate_connect_para
+
+        @returns {NullObj} - 通道信息，参考get_channel
+        """
+        _channel_info = cls.get_channel(connect_para)
+        try:
+            yield _channel_info
+        finally:
+            cls.release_channel(_channel_info)
+
+    @classmethod
+    def close_all(cls):
+        """
+        关闭所有共享通道（正在使用的通道在使用完成后关闭）
+        """
+        with cls._lock:
+            for _channel_info in list(cls._channels.values()):
+                cls._remove_channel(_channel_info)
+        cls._check_event.set()
+
+    @classmethod
+    def channel_count(cls):
+        """
+        获取当前登记表中的通道数量
+
+        @returns {int} - 通道数量
+        """
+        with cls._lock:
+            return len(cls._channels)
+
+    #############################
+    # 内部函数
+    #############################
+    @staticmethod
+    def _get_channel_key(connect_para):
+        """
+        根据连接参数生成通道的key（只使用与连接相关的参数）
+
+        @param {object} connect_para - 客户端连接参数
+
+        @returns {tuple} - 通道的key
+        """
+        return (
+            connect_para.ip, connect_para.port, connect_para.conn_str,
+            connect_para.is_use_ssl, connect_para.root_certificates,
+            connect_para.private_key, connect_para.certificate_chain,
+            repr(connect_para.options), repr(connect_para.compression)
+        )
+
+    @classmethod
+    def _create_channel(cls, key, connect_para):
+        """
+        创建通道信息
+
+        @param {tuple} key - 通道的key
+        @param {object} connect_para - 客户端连接参数
+
+        @returns {NullObj} - 通道信息
+        """
+        _channel_info = NullObj()
+        _channel_info.key = key
+        _channel_info.channel = SimpleGRpcTools.generate_channel(connect_para)
+        _channel_info.stub = SimpleGRpcTools.generate_call_stub(_channel_info.channel)
+        _channel_info.using_count = 0
+        _channel_info.last_use_time = time.monotonic()
+        _channel_info.last_health_check_time = _channel_info.last_use_time
+        _channel_info.is_healthy = True
+        _channel_info.is_removed = False
+        _channel_info.state = grpc.ChannelConnectivity.IDLE
+
+        # 订阅连接状态变化，通道被关闭时可以及时发现
+        def _on_state_change(state):
+            _channel_info.state = state
+
+        _channel_info.state_callback = _on_state_change
+        _channel_info.channel.subscribe(_on_state_change, try_to_connect=False)
+        return _channel_info
+
+    @classmethod
+    def _remove_channel(cls, channel_info):
+        """
+        将通道移出登记表，没有在使用时直接关闭（需在锁内调用）
+
+        @param {NullObj} channel_info - 通道信息
+        """
+        if cls._channels.get(channel_info.key, None) is channel_info:
+            del cls._channels[channel_info.key]
+        channel_info.is_removed = True
+        if channel_info.using_count <= 0:
+            cls._close_channel(channel_info)
+
+    @staticmethod
+    def _close_channel(channel_info):
+        """
+        关闭通道
+
+        @param {NullObj} channel_info - 通道信息
+        """
+        if channel_info.channel is None:
+            return
+        _channel = channel_info.channel
+        channel_info.channel = None
+        channel_info.stub = None
+        with ExceptionTool.ignored_all():
+            _channel.unsubscribe(channel_info.state_callback)
+        with ExceptionTool.ignored_all():
+            _channel.close()
+
+    @classmethod
+    def _start_check_thread(cls):
+        """
+        启动后台检查线程（需在锁内调用）
+        """
+        if cls._check_thread is None:
+            cls._check_event.clear()
+            cls._check_thread = threading.Thread(
+                target=cls._check_thread_fun, name='SimpleGRpcChannelRegistry-check', daemon=True
+            )
+            cls._check_thread.start()
+
+    @classmethod
+    def _check_thread_fun(cls):
+        """
+        后台检查线程函数，关闭空闲超时的通道，并进行健康检查；登记表为空时线程结束
+        """
+        while True:
+            cls._check_event.wait(cls._check_interval)
+            cls._check_event.clear()
+            _now = time.monotonic()
+            _check_list = list()
+            with cls._lock:
+                if len(cls._channels) == 0:
+                    cls._check_thread = None
+                    return
+
+                for _channel_info in list(cls._channels.values()):
+                    if _channel_info.using_count <= 0 and _now - _channel_info.last_use_time >= cls._idle_timeout:
+                        # 空闲超时
+                        cls._remove_channel(_channel_info)
+                    elif cls._health_check_interval > 0 and \
+                            _now - _channel_info.last_health_check_time >= cls._health_check_interval:
+                        _channel_info.last_health_check_time = _now
+                        _check_list.append(_channel_info)
+
+            # 健康检查在锁外执行，避免阻塞调用方
+            for _channel_info in _check_list:
+                _stub = _channel_info.stub
+                if _channel_info.is_removed or _stub is None:
+                    continue
+                _result = SimpleGRpcTools.simple_grpc_health_check_by_stub(
+                    _stub, timeout=cls._health_check_timeout
+                )
+                if _result.status != msg_pb2.HealthResponse.SERVING:
+                    with cls._lock:
+                        _channel_info.is_healthy = False
+                        cls._remove_channel(_channel_info)
+
+
+class SimpleGRpcCallChainLogWriter(object):
+    """
+    SimpleGRpc调用链日志的异步批量写入对象
+    将该对象作为SimpleGRpcServicer或SimpleGRpcConnection的logger传入，调用链日志信息只放入内存队列后即返回，
+    由后台线程批量格式化并写入实际的日志对象，避免日志处理增加请求的响应时间；支持按调用链抽样及每秒限流
+
+    注1：队列基于collections.deque（append/popleft为原子操作），请求线程写入时无需加锁；
+        队列满、未被抽样或超过限流的日志将直接丢弃，并记录到丢弃计数中（限流及计数的更新需加锁）
+    注2：队列积压达到wakeup_size时将唤醒后台线程，避免日志积压后集中处理影响请求线程的响应时间
+    注3：调用链日志以外的日志（例如异常日志），将直接转调实际的日志对象
+    注4：由于日志在后台线程写入，日志记录中的函数名及行号为后台线程的信息
+
+    @example
+        _writer = SimpleGRpcCallChainLogWriter(logger, sample_rate=0.1, max_per_second=1000)
+        _servicer = SimpleGRpcServicer(logger=_writer)
+        ...
+        _writer.stop()
+    """
+
+    #############################
+    # 公共函数
+    #############################
+    def __init__(self, logger, ring_size=65536, batch_size=512, flush_interval=0.05, wakeup_size=32,
+                 sample_rate=1.0, max_per_second=0, is_always_log_error=True, auto_start=True):
+        """
+        构造函数
+
+        @param {simple_log.Logger} logger - 实际写入日志的日志对象（同步或异步日志对象均可）
+        @param {int} ring_size=65536 - 日志队列的最大长度，超过后的日志将被丢弃
+        @param {int} batch_size=512 - 后台线程每批处理的最大日志数
+        @param {number} flush_interval=0.05 - 队列为空时后台线程的最大等待间隔，单位为秒
+        @param {int} wakeup_size=32 - 队列积压达到该数量时立即唤醒后台线程，0代表只按等待间隔处理
+        @param {float} sample_rate=1.0 - 抽样比例（0-1），按trace_id抽样，同一调用链的日志同时保留或丢弃
+        @param {int} max_per_second=0 - 每秒最大写入日志数，0代表不限制
+        @param {bool} is_always_log_error=True - 有异常信息的日志是否忽略抽样及限流（仍受队列长度限制）
+        @param {bool} auto_start=True - 是否自动启动后台线程
+        """
+        self._logger = logger
+        self._ring = collections.deque()
+        self._ring_size = ring_size
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._wakeup_size = wakeup_size
+        self._sample_threshold = int(max(0.0, min(1.0, sample_rate)) * 0x10000)
+        self._max_per_second = max_per_second
+        self._is_always_log_error = is_always_log_error
+
+        # 限流的当前时间窗口
+        self._window = 0
+        self._window_count = 0
+
+        # 统计信息
+        self.dropped_count = 0  # 因队列满或限流丢弃的日志数
+        self.sampled_out_count = 0  # 未被抽样的日志数
+        self.written_count = 0  # 已写入的日志数
+
+        self._lock = threading.Lock()  # 限流窗口及统计计数的更新锁
+        self._stop_event = threading.Event()
+        self._wakeup_event = threading.Event()
+        self._thread = None
+        if auto_start:
+            self.start()
+
+    def push(self, info_dict):
+        """
+        将调用链日志信息放入队列
+
+        @param {dict} info_dict - 信息字典，参考SimpleGRpcTools.write_api_call_chain_log
+            注：放入队列后不可再修改该字典
+
+        @returns {bool} - 是否放入队列
+        """
+        _is_error = self._is_always_log_error and info_dict.get('error', None) is not None
+        if not _is_error:
+            # 抽样，使用稳定的crc32，保证不同进程对同一调用链的抽样结果一致
+            if self._sample_threshold < 0x10000 and (zlib.crc32(
+                    str(info_dict.get('trace_id', '')).encode('utf-8')) & 0xFFFF) >= self._sample_threshold:
+                with self._lock:
+                    self.sampled_out_count += 1
+                return False
+
+            # 限流
+            if self._max_per_second > 0:
+                _window = int(time.monotonic())
+                with self._lock:
+                    if _window != self._window:
+                        self._window = _window
+                        self._window_count = 0
+                    self._window_count += 1
+                    if self._window_count > self._max_per_second:
+                        self.dropped_count += 1
+                        return False
+
+        _len = len(self._ring)
+        if _len >= self._ring_size:
+            with self._lock:
+                self.dropped_count += 1
+            return False
+
+        self._ring.append((self._logger, info_dict))
+        if self._wakeup_size > 0 and _len + 1 >= self._wakeup_size and not self._wakeup_event.is_set():
+            self._wakeup_event.set()
+        return True
+
+    def start(self):
+        """
+        启动后台写日志线程（已启动的情况不处理）
+        """
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._wakeup_event.clear()
+        self._thread = threading.Thread(
+            target=self._write_thread_fun, name='SimpleGRpcCallChainLogWriter', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, is_wait=True, overtime=None):
+        """
+        停止后台写日志线程，停止前会写入队列中的所有日志
+
+        @param {bool} is_wait=True - 是否等待线程结束
+        @param {number} overtime=None - 等待超时时间，单位为秒，None代表一直等待
+        """
+        if self._thread is None:
+            return
+        _thread = self._thread
+        self._stop_event.set()
+        self._wakeup_event.set()
+        if is_wait:
+            _thread.join(overtime)
+
+    def flush(self):
+        """
+        在当前线程写入队列中的所有日志
+        """
+        while self._write_batch() > 0:
+            pass
+
+    def pending_count(self):
+        """
+        获取队列中尚未写入的日志数
+
+        @returns {int} - 日志数
+        """
+        return len(self._ring)
+
+    def __getattr__(self, name):
+        """
+        调用链日志以外的属性及函数，直接转调实际的日志对象
+        """
+        if name == '_logger':
+            raise AttributeError(name)
+        return getattr(self._logger, name)
+
+    #############################
+    # 内部函数
+    #############################
+    def _write_batch(self, is_yield=False):
+        """
+        批量写入队列中的日志
+
+        @param {bool} is_yield=False - 每写入一条日志是否主动让出GIL，避免后台线程长时间占用GIL影响请求线程的响应时间
+
+        @returns {int} - 本批写入的日志数
+        """
+        _count = 0
+        _popleft = self._ring.popleft
+        while _count < self._batch_size:
+            try:
+                _logger, _info_dict = _popleft()
+            except IndexError:
+                break
+            with ExceptionTool.ignored_all():
+                SimpleGRpcTools._deal_api_call_chain_log(_logger, _info_dict)
+            _count += 1
+            if is_yield:
+                time.sleep(0)
+        if _count > 0:
+            # flush可能与后台线程同时执行，计数需加锁
+            with self._lock:
+                self.written_count += _count
+        return _count
+
+    def _write_thread_fun(self):
+        """
+        后台写日志线程函数
+        """
+        try:
+            while not self._stop_event.is_set():
+                if self._write_batch(is_yield=True) == 0:
+                    # 队列为空，等待下一批（积压达到wakeup_size或停止时唤醒）
+                    self._wakeup_event.wait(self._flush_interval)
+                    self._wakeup_event.clear()
+            # 结束前写入剩余日志
+            self.flush()
+        finally:
+            self._thread = None
+
+
 if __name__ == '__main__':
     # 当程序自己独立运行时执行的操作
     # 打印版本信息
@@ -20,6 +20,8 @@ import sys
 import copy
 import json
 import re
+import threading
+from collections import OrderedDict
 # 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
 from HiveNetLib.base_tools.run_tool import RunTool
@@ -237,14 +239,100 @@ class SimpleI18N(object):
         @returns {string} - 国际化转换后的字符串
 
         """
-        temp_lang = lang
-        if lang is None:
-            temp_lang = self.lang
+        _lang_dict = self.__trans_dict.get(self.lang if lang is None else lang, None)
         s = msg_id
-        if temp_lang in self.__trans_dict.keys() and msg_id in self.__trans_dict[temp_lang].keys():
+        if _lang_dict is not None and msg_id in _lang_dict:
             # 可以找到对应的语言信息
-            s = self.__trans_dict[temp_lang][msg_id]
+            s = _lang_dict[msg_id]
         # 替换占位符
+        return SimpleI18N.replace_paras(s, replace_para)
+
+    #############################
+    # 占位符替换
+    #############################
+    TEMPLATE_CACHE_SIZE = 2048  # 占位符模版缓存的最大数量
+    _template_cache = OrderedDict()  # 占位符模版缓存, key为文本, value为拆分后的模版
+    _template_cache_lock = threading.Lock()  # 占位符模版缓存的更新锁
+    _TEMPLATE_PARA_REGEX = re.compile(r'\$([1-9])')  # 匹配占位符的正则表达式
+
+    @classmethod
+    def replace_paras(cls, s, replace_para=()):
+        """
+        将文本中的$1、$2等占位符替换为变量值
+        注：文本拆分后的模版会进行缓存，同一文本多次替换时无需重复解析
+
+        @param {string} s - 要处理的文本
+        @param {tuple} replace_para=() - 进行占位符替换的变量，第1个变量替换$1，第2个变量替换$2，依此类推
+
+        @returns {string} - 替换后的文本
+        """
+        if not replace_para or s.find('$') < 0:
+            return s
+
+        _template = cls._template_cache.get(s, None)
+        if _template is None:
+            _template = cls._compile_template(s)
+        if _template is False:
+            # 文本中有紧接占位符的'$'符号, 替换后可能组成新的占位符, 按原方式逐个替换
+            return cls._replace_paras_one_by_one(s, replace_para)
+
+        if type(replace_para) not in (tuple, list):
+            replace_para = tuple(replace_para)
+        _paras = [str(_para) for _para in replace_para[0: _template[0]]]
+        for _para in _paras:
+            if _para.find('$') >= 0:
+                # 变量中也有占位符, 按原方式逐个替换(替换后的内容可能被后面的变量再次替换)
+                return cls._replace_paras_one_by_one(s, replace_para)
+
+        _len = len(_paras)
+        return ''.join([
+            _part if type(_part) == str else (_paras[_part] if _part < _len else '$%d' % (_part + 1))
+            for _part in _template[1]
+        ])
+
+    @classmethod
+    def _compile_template(cls, s):
+        """
+        将文本拆分为占位符模版并放入缓存
+
+        @param {string} s - 要处理的文本
+
+        @returns {tuple} - 模版，格式为(最大变量序号, (文本, 变量下标, 文本, ...))
+            注：如果文本中有紧接占位符的'$'符号，返回False
+        """
+        _parts = list()
+        _max_index = 0
+        for _index, _part in enumerate(cls._TEMPLATE_PARA_REGEX.split(s)):
+            if _index % 2 == 0:
+                if _part != '':
+                    _parts.append(_part)
+            else:
+                _parts.append(int(_part) - 1)
+                _max_index = max(_max_index, int(_part))
+
+        _template = (_max_index, tuple(_parts))
+        for _index in range(len(_parts) - 1):
+            if type(_parts[_index]) == str and _parts[_index].endswith('$') and type(_parts[_index + 1]) == int:
+                _template = False
+                break
+
+        with cls._template_cache_lock:
+            if len(cls._template_cache) >= cls.TEMPLATE_CACHE_SIZE:
+                cls._template_cache.popitem(last=False)
+            cls._template_cache[s] = _template
+
+        return _template
+
+    @classmethod
+    def _replace_paras_one_by_one(cls, s, replace_para):
+        """
+        按变量顺序逐个进行占位符替换
+
+        @param {string} s - 要处理的文本
+        @param {tuple} replace_para - 进行占位符替换的变量
+
+        @returns {string} - 替换后的文本
+        """
         i = 1  # 记录是第几个
         for para in replace_para:
             if s.find('$' + str(i)) >= 0:
@@ -19,6 +19,13 @@ import os
 import sys
 import threading
 from multiprocessing import Process, Manager, Lock
+from multiprocessing import Queue as ProcessQueue
+from multiprocessing.sharedctypes import RawArray
+from queue import Queue, Empty
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from collections import deque
+import itertools
+import pickle
 import datetime
 import traceback
 import inspect
@@ -379,6 +386,9 @@ class ParallelFw(ABC):
     _is_running = False  # 任务运行状态
     _stat_lock = None
 
+    # 并发任务是否与创建方共享内存(例如线程), 共享内存的情况任务池可直接将Future对象传递给工作任务
+    _share_memory = False
+
     #############################
     # 公开函数
     #############################
@@ -390,7 +400,7 @@ class ParallelFw(ABC):
         @property {bool}
 
         """
-        return self._is_running
+        return self._get_is_running()
 
     def __init__(
         self, deal_fun, run_args=None, run_kwargs=None, auto_start=False,
@@ -607,6 +617,17 @@ class ParallelFw(ABC):
                 raise CallOverTime
             RunTool.sleep(0.001)  # 准备下一次循环
 
+    def bind_cpu(self, cpu_num=1):
+        """
+        绑定并发任务在指定CPU上执行
+
+        @param {long} cpu_num=1L - 要指定的CPU(掩码)
+
+        @throws {NotImplementedError} - 当实现类不支持绑定CPU时, 抛出该异常
+
+        """
+        raise NotImplementedError
+
     #############################
     # 内部函数
     #############################
@@ -902,6 +923,30 @@ class ParallelFw(ABC):
         """
         return ProcessParallelLock()
 
+    @classmethod
+    def _create_task_queue(cls):
+        """
+        创建任务池提交任务所使用的队列(默认为支持多进程访问的队列)
+
+        @returns {object} - 返回队列对象, 需支持put/get(block, timeout)/qsize方法
+
+        """
+        return ProcessQueue()
+
+    @classmethod
+    def _create_control_block(cls, size, keys, datetime_keys=()):
+        """
+        创建任务池工作任务共享状态的控制块
+
+        @param {int} size - 需要的槽位数量
+        @param {tuple} keys - 每个槽位的字段名清单
+        @param {tuple} datetime_keys=() - 值为datetime类型的字段名清单
+
+        @returns {ProcessParallelControlBlock} - 返回控制块对象, 返回None代表不支持, 任务池将使用sharedict_class
+
+        """
+        return None
+
     def _create_is_running_obj(self):
         """
         创建是否运行状态的共享变量
@@ -930,12 +975,128 @@ class ParallelFw(ABC):
         is_running_obj['is_running'] = status
 
 
+class ParallelCpuPlacement(object):
+    """
+    并发池工作任务的CPU分配策略
+
+    @param {string|list} policy - 分配策略, 可选值如下:
+        'round_robin' - 按CPU编号顺序轮流分配
+        'compact' - 优先分配同一物理CPU及同一核心上的逻辑CPU(超线程), 让工作任务尽量集中
+        'spread' - 优先分配不同物理CPU及不同核心, 让工作任务尽量分散
+        list - 指定的CPU编号清单, 例如[0, 2, 4]
+    @param {list} cpus=None - 可分配的CPU编号清单, None代表当前进程可使用的所有CPU
+        注: 当policy为list时该参数无效
+
+    @throws {ValueError} - 当策略不支持时, 抛出该异常
+
+    """
+
+    def __init__(self, policy, cpus=None):
+        """
+        构造函数
+
+        @param {string|list} policy - 分配策略, 'round_robin'/'compact'/'spread'或指定的CPU编号清单
+        @param {list} cpus=None - 可分配的CPU编号清单, None代表当前进程可使用的所有CPU
+
+        @throws {ValueError} - 当策略不支持时, 抛出该异常
+
+        """
+        self.policy = policy
+        if isinstance(policy, (list, tuple)):
+            if len(policy) == 0:
+                raise ValueError('cpu placement list is empty')
+            self._order = list(policy)
+        else:
+            if cpus is None:
+                cpus = affinity.get_available_cpus()
+            _topology = affinity.get_cpu_topology(cpus)
+            if policy == 'round_robin':
+                self._order = sorted(cpus)
+            elif policy == 'compact':
+                self._order = sorted(cpus, key=lambda _cpu: (_topology[_cpu], _cpu))
+            elif policy == 'spread':
+                self._order = self._get_spread_order(_topology)
+            else:
+                raise ValueError('unsupport cpu placement policy [%s]' % str(policy))
+
+        self._lock = threading.Lock()
+        self._next = 0  # round_robin的下一个位置
+        self._load = dict()  # 每个CPU已分配的工作任务数
+        for _cpu in self._order:
+            self._load[_cpu] = 0
+        self._assigned = dict()  # 工作任务已分配的CPU, key为工作任务标识
+
+    def alloc(self, tid):
+        """
+        为工作任务分配CPU
+
+        @param {string} tid - 工作任务标识
+
+        @returns {int} - 分配的CPU编号
+
+        """
+        with self._lock:
+            if self.policy == 'round_robin':
+                _cpu = self._order[self._next % len(self._order)]
+                self._next += 1
+            else:
+                # 选择已分配任务最少的CPU, 相同的情况按策略顺序优先
+                _index = min(
+                    range(len(self._order)), key=lambda _i: (self._load[self._order[_i]], _i)
+                )
+                _cpu = self._order[_index]
+            self._load[_cpu] += 1
+            self._assigned[tid] = _cpu
+            return _cpu
+
+    def free(self, tid):
+        """
+        释放工作任务分配的CPU
+
+        @param {string} tid - 工作任务标识
+
+        """
+        with self._lock:
+            _cpu = self._assigned.pop(tid, None)
+            if _cpu is not None:
+                self._load[_cpu] -= 1
+
+    @staticmethod
+    def _get_spread_order(topology):
+        """
+        获取分散分配的CPU顺序: 在物理CPU之间轮流, 同一物理CPU内先分配每个核心的第一个逻辑CPU
+
+        @param {dict} topology - CPU拓扑, key为CPU编号, value为(物理CPU编号, 核心编号)
+
+        @returns {list} - CPU编号顺序
+        """
+        # 按物理CPU分组, 组内按(核心内序号, 核心编号)排序
+        _core_rank = dict()
+        _packages = dict()
+        for _cpu in sorted(topology.keys()):
+            _package, _core = topology[_cpu]
+            _rank = _core_rank.get((_package, _core), 0)
+            _core_rank[(_package, _core)] = _rank + 1
+            _packages.setdefault(_package, list()).append((_rank, _core, _cpu))
+
+        _groups = [sorted(_packages[_package]) for _package in sorted(_packages.keys())]
+        _order = list()
+        _index = 0
+        while len(_order) < len(topology):
+            for _group in _groups:
+                if _index < len(_group):
+                    _order.append(_group[_index][2])
+            _index += 1
+        return _order
+
+
 class ParallelPool(object):
     """
     并发任务池(线程池、进程池)
 
     @param {fuction} deal_fun - 并发任务处理主函数, 按顺序入参, 可以有返回值
             注: 该函数内部需自行实现获取数据并处理的流程, 但约定如果无处理数据, 函数应返回None(用于并发池判断是否释放任务)
+            注: 如果传入None代表使用任务提交模式, 通过submit函数提交任务, 工作任务阻塞等待task_queue获取任务执行
     @param {ParallelFw} parallel_class=None - 并行任务类定义对象, 获取方法如下:
         (1)import对象后, 直接取类名: parallel_class=ThreadParallel
         (2)未import的对象, 使用ImportTool的方式:
@@ -979,6 +1140,7 @@ class ParallelPool(object):
     @param {bool} auto_stop=False - 是否自动关闭并发池(当任务都已全部完成处理)
     @param {QueueFw} task_queue=None - 并发池需要处理的任务队列
         注: 如果有指定队列, get_task_num_fun参数无效, 则自动根据队列长度检查待处理任务
+        注: 任务提交模式下如果不传入, 将通过parallel_class._create_task_queue自动创建
     @param {function} get_task_num_fun=None - 获取待处理任务数量的函数
         注: 如果task_queue和get_task_num_fun均为None, 则直接创建最大数量的线程数, 且不释放空闲任务
     @param {list} get_task_num_fun_args=None - 获取待处理任务数量的函数, 的入参列表
@@ -991,10 +1153,22 @@ class ParallelPool(object):
     @param {bool} replace_overtime_worker=False - 是否创建新任务替代超时任务
         注: 仅当force_kill_overtime_worker=False时才会进行替代
     @param {number} daemon_thread_time=0.01 - 守护线程的间隔时间
+        注: 任务提交模式下submit会主动唤醒守护线程, 可设置较大的间隔时间以减少空闲时的消耗
+    @param {number} task_get_timeout=1 - 任务提交模式下工作任务阻塞获取任务的超时时间, 单位为秒
+        注: 超时后工作任务会检查一次任务池的控制指令, 再继续阻塞等待
     @param {ParallelShareDictFw} sharedict_class=None - 进程间共享字典对象的类对象, 获取方法参考parallel_class:
         sharedict_class=ThreadParallelShareDict
     @param {ParallelLockFw} parallel_lock_class=None - 进程间锁对象的类对象, 获取方法参考parallel_class:
         parallel_lock_class=ThreadParallelLock
+    @param {bool} use_control_block=True - 是否使用并行任务类提供的共享内存控制块保存工作任务状态
+        注: 多进程任务池将使用一整块共享内存保存所有工作任务的状态, 无需为每个工作任务启动Manager进程;
+        如果并行任务类不支持或槽位已用完, 将使用sharedict_class创建共享对象
+    @param {string|list} cpu_placement=None - 工作任务的CPU绑定策略, None代表不绑定, 可选值如下:
+        'round_robin' - 按CPU编号顺序轮流绑定
+        'compact' - 优先绑定同一物理CPU及同一核心上的逻辑CPU
+        'spread' - 优先绑定不同物理CPU及不同核心
+        list - 指定的CPU编号清单, 例如[0, 2, 4]
+        注: 工作任务创建时(包括替代任务)按策略绑定, 并行任务类需支持bind_cpu, 具体分配规则见ParallelCpuPlacement
     @param {**kwargs} kwargs - 并行任务类对应的初始化参数, 具体参数定义参考具体实现类
 
     """
@@ -1013,7 +1187,8 @@ class ParallelPool(object):
         auto_start=False, auto_stop=False, task_queue=None, get_task_num_fun=None, get_task_num_fun_args=None,
         maxsize=10, minsize=0, worker_release_time=10, worker_overtime=0,
         force_kill_overtime_worker=False, replace_overtime_worker=False, daemon_thread_time=0.01,
-        sharedict_class=None, parallel_lock_class=None,
+        sharedict_class=None, parallel_lock_class=None, task_get_timeout=1, use_control_block=True,
+        cpu_placement=None,
         **kwargs
     ):
         """
@@ -1021,6 +1196,7 @@ class ParallelPool(object):
 
         @param {fuction} deal_fun - 并发任务处理主函数, 按顺序入参, 可以有返回值
             注: 该函数内部需自行实现获取数据并处理的流程, 但约定如果无处理数据, 函数应返回None(用于并发池判断是否释放任务)
+            注: 如果传入None代表使用任务提交模式, 通过submit函数提交任务, 工作任务阻塞等待task_queue获取任务执行
         @param {ParallelFw} parallel_class=None - 并行任务类定义对象, 获取方法如下:
             (1)import对象后, 直接取类名: parallel_class=ThreadParallel
             (2)未import的对象, 使用ImportTool的方式:
@@ -1064,6 +1240,7 @@ class ParallelPool(object):
         @param {bool} auto_stop=False - 是否自动关闭并发池(当任务都已全部完成处理)
         @param {QueueFw} task_queue=None - 并发池需要处理的任务队列
             注: 如果有指定队列, get_task_num_fun参数无效, 则自动根据队列长度检查待处理任务
+            注: 任务提交模式下如果不传入, 将通过parallel_class._create_task_queue自动创建
         @param {function} get_task_num_fun=None - 获取待处理任务数量的函数
             注: 如果task_queue和get_task_num_fun均为None, 则直接创建最大数量的线程数, 且不释放空闲任务
         @param {list} get_task_num_fun_args=None - 获取待处理任务数量的函数, 的入参列表
@@ -1076,10 +1253,22 @@ class ParallelPool(object):
         @param {bool} replace_overtime_worker=False - 是否创建新任务替代超时任务
             注: 仅当force_kill_overtime_worker=False时才会进行替代
         @param {number} daemon_thread_time=0.01 - 守护线程的间隔时间
+            注: 任务提交模式下submit会主动唤醒守护线程, 可设置较大的间隔时间以减少空闲时的消耗
+        @param {number} task_get_timeout=1 - 任务提交模式下工作任务阻塞获取任务的超时时间, 单位为秒
+            注: 超时后工作任务会检查一次任务池的控制指令, 再继续阻塞等待
         @param {ParallelShareDictFw} sharedict_class=None - 进程间共享字典对象的类对象, 获取方法参考parallel_class:
             sharedict_class=ThreadParallelShareDict
         @param {ParallelLockFw} parallel_lock_class=None - 进程间锁对象的类对象, 获取方法参考parallel_class:
             parallel_lock_class=ThreadParallelLock
+        @param {bool} use_control_block=True - 是否使用并行任务类提供的共享内存控制块保存工作任务状态
+            注: 多进程任务池将使用一整块共享内存保存所有工作任务的状态, 无需为每个工作任务启动Manager进程;
+            如果并行任务类不支持或槽位已用完, 将使用sharedict_class创建共享对象
+        @param {string|list} cpu_placement=None - 工作任务的CPU绑定策略, None代表不绑定, 可选值如下:
+            'round_robin' - 按CPU编号顺序轮流绑定
+            'compact' - 优先绑定同一物理CPU及同一核心上的逻辑CPU
+            'spread' - 优先绑定不同物理CPU及不同核心
+            list - 指定的CPU编号清单, 例如[0, 2, 4]
+            注: 工作任务创建时(包括替代任务)按策略绑定, 并行任务类需支持bind_cpu, 具体分配规则见ParallelCpuPlacement
         @param {**kwargs} kwargs - 并行任务类对应的初始化参数, 具体参数定义参考具体实现类
 
         """
@@ -1116,6 +1305,11 @@ class ParallelPool(object):
         self._is_logger_to_deal_fun = is_logger_to_deal_fun
 
         self._auto_stop = auto_stop
+        self._is_submit_mode = (deal_fun is None)
+        self._task_get_timeout = task_get_timeout
+        if self._is_submit_mode and task_queue is None:
+            # 任务提交模式, 由并行任务类创建匹配的队列
+            task_queue = self._parallel_class._create_task_queue()
         self._task_queue = task_queue
         self._get_task_num_fun = get_task_num_fun
         self._get_task_num_fun_args = get_task_num_fun_args
@@ -1139,6 +1333,13 @@ class ParallelPool(object):
         self._parallel_lock_class = parallel_lock_class
         if parallel_lock_class is None:
             self._parallel_lock_class = ThreadParallelLock
+        self._use_control_block = use_control_block
+        self._control_block = None  # 工作任务状态的共享内存控制块
+        self._cpu_placement_policy = cpu_placement
+        self._cpu_placement = None  # 工作任务的CPU分配对象
+        if cpu_placement is not None:
+            # 提前检查策略是否支持
+            self._cpu_placement = ParallelCpuPlacement(cpu_placement)
         self._kwargs = kwargs
 
         # 初始化内部处理的变量
@@ -1147,6 +1348,15 @@ class ParallelPool(object):
         self._daemon = None  # 守护线程
         self._workers_lock = threading.RLock()  # 工作任务清单的访问锁
         self._overtime_workers = dict()  # 超时执行的工作任务清单, key为工作任务标识uuid
+        self._daemon_event = threading.Event()  # 唤醒守护线程的事件
+
+        # 任务提交模式的结果返回处理, 非共享内存的并行任务通过结果队列返回, 由结果分发线程设置Future
+        self._result_queue = None
+        self._result_thread = None
+        self._futures = dict()  # 等待结果的Future清单, key为任务id
+        self._task_id_seq = itertools.count()
+        if self._is_submit_mode and not self._parallel_class._share_memory:
+            self._result_queue = ProcessQueue()
 
         # 公共共享信息, key包括:
         # working_num  - 正在执行任务的任务数, 开始执行任务时+1, 任务完成后-1
@@ -1176,11 +1386,29 @@ class ParallelPool(object):
         # 初始化状态
         self._status = 1
         self._overtime_workers.clear()
-        self._share_info = self._sharedict_class(self._pool_id)
+        self._control_block = None
+        if self._use_control_block:
+            # 控制块槽位包括公共共享信息以及工作任务(替代超时任务的情况预留多一倍)
+            self._control_block = self._parallel_class._create_control_block(
+                self._maxsize * (2 if self._replace_overtime_worker else 1) + 1,
+                ('status', 'cmd', 'starttime', 'taskbegin', 'freebegin', 'working_num'),
+                datetime_keys=('starttime', 'taskbegin', 'freebegin')
+            )
+        self._share_info = self._create_share_dict(self._pool_id)
+        if self._cpu_placement_policy is not None:
+            self._cpu_placement = ParallelCpuPlacement(self._cpu_placement_policy)
         self._share_info['working_num'] = 0
         self._workers.clear()
 
+        # 启动结果分发线程
+        if self._result_queue is not None:
+            self._result_thread = ThreadParallel(
+                self._result_dispatch_fun, auto_start=True, pname='result_dispatch', set_daemon=True,
+                logger=self._logger, log_level=self._log_level
+            )
+
         # 直接启动daemon线程即可
+        self._daemon_event.clear()
         self._daemon = ThreadParallel(
             self._daemon_fun, auto_start=True, pname='daemon', set_daemon=True,
             logger=self._logger, log_level=self._log_level
@@ -1202,6 +1430,7 @@ class ParallelPool(object):
 
         # 发送命令
         self._status = 5  # 通知停止
+        self._daemon_event.set()
         if force:
             # 强制停止所有进程
             self._workers_lock.acquire()
@@ -1233,6 +1462,7 @@ class ParallelPool(object):
 
         # 发送命令
         self._status = 3  # 通知暂停
+        self._daemon_event.set()
         if overtime > 0:
             # 等待
             _starttime = datetime.datetime.now()
@@ -1257,6 +1487,7 @@ class ParallelPool(object):
 
         # 发送命令
         self._status = 4  # 通知暂停
+        self._daemon_event.set()
         if overtime > 0:
             # 等待
             _starttime = datetime.datetime.now()
@@ -1266,6 +1497,136 @@ class ParallelPool(object):
                     # 超时抛出异常
                     raise CallOverTime
 
+    def submit(self, fn, *args, **kwargs):
+        """
+        提交任务到并发池执行(任务提交模式)
+
+        @param {function} fn - 要执行的任务函数
+            注: 如果并行任务为多进程, 函数及参数需支持pickle序列化
+        @param {*args} args - 任务函数的固定入参
+        @param {**kwargs} kwargs - 任务函数的动态入参
+
+        @returns {concurrent.futures.Future} - 获取任务执行结果的Future对象
+            注: 多进程模式下取消Future只代表不再接收结果, 已提交的任务仍会执行
+
+        @throws {RuntimeError} - 当并发池不是任务提交模式(deal_fun不为None)时, 抛出该异常
+        @throws {NotRunning} - 当并发池未启动或正在停止时, 抛出该异常
+
+        """
+        if not self._is_submit_mode:
+            raise RuntimeError('ParallelPool submit only support when deal_fun is None')
+
+        if self._status in (0, 5):
+            raise NotRunning('ParallelPool is not running')
+
+        _future = Future()
+        if self._result_queue is None:
+            # 共享内存模式, 直接将Future对象传递给工作任务
+            self._task_queue.put((_future, fn, args, kwargs))
+        else:
+            _task_id = next(self._task_id_seq)
+            self._futures[_task_id] = _future
+            self._task_queue.put((_task_id, fn, args, kwargs))
+
+        if self._status == 0:
+            # 提交过程中并发池已停止, 取消队列中的任务
+            self._cancel_submit_tasks()
+
+        # 通知守护线程检查是否需要创建工作任务
+        self._daemon_event.set()
+        return _future
+
+    def map(self, fn, iterable, chunksize=1, ordered=True, timeout=None):
+        """
+        将任务函数应用到可迭代对象的每个元素上, 返回全部执行结果(任务提交模式)
+
+        @param {function} fn - 要执行的任务函数, 以单个元素作为入参
+        @param {iterable} iterable - 要处理的元素的可迭代对象
+        @param {int} chunksize=1 - 每个批次包含的元素数量
+            注: 多进程模式下设置较大的批次可减少进程间通讯及序列化的消耗
+        @param {bool} ordered=True - 返回结果是否与元素的顺序一致, 如果为False按批次完成的顺序返回
+        @param {number} timeout=None - 等待每个批次执行结果的超时时间, 单位为秒, None代表一直等待
+
+        @returns {list} - 执行结果列表
+
+        @throws {concurrent.futures.TimeoutError} - 等待批次结果超时时抛出该异常
+        @throws {Exception} - 任务函数执行出现的异常, 在获取对应结果时抛出
+
+        """
+        return list(self.imap(fn, iterable, chunksize=chunksize, ordered=ordered, timeout=timeout))
+
+    def imap(self, fn, iterable, chunksize=1, ordered=True, timeout=None):
+        """
+        将任务函数应用到可迭代对象的每个元素上, 以迭代器方式逐个返回执行结果(任务提交模式)
+        注: 元素按批次延迟提交, 同时处理中的批次不超过maxsize的两倍, 避免一次性加载所有元素
+
+        @param {function} fn - 要执行的任务函数, 以单个元素作为入参
+        @param {iterable} iterable - 要处理的元素的可迭代对象
+        @param {int} chunksize=1 - 每个批次包含的元素数量
+            注: 多进程模式下设置较大的批次可减少进程间通讯及序列化的消耗
+        @param {bool} ordered=True - 返回结果是否与元素的顺序一致, 如果为False按批次完成的顺序返回
+        @param {number} timeout=None - 等待每个批次执行结果的超时时间, 单位为秒, None代表一直等待
+
+        @returns {iterator} - 执行结果的迭代器
+
+        @throws {concurrent.futures.TimeoutError} - 等待批次结果超时时抛出该异常
+        @throws {Exception} - 任务函数执行出现的异常, 在获取对应结果时抛出
+        @throws {ValueError} - 当chunksize小于1时, 调用时直接抛出该异常
+
+        """
+        if chunksize < 1:
+            raise ValueError('chunksize must be >= 1')
+
+        return self._imap(fn, iterable, chunksize, ordered, timeout)
+
+    def _imap(self, fn, iterable, chunksize, ordered, timeout):
+        """
+        imap的实际处理生成器
+
+        @param {function} fn - 要执行的任务函数
+        @param {iterable} iterable - 要处理的元素的可迭代对象
+        @param {int} chunksize - 每个批次包含的元素数量
+        @param {bool} ordered - 返回结果是否与元素的顺序一致
+        @param {number} timeout - 等待每个批次执行结果的超时时间
+
+        @returns {iterator} - 执行结果的迭代器
+
+        """
+        _chunks = self._iter_chunks(iterable, chunksize)
+        _max_pending = max(self._maxsize * 2, 1)
+        _pending = deque()
+        try:
+            # 先提交首批任务
+            for _chunk in _chunks:
+                _pending.append(self.submit(self._run_map_chunk, fn, _chunk))
+                if len(_pending) >= _max_pending:
+                    break
+
+            while len(_pending) > 0:
+                if ordered:
+                    _future = _pending.popleft()
+                    _rets = _future.result(timeout=timeout)
+                else:
+                    _done, _ = wait(_pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                    if len(_done) == 0:
+                        # 超时, 通过result抛出TimeoutError
+                        _pending[0].result(timeout=0)
+                    _future = _done.pop()
+                    _pending.remove(_future)
+                    _rets = _future.result()
+
+                # 补充提交下一批次后再返回结果, 使处理与结果消费并行
+                for _chunk in _chunks:
+                    _pending.append(self.submit(self._run_map_chunk, fn, _chunk))
+                    break
+
+                for _ret in _rets:
+                    yield _ret
+        finally:
+            # 中途退出(异常或迭代器关闭), 取消未执行的批次
+            for _future in _pending:
+                _future.cancel()
+
     @property
     def is_stop(self):
         """
@@ -1310,7 +1671,7 @@ class ParallelPool(object):
         """
         if tid in self._workers.keys():
             self._workers[tid][0].force_stop()
-            del self._workers[tid]
+            self._remove_worker(tid)
         if tid in self._overtime_workers.keys():
             del self._overtime_workers[tid]
         if self._logger is not None:
@@ -1335,6 +1696,10 @@ class ParallelPool(object):
             run_kwargs
             callback_fun
             is_logger_to_deal_fun
+            is_submit_mode
+            task_queue
+            task_get_timeout
+            result_queue
 
         """
         if kwargs['logger'] is not None:
@@ -1367,6 +1732,16 @@ class ParallelPool(object):
                     RunTool.sleep(0.001)
                     continue
 
+                # 任务提交模式, 阻塞等待获取任务, 超时后重新检查控制指令
+                _task = None
+                if kwargs['is_submit_mode']:
+                    try:
+                        _task = kwargs['task_queue'].get(
+                            block=True, timeout=kwargs['task_get_timeout']
+                        )
+                    except Empty:
+                        continue
+
                 # 执行处理函数
                 share_info['working_num'] += 1
                 worker_info['status'] = 1
@@ -1385,12 +1760,16 @@ class ParallelPool(object):
                     kwargs['lock'].acquire()  # 获取锁
 
                 with ExceptionTool.ignored_cresult(_call_result):
-                    _deal_fun_ret = kwargs['deal_fun'](*kwargs['run_args'], **kwargs['run_kwargs'])
+                    if _task is None:
+                        _deal_fun_ret = kwargs['deal_fun'](
+                            *kwargs['run_args'], **kwargs['run_kwargs'])
+                    else:
+                        _deal_fun_ret = cls._run_submit_task(_task, kwargs['result_queue'])
 
                 if kwargs['lock'] is not None:
                     kwargs['lock'].release()  # 释放锁
 
-                if not (_call_result.code[0] == '0' and _deal_fun_ret is None):
+                if _task is not None or not (_call_result.code[0] == '0' and _deal_fun_ret is None):
                     # 返回值不为None, 认为有获取任务及执行
                     worker_info['freebegin'] = datetime.datetime.now()
 
@@ -1466,6 +1845,232 @@ class ParallelPool(object):
                     kwargs['pool_id'], kwargs['pname'], tid, _ret_info)
             )
 
+    @staticmethod
+    def _iter_chunks(iterable, chunksize):
+        """
+        将可迭代对象按批次大小拆分
+
+        @param {iterable} iterable - 可迭代对象
+        @param {int} chunksize - 每个批次包含的元素数量
+
+        @returns {iterator} - 批次列表的迭代器
+
+        """
+        _iter = iter(iterable)
+        while True:
+            _chunk = list(itertools.islice(_iter, chunksize))
+            if len(_chunk) == 0:
+                return
+            yield _chunk
+
+    @staticmethod
+    def _run_map_chunk(fn, chunk):
+        """
+        执行一个批次的map任务
+
+        @param {function} fn - 任务函数
+        @param {list} chunk - 批次元素列表
+
+        @returns {list} - 批次执行结果列表
+
+        """
+        return [fn(_item) for _item in chunk]
+
+    @classmethod
+    def _run_submit_task(cls, task, result_queue):
+        """
+        执行通过submit提交的任务, 并返回执行结果
+
+        @param {tuple} task - 任务信息(任务id, 任务函数, args, kwargs)
+            注: 如果result_queue为None, 任务id为Future对象
+        @param {Queue} result_queue - 结果返回队列, 为None代表直接设置Future对象
+
+        @returns {object} - 任务函数的返回值
+
+        @throws {Exception} - 任务函数执行出现的异常会在返回结果后继续抛出
+
+        """
+        _task_id, _fun, _args, _kwargs = task
+        if result_queue is None and not _task_id.set_running_or_notify_cancel():
+            # Future已被取消, 无需执行
+            return None
+
+        try:
+            _ret = _fun(*_args, **_kwargs)
+        except Exception as e:
+            cls._set_submit_task_result(_task_id, False, e, result_queue)
+            raise
+
+        cls._set_submit_task_result(_task_id, True, _ret, result_queue)
+        return _ret
+
+    @classmethod
+    def _set_submit_task_result(cls, task_id, is_success, value, result_queue):
+        """
+        设置提交任务的执行结果
+
+        @param {object} task_id - 任务id, 如果result_queue为None则为Future对象
+        @param {bool} is_success - 任务是否执行成功
+        @param {object} value - 任务返回值或异常对象
+        @param {Queue} result_queue - 结果返回队列, 为None代表直接设置Future对象
+
+        """
+        if result_queue is None:
+            if is_success:
+                task_id.set_result(value)
+            else:
+                task_id.set_exception(value)
+            return
+
+        if not is_success:
+            # 异常对象无法序列化时, 转换为通用异常返回
+            try:
+                pickle.dumps(value)
+            except Exception:
+                value = RuntimeError('%s: %s' % (str(type(value)), str(value)))
+        result_queue.put((task_id, is_success, value))
+
+    def _result_dispatch_fun(self):
+        """
+        结果分发线程, 从结果队列获取多进程任务的执行结果并设置到对应的Future对象
+
+        """
+        while True:
+            try:
+                _task_id, _is_success, _value = self._result_queue.get(
+                    block=True, timeout=self._task_get_timeout
+                )
+            except Empty:
+                if self._status == 0:
+                    # 并发池已停止
+                    break
+                continue
+
+            _future = self._futures.pop(_task_id, None)
+            if _future is None or not _future.set_running_or_notify_cancel():
+                # Future已被取消
+                continue
+
+            if _is_success:
+                _future.set_result(_value)
+            else:
+                _future.set_exception(_value)
+
+        # 已没有可返回的结果, 剩余的Future对应任务未执行或执行中被中止, 全部取消
+        for _task_id in list(self._futures.keys()):
+            self._cancel_future(self._futures.pop(_task_id, None))
+
+    def _cancel_submit_tasks(self):
+        """
+        取消任务队列中未执行的提交任务(并发池停止时调用)
+
+        """
+        if not self._is_submit_mode:
+            return
+
+        while True:
+            try:
+                _task = self._task_queue.get(block=False)
+            except Empty:
+                break
+
+            if self._result_queue is None:
+                self._cancel_future(_task[0])
+            else:
+                self._cancel_future(self._futures.pop(_task[0], None))
+
+    @staticmethod
+    def _cancel_future(future):
+        """
+        取消Future对象, 如果已开始执行则设置NotRunning异常
+
+        @param {concurrent.futures.Future} future - 要取消的Future对象
+
+        """
+        if future is None:
+            return
+
+        if future.cancel():
+            # 通知wait/as_completed等待的对象取消完成
+            try:
+                future.set_running_or_notify_cancel()
+            except RuntimeError:
+                # 已经通知过
+                pass
+            return
+
+        if not future.done():
+            try:
+                future.set_exception(NotRunning('ParallelPool is stopped'))
+            except Exception:
+                # 已经有执行结果
+                pass
+
+    def _create_share_dict(self, tag):
+        """
+        创建共享对象, 优先从控制块分配槽位
+
+        @param {string} tag - 唯一标识
+
+        @returns {ParallelShareDictFw} - 返回共享对象
+
+        """
+        if self._control_block is not None:
+            _slot = self._control_block.alloc_slot()
+            if _slot is not None:
+                return _slot
+        return self._sharedict_class(tag)
+
+    def _remove_worker(self, tid):
+        """
+        从工作任务清单删除任务, 并释放任务占用的共享对象及CPU
+
+        @param {string} tid - 任务id
+
+        """
+        self._release_share_dict(self._workers[tid][1])
+        if self._cpu_placement is not None:
+            self._cpu_placement.free(tid)
+        del self._workers[tid]
+
+    def _bind_worker_cpu(self, tid, task):
+        """
+        按CPU分配策略绑定工作任务的CPU
+
+        @param {string} tid - 任务id
+        @param {ParallelFw} task - 工作任务对象
+
+        """
+        _cpu = self._cpu_placement.alloc(tid)
+        try:
+            task.bind_cpu(1 << _cpu)
+        except Exception as e:
+            if self._logger is not None:
+                self._logger.log(
+                    logging.ERROR,
+                    '[EX:%s]ParallelPool[%s]  bind Worker[%s: %s] to cpu %s error: %s' % (
+                        str(type(e)), self._pool_id, self._pname, tid, str(_cpu), traceback.format_exc()
+                    )
+                )
+
+    def _release_share_dict(self, share_dict):
+        """
+        释放共享对象, 如果是控制块分配的槽位则归还
+
+        @param {ParallelShareDictFw} share_dict - 共享对象
+
+        """
+        if self._control_block is not None:
+            self._control_block.free_slot(share_dict)
+
+    def _daemon_wait(self):
+        """
+        守护线程等待下一次循环, 可通过self._daemon_event提前唤醒
+
+        """
+        self._daemon_event.wait(self._daemon_thread_time)
+        self._daemon_event.clear()
+
     def _create_worker(self):
         """
         创建一个新的工作任务
@@ -1475,7 +2080,7 @@ class ParallelPool(object):
         """
         # 基础数据
         _tid = str(uuid.uuid1())
-        _worker_info = self._sharedict_class(_tid)
+        _worker_info = self._create_share_dict(_tid)
         _worker_info['status'] = 0  # 执行状态(0-空闲, 1-正在执行, 2-暂停, 3-已销毁)
         _worker_info['cmd'] = 0  # 任务指令通知(0-无指令, 2-暂停任务, 3-结束任务, 4-因空闲结束任务)
         _now = datetime.datetime.now()
@@ -1495,7 +2100,11 @@ class ParallelPool(object):
             'run_args': self._run_args,
             'run_kwargs': self._run_kwargs,
             'callback_fun': self._callback_fun,
-            'is_logger_to_deal_fun': self._is_logger_to_deal_fun
+            'is_logger_to_deal_fun': self._is_logger_to_deal_fun,
+            'is_submit_mode': self._is_submit_mode,
+            'task_queue': self._task_queue if self._is_submit_mode else None,
+            'task_get_timeout': self._task_get_timeout,
+            'result_queue': self._result_queue
         }
 
         # 创建线程
@@ -1514,6 +2123,8 @@ class ParallelPool(object):
                 log_level=self._log_level, **self._kwargs
             )
             self._workers[_tid][0] = _task
+            if self._cpu_placement is not None:
+                self._bind_worker_cpu(_tid, _task)
         except Exception as e:
             # 记录日志
             if self._logger is not None:
@@ -1627,6 +2238,8 @@ class ParallelPool(object):
                                 break
                         self._workers_lock.release()
                         if _all_stop:
+                            # 取消未执行的提交任务, 避免Future对象一直等待
+                            self._cancel_submit_tasks()
                             self._status = 0  # 全部任务已经为销毁状态
                             if self._logger is not None:
                                 self._logger.log(
@@ -1637,7 +2250,7 @@ class ParallelPool(object):
 
                 if self._status == 2:
                     # 暂停
-                    RunTool.sleep(self._daemon_thread_time)
+                    self._daemon_wait()
                     continue
 
                 if self._status == 0:
@@ -1651,7 +2264,7 @@ class ParallelPool(object):
                 for _key in _keys:
                     if self._workers[_key][1]['status'] == 3:
                         # 已销毁, 直接从清单删除就可以了
-                        del self._workers[_key]
+                        self._remove_worker(_key)
                         continue
 
                     if (
@@ -1752,7 +2365,7 @@ class ParallelPool(object):
                         self._create_worker()
                         _create_num = _create_num - 1
 
-                RunTool.sleep(self._daemon_thread_time)
+                self._daemon_wait()
 
             except Exception as e:
                 # 异常, 写日志, 但不退出
@@ -1938,6 +2551,157 @@ class ProcessParallelShareDict(ParallelShareDictFw):
         self._dict[key] = value
 
 
+class ProcessParallelShareSlot(ParallelShareDictFw):
+    """
+    进程共享内存槽位对象(基于ParallelShareDictFw的实现)
+    由ProcessParallelControlBlock分配, 取值和赋值直接访问共享内存, 无需进程间通讯
+    注: 槽位前半部分存储字段值, 后半部分存储字段值的类型编码, 取值时按赋值时的类型返回
+
+    @param {RawArray} array - 控制块的共享内存数组
+    @param {int} base - 槽位在数组中的起始位置
+    @param {dict} key_index - 字段名与槽位内偏移位置的映射
+    @param {set} datetime_keys - 值为datetime类型的字段名集合(共享内存中存储为时间戳)
+
+    """
+
+    def __init__(self, array, base, key_index, datetime_keys):
+        """
+        初始化函数, 不使用框架的tag登记
+
+        @param {RawArray} array - 控制块的共享内存数组
+        @param {int} base - 槽位在数组中的起始位置
+        @param {dict} key_index - 字段名与槽位内偏移位置的映射
+        @param {set} datetime_keys - 值为datetime类型的字段名集合(共享内存中存储为时间戳)
+
+        """
+        self._tag = base
+        self._array = array
+        self._base = base
+        self._key_index = key_index
+        self._datetime_keys = datetime_keys
+        self._type_base = base + len(key_index)
+        self._dict = None
+
+    # 非datetime字段支持的值类型, 以清单中的位置作为类型编码, 未赋值时为0(int)
+    _VALUE_TYPES = (int, bool, float)
+
+    #############################
+    # 需实现类实现的接口定义
+    #############################
+    def _init(self, tag):
+        """
+        初始化对象, 共享内存无需初始化
+
+        @param {string} tag - 唯一标识
+
+        """
+        return None
+
+    def _refresh(self, key):
+        """
+        从共享内存获取指定key的值
+
+        @param {object} key - 要刷新的key
+
+        @returns {object} - 返回具体的值
+
+        """
+        _index = self._key_index[key]
+        _value = self._array[self._base + _index]
+        if key in self._datetime_keys:
+            return datetime.datetime.fromtimestamp(_value)
+        return self._VALUE_TYPES[int(self._array[self._type_base + _index])](_value)
+
+    def _update(self, key, value):
+        """
+        更新共享内存中指定key的值
+
+        @param {object} key - 索引
+        @param {object} value - 要设置的值
+
+        """
+        _index = self._key_index[key]
+        if key in self._datetime_keys:
+            value = value.timestamp()
+        else:
+            self._array[self._type_base + _index] = self._VALUE_TYPES.index(type(value))
+        self._array[self._base + _index] = value
+
+
+class ProcessParallelControlBlock(object):
+    """
+    多进程共享内存控制块, 使用一个共享内存数组为多个并发任务提供固定字段的状态槽位
+    注: 槽位的分配及释放只能在创建控制块的进程中执行, 分配的槽位可传递给子进程访问
+
+    @param {int} size - 槽位数量
+    @param {tuple} keys - 每个槽位的字段名清单, 值只支持数值(int/bool/float)或datetime类型
+    @param {tuple} datetime_keys=() - 值为datetime类型的字段名清单
+
+    """
+
+    def __init__(self, size, keys, datetime_keys=()):
+        """
+        构造函数, 创建共享内存数组
+
+        @param {int} size - 槽位数量
+        @param {tuple} keys - 每个槽位的字段名清单, 值只支持数值(int/bool/float)或datetime类型
+        @param {tuple} datetime_keys=() - 值为datetime类型的字段名清单
+
+        """
+        self._size = size
+        self._key_index = dict()
+        for _index, _key in enumerate(keys):
+            self._key_index[_key] = _index
+        self._datetime_keys = set(datetime_keys)
+        self._slot_len = len(keys) * 2  # 每个字段占用值及类型编码两个位置
+        self._array = RawArray('d', size * self._slot_len)
+        self._free_slots = list(range(size - 1, -1, -1))
+        self._lock = threading.Lock()
+
+    @property
+    def free_num(self):
+        """
+        剩余可分配的槽位数量
+
+        @property {int}
+
+        """
+        return len(self._free_slots)
+
+    def alloc_slot(self):
+        """
+        分配一个槽位
+
+        @returns {ProcessParallelShareSlot} - 返回槽位对象, 如果没有空闲槽位返回None
+
+        """
+        with self._lock:
+            if len(self._free_slots) == 0:
+                return None
+            _index = self._free_slots.pop()
+
+        _base = _index * self._slot_len
+        for _i in range(_base, _base + self._slot_len):
+            self._array[_i] = 0
+        return ProcessParallelShareSlot(self._array, _base, self._key_index, self._datetime_keys)
+
+    def free_slot(self, slot):
+        """
+        释放槽位
+
+        @param {ProcessParallelShareSlot} slot - 要释放的槽位对象
+            注: 如果不是该控制块分配的槽位则不处理
+
+        """
+        if not isinstance(slot, ProcessParallelShareSlot) or slot._array is not self._array:
+            return
+
+        with self._lock:
+            _index = slot._base // self._slot_len
+            if _index not in self._free_slots:
+                self._free_slots.append(_index)
+
+
 class ThreadParallel(ParallelFw):
     """
     多线程并行任务处理
@@ -1949,6 +2713,46 @@ class ThreadParallel(ParallelFw):
     _start_args = None
     _start_kwargs = None
     _thread = None
+    _share_memory = True
+
+    #############################
+    # 自身特定的函数
+    #############################
+    def bind_cpu(self, cpu_num=1):
+        """
+        绑定线程在指定CPU上执行
+        注: 暂时只支持linux(按线程的native_id设置)
+
+        @param {long} cpu_num=1L - 要指定的CPU(掩码)
+
+        @throws {NotRunning} - 当线程未运行时, 抛出该异常
+        @throws {NotImplementedError} - 非linux平台抛出该异常
+
+        """
+        if not sys.platform.startswith('linux'):
+            raise NotImplementedError
+
+        self._stat_lock.acquire()
+        try:
+            if not self._get_is_running():
+                raise NotRunning
+
+            _native_id = self._thread.native_id
+        finally:
+            self._stat_lock.release()
+
+        _last_cpu = affinity.set_process_affinity_mask(_native_id, cpu_num)
+        if self._logger is not None:
+            self._logger.log(
+                self._log_level,
+                'set thread [%s:%s] bind cpu - [native_id:%s] from %s to %s' % (
+                    self._pid,
+                    self._pname,
+                    str(_native_id),
+                    str(_last_cpu),
+                    str(cpu_num)
+                )
+            )
 
     #############################
     # 内部函数
@@ -2034,6 +2838,16 @@ class ThreadParallel(ParallelFw):
         """
         return {'is_running': False}
 
+    @classmethod
+    def _create_task_queue(cls):
+        """
+        创建任务池提交任务所使用的队列
+
+        @returns {Queue} - 返回线程安全的队列对象
+
+        """
+        return Queue()
+
 
 class ProcessParallel(ParallelFw):
     """
@@ -2064,7 +2878,7 @@ class ProcessParallel(ParallelFw):
         finally:
             self._stat_lock.release()
 
-        if sys.platform in ('win32', 'linux2'):
+        if sys.platform == 'win32' or sys.platform.startswith('linux'):
             try:
                 _last_cpu = affinity.set_process_affinity_mask(_pid, cpu_num)
                 # 打印日志
@@ -2082,7 +2896,10 @@ class ProcessParallel(ParallelFw):
             except:
                 if self._logger is not None:
                     self._logger.log(
-                        'affinity for python 3 incorrect, change affinity/__init__.py to fix'
+                        logging.ERROR,
+                        'set process [%s:%s] bind cpu error: %s' % (
+                            self._pid, self._pname, traceback.format_exc()
+                        )
                     )
 
     def get_runing_cpu(self):
@@ -2115,6 +2932,34 @@ class ProcessParallel(ParallelFw):
         """
         return
 
+    def _create_is_running_obj(self):
+        """
+        创建是否运行状态的共享变量, 使用共享内存, 无需为每个任务启动Manager进程
+
+        """
+        return ProcessParallelControlBlock(1, ('is_running', )).alloc_slot()
+
+    def _get_is_running(self):
+        """
+        返回是否运行的状态
+
+        """
+        return bool(self._is_running['is_running'])
+
+    @classmethod
+    def _create_control_block(cls, size, keys, datetime_keys=()):
+        """
+        创建任务池工作任务共享状态的控制块, 整个任务池使用一块共享内存
+
+        @param {int} size - 需要的槽位数量
+        @param {tuple} keys - 每个槽位的字段名清单
+        @param {tuple} datetime_keys=() - 值为datetime类型的字段名清单
+
+        @returns {ProcessParallelControlBlock} - 返回控制块对象
+
+        """
+        return ProcessParallelControlBlock(size, keys, datetime_keys=datetime_keys)
+
     def _start(self, run_args=None, run_kwargs=None, **kwargs):
         """
         执行并发任务
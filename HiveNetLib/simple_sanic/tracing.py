@@ -173,7 +173,7 @@ class SanicTracer(OpenTracerFW):
         自定义的初始化处理
         """
         # 添加http协议请求固定的Tags参数
-        self._request_tag_paras = self._request_tag_paras.update({
+        self._request_tag_paras.update({
             tags.COMPONENT: 'const:SanicRequest',
             tags.HTTP_METHOD: 'req:method',
             tags.HTTP_URL: 'req:url',
@@ -181,7 +181,7 @@ class SanicTracer(OpenTracerFW):
         })
 
         # 添加http协议响应固定的Tags参数
-        self._response_tag_paras = self._response_tag_paras.update({
+        self._response_tag_paras.update({
             tags.HTTP_STATUS_CODE: 'resp:status'
         })
 
@@ -202,7 +202,8 @@ class SanicTracer(OpenTracerFW):
     def _set_all_request_trace_middleware(self):
         """
         设置app追踪所有请求的中间件处理函数
-        注: 分别在请求处理函数的执行前、执行后、执行中出现异常这3个情况分别执行_before_request_fn和_after_request_fn函数
+        注: 分别在请求处理函数的执行前、执行后、执行中出现异常这3个情况分别执行_before_request_fn和_after_request_fn函数;
+            请求中间件与请求处理函数在同一协程任务中执行, _before_request_fn设置的调用链上下文(TraceContext)将传递到请求处理函数
         """
         # 请求处理中间件
         @self._app.middleware(middleware_or_request="request")
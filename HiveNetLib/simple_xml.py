@@ -15,7 +15,10 @@
 import sys
 import os
 import re
+import io
+import threading
 from enum import Enum
+from collections import OrderedDict
 # 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
 # 动态安装包
@@ -67,6 +70,11 @@ class SimpleXml(object):
         可以通过访问SimpleXml.root直接使用lxml.etree的原生方法
 
     """
+    _DICT_VALUE_TYPES = frozenset(('dict', 'list', 'tuple', 'bool', 'int', 'float', 'string'))  # 支持的节点类型
+    ENCODING_DETECT_SIZE = 64 * 1024  # 自动判断字符集时最多采样的字节数
+    XPATH_CACHE_SIZE = 2048  # 预编译xpath的缓存数量上限
+    _xpath_cache = OrderedDict()  # 预编译xpath的缓存（LRU），key为(xpath, namespaces, xpath版本)
+    _xpath_cache_lock = threading.Lock()
 
     #############################
     # 内部函数
@@ -135,12 +143,7 @@ class SimpleXml(object):
 
         # 判断字符集
         if self.encoding is None:
-            if use_chardet:
-                self.encoding = chardet.detect(_xml_bytes)['encoding']
-                if self.encoding.startswith('ISO-8859'):
-                    self.encoding = 'gbk'
-            else:
-                self.encoding = 'utf-8'
+            self.encoding = self._detect_encoding(_xml_bytes, use_chardet=use_chardet)
 
         # 生成root
         if parser == 'html':
@@ -199,12 +202,62 @@ class SimpleXml(object):
         """
         return self.to_string(xml_declaration=None)
 
-    def _xml_node_to_dict_value(self, node: ET._Element, item_dict_nodes=None):
+    @classmethod
+    def _detect_encoding(cls, xml_bytes, use_chardet=True):
+        """
+        判断xml数据的字符集（只采样开头部分数据，采样部分全为ascii字符时按utf-8处理）
+
+        @param {bytes} xml_bytes - xml数据（可以只传入开头部分）
+        @param {bool} use_chardet=True - 是否使用chardet库判断，如果不使用直接返回'utf-8'
+
+        @return {str} - 字符集
+        """
+        if not use_chardet:
+            return 'utf-8'
+
+        _detector = chardet.UniversalDetector()
+        _pos = 0
+        _size = min(len(xml_bytes), cls.ENCODING_DETECT_SIZE)
+        while _pos < _size and not _detector.done:
+            # 分块送入，能确定字符集时提前结束
+            _detector.feed(xml_bytes[_pos: min(_pos + 4096, _size)])
+            _pos += 4096
+        _encoding = _detector.close()['encoding']
+        if _encoding is None or _encoding.lower() == 'ascii':
+            # 采样部分全为ascii字符时，后续数据仍可能有非ascii字符，按兼容ascii的utf-8处理
+            return 'utf-8'
+        elif _encoding.startswith('ISO-8859'):
+            return 'gbk'
+        return _encoding
+
+    @staticmethod
+    def _get_namespace_uri(namespaces, prefix, path):
+        """
+        获取命名空间前缀对应的uri
+
+        @param {dict} namespaces - 命名空间
+        @param {str} prefix - 命名空间前缀
+        @param {str} path - 前缀所在的路径，用于异常提示
+
+        @return {str} - 前缀对应的uri
+
+        @throws {ValueError} - 当namespaces为None或未包含该前缀时抛出
         """
-        将指定节点通过递归生成存入dict的key-value值
+        if namespaces is None or prefix not in namespaces.keys():
+            raise ValueError('unknown namespace prefix [%s] in path: %s' % (prefix, path))
+        return namespaces[prefix]
+
+    @classmethod
+    def _xml_node_to_dict_value(cls, node: ET._Element, item_dict_nodes=None, type_hints=None):
+        """
+        将指定节点生成存入dict的key-value值（非递归遍历，支持层级很深的节点）
 
         @param {ET._Element} node - 要生成key-value的节点
-        @param {list} item_dict_nodes = None - 指定list和tuple情况下，使用字典作为列表项的节点清单(Element)
+        @param {list|set} item_dict_nodes = None - 指定list和tuple情况下，使用字典作为列表项的节点清单(Element)
+        @param {dict} type_hints=None - 节点类型提示字典，用于相同结构的报文重复转换时跳过类型推断
+            key为从node开始的标签路径（例如'data/a/b'），value为节点类型（dict, list, tuple）；
+            有子节点且没有type属性的节点优先使用字典中的类型，如果路径不在字典中，将推断出的list类型写入字典
+            注：只有一个子节点的列表节点会被推断为dict，因此推断为dict的类型不写入字典，避免后续有重复子节点的报文被错误处理
 
         @return {tuple} - 返回 key, value 值，如果是注释返回 None, None
         """
@@ -212,98 +265,133 @@ class SimpleXml(object):
             # 不是节点的情况（例如注释），直接返回None
             return None, None
 
-        _key = node.tag
-        _value = None
-        _type = None
-
-        # 处理数据类型的判断
-        if 'type' in node.attrib.keys():
-            _type = node.attrib['type']
-            if _type not in ('dict', 'list', 'tuple', 'bool', 'int', 'float', 'string'):
+        _item_dict_nodes = None
+        if item_dict_nodes is not None and len(item_dict_nodes) > 0:
+            _item_dict_nodes = item_dict_nodes if type(item_dict_nodes) == set else set(item_dict_nodes)
+        _std_types = cls._DICT_VALUE_TYPES
+        _use_hints = type_hints is not None
+        _tuple_list = list()  # 需要转换为tuple的列表, (上级容器, key, 列表)
+
+        def _leaf_value(leaf):
+            # 没有子节点的节点直接转换
+            _leaf_type = leaf.get('type', None)
+            _leaf_text = leaf.text
+            if _leaf_text is not None:
+                _leaf_text = _leaf_text.strip()
+            if _leaf_type is None or _leaf_type == 'string' or _leaf_type == 'dict' or \
+                    _leaf_type not in _std_types:
+                return '' if _leaf_text is None else _leaf_text
+            elif _leaf_type == 'bool':
+                return _leaf_text == 'true'
+            elif _leaf_type == 'int':
+                return round(float(_leaf_text))
+            elif _leaf_type == 'float':
+                return float(_leaf_text)
+            elif _leaf_type == 'list':
+                return list()
+            else:
+                return tuple()
+
+        if len(node) == 0:
+            return node.tag, _leaf_value(node)
+
+        # 待处理节点栈（只放入有子节点的节点），每个元素为(节点, 标签路径, 上级容器, 在上级容器中的key)
+        # 节点在上级容器中的位置已预先占位，因此处理顺序不影响结果顺序
+        _root_holder = [None]
+        _stack = [(node, node.tag, _root_holder, 0)]
+        while len(_stack) > 0:
+            _node, _path, _container, _ckey = _stack.pop()
+            _childs = list(_node)
+
+            # 处理数据类型的判断
+            _type = _node.get('type', None)
+            if _type not in _std_types:
                 # 非标准类型，当作没有传入，重新再处理
                 _type = None
-
-        _childs = None  # 子节点清单
-        if _type is None:
-            _childs = node.getchildren()
-            if len(_childs) > 0:
+            _tag_dict = None  # 子节点标签字典，value为该标签的最后一个子节点
+            if _type is None and _use_hints:
+                _type = type_hints.get(_path, None)
+            if _type is None:
                 # 只要子节点有重复的tag，则认为一定是list
-                _tag_list = list()
                 _type = 'dict'
+                _tag_dict = dict()
                 for _childnode in _childs:
-                    if not (hasattr(_childnode, 'tag') and type(_childnode.tag) == str):
+                    _tag = _childnode.tag
+                    if type(_tag) != str:
                         # 注释
                         continue
-
-                    if _childnode.tag in _tag_list:
-                        # 发现有tag重复的节点
+                    if _tag in _tag_dict:
                         _type = 'list'
                         break
-                    else:
-                        _tag_list.append(_childnode.tag)
-            else:
-                _type = 'string'
-
-        # 按不同type属性类型进行处理
-        _text = node.text
-        if type(_text) == str:
-            _text = node.text.strip()
-        if _type == 'string':
-            _value = _text
-        elif _type == 'bool':
-            _value = (_text == 'true')
-        elif _type == 'int':
-            _value = round(float(_text))
-        elif _type == 'float':
-            _value = float(_text)
-        elif _type == 'dict':
-            # 字典
-            if _childs is None:
-                _childs = node.getchildren()
-            if len(_childs) > 0:
-                # 有子节点
+                    _tag_dict[_tag] = _childnode
+                if _use_hints and _type == 'list':
+                    type_hints[_path] = _type
+
+            # 按不同type属性类型进行处理
+            if _type == 'dict':
                 _value = dict()
-                for childnode in node.getchildren():
-                    _child_key, _child_value = self._xml_node_to_dict_value(
-                        childnode, item_dict_nodes=item_dict_nodes)
-                    # 加到字典里面
-                    if _child_key is not None:
-                        _value[_child_key] = _child_value
-            else:
-                # 没有子节点，等同于string
-                _value = _text
-        else:
-            # list或tuple
-            if _type == 'tuple':
-                _value = tuple()
-            else:
+                if _tag_dict is None:
+                    # 重复的标签取最后一个节点的值
+                    _tag_dict = dict()
+                    for _childnode in _childs:
+                        if type(_childnode.tag) == str:
+                            _tag_dict[_childnode.tag] = _childnode
+                for _tag, _childnode in _tag_dict.items():
+                    if len(_childnode) == 0:
+                        _value[_tag] = _leaf_value(_childnode)
+                    else:
+                        _value[_tag] = None
+                        _stack.append((
+                            _childnode, _path + '/' + _tag if _use_hints else None, _value, _tag
+                        ))
+            elif _type == 'list' or _type == 'tuple':
+                # tuple在最后统一转换
                 _value = list()
-            # 判断是否使用字典方式放在列表中
-            _use_dict = False
-            if item_dict_nodes is not None:
-                for _node in item_dict_nodes:
-                    if _node is node:
-                        _use_dict = True
-                        break
-            # 列表处理
-            for childnode in node.getchildren():
-                _child_key, _child_value = self._xml_node_to_dict_value(
-                    childnode, item_dict_nodes=item_dict_nodes)
-
-                if _child_key is None and _child_value is None:
-                    # 屏蔽掉注释的情况
-                    continue
-
-                if _use_dict:
-                    # 列表项按字典处理
-                    _child_value = {_child_key: _child_value}
-                # 加入列表中
-                _value.append(_child_value)
-
-        # 返回自身的key值和Value值
-        if _value is None:
-            _value = ''
-        return _key, _value
+                _use_dict = _item_dict_nodes is not None and _node in _item_dict_nodes
+                for _childnode in _childs:
+                    _tag = _childnode.tag
+                    if type(_tag) != str:
+                        continue
+                    _item_container = _value
+                    _item_key = len(_value)
+                    if _use_dict:
+                        # 列表项按字典处理
+                        _item_container = {_tag: None}
+                        _item_key = _tag
+                        _value.append(_item_container)
+                    else:
+                        _value.append(None)
+                    if len(_childnode) == 0:
+                        _item_container[_item_key] = _leaf_value(_childnode)
+                    else:
+                        _stack.append((
+                            _childnode, _path + '/' + _tag if _use_hints else None,
+                            _item_container, _item_key
+                        ))
+                if _type == 'tuple':
+                    _tuple_list.append((_container, _ckey, _value))
+            else:
+                # 有子节点的基础类型，按节点文本转换
+                _text = _node.text
+                if _text is not None:
+                    _text = _text.strip()
+                if _type == 'bool':
+                    _value = (_text == 'true')
+                elif _type == 'int':
+                    _value = round(float(_text))
+                elif _type == 'float':
+                    _value = float(_text)
+                else:
+                    _value = '' if _text is None else _text
+
+            # 放入上级容器
+            _container[_ckey] = _value
+
+        # 将tuple类型的列表转换为tuple，后创建的先转换（子节点在上级节点之前）
+        for _container, _ckey, _value in reversed(_tuple_list):
+            _container[_ckey] = tuple(_value)
+
+        return node.tag, _root_holder[0]
 
     #############################
     # 文件操作
@@ -380,12 +468,7 @@ class SimpleXml(object):
         if xpath is None:
             _node = self.root
         else:
-            if self.use_xpath2:
-                # xpath2.0
-                _nodes = elementpath.select(self.root, xpath, namespaces=namespaces)
-            else:
-                # xpath1.0
-                _nodes = self.root.xpath(xpath, namespaces=namespaces)
+            _nodes = self._select(xpath, namespaces=namespaces)
             if len(_nodes) > 0:
                 _node = _nodes[0]
 
@@ -416,6 +499,8 @@ class SimpleXml(object):
             item_dict_xpaths = None - {dict} - 指定list和tuple情况下，使用字典作为列表项的节点xPath路径
                 key - 节点对应的xPath，value - 搜索命名空间，值为None或dict
                 注：xPath为列表节点的路径（非列表项节点路径）; xPath的路径从根节点开始查找
+            type_hints = None - {dict} - 节点类型提示字典，相同结构的报文重复转换时传入同一个字典，
+                可跳过节点类型的推断，具体说明见_xml_node_to_dict_value
 
         @return {dict} - 转换后的字典对象
             注：包含节点自身，例如<data><a>val1</a><b>val2</b></data>转换后的字典应该通过dict['data']开始访问
@@ -425,17 +510,9 @@ class SimpleXml(object):
         if 'item_dict_xpaths' in kwargs.keys() and kwargs['item_dict_xpaths'] is not None:
             _item_dict_nodes = list()
             for _get_xpath in kwargs['item_dict_xpaths'].keys():
-                if self.use_xpath2:
-                    # xpath2.0
-                    _get_nodes = elementpath.select(
-                        self.root, _get_xpath, namespaces=kwargs['item_dict_xpaths'][_get_xpath]
-                    )
-                else:
-                    # xpath1.0
-                    _get_nodes = self.root.xpath(
-                        _get_xpath,
-                        namespaces=kwargs['item_dict_xpaths'][_get_xpath]
-                    )
+                _get_nodes = self._select(
+                    _get_xpath, namespaces=kwargs['item_dict_xpaths'][_get_xpath]
+                )
                 # 合并列表
                 _item_dict_nodes = _item_dict_nodes + _get_nodes
 
@@ -443,25 +520,119 @@ class SimpleXml(object):
         _roots = [self.root]
         if xpath is not None:
             # 获取全部匹配节点
-            if self.use_xpath2:
-                # xpath2.0
-                _roots = elementpath.select(
-                    self.root, xpath, namespaces=namespaces
-                )
-            else:
-                # xpath1.0
-                _roots = self.root.xpath(xpath, namespaces=namespaces)
+            _roots = self._select(xpath, namespaces=namespaces)
 
         # 生成字典
+        _type_hints = kwargs.get('type_hints', None)
         _dict = dict()
         for _root in _roots:
             if _root is not None:
-                _key, _value = self._xml_node_to_dict_value(_root, item_dict_nodes=_item_dict_nodes)
+                _key, _value = self._xml_node_to_dict_value(
+                    _root, item_dict_nodes=_item_dict_nodes, type_hints=_type_hints
+                )
                 if _key is not None:
                     _dict[_key] = _value
         # 返回结果
         return _dict
 
+    #############################
+    # 流式处理
+    #############################
+    @classmethod
+    def iter_records(cls, xml_obj, path, obj_type=EnumXmlObjType.File, encoding=None,
+                     use_chardet=True, namespaces=None, type_hints=None, **kwargs):
+        """
+        以流方式（iterparse）逐个获取xml中匹配的记录节点，并转换为字典值返回
+        注：适用于超大xml文件，处理过程中会清除已处理的节点，不会装载完整的xml树；
+            记录节点不能嵌套（记录节点内不能包含与记录节点标签相同的子节点）
+
+        @param {object} xml_obj - 要装载的报文载体，说明同构造函数
+        @param {str} path - 记录节点的匹配路径，只支持标签及'/'，例如：
+            'record' - 匹配所有标签为record的节点
+            'records/record' - 匹配父节点为records，标签为record的节点
+            '/data/records/record' - 从根节点开始完整匹配
+            注：标签可以使用命名空间前缀（例如'p:record'）或'{uri}record'的格式
+        @param {EnumXmlObjType} obj_type=EnumXmlObjType.File - xml对象类型
+        @param {string} encoding=None - 装载字符编码，如果传None代表自动判断（只采样开头部分数据）
+        @param {bool} use_chardet=True - 当自动判断的时候，是否使用chardet库
+        @param {dict} namespaces=None - 命名空间，用于转换path中的命名空间前缀
+        @param {dict} type_hints=None - 记录节点的类型提示字典，传入空字典即可在处理过程中复用推断的类型，
+            具体说明见_xml_node_to_dict_value
+        @param {**kwargs} kwargs - 扩展的装载参数，为etree.iterparse的参数，例如：
+            huge_tree - disable security restrictions and support very deep trees
+            recover - try hard to parse through broken XML
+            remove_blank_text - discard blank text nodes that appear ignorable
+            remove_comments - discard comments
+
+        @return {generator} - 每次返回一个记录节点转换后的值（与to_dict中节点对应的值一致）
+
+        @throws {ValueError} - path中的命名空间前缀未在namespaces中定义时抛出
+
+        @example
+            for _record in SimpleXml.iter_records('/data/export.xml', 'records/record'):
+                print(_record['id'])
+        """
+        # 转换匹配路径
+        _tags = list()
+        for _tag in path.strip('/').split('/'):
+            if ':' in _tag and not _tag.startswith('{'):
+                _prefix, _tag = _tag.split(':', 1)
+                _tag = '{%s}%s' % (cls._get_namespace_uri(namespaces, _prefix, path), _tag)
+            _tags.append(_tag)
+        _is_abs = path.startswith('/')
+
+        # 获取数据源及字符集
+        _source = None
+        _is_close_source = False
+        if obj_type == EnumXmlObjType.File:
+            _source = open(xml_obj, 'rb')
+            _is_close_source = True
+        elif obj_type == EnumXmlObjType.FileHandle:
+            _source = xml_obj
+        elif obj_type == EnumXmlObjType.Bytes:
+            _source = io.BytesIO(xml_obj)
+        else:
+            if encoding is None:
+                encoding = 'utf-8'
+            _source = io.BytesIO(xml_obj.encode(encoding=encoding))
+
+        try:
+            if encoding is None:
+                _pos = _source.tell()
+                encoding = cls._detect_encoding(
+                    _source.read(cls.ENCODING_DETECT_SIZE), use_chardet=use_chardet
+                )
+                _source.seek(_pos)
+
+            # 按最后一级标签过滤节点，再检查上级节点的标签
+            _parent_tags = _tags[0: -1]
+            _parent_tags.reverse()
+            for _event, _node in ET.iterparse(
+                _source, events=('end', ), tag=_tags[-1], encoding=encoding, **kwargs
+            ):
+                _is_match = True
+                _parent = _node.getparent()
+                for _tag in _parent_tags:
+                    if _parent is None or _parent.tag != _tag:
+                        _is_match = False
+                        break
+                    _parent = _parent.getparent()
+                if _is_match and _is_abs and _parent is not None:
+                    _is_match = False
+
+                if _is_match:
+                    yield cls._xml_node_to_dict_value(_node, type_hints=type_hints)[1]
+
+                # 清除已处理的节点及前面的兄弟节点
+                _node.clear()
+                _parent = _node.getparent()
+                if _parent is not None:
+                    while _node.getprevious() is not None:
+                        del _parent[0]
+        finally:
+            if _is_close_source:
+                _source.close()
+
     #############################
     # 节点操作
     #############################
@@ -475,12 +646,7 @@ class SimpleXml(object):
 
         @return {list} - 返回节点清单(返回的数组内部对象为ET._Element)
         """
-        if self.use_xpath2:
-            # xpath2.0
-            _els = elementpath.select(self.root, xpath, namespaces=namespaces)
-        else:
-            # xpath1.0
-            _els = self.root.xpath(xpath, namespaces=namespaces)
+        _els = self._select(xpath, namespaces=namespaces)
         return _els
 
     def get_xpath(self, node: ET._Element):
@@ -510,6 +676,7 @@ class SimpleXml(object):
         @return {Element} - 返回创建完成的节点
 
         @throws {AttributeError} - 当搜索路径不符合创建规范时，抛出该异常
+        @throws {ValueError} - 当搜索路径中的命名空间前缀未在namespaces中定义时，抛出该异常
         """
         # 检查是否有不符合的情况
         if not ignore_path_check:
@@ -526,6 +693,10 @@ class SimpleXml(object):
         if path.startswith('/'):
             # 带了根节点, 忽略第一个节点
             del _tag_list[0]
+        for _tag in _tag_list:
+            if ':' in _tag[0] and not _tag[0].startswith('{'):
+                # 提前检查命名空间前缀，避免find时抛出不明确的异常
+                self._get_namespace_uri(namespaces, _tag[0].split(':', 1)[0], path)
         _node = self.root
         for _tag in _tag_list:
             _new_node = _node.find(_tag[0], namespaces=namespaces)
@@ -535,7 +706,7 @@ class SimpleXml(object):
                 if ':' in _tag[0]:
                     # 有命名空间的处理
                     _prefix, _tag = _tag[0].split(':', 1)
-                    _tag = '{' + namespaces[_prefix] + '}' + _tag
+                    _tag = '{' + self._get_namespace_uri(namespaces, _prefix, path) + '}' + _tag
                     _new_node = ET.Element(_tag, nsmap=namespaces)
                 else:
                     _new_node = ET.Element(_tag[0])
@@ -556,12 +727,7 @@ class SimpleXml(object):
 
         @return {ET._Element} - 返回匹配到的节点
         """
-        if self.use_xpath2:
-            # xpath2.0
-            _nodes = elementpath.select(self.root, xpath, namespaces=namespaces)
-        else:
-            # xpath1.0
-            _nodes = self.root.xpath(xpath, namespaces=namespaces)
+        _nodes = self._select(xpath, namespaces=namespaces)
         if len(_nodes) > 0:
             return _nodes[0].append(node)
         else:
@@ -578,11 +744,13 @@ class SimpleXml(object):
         @param {dict} namespaces=None - 命名空间
 
         @return {ET._Element} - 返回匹配到的节点
+
+        @throws {ValueError} - 当prefix未在namespaces中定义时，抛出该异常
         """
         # 创建节点对象
         _new_node = None
         if prefix is not None:
-            _tag = '{' + namespaces[prefix] + '}' + tag
+            _tag = '{' + self._get_namespace_uri(namespaces, prefix, tag) + '}' + tag
             _new_node = ET.Element(_tag, nsmap=namespaces)
         else:
             _new_node = ET.Element(tag)
@@ -621,12 +789,7 @@ class SimpleXml(object):
         @param {dict} namespaces=None - 命名空间
         @param {bool} hold_tail=False - 是否保留上一节点的tail信息
         """
-        if self.use_xpath2:
-            # xpath2.0
-            _nodes = elementpath.select(self.root, xpath, namespaces=namespaces)
-        else:
-            # xpath1.0
-            _nodes = self.root.xpath(xpath, namespaces=namespaces)
+        _nodes = self._select(xpath, namespaces=namespaces)
 
         for _node in _nodes:
             self.remove_node(_node, hold_tail=hold_tail)
@@ -651,12 +814,7 @@ class SimpleXml(object):
 
         @return {string} - 第一个匹配节点的文本值，如果没有找到匹配节点，返回''
         """
-        if self.use_xpath2:
-            # xpath2.0
-            _nodes = elementpath.select(self.root, xpath, namespaces=namespaces)
-        else:
-            # xpath1.0
-            _nodes = self.root.xpath(xpath, namespaces=namespaces)
+        _nodes = self._select(xpath, namespaces=namespaces)
 
         if len(_nodes) == 0:
             return default
@@ -666,6 +824,28 @@ class SimpleXml(object):
             else:
                 return _nodes[0].text
 
+    def get_values(self, xpaths, default='', namespaces=None):
+        """
+        批量获取多个节点的值
+
+        @param {list} xpaths - 符合XPath语法的搜索路径清单，说明同get_value
+        @param {string} default='' - 如果找不到节点时默认返回的值
+        @param {dict} namespaces=None - 命名空间，说明同get_value
+
+        @return {list} - 与xpaths顺序一致的值清单，每个值为第一个匹配节点的文本值
+        """
+        _values = list()
+        _root = self.root
+        for _xpath in xpaths:
+            _nodes = self._get_compiled_xpath(
+                _xpath, namespaces=namespaces, use_xpath2=self.use_xpath2
+            )(_root)
+            if len(_nodes) == 0 or _nodes[0].text is None:
+                _values.append(default)
+            else:
+                _values.append(_nodes[0].text)
+        return _values
+
     def get_attr(self, xpath, attr_name, default='', namespaces=None):
         """
         获取指定节点的属性值
@@ -684,12 +864,7 @@ class SimpleXml(object):
 
         @return {string} - 第一个匹配节点的指定属性文本值，如果没有找到匹配节点或属性，返回''
         """
-        if self.use_xpath2:
-            # xpath2.0
-            _nodes = elementpath.select(self.root, xpath, namespaces=namespaces)
-        else:
-            # xpath1.0
-            _nodes = self.root.xpath(xpath, namespaces=namespaces)
+        _nodes = self._select(xpath, namespaces=namespaces)
 
         if len(_nodes) == 0:
             return default
@@ -719,12 +894,7 @@ class SimpleXml(object):
         @throws {AttributeError} - 当搜索路径不符合自动创建规范时，抛出该异常
         """
         try:
-            if self.use_xpath2:
-                # xpath2.0
-                _nodes = elementpath.select(self.root, xpath, namespaces=namespaces)
-            else:
-                # xpath1.0
-                _nodes = self.root.xpath(xpath, namespaces=namespaces)
+            _nodes = self._select(xpath, namespaces=namespaces)
 
             if len(_nodes) == 0:
                 if auto_create:
@@ -768,12 +938,7 @@ class SimpleXml(object):
         @throw {NameError} - 当节点不存在时抛出该异常
         @throws {AttributeError} - 当搜索路径不符合自动创建规范时，抛出该异常
         """
-        if self.use_xpath2:
-            # xpath2.0
-            _nodes = elementpath.select(self.root, xpath, namespaces=namespaces)
-        else:
-            # xpath1.0
-            _nodes = self.root.xpath(xpath, namespaces=namespaces)
+        _nodes = self._select(xpath, namespaces=namespaces)
 
         if len(_nodes) == 0:
             if auto_create:
@@ -850,28 +1015,33 @@ class SimpleXml(object):
             else:
                 try:
                     _value_xpath = '%s%s' % (_xpath, _key)
+                    _type_name = None
                     if not with_type:
                         # 无需处理类型，直接按字符串处理
-                        self.set_value(
-                            _value_xpath, str(_value), debug=debug, ignore_path_check=True
-                        )
+                        _text = str(_value)
+                    elif _value_type == bool:
+                        # 有点特殊，要转换为true/false
+                        _text = 'true' if _value else 'false'
+                        _type_name = 'bool'
                     else:
-                        if _value_type == bool:
-                            # 有点特殊，要转换为true/false
-                            self.set_value(
-                                _value_xpath, 'true' if _value else 'false', debug=debug,
-                                ignore_path_check=True
-                            )
-                            self.set_attr(_value_xpath, 'type', 'bool', ignore_path_check=True)
-                        else:
-                            self.set_value(
-                                _value_xpath, str(_value), debug=debug, ignore_path_check=True
-                            )
-                            if _value_type == int:
-                                self.set_attr(_value_xpath, 'type', 'int', ignore_path_check=True)
-                            elif _value_type == float:
-                                self.set_attr(_value_xpath, 'type', 'float', ignore_path_check=True)
+                        _text = str(_value)
+                        if _value_type == int:
+                            _type_name = 'int'
+                        elif _value_type == float:
+                            _type_name = 'float'
+
+                    # 一次检索同时设置值和类型属性
+                    _nodes = self._select(_value_xpath)
+                    if len(_nodes) == 0:
+                        _nodes = [self.append_path_node(_value_xpath, ignore_path_check=True)]
+                    for _node in _nodes:
+                        _node.text = _text
+                        if _type_name is not None:
+                            _node.set('type', _type_name)
                 except:
+                    if debug:
+                        # 打印入参
+                        print('set_value error, para:[xpath=%s%s][value=%s]' % (_xpath, _key, str(_value)))
                     if not ignore_exception:
                         raise
                     else:
@@ -881,6 +1051,64 @@ class SimpleXml(object):
 
         return _exception_list
 
+    #############################
+    # xpath预编译处理
+    #############################
+    @classmethod
+    def clear_xpath_cache(cls):
+        """
+        清空预编译xpath的缓存
+        """
+        with cls._xpath_cache_lock:
+            cls._xpath_cache.clear()
+
+    @classmethod
+    def _get_compiled_xpath(cls, xpath, namespaces=None, use_xpath2=False):
+        """
+        获取预编译的xpath查询函数（优先从缓存中获取）
+
+        @param {string} xpath - 符合XPath语法的搜索路径
+        @param {dict} namespaces=None - 命名空间
+        @param {bool} use_xpath2=False - 是否使用xpath2.0
+
+        @return {function} - 查询函数，传入开始检索的节点，返回匹配结果
+        """
+        _key = (
+            xpath, None if namespaces is None else tuple(sorted(namespaces.items())), use_xpath2
+        )
+        _cache = cls._xpath_cache
+        with cls._xpath_cache_lock:
+            _fun = _cache.get(_key, None)
+            if _fun is not None:
+                _cache.move_to_end(_key)
+                return _fun
+
+        if use_xpath2:
+            # xpath2.0
+            _fun = elementpath.Selector(xpath, namespaces=namespaces).select
+        else:
+            # xpath1.0
+            _fun = ET.XPath(xpath, namespaces=namespaces)
+
+        with cls._xpath_cache_lock:
+            _cache[_key] = _fun
+            if len(_cache) > cls.XPATH_CACHE_SIZE:
+                _cache.popitem(last=False)
+        return _fun
+
+    def _select(self, xpath, namespaces=None):
+        """
+        从根节点开始按xpath检索
+
+        @param {string} xpath - 符合XPath语法的搜索路径
+        @param {dict} namespaces=None - 命名空间
+
+        @return {list} - 匹配结果
+        """
+        return self._get_compiled_xpath(
+            xpath, namespaces=namespaces, use_xpath2=self.use_xpath2
+        )(self.root)
+
     #############################
     # 特定节点的值处理，静态函数
     #############################
@@ -897,7 +1125,7 @@ class SimpleXml(object):
         @return {string} - 第一个匹配节点的文本值，如果没有找到匹配节点，返回''
         """
 
-        _nodes = node.xpath(xpath, namespaces=namespaces)
+        _nodes = SimpleXml._get_compiled_xpath(xpath, namespaces=namespaces)(node)
         if len(_nodes) == 0:
             return default
         else:
@@ -916,7 +1144,7 @@ class SimpleXml(object):
 
         @return {string} - 第一个匹配节点的指定属性文本值，如果没有找到匹配节点或属性，返回''
         """
-        _nodes = node.xpath(xpath, namespaces=namespaces)
+        _nodes = SimpleXml._get_compiled_xpath(xpath, namespaces=namespaces)(node)
         if len(_nodes) == 0:
             return default
         else:
@@ -934,7 +1162,7 @@ class SimpleXml(object):
 
         @return {list} - 获取到的节点列表
         """
-        return node.xpath(xpath, namespaces=namespaces)
+        return SimpleXml._get_compiled_xpath(xpath, namespaces=namespaces)(node)
 
     @staticmethod
     def get_legal_tag_name(tag_name: str):
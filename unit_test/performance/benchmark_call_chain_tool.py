@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+call_chain_tool性能测试, 对比methon_call_chain原处理方式(每次调用获取函数信息、通过调用堆栈查找上级函数的调用链参数、
+通过eval执行函数)与调用链上下文(contextvars)方式的性能
+@module benchmark_call_chain_tool
+@file benchmark_call_chain_tool.py
+"""
+
+import os
+import sys
+import time
+import datetime
+import inspect
+# 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir)))
+from HiveNetLib.base_tools.run_tool import RunTool
+from HiveNetLib.base_tools.call_chain_tool import CallChainTool
+
+
+__MOUDLE__ = 'benchmark_call_chain_tool'  # 模块名
+__DESCRIPT__ = u'call_chain_tool性能测试'  # 模块描述
+__VERSION__ = '0.1.0'  # 版本
+__AUTHOR__ = u'黎慧剑'  # 作者
+__PUBLISH__ = '2026.10.19'  # 发布日期
+
+
+class NullLogger(object):
+    """
+    不输出任何内容的日志对象, 仅测试修饰符本身的处理耗时
+    """
+
+    def log(self, level, msg, *args, **kwargs):
+        pass
+
+
+def old_get_parent_fun_para_value(parent_fun_frame, para_name):
+    """
+    原处理方式: 从父函数堆栈获取参数值
+    """
+    _para_value = None
+    if hasattr(parent_fun_frame, 'f_locals'):
+        if para_name in parent_fun_frame.f_locals.keys():
+            _para_value = parent_fun_frame.f_locals[para_name]
+        elif 'kwargs' in parent_fun_frame.f_locals.keys() and para_name in parent_fun_frame.f_locals['kwargs']:
+            _para_value = parent_fun_frame.f_locals['kwargs'][para_name]
+    return _para_value
+
+
+def old_call_func(func, args, kwargs):
+    """
+    原处理方式: 通过eval执行非标准定义的函数
+    """
+    _exec_str = 'func('
+    _i = 0
+    while _i < len(args):
+        _exec_str = _exec_str + ('args[%s],' % (str(_i)))
+        _i = _i + 1
+    _exec_str_2 = _exec_str.rstrip(',') + ')'
+    for _key in kwargs.keys():
+        _exec_str = _exec_str + ('%s=kwargs[\'%s\'],' % (_key, _key))
+    _exec_str = _exec_str.rstrip(',') + ')'
+    try:
+        return eval(_exec_str)
+    except TypeError:
+        return eval(_exec_str_2)
+
+
+def old_methon_call_chain(logger=None, log_level=20):
+    """
+    原methon_call_chain的处理方式(保留影响性能的处理步骤)
+    """
+    def wrapper1(func):
+        def wrapper2(*args, **kwargs):
+            _logger = logger
+            _start_time = datetime.datetime.now()
+            _call_id = CallChainTool.generate_trace_id()
+            _file_path, _file_name = os.path.split(inspect.getabsfile(func))
+            _fun_name = RunTool.get_function_name(func)
+
+            _parent_fun = sys._getframe().f_back
+            _parent_fun_name = str(_parent_fun.f_code.co_name)
+            _trace_id = kwargs.get('trace_id', None)
+            if _trace_id is None and _parent_fun_name != '<module>':
+                _trace_id = old_get_parent_fun_para_value(_parent_fun, 'trace_id')
+            if _trace_id is None:
+                _trace_id = _call_id
+
+            _trace_level = kwargs.get('trace_level', None)
+            if _trace_level is None and _parent_fun_name != '<module>':
+                _trace_level = old_get_parent_fun_para_value(_parent_fun, 'trace_level')
+            if _trace_level is None:
+                _trace_level = [0]
+            _trace_level[0] = _trace_level[0] + 1
+
+            _parent_call_id = kwargs.get('parent_id', None)
+            if _parent_call_id is None and _parent_fun_name != '<module>':
+                _parent_call_id = old_get_parent_fun_para_value(_parent_fun, 'call_id')
+            if _parent_call_id is None:
+                _parent_call_id = ''
+
+            _trace_item = '%s:%s:%s:%s:%s:%s' % (
+                _trace_id, _call_id, _parent_call_id, str(_trace_level[0]), _file_name, _fun_name)
+            _logger.log(log_level, '[TRACE:%s]%s' % (_trace_item, str({'key': {}, 'para': {}})))
+
+            kwargs['trace_id'] = _trace_id
+            kwargs['trace_level'] = _trace_level
+            kwargs['call_id'] = _call_id
+            kwargs['parent_id'] = _parent_call_id
+            _back = old_call_func(func, args, kwargs)
+
+            _use = (datetime.datetime.now() - _start_time).total_seconds()
+            _logger.log(log_level, '[TRACE:%s][USE:%ss]' % (_trace_item, str(_use)))
+            return _back
+        return wrapper2
+    return wrapper1
+
+
+_LOGGER = NullLogger()
+
+
+# 原处理方式修饰的函数
+@old_methon_call_chain(logger=_LOGGER)
+def old_child(a, b):
+    return a
+
+
+@old_methon_call_chain(logger=_LOGGER)
+def old_parent(a, **kwargs):
+    old_child(a, 'b')
+    return old_child(a, 'c')
+
+
+# 调用链上下文方式修饰的函数
+@CallChainTool.methon_call_chain(logger=_LOGGER)
+def new_child(a, b):
+    return a
+
+
+@CallChainTool.methon_call_chain(logger=_LOGGER)
+def new_parent(a, **kwargs):
+    new_child(a, 'b')
+    return new_child(a, 'c')
+
+
+def benchmark_fun(name, fun, count):
+    """
+    执行测试并打印单次耗时
+    """
+    _start = time.perf_counter()
+    for _i in range(count):
+        fun()
+    _cost = time.perf_counter() - _start
+    print('%-30s: %8.2f us' % (name, _cost * 1000000 / count))
+
+
+def benchmark_call_chain(count):
+    """
+    调用链修饰符的性能测试
+    """
+    print('=== single call')
+    benchmark_fun('old single call', lambda: old_child('a', 'b'), count)
+    benchmark_fun('context single call', lambda: new_child('a', 'b'), count)
+    print('=== nested call (1 parent + 2 children)')
+    benchmark_fun('old nested call', lambda: old_parent('a'), count)
+    benchmark_fun('context nested call', lambda: new_parent('a'), count)
+
+
+if __name__ == '__main__':
+    # 当程序自己独立运行时执行的操作
+    benchmark_call_chain(20000)
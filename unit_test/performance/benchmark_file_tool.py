@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+file_tool性能测试, 对比逐个文件压缩与线程池并行压缩的zip打包性能, 以及共享文件句柄与内存映射方式的zip读取性能
+@module benchmark_file_tool
+@file benchmark_file_tool.py
+"""
+
+import os
+import sys
+import time
+import random
+from concurrent.futures import ThreadPoolExecutor
+# 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir)))
+from HiveNetLib.base_tools.file_tool import FileTool
+import HiveNetLib.base_tools.myzipfile as zipfile
+
+
+__MOUDLE__ = 'benchmark_file_tool'  # 模块名
+__DESCRIPT__ = u'file_tool性能测试'  # 模块描述
+__VERSION__ = '0.1.0'  # 版本
+__AUTHOR__ = u'黎慧剑'  # 作者
+__PUBLISH__ = '2026.10.19'  # 发布日期
+
+
+_TEMP_DIR = os.path.realpath(
+    os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir,
+                 'test_data/temp/benchmark_file_tool')
+)
+
+
+class NullStream(object):
+    """
+    丢弃写入数据且不支持seek的输出流, 模拟socket
+    """
+
+    def write(self, data):
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+def generate_log_file(filename, size):
+    """
+    生成指定大小(近似)的模拟日志文件
+    """
+    _rand = random.Random(size)
+    _levels = ('DEBUG', 'INFO', 'WARNING', 'ERROR')
+    with open(filename, 'wb') as _f:
+        _written = 0
+        _index = 0
+        while _written < size:
+            _lines = ''.join(
+                '2026-10-19 12:%02d:%02d [%s] trace_id=%08x call service %d cost %d ms\n' % (
+                    (_index + _i) // 60 % 60, (_index + _i) % 60, _levels[_rand.randint(0, 3)],
+                    _rand.getrandbits(32), _rand.randint(1, 50), _rand.randint(1, 3000)
+                ) for _i in range(1000)
+            ).encode('utf-8')
+            _f.write(_lines)
+            _written += len(_lines)
+            _index += 1000
+
+
+def prepare_data():
+    """
+    准备测试数据: 大量小文件目录和少量大文件目录
+    """
+    _small_dir = os.path.join(_TEMP_DIR, 'small_files')
+    _large_dir = os.path.join(_TEMP_DIR, 'large_files')
+    if not os.path.exists(_small_dir):
+        FileTool.create_dir(_small_dir, exist_ok=True)
+        for _i in range(2000):
+            generate_log_file(os.path.join(_small_dir, 'log_%d.log' % _i), 16 * 1024)
+    if not os.path.exists(_large_dir):
+        FileTool.create_dir(_large_dir, exist_ok=True)
+        for _i in range(4):
+            generate_log_file(os.path.join(_large_dir, 'log_%d.log' % _i), 64 * 1024 * 1024)
+    return (('2000 small files', _small_dir), ('4 large files', _large_dir))
+
+
+def benchmark_fun(name, fun):
+    """
+    执行测试并打印耗时
+    """
+    _start = time.perf_counter()
+    fun()
+    _cost = time.perf_counter() - _start
+    print('%-30s: %10.2f s' % (name, _cost))
+
+
+def benchmark_zip():
+    """
+    zip打包的性能测试
+    """
+    _zip_path = os.path.join(_TEMP_DIR, 'zip')
+    for _name, _src_dir in prepare_data():
+        print('=== %s' % _name)
+        benchmark_fun('serial', lambda: FileTool.zip(
+            _src_dir, dest_path=_zip_path, dest_filename='serial.zip'
+        ))
+        for _workers in (2, 4, 8):
+            benchmark_fun('parallel %d workers' % _workers, lambda: FileTool.zip(
+                _src_dir, dest_path=_zip_path, dest_filename='parallel.zip', workers=_workers
+            ))
+
+        # 流式写入不可seek的流
+        benchmark_fun('parallel stream', lambda: FileTool.zip(
+            _src_dir, dest_obj=NullStream(), workers=os.cpu_count() or 1
+        ))
+
+
+def benchmark_read_zip():
+    """
+    zip读取的性能测试
+    """
+    _zip_path = os.path.join(_TEMP_DIR, 'zip')
+    for _name, _src_dir in prepare_data():
+        print('=== read %s' % _name)
+        _zip_file = os.path.join(_zip_path, 'read.zip')
+        FileTool.zip(_src_dir, dest_path=_zip_path, dest_filename='read.zip')
+        with zipfile.ZipFile(_zip_file) as _zip:
+            _names = _zip.namelist()
+
+        # 每次读取单个文件(重复打开压缩包)
+        _read_names = _names[0: 20]
+        benchmark_fun('read_zip_file x20', lambda: [
+            FileTool.read_zip_file(_zip_file, _member) for _member in _read_names
+        ])
+        benchmark_fun('read_zip_file x20 use_mmap', lambda: [
+            FileTool.read_zip_file(_zip_file, _member, use_mmap=True) for _member in _read_names
+        ])
+
+        # 多线程并发读取所有文件
+        for _cls in (zipfile.ZipFile, zipfile.MmapZipFile):
+            with _cls(_zip_file) as _zip, ThreadPoolExecutor(max_workers=4) as _executor:
+                benchmark_fun('%s 4 threads read all' % _cls.__name__, lambda: list(
+                    _executor.map(_zip.read, _names)
+                ))
+
+        # 解压
+        benchmark_fun('unzip', lambda: FileTool.unzip(
+            _zip_file, dest_path=os.path.join(_zip_path, 'unzip')
+        ))
+        benchmark_fun('unzip 4 workers', lambda: FileTool.unzip(
+            _zip_file, dest_path=os.path.join(_zip_path, 'unzip'), workers=4
+        ))
+
+
+if __name__ == '__main__':
+    # 当程序自己独立运行时执行的操作
+    benchmark_zip()
+    benchmark_read_zip()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+file_transfer性能测试, 对比单连接1KB分块下载与HttpPullProtocol多连接分段下载http文件的性能
+@module benchmark_file_transfer
+@file benchmark_file_transfer.py
+"""
+
+import os
+import sys
+import re
+import time
+import multiprocessing
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+# 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir)))
+from HiveNetLib.base_tools.file_tool import FileTool
+from HiveNetLib.base_tools.net_tool import NetTool
+from HiveNetLib.file_transfer.transfer import Transfer
+from HiveNetLib.file_transfer.extend_protocol.http import HttpPullProtocol
+
+
+__MOUDLE__ = 'benchmark_file_transfer'  # 模块名
+__DESCRIPT__ = u'file_transfer性能测试'  # 模块描述
+__VERSION__ = '0.1.0'  # 版本
+__AUTHOR__ = u'黎慧剑'  # 作者
+__PUBLISH__ = '2026.10.19'  # 发布日期
+
+
+_TEMP_DIR = os.path.realpath(
+    os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir,
+                 'test_data/temp/benchmark_file_transfer')
+)
+_SRC_DIR = os.path.join(_TEMP_DIR, 'src')
+_DEST_DIR = os.path.join(_TEMP_DIR, 'dest')
+
+
+class RangeHTTPRequestHandler(SimpleHTTPRequestHandler):
+    """
+    支持Range请求及单连接限速的http文件服务处理类, 模拟真实的文件下载服务器
+    """
+    protocol_version = 'HTTP/1.1'
+    rate_limit = 0  # 单连接限速, 单位为byte/s, 0代表不限速
+
+    def send_head(self):
+        self._range_left = None
+        _range = self.headers.get('Range', None)
+        _path = self.translate_path(self.path)
+        if _range is None or not os.path.isfile(_path):
+            return super().send_head()
+
+        _file = open(_path, 'rb')
+        _size = os.fstat(_file.fileno()).st_size
+        _match = re.match(r'^bytes=(\d+)-(\d*)$', _range)
+        _start = int(_match.group(1))
+        _end = _size - 1 if _match.group(2) == '' else min(int(_match.group(2)), _size - 1)
+        self.send_response(206)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Range', 'bytes %d-%d/%d' % (_start, _end, _size))
+        self.send_header('Content-Length', str(_end - _start + 1))
+        self.end_headers()
+        _file.seek(_start)
+        self._range_left = _end - _start + 1
+        return _file
+
+    def copyfile(self, source, outputfile):
+        _left = self._range_left
+        _start_time = time.perf_counter()
+        _sent = 0
+        while _left is None or _left > 0:
+            _data = source.read(64 * 1024 if _left is None else min(_left, 64 * 1024))
+            if not _data:
+                break
+            try:
+                outputfile.write(_data)
+            except ConnectionError:
+                # 客户端提前关闭连接(例如获取文件大小的探测请求)
+                return
+            _sent += len(_data)
+            if _left is not None:
+                _left -= len(_data)
+            if self.rate_limit > 0:
+                # 按限速控制发送节奏
+                _wait = _sent / self.rate_limit - (time.perf_counter() - _start_time)
+                if _wait > 0:
+                    time.sleep(_wait)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_server(port, rate_limit):
+    """
+    在独立进程中启动http服务, 避免与下载端争用GIL
+    """
+    RangeHTTPRequestHandler.rate_limit = rate_limit
+    _server = ThreadingHTTPServer(
+        ('127.0.0.1', port), partial(RangeHTTPRequestHandler, directory=_SRC_DIR)
+    )
+    _server.serve_forever()
+
+
+def benchmark_fun(name, fun, file_size):
+    """
+    执行测试并打印耗时及速度
+    """
+    _start = time.perf_counter()
+    fun()
+    _cost = time.perf_counter() - _start
+    print('%-30s: %8.2f s %10.2f MB/s' % (name, _cost, file_size / _cost / 1024 / 1024))
+
+
+def transfer_download(url, dest_file, thread_num, block_size):
+    """
+    通过HttpPullProtocol下载文件
+    """
+    with HttpPullProtocol(
+        url, dest_file, is_resume=False, is_overwrite=True, thread_num=thread_num,
+        block_size=block_size, cache_size=4096
+    ) as _protocol:
+        _status = Transfer(_protocol, thread_interval=0.0).start(wait_finished=True)
+        if _status != 'finished':
+            raise RuntimeError('download failed: %s' % _status)
+
+
+def benchmark_download(file_size, rate_limit, port=18765):
+    """
+    http下载的性能测试
+    """
+    FileTool.create_dir(_SRC_DIR, exist_ok=True)
+    FileTool.create_dir(_DEST_DIR, exist_ok=True)
+    _src_file = os.path.join(_SRC_DIR, 'download_%d.bin' % file_size)
+    if not os.path.exists(_src_file):
+        with open(_src_file, 'wb') as _f:
+            for _i in range(file_size // (1024 * 1024)):
+                _f.write(os.urandom(1024 * 1024))
+    _url = 'http://127.0.0.1:%d/%s' % (port, os.path.split(_src_file)[1])
+    _dest_file = os.path.join(_DEST_DIR, 'download.bin')
+
+    _server = multiprocessing.Process(target=run_server, args=(port, rate_limit), daemon=True)
+    _server.start()
+    time.sleep(1)
+    try:
+        print('=== %d MB, rate limit per connection: %s' % (
+            file_size // 1024 // 1024, '%d MB/s' % (rate_limit // 1024 // 1024) if rate_limit > 0 else 'none'
+        ))
+        benchmark_fun('download_http_file 1KB blocks', lambda: NetTool.download_http_file(
+            _url, filename='download.bin', path=_DEST_DIR, is_resume=True
+        ), file_size)
+        FileTool.remove_file(_dest_file)
+
+        for _thread_num in (1, 4, 8):
+            benchmark_fun('HttpPullProtocol %d threads' % _thread_num, lambda: transfer_download(
+                _url, _dest_file, _thread_num, 256 * 1024
+            ), file_size)
+    finally:
+        _server.terminate()
+        _server.join()
+
+
+if __name__ == '__main__':
+    # 当程序自己独立运行时执行的操作
+    benchmark_download(100 * 1024 * 1024, 0)
+    benchmark_download(100 * 1024 * 1024, 10 * 1024 * 1024, port=18766)
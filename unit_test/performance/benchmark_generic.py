@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+generic性能测试, 对比CResult原处理方式(构造时生成msg)与延迟生成msg方式创建成功及失败结果的性能
+@module benchmark_generic
+@file benchmark_generic.py
+"""
+
+import os
+import sys
+import re
+import time
+# 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir)))
+from HiveNetLib.base_tools.run_tool import RunTool
+from HiveNetLib.generic import NullObj, CResult
+from HiveNetLib.simple_i18n import get_global_i18n, init_global_i18n
+
+
+__MOUDLE__ = 'benchmark_generic'  # 模块名
+__DESCRIPT__ = u'generic性能测试'  # 模块描述
+__VERSION__ = '0.1.0'  # 版本
+__AUTHOR__ = u'黎慧剑'  # 作者
+__PUBLISH__ = '2026.10.19'  # 发布日期
+
+
+def old_translate(i18n_obj, msg_id, replace_para=(), lang=None):
+    """
+    原SimpleI18N.translate的处理方式
+    """
+    temp_lang = lang
+    if lang is None:
+        temp_lang = i18n_obj.lang
+    s = msg_id
+    if temp_lang in i18n_obj.trans_dict.keys() and msg_id in i18n_obj.trans_dict[temp_lang].keys():
+        s = i18n_obj.trans_dict[temp_lang][msg_id]
+    i = 1
+    for para in replace_para:
+        if s.find('$' + str(i)) >= 0:
+            s = re.sub(r'\$' + str(i), str(para).replace('\\', '\\\\'), s)
+        i = i + 1
+    return s
+
+
+class OldCResult(NullObj):
+    """
+    原CResult的处理方式: 构造时即完成国际化及占位符替换
+    """
+
+    _i18n_obj = None
+    i18n_error_type_msg_id = ''
+    i18n_msg_id = ''
+    i18n_msg_paras = None
+
+    def __init__(self, code='00000', msg=None, error='', trace_str='',
+                 i18n_obj=None, i18n_msg_paras=()):
+        self.code = code
+        self.msg = msg
+        self.i18n_msg_id = msg
+        self.i18n_msg_paras = i18n_msg_paras
+        self._i18n_obj = i18n_obj
+        self.error = error
+        self.trace_str = trace_str
+        if i18n_obj is None:
+            self._i18n_obj = get_global_i18n()
+        self.__get_i18n_msg_id()
+        self.reset_msg()
+
+    def is_success(self):
+        return (self.code[0] == '0')
+
+    def reset_msg(self):
+        if self._i18n_obj is None:
+            self.msg = self.i18n_msg_id
+            if self.msg != '':
+                i = 1
+                for para in self.i18n_msg_paras:
+                    if self.msg.find('$' + str(i)) >= 0:
+                        self.msg = re.sub(r'\$' + str(i), str(para), self.msg)
+                    i = i + 1
+            if self.i18n_error_type_msg_id != '':
+                if self.msg != '':
+                    self.msg = '%s: %s' % (self.i18n_error_type_msg_id, self.msg)
+                else:
+                    self.msg = self.i18n_error_type_msg_id
+        else:
+            self.msg = ''
+            if self.i18n_error_type_msg_id != '':
+                self.msg = old_translate(self._i18n_obj, self.i18n_error_type_msg_id)
+                if self.i18n_msg_id != '':
+                    self.msg = self.msg + ': '
+
+            if self.i18n_msg_id != '':
+                self.msg = self.msg + \
+                    old_translate(self._i18n_obj, self.i18n_msg_id, self.i18n_msg_paras)
+
+    def __get_i18n_msg_id(self):
+        _map_error_code = RunTool.get_global_var('HIVENET_ERROR_CODE_MAP')
+        if self.code[0] in _map_error_code.keys():
+            self.i18n_error_type_msg_id = _map_error_code[self.code[0]]
+        else:
+            self.i18n_error_type_msg_id = 'unknow'
+
+        if self.i18n_msg_id is None or self.i18n_msg_id == '':
+            if self.code[1:] in _map_error_code.keys():
+                self.i18n_msg_id = _map_error_code[self.code[1:]]
+            else:
+                self.i18n_msg_id = ''
+
+
+def benchmark_fun(name, fun, count):
+    """
+    执行测试并打印单次耗时
+    """
+    _start = time.perf_counter()
+    for _i in range(count):
+        fun()
+    _cost = time.perf_counter() - _start
+    print('%-40s: %8.3f us' % (name, _cost * 1000000 / count))
+
+
+def benchmark_cresult(count):
+    """
+    CResult创建的性能测试
+    """
+    CResult()  # 装载错误码映射
+    for _title, _paras in (
+        ('success', {'code': '00000'}),
+        ('error', {'code': '11403', 'i18n_msg_paras': ('service_name', )}),
+        ('error with msg', {
+            'code': '19999', 'msg': '[$2]("$1") must between $4 and $5',
+            'i18n_msg_paras': ('abc', 'my_obj', 'str_len', 3, 4)
+        }),
+    ):
+        print('=== %s' % _title)
+        benchmark_fun('old create', lambda: OldCResult(**_paras), count)
+        benchmark_fun('lazy create', lambda: CResult(**_paras), count)
+        benchmark_fun('lazy create and get msg', lambda: CResult(**_paras).msg, count)
+        if _title == 'success':
+            benchmark_fun('lazy create and is_success', lambda: CResult(**_paras).is_success(), count)
+
+
+def benchmark_translate(count):
+    """
+    SimpleI18N.translate的性能测试
+    """
+    _i18n = get_global_i18n()
+    print('=== translate, lang=%s' % _i18n.lang)
+    for _title, _msg_id, _paras in (
+        ('no para', 'success', ()),
+        ('2 paras', '[$1] not found in object $2', ('my_key', 'my_obj')),
+        ('5 paras', '[$2]("$1") must between $4 and $5', ('abc', 'my_obj', 'str_len', 3, 4)),
+    ):
+        benchmark_fun('old translate %s' % _title, lambda: old_translate(_i18n, _msg_id, _paras), count)
+        benchmark_fun('cached translate %s' % _title, lambda: _i18n.translate(_msg_id, _paras), count)
+
+
+if __name__ == '__main__':
+    # 当程序自己独立运行时执行的操作
+    print('****** without i18n')
+    benchmark_cresult(100000)
+    init_global_i18n()
+    for _lang in ('en', 'zh'):
+        get_global_i18n().lang = _lang
+        print('****** i18n lang=%s' % _lang)
+        benchmark_cresult(100000)
+    benchmark_translate(100000)
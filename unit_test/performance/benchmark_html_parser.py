@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+html_parser性能测试, 对比大页面上通过xpath全树扫描与通过元素索引查找元素的性能
+@module benchmark_html_parser
+@file benchmark_html_parser.py
+"""
+
+import os
+import sys
+import time
+# 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir)))
+from HiveNetLib.html_parser import HtmlParser
+
+
+__MOUDLE__ = 'benchmark_html_parser'  # 模块名
+__DESCRIPT__ = u'html_parser性能测试'  # 模块描述
+__VERSION__ = '0.1.0'  # 版本
+__AUTHOR__ = u'黎慧剑'  # 作者
+__PUBLISH__ = '2026.10.19'  # 发布日期
+
+
+# 原处理方式使用的xpath
+OLD_XPATHS = {
+    'id': './/*[@id="%s"]',
+    'name': './/*[@name="%s"]',
+    'tag_name': './/%s',
+    'class_name': './/*[contains(concat(" ", normalize-space(@class), " "), " %s ")]',
+    'link_text': './/*[@href and text()="%s"]'
+}
+
+
+def generate_html(rows):
+    """
+    生成大页面，每行包含id、name、class及链接
+    """
+    return '<html><body><table id="list">%s</table></body></html>' % ''.join(
+        '<tr id="row%d" class="row %s"><td name="col_name">name %d</td>'
+        '<td><a href="/item/%d" class="link">item %d</a></td></tr>' % (
+            _i, 'odd' if _i % 2 else 'even', _i, _i, _i
+        ) for _i in range(rows)
+    )
+
+
+def benchmark_fun(name, fun, steps_list):
+    """
+    执行测试并打印单次查找耗时
+    """
+    _start = time.perf_counter()
+    for _steps in steps_list:
+        fun(_steps)
+    _cost = time.perf_counter() - _start
+    print('%-30s: %10.2f us/lookup' % (name, _cost * 1000000 / len(steps_list)))
+
+
+def benchmark_find_elements(rows, count):
+    """
+    查找元素的性能测试
+    """
+    _parser = HtmlParser(generate_html(rows))
+
+    def _old_find(steps):
+        # 原处理方式：每个步骤转换为xpath扫描子树
+        _elements = [None]
+        for _op, _value in steps:
+            _new_elements = list()
+            for _element in _elements:
+                _new_elements.extend(
+                    _parser._find_elements_by_xpath(OLD_XPATHS[_op] % _value, parent=_element)
+                )
+            _elements = _new_elements
+        return _elements
+
+    _start = time.perf_counter()
+    _parser.find_elements([['id', 'list']])
+    print('=== %d rows, build index: %.2f ms' % (rows, (time.perf_counter() - _start) * 1000))
+    for _name, _steps_list in (
+        ('id', [[['id', 'row%d' % (_i * 7 % rows)]] for _i in range(count)]),
+        ('id > link_text', [
+            [['id', 'row%d' % (_i * 7 % rows)], ['link_text', 'item %d' % (_i * 7 % rows)]]
+            for _i in range(count)
+        ]),
+        ('class_name', [[['class_name', 'odd']] for _i in range(count // 10)]),
+        ('id > tag_name', [[['id', 'row%d' % _i], ['tag_name', 'td']] for _i in range(count)])
+    ):
+        benchmark_fun('%s - xpath' % _name, _old_find, _steps_list)
+        benchmark_fun('%s - index' % _name, _parser.find_elements, _steps_list)
+
+
+if __name__ == '__main__':
+    # 当程序自己独立运行时执行的操作
+    benchmark_find_elements(5000, 200)
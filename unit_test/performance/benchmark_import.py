@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+模块导入性能测试, 对比原处理方式(导入时即装载lxml、dicttoxml、chardet、myzipfile、gevent、asyncio等依赖)
+与延迟装载依赖方式导入核心模块的耗时
+@module benchmark_import
+@file benchmark_import.py
+"""
+
+import os
+import sys
+import subprocess
+
+
+__MOUDLE__ = 'benchmark_import'  # 模块名
+__DESCRIPT__ = u'模块导入性能测试'  # 模块描述
+__VERSION__ = '0.1.0'  # 版本
+__AUTHOR__ = u'黎慧剑'  # 作者
+__PUBLISH__ = '2026.10.19'  # 发布日期
+
+
+# 包所在路径
+PACKAGE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+
+# 要测试的核心模块, value为原处理方式导入时是否会装载依赖包
+# 注: simple_cache、simple_queue原来就不依赖generic等模块, 仅测试导入耗时
+MODULES = {
+    'generic': True,
+    'simple_log': True,
+    'simple_cache': False,
+    'simple_queue': False,
+}
+
+# 原处理方式在导入时装载的依赖包
+OLD_EAGER_IMPORT = '''
+import asyncio
+try:
+    import nest_asyncio
+    nest_asyncio.apply()
+except ImportError:
+    pass
+try:
+    import gevent
+except ImportError:
+    pass
+import chardet
+import dicttoxml
+from lxml import etree
+import HiveNetLib.base_tools.myzipfile
+'''
+
+# 在独立进程中执行的测试代码, 输出导入耗时(毫秒)
+CHILD_CODE = '''
+import sys
+import time
+sys.path.insert(0, %r)
+_start = time.perf_counter()
+%s
+import HiveNetLib.%s
+print((time.perf_counter() - _start) * 1000)
+'''
+
+
+def import_cost(module_name, pre_import=''):
+    """
+    在新的Python进程中导入模块并返回耗时
+
+    @param {str} module_name - 要导入的模块名
+    @param {str} pre_import='' - 导入模块前执行的代码
+
+    @returns {float} - 导入耗时, 单位为毫秒
+    """
+    _code = CHILD_CODE % (PACKAGE_PATH, pre_import, module_name)
+    _out = subprocess.check_output([sys.executable, '-c', _code])
+    return float(_out.decode('utf-8').strip().split('\n')[-1])
+
+
+def benchmark_fun(name, module_name, pre_import, count):
+    """
+    执行测试并打印导入耗时(取最小值及平均值)
+    """
+    _costs = [import_cost(module_name, pre_import=pre_import) for _i in range(count)]
+    print('%-30s: min %8.2f ms, avg %8.2f ms' % (name, min(_costs), sum(_costs) / count))
+
+
+def benchmark_import(count):
+    """
+    核心模块导入的性能测试
+    """
+    for _module_name, _is_eager in MODULES.items():
+        print('=== import HiveNetLib.%s' % _module_name)
+        if _is_eager:
+            benchmark_fun('old eager import', _module_name, OLD_EAGER_IMPORT, count)
+        benchmark_fun('lazy import', _module_name, '', count)
+
+
+if __name__ == '__main__':
+    # 当程序自己独立运行时执行的操作
+    benchmark_import(10)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+msg_json性能测试, 对比每次解析jsonpath及exec赋值的方式与路径缓存、直接遍历方式的单字段读写性能
+@module benchmark_msg_json
+@file benchmark_msg_json.py
+"""
+
+import os
+import sys
+import time
+from jsonpath_rw import parse
+# 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir)))
+from HiveNetLib.interface_tool.msg_json import MsgJSON
+
+
+__MOUDLE__ = 'benchmark_msg_json'  # 模块名
+__DESCRIPT__ = u'msg_json性能测试'  # 模块描述
+__VERSION__ = '0.1.0'  # 版本
+__AUTHOR__ = u'黎慧剑'  # 作者
+__PUBLISH__ = '2026.10.19'  # 发布日期
+
+
+TEST_JSON_STR = (
+    '{"head": {"id": "001", "tran_code": "T0001", "tags": ["a", "b"]}, '
+    '"body": {"list": [{"val": 1}, {"val": 2}, {"val": 3}], "amount": 100}}'
+)
+
+SIMPLE_PATHS = ['head.id', 'head.tran_code', '$.body.list[2].val', 'body.amount']
+JSONPATH_PATHS = ['body.list[*].val', '$..tran_code']
+
+
+def old_get_value(msg, search_path):
+    """
+    原处理方式：每次解析jsonpath
+    """
+    _nodes = parse(search_path).find(msg)
+    if len(_nodes) == 0:
+        raise NameError
+    return _nodes[0].value
+
+
+def old_set_value(msg, search_path, value):
+    """
+    原处理方式：每次解析jsonpath，通过exec赋值
+    """
+    _msg = msg
+    _nodes = parse(search_path).find(_msg)
+    if len(_nodes) == 0:
+        raise NameError
+    for _item in _nodes:
+        exec('_msg%s = str(value)' % MsgJSON.get_jsonpath_location_string(_item.full_path))
+    return _msg
+
+
+def benchmark_fun(name, fun, paths, count):
+    """
+    执行测试并打印单字段处理耗时
+    """
+    _start = time.perf_counter()
+    for _i in range(count):
+        for _path in paths:
+            fun(_path)
+    _cost = time.perf_counter() - _start
+    print('%-30s: %8.2f us/field' % (name, _cost * 1000000 / (count * len(paths))))
+
+
+def benchmark_msg_json(count):
+    """
+    单字段读写性能测试
+    """
+    _msg = MsgJSON(TEST_JSON_STR)
+    _obj = _msg.base_object
+    for _name, _paths in (('simple path', SIMPLE_PATHS), ('jsonpath', JSONPATH_PATHS)):
+        print('=== %s: %s' % (_name, str(_paths)))
+        benchmark_fun('get - parse every time', lambda p: old_get_value(_obj, p), _paths, count)
+        benchmark_fun('get - MsgJSON', lambda p: _msg.get_value(p), _paths, count)
+        benchmark_fun('set - parse and exec', lambda p: old_set_value(_obj, p, 'v'), _paths, count)
+        benchmark_fun('set - MsgJSON', lambda p: _msg.set_value(p, 'v'), _paths, count)
+
+
+if __name__ == '__main__':
+    # 当程序自己独立运行时执行的操作
+    benchmark_msg_json(500)
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+net_service性能测试:
+    1、对比TcpIpService线程模式与事件循环模式在不同连接数下的线程数、CPU占用及处理性能
+    2、recv_data在不同报文大小下的接收吞吐量
+    3、send_data发送报文头+大报文体(内存数据/文件)的吞吐量及CPU占用
+@module benchmark_net_service
+@file benchmark_net_service.py
+"""
+
+import os
+import sys
+import time
+import logging
+import socket
+import datetime
+import tempfile
+import threading
+# 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir)))
+from HiveNetLib.net_service.tcpip_service import TcpIpService, SocketFileRegion
+from HiveNetLib.generic import NullObj, CResult
+from HiveNetLib.base_tools.exception_tool import ExceptionTool
+
+
+__MOUDLE__ = 'benchmark_net_service'  # 模块名
+__DESCRIPT__ = u'net_service性能测试'  # 模块描述
+__VERSION__ = '0.1.0'  # 版本
+__AUTHOR__ = u'黎慧剑'  # 作者
+__PUBLISH__ = '2026.10.19'  # 发布日期
+
+
+BASE_PORT = 9620  # 测试服务的起始端口
+IDLE_SECONDS = 3  # 统计空闲连接CPU占用的时长
+ROUNDS = 5  # 每个连接的请求次数
+CLIENT_THREADS = 8  # 客户端并发线程数
+
+
+def echo_deal_fun(thread_id, server_opts, net_info, self_tag):
+    """
+    长连接回显处理函数, 报文格式为4字节长度+报文体
+    """
+    while True:
+        _read_result = TcpIpService.recv_data(net_info, {'recv_len': 4})
+        if not _read_result.is_success():
+            TcpIpService.close_connect(net_info)
+            return
+        _len = int.from_bytes(_read_result.data, byteorder='big', signed=False)
+        _read_result = TcpIpService.recv_data(net_info, {'recv_len': _len})
+        if not _read_result.is_success():
+            TcpIpService.close_connect(net_info)
+            return
+        TcpIpService.send_data(
+            net_info, _len.to_bytes(4, byteorder='big', signed=False) + _read_result.data, {}
+        )
+
+        if server_opts.use_event_loop:
+            # 事件循环模式处理完当前请求直接返回
+            return
+
+
+def client_fun(net_infos, rounds):
+    """
+    客户端处理, 在每个连接上顺序发送请求
+    """
+    _body = b'x' * 64
+    _send = len(_body).to_bytes(4, byteorder='big', signed=False) + _body
+    for _i in range(rounds):
+        for _net_info in net_infos:
+            TcpIpService.send_data(_net_info, _send, {})
+            _result = TcpIpService.recv_data(_net_info, {'recv_len': len(_send)})
+            if not _result.is_success():
+                raise RuntimeError('recv error: %s' % _result.code)
+
+
+def benchmark(connect_num, use_event_loop, port):
+    """
+    执行单个场景的测试
+    """
+    _server = TcpIpService(
+        logger=logging.getLogger(), server_connect_deal_fun=echo_deal_fun, log_level=logging.DEBUG
+    )
+    _server_opts = TcpIpService.generate_server_opts(
+        ip='127.0.0.1', port=port, max_connect=4096, use_event_loop=use_event_loop, worker_num=4
+    )
+    _server.start_server(_server_opts, is_wait=True)
+    _net_infos = list()
+    try:
+        for _i in range(connect_num):
+            _net_infos.append(TcpIpService.connect_server(_server_opts).net_info)
+        time.sleep(1)
+
+        # 空闲连接的线程数及CPU占用
+        _threads = threading.active_count()
+        _cpu_begin = time.process_time()
+        time.sleep(IDLE_SECONDS)
+        _idle_cpu = (time.process_time() - _cpu_begin) / IDLE_SECONDS * 100
+
+        # 所有连接并发请求的处理性能
+        _groups = [_net_infos[_i::CLIENT_THREADS] for _i in range(CLIENT_THREADS)]
+        _clients = [threading.Thread(target=client_fun, args=(_group, ROUNDS)) for _group in _groups]
+        _cpu_begin = time.process_time()
+        _start = time.perf_counter()
+        for _client in _clients:
+            _client.start()
+        for _client in _clients:
+            _client.join()
+        _use = time.perf_counter() - _start
+        _busy_cpu = time.process_time() - _cpu_begin
+    finally:
+        for _net_info in _net_infos:
+            TcpIpService.close_connect(_net_info)
+        _server.stop_server(is_wait=True, overtime=60)
+
+    _requests = connect_num * ROUNDS
+    print('    %-12s threads=%-6d idle cpu=%6.2f%%  %8.0f req/s  cpu=%6.3fs' % (
+        'event_loop' if use_event_loop else 'thread', _threads, _idle_cpu, _requests / _use, _busy_cpu
+    ))
+
+
+def legacy_recv(net_info, recv_len):
+    """
+    原有的接收处理方式(拼接bytes, 每次循环计算超时), 用于对比
+    """
+    _result = CResult('00000')
+    _result.data = b''
+    _result.recv_time = datetime.datetime.now()
+    _overtime = net_info.recv_timeout
+    with ExceptionTool.ignored_cresult(_result):
+        _rest_bytes = recv_len
+        while _rest_bytes > 0:
+            if (datetime.datetime.now() - _result.recv_time).total_seconds() * 1000 > _overtime:
+                _result.change_code(code='20403')
+                break
+            with ExceptionTool.ignored(expect=(BlockingIOError)):
+                _buffer = net_info.csocket.recv(_rest_bytes)
+                if len(_buffer) > 0:
+                    _result.data = _result.data + _buffer
+                    _rest_bytes = _rest_bytes - len(_buffer)
+    return _result
+
+
+def benchmark_recv(payload_size, total_size):
+    """
+    测试recv_data接收指定大小报文的吞吐量
+    """
+    _count = max(1, total_size // payload_size)
+    _payload = os.urandom(payload_size)
+    _buffer = bytearray(payload_size)
+    print('payload=%d bytes, count=%d' % (payload_size, _count))
+    _cases = [
+        ('bytes concat', lambda net_info: legacy_recv(net_info, payload_size).data),
+        ('recv_data', lambda net_info: TcpIpService.recv_data(net_info, {'recv_len': payload_size}).data),
+        ('recv_data(buffer)', lambda net_info: TcpIpService.recv_data(
+            net_info, {'recv_len': payload_size, 'buffer': _buffer}).data),
+    ]
+    for _label, _fun in _cases:
+        if _label == 'bytes concat' and payload_size > 4 * 1024 * 1024:
+            # 拼接方式处理大报文耗时过长
+            print('    %-20s skipped' % _label)
+            continue
+        _rsock, _wsock = socket.socketpair()
+        _rsock.setblocking(False)
+        _net_info = NullObj()
+        _net_info.csocket = _rsock
+        _net_info.recv_timeout = 60000
+        _sender = threading.Thread(target=lambda: [_wsock.sendall(_payload) for _i in range(_count)])
+        _start = time.perf_counter()
+        _sender.start()
+        for _i in range(_count):
+            if len(_fun(_net_info)) != payload_size:
+                raise RuntimeError('recv error')
+        _use = time.perf_counter() - _start
+        _sender.join()
+        _rsock.close()
+        _wsock.close()
+        print('    %-20s %8.3fs  %10.1f MB/s  %10.0f msg/s' % (
+            _label, _use, payload_size * _count / _use / 1024 / 1024, _count / _use
+        ))
+
+
+def legacy_send(net_info, data):
+    """
+    原有的发送处理方式(每次部分发送后对bytes切片), 用于对比
+    """
+    _rest_bytes = len(data)
+    _total_bytes = _rest_bytes
+    while _rest_bytes > 0:
+        with ExceptionTool.ignored(expect=(BlockingIOError)):
+            _len = net_info.csocket.send(data[_total_bytes - _rest_bytes:])
+            if _len > 0:
+                _rest_bytes = _rest_bytes - _len
+
+
+def benchmark_send(payload_size, count):
+    """
+    测试send_data发送报文头+报文体的吞吐量
+    """
+    _head = b'HTTP/1.1 200 OK\r\nContent-Length:%d\r\n\r\n' % payload_size
+    _payload = os.urandom(payload_size)
+    _file = tempfile.TemporaryFile()
+    _file.write(_payload)
+    _file.flush()
+    print('head + payload=%d bytes, count=%d' % (payload_size, count))
+    _cases = [
+        ('concat + slice send', lambda net_info: legacy_send(net_info, _head + _payload)),
+        ('send_data(list)', lambda net_info: TcpIpService.send_data(net_info, [_head, _payload], {})),
+        ('send_data(file)', lambda net_info: TcpIpService.send_data(
+            net_info, [_head, SocketFileRegion(_file, 0, payload_size)], {})),
+    ]
+    for _label, _fun in _cases:
+        if _label == 'concat + slice send' and payload_size > 4 * 1024 * 1024:
+            # 切片方式处理大报文耗时过长
+            print('    %-20s skipped' % _label)
+            continue
+        _rsock, _wsock = socket.socketpair()
+        _wsock.setblocking(False)
+        _net_info = NullObj()
+        _net_info.csocket = _wsock
+        _net_info.send_timeout = 60000
+        _total = (len(_head) + payload_size) * count
+
+        def _recv_fun():
+            _buffer = bytearray(1024 * 1024)
+            _rest = _total
+            while _rest > 0:
+                _rest -= _rsock.recv_into(_buffer)
+
+        _receiver = threading.Thread(target=_recv_fun)
+        _receiver.start()
+        _cpu_begin = time.process_time()
+        _start = time.perf_counter()
+        for _i in range(count):
+            _fun(_net_info)
+        _receiver.join()
+        _use = time.perf_counter() - _start
+        _cpu = time.process_time() - _cpu_begin
+        _rsock.close()
+        _wsock.close()
+        print('    %-20s %8.3fs  %10.1f MB/s  cpu=%6.3fs' % (_label, _use, _total / _use / 1024 / 1024, _cpu))
+    _file.close()
+
+
+if __name__ == '__main__':
+    benchmark_recv(1024, 32 * 1024 * 1024)
+    benchmark_recv(1024 * 1024, 256 * 1024 * 1024)
+    benchmark_recv(64 * 1024 * 1024, 256 * 1024 * 1024)
+
+    benchmark_send(1024 * 1024, 256)
+    benchmark_send(64 * 1024 * 1024, 4)
+
+    _port = BASE_PORT
+    for _connect_num in (10, 100, 1000, 3000):
+        print('connections=%d, requests=%d' % (_connect_num, _connect_num * ROUNDS))
+        for _use_event_loop in (False, True):
+            benchmark(_connect_num, _use_event_loop, _port)
+            _port += 1
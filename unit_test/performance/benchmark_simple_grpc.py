@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+simple_grpc性能测试:
+    1、对比原有eval动态执行方式与调用计划直接执行方式的服务函数分发性能
+    2、进程内直接调用SimpleGRpcServicer.GRpcCallSimple的简单调用QPS
+    3、对比json与二进制编码(SimpleGRpcBinCodec)的参数及返回值序列化性能
+    4、对比每次调用新建channel、共享channel及单channel并发调用(grpc_call_many)的网络调用QPS
+    5、对比同步写调用链日志与异步批量写入(SimpleGRpcCallChainLogWriter)的调用耗时(平均及p99)
+@module benchmark_simple_grpc
+@file benchmark_simple_grpc.py
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import tempfile
+# 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir)))
+from HiveNetLib.simple_grpc.grpc_server import SimpleGRpcServicer, SimpleGRpcServer
+from HiveNetLib.simple_grpc.grpc_tool import EnumCallMode, SimpleGRpcTools, SimpleGRpcChannelRegistry, \
+    SimpleGRpcCallChainLogWriter
+from HiveNetLib.generic import NullObj
+from HiveNetLib.simple_grpc.grpc_codec import SimpleGRpcBinCodec
+from HiveNetLib.base_tools.run_tool import RunTool
+
+
+__MOUDLE__ = 'benchmark_simple_grpc'  # 模块名
+__DESCRIPT__ = u'simple_grpc性能测试'  # 模块描述
+__VERSION__ = '0.1.0'  # 版本
+__AUTHOR__ = u'黎慧剑'  # 作者
+__PUBLISH__ = '2026.10.19'  # 发布日期
+
+
+COUNT = 100000  # 每个场景的调用次数
+
+
+def service_fun(a, b, *args, c=10, **kwargs):
+    """
+    测试用的服务函数
+    """
+    return [a, b, c]
+
+
+def service_fun_no_kwargs(a, b, c=10):
+    """
+    测试用的服务函数(无**kwargs参数)
+    """
+    return [a, b, c]
+
+
+def legacy_call(request, fun_object, paras, trace_info):
+    """
+    原有的分发处理方式(每次分析函数签名, 拼接参数字符串后通过eval执行), 用于对比
+    """
+    _call_para_str = ''
+    _is_function_has_var_parameter = RunTool.is_function_has_var_parameter(
+        fun_object, var_positional=False, var_keyword=True
+    )
+    _has_deal_trace_id = False
+    _has_deal_parent_id = False
+    _has_deal_trace_level = False
+    for _i in range(len(paras)):
+        if paras[_i][0] == '':
+            _call_para_str = '%s, paras[%s][1]' % (_call_para_str, str(_i))
+        elif not _has_deal_trace_id and paras[_i][0] == 'trace_id':
+            _has_deal_trace_id = True
+            _call_para_str = '%s, trace_id=trace_info.trace_id' % _call_para_str
+        elif not _has_deal_parent_id and paras[_i][0] == 'parent_id':
+            _has_deal_parent_id = True
+            _call_para_str = '%s, parent_id=trace_info.call_id' % _call_para_str
+        elif not _has_deal_trace_level and paras[_i][0] == 'trace_level':
+            _has_deal_trace_level = True
+            _call_para_str = '%s, trace_level=trace_info.trace_level' % _call_para_str
+        else:
+            _call_para_str = '%s, %s=paras[%s][1]' % (_call_para_str, paras[_i][0], str(_i))
+
+    if _is_function_has_var_parameter:
+        if not _has_deal_trace_id:
+            _call_para_str = '%s, trace_id=trace_info.trace_id' % _call_para_str
+        if not _has_deal_parent_id:
+            _call_para_str = '%s, parent_id=trace_info.call_id' % _call_para_str
+        if not _has_deal_trace_level:
+            _call_para_str = '%s, trace_level=trace_info.trace_level' % _call_para_str
+
+    if len(_call_para_str) > 0 and _call_para_str[0] == ',':
+        _call_para_str = _call_para_str[2:]
+
+    return eval('fun_object(%s)' % _call_para_str)
+
+
+def benchmark_dispatch(servicer, fun, count):
+    """
+    测试服务函数分发(参数绑定+执行)的性能
+    """
+    _para_json = SimpleGRpcTools.parameters_to_json([['', 'a'], ['', 'b'], ['c', 3]]).para_json
+    _request = SimpleGRpcTools.generate_request_obj('service', para_json=_para_json)
+    _trace_info = servicer._get_trace_info(_request, None)
+    _call_plan = servicer._generate_call_plan(fun)
+    print('dispatch %s, count=%d' % (fun.__name__, count))
+    _cases = [
+        ('eval', lambda: legacy_call(_request, fun, json.loads(_request.para_json), _trace_info)),
+        ('call plan', lambda: servicer._call_service_fun(
+            _call_plan, _request, json.loads(_request.para_json), _trace_info)),
+    ]
+    for _label, _fun in _cases:
+        _start = time.perf_counter()
+        for _i in range(count):
+            _fun()
+        _use = time.perf_counter() - _start
+        print('    %-12s %8.3fs  %10.0f calls/s' % (_label, _use, count / _use))
+
+
+def benchmark_simple_call(servicer, count):
+    """
+    测试进程内直接调用GRpcCallSimple的QPS(不经过网络)
+    """
+    _para_json = SimpleGRpcTools.parameters_to_json([['', 'a'], ['', 'b'], ['c', 3]]).para_json
+    _request = SimpleGRpcTools.generate_request_obj('service_fun', para_json=_para_json)
+    _start = time.perf_counter()
+    for _i in range(count):
+        _resp = servicer.GRpcCallSimple(_request, None)
+    _use = time.perf_counter() - _start
+    if _resp.call_code != '00000':
+        raise RuntimeError('call error: %s' % _resp.call_code)
+    print('GRpcCallSimple, count=%d' % count)
+    print('    %-12s %8.3fs  %10.0f QPS' % ('in-process', _use, count / _use))
+
+
+def benchmark_codec(label, para_list, return_obj, count):
+    """
+    测试参数及返回值的json与二进制编码序列化性能(编码+解码)
+    """
+    print('codec %s, count=%d' % (label, count))
+
+    def _json_fun():
+        # 每次需要复制参数列表, parameters_to_json会替换字节数组为占位字符
+        _para_obj = SimpleGRpcTools.parameters_to_json([list(_item) for _item in para_list], is_support_bytes=True)
+        json.loads(_para_obj.para_json)
+        _ret_obj = SimpleGRpcTools.object_to_json_support_bytes(return_obj, is_support_bytes=True)
+        json.loads(_ret_obj.return_json)
+        return len(_para_obj.para_json) + len(_para_obj.para_bytes or b'') + \
+            len(_ret_obj.return_json) + len(_ret_obj.return_bytes or b'')
+
+    def _bin_fun():
+        _para_obj = SimpleGRpcTools.parameters_to_bin([list(_item) for _item in para_list])
+        SimpleGRpcBinCodec.loads(_para_obj.para_bytes)
+        _ret_obj = SimpleGRpcTools.object_to_json_support_bytes(return_obj, is_use_bin_codec=True)
+        SimpleGRpcBinCodec.loads(_ret_obj.return_bytes)
+        return len(_para_obj.para_bytes) + len(_ret_obj.return_bytes)
+
+    for _label, _fun in (('json', _json_fun), ('bin codec', _bin_fun)):
+        _start = time.perf_counter()
+        for _i in range(count):
+            _size = _fun()
+        _use = time.perf_counter() - _start
+        print('    %-12s %8.3fs  %10.0f calls/s  size=%d' % (_label, _use, count / _use, _size))
+
+
+def benchmark_channel(servicer, port, count):
+    """
+    测试通过网络调用的QPS: 每次新建channel、共享channel、单channel并发调用
+    """
+    _server = SimpleGRpcServer(server_name='BenchmarkServer', logger=logging.getLogger())
+    _server.start_server(
+        SimpleGRpcServer.generate_server_opts(ip='127.0.0.1', port=port, max_workers=8, max_connect=1000),
+        servicer_list={'servicer': servicer}, is_wait=True
+    )
+    try:
+        _connect_para = SimpleGRpcTools.generate_connect_para(ip='127.0.0.1', port=port)
+        _para_json = SimpleGRpcTools.parameters_to_json([['', 'a'], ['', 'b'], ['c', 3]]).para_json
+        _requests = [SimpleGRpcTools.generate_request_obj('service_fun', para_json=_para_json)
+                     for _i in range(count)]
+        print('network call, count=%d' % count)
+        _cases = [
+            ('new channel', lambda: [
+                SimpleGRpcTools.grpc_call(_connect_para, _request, is_reuse_channel=False)
+                for _request in _requests
+            ]),
+            ('shared channel', lambda: [
+                SimpleGRpcTools.grpc_call(_connect_para, _request) for _request in _requests
+            ]),
+            ('call many(100)', lambda: SimpleGRpcTools.grpc_call_many(
+                _connect_para, _requests, max_concurrent=100
+            )),
+        ]
+        for _label, _fun in _cases:
+            _start = time.perf_counter()
+            _cresults = _fun()
+            _use = time.perf_counter() - _start
+            if not _cresults[-1].is_success():
+                raise RuntimeError('call error: %s' % _cresults[-1].code)
+            print('    %-16s %8.3fs  %10.0f QPS' % (_label, _use, count / _use))
+    finally:
+        SimpleGRpcChannelRegistry.close_all()
+        _server.stop_server(is_wait=True)
+
+
+def benchmark_call_chain_log(count):
+    """
+    测试写调用链日志时进程内调用GRpcCallSimple的耗时
+    """
+    # 模拟服务端上下文
+    _context = NullObj()
+    _context.peer = lambda: 'ipv4:127.0.0.1:50000'
+    _context._rpc_event = NullObj()
+    _context._rpc_event.call_details = NullObj()
+    _context._rpc_event.call_details.host = b'127.0.0.1:50051'
+
+    _file = tempfile.NamedTemporaryFile(suffix='.log', delete=False)
+    _file.close()
+    _logger = logging.getLogger('benchmark_simple_grpc_call_chain')
+    _logger.setLevel(logging.INFO)
+    _logger.propagate = False
+    _logger.addHandler(logging.FileHandler(_file.name))
+    _writer = SimpleGRpcCallChainLogWriter(_logger)
+
+    _para_json = SimpleGRpcTools.parameters_to_json([['', 'a'], ['', 'b'], ['c', 3]]).para_json
+    _request = SimpleGRpcTools.generate_request_obj('service_fun', para_json=_para_json)
+    print('call chain log, count=%d' % count)
+    for _label, _log_obj in (('sync logger', _logger), ('log writer', _writer)):
+        _servicer = SimpleGRpcServicer(logger=_log_obj, log_level=logging.INFO)
+        _servicer.add_service(EnumCallMode.Simple, 'service_fun', service_fun)
+        _uses = list()
+        _start = time.perf_counter()
+        for _i in range(count):
+            _call_start = time.perf_counter()
+            _servicer.GRpcCallSimple(_request, _context)
+            _uses.append(time.perf_counter() - _call_start)
+        _use = time.perf_counter() - _start
+        _uses.sort()
+        print('    %-12s %8.3fs  %10.0f QPS  avg=%.1fus  p99=%.1fus' % (
+            _label, _use, count / _use, _use / count * 1000000, _uses[int(count * 0.99)] * 1000000
+        ))
+    _writer.stop()
+    os.remove(_file.name)
+
+
+if __name__ == '__main__':
+    _servicer = SimpleGRpcServicer(logger=None, is_use_global_logger=False)
+    _servicer.add_service(EnumCallMode.Simple, 'service_fun', service_fun)
+
+    benchmark_dispatch(_servicer, service_fun, COUNT)
+    benchmark_dispatch(_servicer, service_fun_no_kwargs, COUNT)
+    benchmark_simple_call(_servicer, COUNT)
+
+    # 小参数, 无字节数组
+    benchmark_codec(
+        'small', [['', 'a'], ['', 12345], ['c', {'k1': 'v1', 'k2': [1, 2, 3]}]],
+        {'code': '00000', 'data': [1.5, 'str', None, True]}, COUNT
+    )
+    # 一个字节数组(json方式返回值需要深复制)
+    _data = os.urandom(64 * 1024)
+    benchmark_codec(
+        'one bytes(64KB)', [['', 'file.bin'], ['data', _data]],
+        {'name': 'file.bin', 'info': {'size': len(_data), 'tags': list(range(100))}, 'data': _data},
+        COUNT // 10
+    )
+    # 多个字节数组(json方式无法直接传递, 只能转换为字符串, 这里仅测试二进制编码)
+    print('codec many bytes, json not supported')
+    _list = [os.urandom(1024) for _i in range(64)]
+    _start = time.perf_counter()
+    for _i in range(COUNT // 10):
+        SimpleGRpcBinCodec.loads(SimpleGRpcTools.parameters_to_bin([['', _list]]).para_bytes)
+    _use = time.perf_counter() - _start
+    print('    %-12s %8.3fs  %10.0f calls/s' % ('bin codec', _use, COUNT // 10 / _use))
+
+    benchmark_channel(_servicer, 50091, 2000)
+
+    benchmark_call_chain_log(COUNT // 10)
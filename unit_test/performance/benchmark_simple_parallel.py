@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+simple_parallel性能测试, 对比ParallelPool.map与concurrent.futures的处理性能
+@module benchmark_simple_parallel
+@file benchmark_simple_parallel.py
+"""
+
+import os
+import sys
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+# 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir)))
+from HiveNetLib.simple_parallel import ParallelPool, ThreadParallel, ProcessParallel
+import HiveNetLib.base_tools.affinity as affinity
+
+
+__MOUDLE__ = 'benchmark_simple_parallel'  # 模块名
+__DESCRIPT__ = u'simple_parallel性能测试'  # 模块描述
+__VERSION__ = '0.1.0'  # 版本
+__AUTHOR__ = u'黎慧剑'  # 作者
+__PUBLISH__ = '2026.10.19'  # 发布日期
+
+
+WORKERS = 4  # 并发数
+CACHE_BUFFER = None  # 每个工作进程私有的数据缓存
+
+
+def cpu_bound_fun(n):
+    """
+    CPU密集型任务
+    """
+    _sum = 0
+    for _i in range(2000):
+        _sum += (_i * n) % 7
+    return _sum
+
+
+def io_bound_fun(n):
+    """
+    IO密集型任务
+    """
+    time.sleep(0.002)
+    return n
+
+
+def cache_bound_fun(n):
+    """
+    依赖CPU缓存的CPU密集型任务, 反复处理工作进程私有的数据(512KB)
+    """
+    global CACHE_BUFFER
+    if CACHE_BUFFER is None:
+        CACHE_BUFFER = os.urandom(512 * 1024)
+    _crc = n
+    for _i in range(20):
+        _crc = zlib.crc32(CACHE_BUFFER, _crc)
+    return _crc
+
+
+def run_parallel_pool(parallel_class, fun, items, chunksize, cpu_placement=None):
+    """
+    使用ParallelPool.map执行
+    """
+    _pool = ParallelPool(
+        None, parallel_class=parallel_class, maxsize=WORKERS, minsize=WORKERS,
+        is_use_global_logger=False, daemon_thread_time=0.5, task_get_timeout=0.5,
+        cpu_placement=cpu_placement
+    )
+    _pool.start()
+    try:
+        _start = time.perf_counter()
+        _pool.map(fun, items, chunksize=chunksize)
+        return time.perf_counter() - _start
+    finally:
+        _pool.stop(overtime=30)
+
+
+def run_executor(executor_class, fun, items, chunksize):
+    """
+    使用concurrent.futures执行
+    """
+    with executor_class(max_workers=WORKERS) as _executor:
+        _start = time.perf_counter()
+        list(_executor.map(fun, items, chunksize=chunksize))
+        return time.perf_counter() - _start
+
+
+def benchmark(name, fun, count, chunksize):
+    """
+    执行单个场景的对比测试
+    """
+    _items = list(range(count))
+    _results = [
+        ('ParallelPool(ThreadParallel)', run_parallel_pool(ThreadParallel, fun, _items, chunksize)),
+        ('ThreadPoolExecutor', run_executor(ThreadPoolExecutor, fun, _items, chunksize)),
+        ('ParallelPool(ProcessParallel)', run_parallel_pool(ProcessParallel, fun, _items, chunksize)),
+        ('ProcessPoolExecutor', run_executor(ProcessPoolExecutor, fun, _items, chunksize)),
+    ]
+    print('%s: items=%d, chunksize=%d, workers=%d' % (name, count, chunksize, WORKERS))
+    for _label, _use in _results:
+        print('    %-32s %8.3fs  %10.0f items/s' % (_label, _use, count / _use))
+
+
+def benchmark_cpu_placement(count):
+    """
+    对比进程池不同CPU绑定策略的处理性能
+    """
+    _items = list(range(count))
+    _cpus = affinity.get_available_cpus()
+    print('CPU placement (cache bound): items=%d, workers=%d, cpus=%s' % (count, WORKERS, str(_cpus)))
+    for _policy in (None, 'round_robin', 'compact', 'spread', _cpus[::2]):
+        _use = run_parallel_pool(ProcessParallel, cache_bound_fun, _items, 1, cpu_placement=_policy)
+        print('    %-32s %8.3fs  %10.0f items/s' % (str(_policy), _use, count / _use))
+
+
+if __name__ == '__main__':
+    benchmark('CPU bound', cpu_bound_fun, 20000, 1)
+    benchmark('CPU bound', cpu_bound_fun, 20000, 500)
+    benchmark('IO bound', io_bound_fun, 2000, 1)
+    benchmark('IO bound', io_bound_fun, 2000, 50)
+    benchmark_cpu_placement(2000)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+simple_xml性能测试, 对比原递归方式与当前的xml节点转换字典处理性能
+@module benchmark_simple_xml
+@file benchmark_simple_xml.py
+"""
+
+import os
+import sys
+import time
+# 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir)))
+from HiveNetLib.simple_xml import EnumXmlObjType, SimpleXml
+
+
+__MOUDLE__ = 'benchmark_simple_xml'  # 模块名
+__DESCRIPT__ = u'simple_xml性能测试'  # 模块描述
+__VERSION__ = '0.1.0'  # 版本
+__AUTHOR__ = u'黎慧剑'  # 作者
+__PUBLISH__ = '2026.10.19'  # 发布日期
+
+
+def old_node_to_dict_value(node, item_dict_nodes=None):
+    """
+    原处理方式：递归处理，多次获取子节点，通过列表判断重复标签
+    """
+    if not (hasattr(node, 'tag') and type(node.tag) == str):
+        return None, None
+
+    _key = node.tag
+    _value = None
+    _type = None
+    if 'type' in node.attrib.keys():
+        _type = node.attrib['type']
+        if _type not in ('dict', 'list', 'tuple', 'bool', 'int', 'float', 'string'):
+            _type = None
+
+    _childs = None
+    if _type is None:
+        _childs = node.getchildren()
+        if len(_childs) > 0:
+            _tag_list = list()
+            _type = 'dict'
+            for _childnode in _childs:
+                if not (hasattr(_childnode, 'tag') and type(_childnode.tag) == str):
+                    continue
+                if _childnode.tag in _tag_list:
+                    _type = 'list'
+                    break
+                else:
+                    _tag_list.append(_childnode.tag)
+        else:
+            _type = 'string'
+
+    _text = node.text
+    if type(_text) == str:
+        _text = node.text.strip()
+    if _type == 'string':
+        _value = _text
+    elif _type == 'bool':
+        _value = (_text == 'true')
+    elif _type == 'int':
+        _value = round(float(_text))
+    elif _type == 'float':
+        _value = float(_text)
+    elif _type == 'dict':
+        if _childs is None:
+            _childs = node.getchildren()
+        if len(_childs) > 0:
+            _value = dict()
+            for childnode in node.getchildren():
+                _child_key, _child_value = old_node_to_dict_value(
+                    childnode, item_dict_nodes=item_dict_nodes)
+                if _child_key is not None:
+                    _value[_child_key] = _child_value
+        else:
+            _value = _text
+    else:
+        _value = list()
+        _use_dict = False
+        if item_dict_nodes is not None:
+            for _node in item_dict_nodes:
+                if _node is node:
+                    _use_dict = True
+                    break
+        for childnode in node.getchildren():
+            _child_key, _child_value = old_node_to_dict_value(
+                childnode, item_dict_nodes=item_dict_nodes)
+            if _child_key is None and _child_value is None:
+                continue
+            if _use_dict:
+                _child_value = {_child_key: _child_value}
+            _value.append(_child_value)
+
+    if _value is None:
+        _value = ''
+    return _key, _value
+
+
+def generate_wide_xml(count):
+    """
+    生成宽报文：根节点下有大量不重复标签的子节点
+    """
+    return '<data>%s</data>' % ''.join(
+        '<f%d><a>%d</a><b type="int">%d</b></f%d>' % (_i, _i, _i, _i) for _i in range(count)
+    )
+
+
+def generate_deep_xml(depth, width):
+    """
+    生成深报文：多层嵌套，每层带若干字段
+    """
+    _head = ''.join(
+        '<n%d>%s' % (_i, ''.join('<v%d>%d</v%d>' % (_j, _j, _j) for _j in range(width)))
+        for _i in range(depth)
+    )
+    _tail = ''.join('</n%d>' % _i for _i in reversed(range(depth)))
+    return '<data>%s%s</data>' % (_head, _tail)
+
+
+def benchmark_fun(name, fun, count):
+    """
+    执行测试并打印单次处理耗时
+    """
+    _start = time.perf_counter()
+    for _i in range(count):
+        fun()
+    _cost = time.perf_counter() - _start
+    print('%-30s: %10.2f us' % (name, _cost * 1000000 / count))
+
+
+def benchmark_to_dict(count):
+    """
+    xml节点转换字典的性能测试
+    """
+    for _name, _xml in (
+        ('wide 2000 fields', generate_wide_xml(2000)),
+        ('deep 200 levels', generate_deep_xml(200, 5)),
+        ('message 20 fields', generate_wide_xml(20))
+    ):
+        print('=== %s' % _name)
+        _doc = SimpleXml(_xml, obj_type=EnumXmlObjType.String, huge_tree=True)
+        _type_hints = dict()
+        benchmark_fun('recursive', lambda: old_node_to_dict_value(_doc.root), count)
+        benchmark_fun('to_dict', lambda: _doc.to_dict(), count)
+        benchmark_fun('to_dict with type_hints', lambda: _doc.to_dict(type_hints=_type_hints), count)
+
+
+def benchmark_set_value_by_dict(count):
+    """
+    字典写入xml的性能测试
+    """
+    print('=== set_value_by_dict 50 fields')
+    _dict = dict()
+    for _i in range(10):
+        _dict['g%d' % _i] = {'a': _i, 'b': 1.5, 'c': True, 'd': 'str', 'e': None}
+
+    def _set_fun():
+        _doc = SimpleXml('<data><body/></data>', obj_type=EnumXmlObjType.String)
+        _doc.set_value_by_dict('/data/body', _dict, with_type=True)
+
+    benchmark_fun('set_value_by_dict', _set_fun, count)
+
+
+if __name__ == '__main__':
+    # 当程序自己独立运行时执行的操作
+    benchmark_to_dict(50)
+    benchmark_set_value_by_dict(200)
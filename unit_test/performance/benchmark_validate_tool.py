@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+validate_tool性能测试, 对比每次按规则解析校验(check_by_rule)与预编译规则后校验的性能
+@module benchmark_validate_tool
+@file benchmark_validate_tool.py
+"""
+
+import os
+import sys
+import time
+# 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir)))
+from HiveNetLib.base_tools.validate_tool import ValidateTool
+
+
+__MOUDLE__ = 'benchmark_validate_tool'  # 模块名
+__DESCRIPT__ = u'validate_tool性能测试'  # 模块描述
+__VERSION__ = '0.1.0'  # 版本
+__AUTHOR__ = u'黎慧剑'  # 作者
+__PUBLISH__ = '2026.10.19'  # 发布日期
+
+
+# 模拟接口报文的校验规则
+API_RULE = {
+    'head': {
+        'trans_code': ('And', ['str_not_null', ('str_len', (4, 8))]),
+        'trans_time': ('str_is_datetime', 'yyyy-MM-dd hh24:mm:ss'),
+        'trace_id': ('str_check_regex', '^[0-9a-f]{32}$'),
+        'channel': ('check_in_enum', (['APP', 'WEB', 'API'], )),
+    },
+    'body': {
+        'user_id': ['str_not_null', 'str_is_int'],
+        'email': 'str_is_email',
+        'birthday': ('str_check_date', None, {'format_str': 'yyyyMMdd'}),
+        'amount': ('And', [('str_is_float', ), ('str_check_float_size', (12, 2))]),
+        'items': {
+            'sku': ('str_check_regex', ('^[A-Z]{2}-\\d{6}$', )),
+            'qty': ('str_check_num_area', (1, 999)),
+            'remark': ('str_lenb', (0, 200)),
+        },
+    }
+}
+
+
+def generate_message(item_count):
+    """
+    生成通过校验的接口报文
+    """
+    return {
+        'head': {
+            'trans_code': 'PAY001', 'trans_time': '2026-10-19 12:30:45',
+            'trace_id': '0123456789abcdef0123456789abcdef', 'channel': 'APP'
+        },
+        'body': {
+            'user_id': '1234567', 'email': 'user@example.com', 'birthday': '19900101',
+            'amount': '1024.50',
+            'items': [
+                {'sku': 'AB-%06d' % _i, 'qty': str(_i % 100 + 1), 'remark': '备注信息 %d' % _i}
+                for _i in range(item_count)
+            ]
+        }
+    }
+
+
+def benchmark_fun(name, fun, obj, count):
+    """
+    执行测试并打印单次校验耗时
+    """
+    _result = fun(obj)
+    if not _result.is_success():
+        raise RuntimeError('%s check failed: %s' % (name, _result.msg))
+    _start = time.perf_counter()
+    for _i in range(count):
+        fun(obj)
+    _cost = time.perf_counter() - _start
+    print('%-30s: %10.2f us/check' % (name, _cost * 1000000 / count))
+
+
+def benchmark_check(item_count, count):
+    """
+    报文校验的性能测试
+    """
+    print('=== message with %d items' % item_count)
+    _msg = generate_message(item_count)
+    benchmark_fun('check_by_rule', lambda obj: ValidateTool.check_by_rule(API_RULE, obj), _msg, count)
+    _validate = ValidateTool(API_RULE, is_compile=False)
+    benchmark_fun('instance not compile', _validate.check, _msg, count)
+    _validate = ValidateTool(API_RULE)
+    benchmark_fun('instance compiled', _validate.check, _msg, count)
+
+    _start = time.perf_counter()
+    for _i in range(100):
+        ValidateTool(API_RULE)
+    print('%-30s: %10.2f us' % ('compile rule', (time.perf_counter() - _start) * 1000000 / 100))
+
+
+if __name__ == '__main__':
+    # 当程序自己独立运行时执行的操作
+    benchmark_check(1, 5000)
+    benchmark_check(20, 1000)
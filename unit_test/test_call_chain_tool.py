@@ -10,10 +10,14 @@
 import os
 import sys
 import time
+import asyncio
+import threading
 import unittest
 # 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
 from HiveNetLib.base_tools.call_chain_tool import CallChainTool
+from HiveNetLib.base_tools.trace_context import TraceContext
+from HiveNetLib.base_tools.opentracing_tool import OpenTracerFW
 import HiveNetLib.simple_log as simple_log
 from HiveNetLib.base_tools.file_tool import FileTool
 from HiveNetLib.generic import CResult
@@ -124,6 +128,48 @@ def func_case1_call_4(a, b, c, **kwargs):
     return
 
 
+# 通过调用链上下文获取调用链信息的函数（没有调用链参数）
+@CallChainTool.methon_call_chain(is_use_global_logger=True)
+def func_case2_get_trace(a):
+    return TraceContext.get_trace_info()
+
+
+@CallChainTool.methon_call_chain(is_use_global_logger=True)
+def func_case2_parent(**kwargs):
+    return kwargs, func_case2_get_trace('a')
+
+
+# 协程函数的调用链
+@CallChainTool.methon_call_chain(is_use_global_logger=True)
+async def func_case2_async_child(**kwargs):
+    await asyncio.sleep(0.001)
+    return kwargs['trace_id'], kwargs['parent_id']
+
+
+@CallChainTool.methon_call_chain(is_use_global_logger=True)
+async def func_case2_async_parent(**kwargs):
+    _results = await asyncio.gather(func_case2_async_child(), func_case2_async_child())
+    return kwargs['trace_id'], kwargs['call_id'], _results
+
+
+async def func_case2_tracer_handler(tracer, trace_all_exception):
+    """
+    OpenTracerFW修饰的请求处理函数抛出异常，返回处理后的调用链上下文
+    """
+    _infos = []
+
+    @tracer.trace(trace_all_exception=trace_all_exception)
+    async def _handler(request_obj):
+        _infos.append(TraceContext.get_trace_info())
+        raise ValueError('handler error')
+
+    try:
+        await _handler('request')
+    except ValueError:
+        pass
+    return _infos[0], TraceContext.get_trace_info()
+
+
 class TestCallChainTool(unittest.TestCase):
     """
     测试CallChainTool类
@@ -133,6 +179,8 @@ class TestCallChainTool(unittest.TestCase):
         """
         启动测试执行的初始化
         """
+        # 临时目录不纳入版本管理，需自行创建
+        FileTool.create_dir(_TEMP_DIR, exist_ok=True)
         # 初始化日志类
         try:
             # 删除临时日志
@@ -175,6 +223,51 @@ class TestCallChainTool(unittest.TestCase):
         print('\n\n调用链执行')
         func_case1_call_1('1a', '1b', k1='testk1')
 
+    def test_trace_context(self):
+        """
+        测试通过调用链上下文传递调用链信息
+        """
+        print('\n嵌套调用')
+        _kwargs, _child = func_case2_parent()
+        self.assertTrue(
+            _child.trace_id == _kwargs['trace_id'] and _child.call_id != _kwargs['call_id'],
+            '失败：嵌套调用沿用调用链'
+        )
+        self.assertTrue(_child.trace_level is _kwargs['trace_level'], '失败：共享调用层级')
+        self.assertTrue(TraceContext.get_trace_info() is None, '失败：调用结束恢复上下文')
+
+        print('\n协程调用')
+        _trace_id, _call_id, _results = asyncio.run(func_case2_async_parent())
+        self.assertTrue(
+            _results == [(_trace_id, _call_id), (_trace_id, _call_id)], '失败：协程调用链 - %s' % str(_results)
+        )
+
+        print('\n指定调用链上下文及线程传递')
+        with TraceContext.trace_info_context('my_trace_id', 'my_call_id', 3):
+            _info = func_case2_get_trace('a')
+            self.assertTrue(
+                _info.trace_id == 'my_trace_id' and _info.trace_level[0] == 4, '失败：指定调用链上下文'
+            )
+            _thread_infos = []
+            _thread = threading.Thread(
+                target=TraceContext.bind(lambda: _thread_infos.append(func_case2_get_trace('a')))
+            )
+            _thread.start()
+            _thread.join()
+            self.assertTrue(_thread_infos[0].trace_id == 'my_trace_id', '失败：线程传递调用链')
+        self.assertTrue(TraceContext.get_trace_info() is None, '失败：退出with恢复上下文')
+
+        print('\nOpenTracer请求处理异常时恢复上下文')
+        for _trace_all_exception in (True, False):
+            _tracer = OpenTracerFW(None, trace_all_exception=_trace_all_exception)
+            _tracer.get_request_obj = lambda *args, **kwargs: args[0]
+            _handler_info, _info = asyncio.run(func_case2_tracer_handler(_tracer, _trace_all_exception))
+            self.assertTrue(_handler_info is not None, '失败：OpenTracer设置调用链上下文')
+            self.assertTrue(
+                _info is None and len(_tracer._current_trace_tokens) == 0,
+                '失败：OpenTracer处理异常恢复上下文 - %s' % str(_trace_all_exception)
+            )
+
     def test_api(self):
         """
         aip接口日志测试
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+测试file_tool模块
+@module test_file_tool
+@file test_file_tool.py
+"""
+
+import os
+import sys
+import io
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+# 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+from HiveNetLib.base_tools.file_tool import FileTool
+import HiveNetLib.base_tools.myzipfile as zipfile
+
+
+__MOUDLE__ = 'test_file_tool'  # 模块名
+__DESCRIPT__ = u'测试file_tool模块'  # 模块描述
+__VERSION__ = '0.1.0'  # 版本
+__AUTHOR__ = u'黎慧剑'  # 作者
+__PUBLISH__ = '2026.10.19'  # 发布日期
+
+
+_TEMP_DIR = os.path.realpath(
+    os.path.join(os.path.dirname(__file__), os.path.pardir, 'test_data/temp/file_tool')
+)
+_SRC_DIR = os.path.join(_TEMP_DIR, 'src')
+
+
+class _UnseekableStream(object):
+    """
+    模拟不支持seek及tell的输出流
+    """
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    def write(self, data):
+        return self.buffer.write(data)
+
+    def flush(self):
+        pass
+
+
+class TestFileTool(unittest.TestCase):
+    """
+    测试file_tool模块
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        启动测试类执行的初始化
+        """
+        if os.path.exists(_TEMP_DIR):
+            FileTool.remove_dir(_TEMP_DIR)
+        FileTool.create_dir(os.path.join(_SRC_DIR, 'logs/sub'), exist_ok=True)
+        FileTool.create_dir(os.path.join(_SRC_DIR, 'empty'), exist_ok=True)
+        for _i in range(20):
+            with open(os.path.join(_SRC_DIR, 'logs/small_%d.log' % _i), 'wb') as _f:
+                _f.write(''.join('日志 %d - %d\n' % (_i, _j) for _j in range(_i * 50)).encode('utf-8'))
+        with open(os.path.join(_SRC_DIR, 'logs/sub/big.log'), 'wb') as _f:
+            _f.write(b''.join(b'line %d: %s\n' % (_j, b'x' * (_j % 97)) for _j in range(50000)))
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        结束测试类执行的销毁
+        """
+        FileTool.remove_dir(_TEMP_DIR)
+
+    def _check_zip(self, zip_file, label):
+        """
+        解压并检查压缩包内容与源文件一致
+        """
+        _dest = os.path.join(_TEMP_DIR, 'unzip_' + label)
+        FileTool.unzip(zip_file, dest_path=_dest)
+        self.assertTrue(os.path.isdir(os.path.join(_dest, 'empty')), '失败：%s - 空目录' % label)
+        for _root, _dirs, _files in os.walk(_SRC_DIR):
+            for _file in _files:
+                _src_file = os.path.join(_root, _file)
+                _dest_file = os.path.join(_dest, os.path.relpath(_src_file, _SRC_DIR))
+                with open(_src_file, 'rb') as _f1, open(_dest_file, 'rb') as _f2:
+                    self.assertTrue(_f1.read() == _f2.read(), '失败：%s - %s' % (label, _src_file))
+
+    def test_zip(self):
+        """
+        测试压缩文件
+        """
+        print('测试FileTool.zip - 逐个文件压缩')
+        FileTool.zip(_SRC_DIR, dest_path=_TEMP_DIR, dest_filename='serial.zip')
+        self._check_zip(os.path.join(_TEMP_DIR, 'serial.zip'), 'serial')
+
+        print('测试FileTool.zip - 并行压缩')
+        FileTool.zip(
+            _SRC_DIR, dest_path=_TEMP_DIR, dest_filename='parallel.zip', workers=4,
+            chunk_size=64 * 1024, max_pending=3
+        )
+        self._check_zip(os.path.join(_TEMP_DIR, 'parallel.zip'), 'parallel')
+        self.assertTrue(
+            FileTool.read_zip_file(os.path.join(_TEMP_DIR, 'parallel.zip'), 'logs/sub/big.log') ==
+            FileTool.read_zip_file(os.path.join(_TEMP_DIR, 'serial.zip'), 'logs/sub/big.log'),
+            '失败：并行压缩 - 大文件分块压缩'
+        )
+
+        print('测试FileTool.zip - 并行压缩写入不可seek的流')
+        _stream = _UnseekableStream()
+        FileTool.zip(_SRC_DIR, dest_obj=_stream, workers=2, chunk_size=64 * 1024)
+        with open(os.path.join(_TEMP_DIR, 'stream.zip'), 'wb') as _f:
+            _f.write(_stream.buffer.getvalue())
+        self._check_zip(os.path.join(_TEMP_DIR, 'stream.zip'), 'stream')
+
+        print('测试FileTool.zip - 单个文件并行压缩')
+        FileTool.zip(
+            os.path.join(_SRC_DIR, 'logs/sub/big.log'), dest_path=_TEMP_DIR, workers=2,
+            chunk_size=64 * 1024
+        )
+        with open(os.path.join(_SRC_DIR, 'logs/sub/big.log'), 'rb') as _f:
+            self.assertTrue(
+                FileTool.read_zip_file(os.path.join(_TEMP_DIR, 'big.log.zip'), 'big.log') == _f.read(),
+                '失败：单个文件并行压缩'
+            )
+
+    def test_mmap_zip(self):
+        """
+        测试内存映射方式读取压缩包
+        """
+        _zip_file = os.path.join(_TEMP_DIR, 'mmap.zip')
+        FileTool.zip(_SRC_DIR, dest_path=_TEMP_DIR, dest_filename='mmap.zip')
+        with zipfile.ZipFile(_zip_file) as _zip:
+            _expect = dict((_name, _zip.read(_name)) for _name in _zip.namelist())
+
+        print('测试MmapZipFile - 多线程并发读取')
+        zipfile.MmapZipFile.clear_central_dir_cache()
+        with zipfile.MmapZipFile(_zip_file) as _zip:
+            self.assertTrue(_zip.namelist() == list(_expect.keys()), '失败：成员清单')
+            with ThreadPoolExecutor(max_workers=4) as _executor:
+                _datas = list(_executor.map(_zip.read, list(_expect.keys()) * 4))
+            self.assertTrue(_datas == list(_expect.values()) * 4, '失败：多线程并发读取')
+            with _zip.open('logs/sub/big.log') as _f:
+                _f.seek(1000)
+                self.assertTrue(
+                    _f.read(100) == _expect['logs/sub/big.log'][1000:1100], '失败：成员seek读取'
+                )
+
+        print('测试MmapZipFile - 中央目录缓存')
+        _key = os.path.realpath(_zip_file)
+        _cached = zipfile.MmapZipFile._central_dir_cache[_key]
+        with zipfile.MmapZipFile(_zip_file) as _zip:
+            self.assertTrue(
+                zipfile.MmapZipFile._central_dir_cache[_key] is _cached, '失败：使用缓存'
+            )
+        FileTool.zip(os.path.join(_SRC_DIR, 'logs/sub'), dest_path=_TEMP_DIR, dest_filename='mmap.zip')
+        self.assertTrue(
+            FileTool.read_zip_file(_zip_file, 'big.log', use_mmap=True) ==
+            _expect['logs/sub/big.log'], '失败：文件变化后重新解析'
+        )
+
+        print('测试MmapZipFile - 并行解压')
+        FileTool.zip(_SRC_DIR, dest_path=_TEMP_DIR, dest_filename='mmap.zip')
+        _dest = os.path.join(_TEMP_DIR, 'unzip_mmap')
+        FileTool.unzip(_zip_file, dest_path=_dest, workers=4)
+        for _name, _data in _expect.items():
+            if _name.endswith('/'):
+                self.assertTrue(os.path.isdir(os.path.join(_dest, _name)), '失败：并行解压 - 目录')
+                continue
+            with open(os.path.join(_dest, _name), 'rb') as _f:
+                self.assertTrue(_f.read() == _data, '失败：并行解压 - %s' % _name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,8 +5,12 @@
 import sys
 import os
 import random
+import re
 import unittest
 import time
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 # 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
 from HiveNetLib.base_tools.test_tool import TestTool
@@ -14,6 +18,7 @@ from HiveNetLib.file_transfer.saver import TransferSaver
 from HiveNetLib.file_transfer.protocol import LocalProtocol
 from HiveNetLib.file_transfer.transfer import Transfer
 from HiveNetLib.file_transfer.extend_protocol.grpc import GRpcPullServicerGenerater, GRpcPushServicerGenerater, GRpcPushProtocol, GRpcPullProtocol
+from HiveNetLib.file_transfer.extend_protocol.http import HttpPullProtocol
 from HiveNetLib.base_tools.file_tool import FileTool
 from HiveNetLib.prompt_plus import ProgressRate
 from HiveNetLib.base_tools.debug_tool import DebugTool
@@ -27,7 +32,8 @@ TEST_FLAG = {
     'test_TransferSaver_fun': False,
     'test_local_to_local': False,
     'test_local_to_grpc': True,
-    'test_grpc_to_local': False
+    'test_grpc_to_local': False,
+    'test_http_to_local': True
 }
 
 _temp_path = os.path.realpath(
@@ -40,6 +46,59 @@ _temp_file = os.path.join(_temp_path, 'temp_src_file.bin')
 _log_path = os.path.join(_temp_path, 'log')
 
 
+class RangeHTTPRequestHandler(SimpleHTTPRequestHandler):
+    """
+    支持Range请求的http文件服务处理类
+    """
+    protocol_version = 'HTTP/1.1'
+    support_range = True
+    ranges = list()  # 收到的Range请求头
+
+    def send_head(self):
+        self._range_left = None
+        _range = self.headers.get('Range', None)
+        self.ranges.append(_range)
+        _path = self.translate_path(self.path)
+        if not self.support_range or _range is None or not os.path.isfile(_path):
+            return super().send_head()
+
+        _file = open(_path, 'rb')
+        _size = os.fstat(_file.fileno()).st_size
+        _match = re.match(r'^bytes=(\d+)-(\d*)$', _range)
+        _start = int(_match.group(1))
+        _end = _size - 1 if _match.group(2) == '' else min(int(_match.group(2)), _size - 1)
+        if _start >= _size:
+            _file.close()
+            self.send_response(416)
+            self.send_header('Content-Range', 'bytes */%d' % _size)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return None
+
+        self.send_response(206)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Range', 'bytes %d-%d/%d' % (_start, _end, _size))
+        self.send_header('Content-Length', str(_end - _start + 1))
+        self.end_headers()
+        _file.seek(_start)
+        self._range_left = _end - _start + 1
+        return _file
+
+    def copyfile(self, source, outputfile):
+        if self._range_left is None:
+            return super().copyfile(source, outputfile)
+
+        while self._range_left > 0:
+            _data = source.read(min(self._range_left, 64 * 1024))
+            if not _data:
+                break
+            outputfile.write(_data)
+            self._range_left -= len(_data)
+
+    def log_message(self, format, *args):
+        pass
+
+
 class Test(unittest.TestCase):
 
     # 整个Test类的开始和结束执行
@@ -927,6 +986,123 @@ class Test(unittest.TestCase):
                 _status == 'finished', msg="本地gRpc推送-%s: %s" % (_tips, _status)
             )
 
+    def test_http_to_local(self):
+        if not TEST_FLAG['test_http_to_local']:
+            return
+
+        print('测试http下载至本地')
+        _copy_file = os.path.join(_temp_path, 'http_to_local.bin')
+        _empty_file = os.path.join(_temp_path, 'http_empty_src.bin')
+        _empty_copy_file = os.path.join(_temp_path, 'http_empty_copy.bin')
+        _src_md5 = NetTool.get_file_md5(_temp_file)
+
+        def _remove_temp_files():
+            # 删除测试生成的文件
+            for _file in (_copy_file, _empty_file, _empty_copy_file):
+                for _ext in ('', '.lock', '.tmp', '.info'):
+                    if os.path.exists(_file + _ext):
+                        FileTool.remove_file(_file + _ext)
+
+        _remove_temp_files()
+
+        # 启动http服务
+        _server = ThreadingHTTPServer(
+            ('127.0.0.1', 0), partial(RangeHTTPRequestHandler, directory=_temp_path)
+        )
+        _server_thread = threading.Thread(target=_server.serve_forever, daemon=True)
+        _server_thread.start()
+        _url = 'http://127.0.0.1:%d/%s' % (_server.server_address[1], os.path.split(_temp_file)[1])
+        try:
+            # 多线程
+            _tips = '多线程'
+            RangeHTTPRequestHandler.ranges.clear()
+            with HttpPullProtocol(
+                _url, _copy_file, is_resume=True, is_overwrite=True,
+                cache_size=64, thread_num=5, block_size=16384, md5=_src_md5
+            ) as _protocol:
+                self.assertTrue(_protocol.support_range, msg="http下载-%s: 支持Range" % _tips)
+                _reader = Transfer(_protocol, thread_interval=0.0)
+                _status = _reader.start(wait_finished=True)
+                self.assertTrue(
+                    _status == 'finished', msg="http下载-%s: %s" % (_tips, _status)
+                )
+            self.assertTrue(
+                NetTool.get_file_md5(_copy_file) == _src_md5, msg="http下载-%s: md5" % _tips
+            )
+            self.assertTrue(
+                len(RangeHTTPRequestHandler.ranges) > 1 and all(
+                    re.match(r'^bytes=\d+-\d+$', _range) for _range in RangeHTTPRequestHandler.ranges
+                ), msg="http下载-%s: 按区间请求 %s" % (_tips, str(RangeHTTPRequestHandler.ranges))
+            )
+
+            # 空文件
+            _tips = '空文件'
+            with open(_empty_file, 'wb'):
+                pass
+            with HttpPullProtocol(
+                'http://127.0.0.1:%d/http_empty_src.bin' % _server.server_address[1], _empty_copy_file,
+                is_resume=True, is_overwrite=True, thread_num=2
+            ) as _protocol:
+                self.assertTrue(
+                    _protocol.get_file_size() == 0 and _protocol.support_range,
+                    msg="http下载-%s: 文件大小" % _tips
+                )
+                _reader = Transfer(_protocol, thread_interval=0.0)
+                _status = _reader.start(wait_finished=True)
+                self.assertTrue(
+                    _status == 'finished', msg="http下载-%s: %s" % (_tips, _status)
+                )
+            self.assertTrue(
+                os.path.getsize(_empty_copy_file) == 0, msg="http下载-%s: 文件内容" % _tips
+            )
+
+            # 多线程-停止后续传
+            _tips = '多线程-停止后续传'
+            with HttpPullProtocol(
+                _url, _copy_file, is_resume=True, is_overwrite=True,
+                cache_size=2, thread_num=5, block_size=1024, md5=_src_md5
+            ) as _protocol:
+                _reader = Transfer(_protocol, thread_interval=0.05)
+                _reader.start()
+                time.sleep(0.5)
+                _reader.stop()
+            self.assertTrue(
+                _reader.status == 'stop', msg="http下载-%s(暂停): %s" % (_tips, _reader.status)
+            )
+            with HttpPullProtocol(
+                _url, _copy_file, is_resume=True, is_overwrite=True,
+                cache_size=2, thread_num=5, block_size=16384, md5=_src_md5
+            ) as _protocol:
+                self.assertTrue(
+                    _protocol.get_saver_info()['write_size'] > 0, msg="http下载-%s: 已下载数据" % _tips
+                )
+                _reader = Transfer(_protocol, thread_interval=0.0)
+                _status = _reader.start(wait_finished=True)
+                self.assertTrue(
+                    _status == 'finished', msg="http下载-%s: %s" % (_tips, _status)
+                )
+
+            # 服务器不支持Range
+            _tips = '不支持Range'
+            RangeHTTPRequestHandler.support_range = False
+            with HttpPullProtocol(
+                _url, _copy_file, is_resume=True, is_overwrite=True,
+                thread_num=5, block_size=16384, md5=_src_md5
+            ) as _protocol:
+                self.assertTrue(
+                    _protocol.get_thread_num() == 1, msg="http下载-%s: 单线程" % _tips
+                )
+                _reader = Transfer(_protocol, thread_interval=0.0)
+                _status = _reader.start(wait_finished=True)
+                self.assertTrue(
+                    _status == 'finished', msg="http下载-%s: %s" % (_tips, _status)
+                )
+        finally:
+            RangeHTTPRequestHandler.support_range = True
+            _server.shutdown()
+            _server.server_close()
+            _remove_temp_files()
+
 
 if __name__ == '__main__':
     unittest.main()
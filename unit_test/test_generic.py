@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+测试generic模块
+@module test_generic
+@file test_generic.py
+"""
+
+import os
+import sys
+import copy
+import subprocess
+import unittest
+# 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+from HiveNetLib.generic import CResult
+from HiveNetLib.simple_i18n import SimpleI18N
+
+
+__MOUDLE__ = 'test_generic'  # 模块名
+__DESCRIPT__ = u'测试generic模块'  # 模块描述
+__VERSION__ = '0.1.0'  # 版本
+__AUTHOR__ = u'黎慧剑'  # 作者
+__PUBLISH__ = '2026.10.19'  # 发布日期
+
+
+class TestCResult(unittest.TestCase):
+    """
+    测试CResult类
+    """
+
+    def setUp(self):
+        """
+        启动测试执行的初始化
+        """
+        self.i18n_obj = SimpleI18N(lang='zh')
+        self.i18n_obj.load_trans_from_json(
+            {'business failure': '业务失败', 'success': '成功', '[$1] not found': '找不到[$1]'},
+            lang='zh'
+        )
+
+    def test_lazy_msg(self):
+        """
+        测试延迟生成msg
+        """
+        _result = CResult(code='19999', msg='[$1] not found', i18n_obj=self.i18n_obj, i18n_msg_paras=('key', ))
+        self.assertTrue(_result.i18n_msg_id == '[$1] not found', '失败：i18n_msg_id')
+        self.assertTrue(_result.msg == '业务失败: 找不到[key]', '失败：生成msg - %s' % _result.msg)
+
+        # 修改语言后重置
+        self.i18n_obj.lang = 'en'
+        self.assertTrue(_result.msg == '业务失败: 找不到[key]', '失败：msg已生成不变化')
+        _result.reset_msg()
+        self.assertTrue(_result.msg == 'business failure: [key] not found', '失败：reset_msg')
+
+        # 直接设置msg
+        _result.msg = 'my msg'
+        self.assertTrue(_result.msg == 'my msg', '失败：直接设置msg')
+        _result.change_code(code='00000')
+        self.assertTrue(_result.is_success() and _result.msg == 'success: success', '失败：change_code')
+
+    def test_attrs(self):
+        """
+        测试标准属性及动态属性
+        """
+        _result = CResult(code='00000')
+        _result.job = 'NewJob'
+        self.assertTrue(_result.job == 'NewJob' and 'job' in _result.__dict__, '失败：动态属性')
+        self.assertTrue('code' not in _result.__dict__, '失败：标准属性使用__slots__')
+
+        _copy = copy.deepcopy(_result)
+        self.assertTrue(_copy.job == 'NewJob' and _copy.msg == _result.msg, '失败：deepcopy')
+
+        _json = CResult.__fromjson__(_result.__json__())
+        self.assertTrue(
+            _json.code == '00000' and _json.msg == _result.msg and '"_msg"' not in _result.__json__(),
+            '失败：json转换'
+        )
+
+    def test_lazy_import(self):
+        """
+        测试导入generic时不装载可选依赖包
+        """
+        _code = (
+            'import sys\n'
+            'sys.path.insert(0, %r)\n'
+            'import HiveNetLib.generic\n'
+            'print(",".join([_m for _m in ("lxml", "dicttoxml", "chardet", "gevent", "asyncio", '
+            '"HiveNetLib.base_tools.myzipfile") if _m in sys.modules]))\n'
+        ) % os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+        _loaded = subprocess.check_output([sys.executable, '-c', _code]).decode('utf-8').strip()
+        self.assertTrue(_loaded == '', '失败：导入时装载了依赖包 - %s' % _loaded)
+
+        # 通过模块属性访问时装载
+        from HiveNetLib.base_tools import string_tool, file_tool
+        self.assertTrue(string_tool.etree.__name__ == 'lxml.etree', '失败：延迟装载etree')
+        self.assertTrue(
+            file_tool.zipfile.ZIP_DEFLATED == file_tool.ZIP_DEFLATED, '失败：延迟装载zipfile'
+        )
+        with self.assertRaises(AttributeError):
+            file_tool.not_exists_attr
+
+
+if __name__ == '__main__':
+    unittest.main()
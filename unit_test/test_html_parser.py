@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+测试html_parser模块
+@module test_html_parser
+@file test_html_parser.py
+"""
+
+import os
+import sys
+import unittest
+# 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+from HiveNetLib.html_parser import HtmlParser
+
+
+__MOUDLE__ = 'test_html_parser'  # 模块名
+__DESCRIPT__ = u'测试html_parser模块'  # 模块描述
+__VERSION__ = '0.1.0'  # 版本
+__AUTHOR__ = u'黎慧剑'  # 作者
+__PUBLISH__ = '2026.10.19'  # 发布日期
+
+
+TEST_HTML = '''<html><body>
+<div id="d1" class="box main">
+    <span name="s" class="item">s1</span>
+    <a href="/a1" class="item">link1</a>
+    <div id="d2" class="box"><span name="s">s2</span><a href="/a2">link2<!-- c --> tail</a></div>
+</div>
+<div id="d3" class="other"><span name="s">s3</span></div>
+</body></html>'''
+
+
+class TestHtmlParser(unittest.TestCase):
+    """
+    测试html_parser模块
+    """
+
+    def setUp(self):
+        """
+        启动测试执行的初始化
+        """
+        self.parser = HtmlParser(TEST_HTML)
+
+    def tearDown(self):
+        """
+        结束测试执行的销毁
+        """
+        pass
+
+    def test_find_elements(self):
+        """
+        测试查找元素
+        """
+        print('测试HtmlParser - 全局查找')
+        _parser = self.parser
+        self.assertTrue(_parser.find_elements([['id', 'd2']])[0].tag_name == 'div', '失败：通过id查找')
+        self.assertTrue(
+            [_el.text for _el in _parser.find_elements([['name', 's']])] == ['s1', 's2', 's3'],
+            '失败：通过name查找'
+        )
+        self.assertTrue(
+            [_el.id for _el in _parser.find_elements([['class_name', 'box']])] == ['d1', 'd2'],
+            '失败：通过class查找'
+        )
+        self.assertTrue(len(_parser.find_elements([['tag_name', 'span']])) == 3, '失败：通过标签查找')
+        self.assertTrue(len(_parser.find_elements([['link_text', ' tail']])) == 1, '失败：通过链接文本查找')
+        self.assertTrue(len(_parser.find_elements([['id', 'none']])) == 0, '失败：查找不存在的id')
+
+        print('测试HtmlParser - 逐级查找')
+        _els = _parser.find_elements([['id', 'd1'], ['tag_name', 'span']])
+        self.assertTrue([_el.text for _el in _els] == ['s1', 's2'], '失败：逐级查找子孙元素')
+        _els = _parser.find_elements([['class_name', 'box'], ['class_name', 'box']])
+        self.assertTrue([_el.id for _el in _els] == ['d2'], '失败：逐级查找不包含父节点自身')
+        _parent = _parser.find_elements([['id', 'd3']])[0]
+        _els = _parser.find_elements([['name', 's']], parent=_parent)
+        self.assertTrue([_el.text for _el in _els] == ['s3'], '失败：指定父节点查找')
+
+        print('测试HtmlParser - 不支持索引的查找')
+        _els = _parser.find_elements([['class_name', 'box main']])
+        self.assertTrue([_el.id for _el in _els] == ['d1'], '失败：多个class查找')
+        _els = _parser.find_elements([['partial_link_text', 'link']])
+        self.assertTrue(len(_els) == 2, '失败：部分链接文本查找')
+
+
+if __name__ == '__main__':
+    unittest.main()
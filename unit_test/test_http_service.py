@@ -10,10 +10,14 @@
 import os
 import sys
 import time
+import socket
+import logging
 import unittest
 # 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
-from HiveNetLib.net_service.http_service import HttpService
+from HiveNetLib.net_service.http_service import HttpService, HttpChunkedReader
+from HiveNetLib.net_service.tcpip_service import TcpIpService
+from HiveNetLib.generic import NullObj
 import HiveNetLib.simple_log as simple_log
 from HiveNetLib.base_tools.string_tool import StringTool
 from HiveNetLib.base_tools.file_tool import FileTool
@@ -156,6 +160,122 @@ class TestHttpService(unittest.TestCase):
                          + '\n'.join(['%s:%s' % item for item in _close_result.__dict__.items()])))
 
 
+class TestHttpServiceKeepAlive(unittest.TestCase):
+    """
+    测试HttpService的长连接、流水线请求及分块传输
+    """
+
+    @classmethod
+    def server_http_deal_fun(cls, net_info, proto_msg, msg):
+        if isinstance(msg, HttpChunkedReader):
+            _body = b'chunks:' + b'|'.join(msg)
+        else:
+            _body = msg or b''
+        _rproto_msg = MsgHTTP('HTTP/1.1 200 OK', obj_type=EnumMsgObjType.String)
+        if proto_msg.base_object.url == '/stream':
+            # 分块返回
+            return (False, _rproto_msg, (_chunk for _chunk in (b'AAA', b'BB')))
+        return (False, _rproto_msg, b'echo:' + _body)
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        启动测试类执行的初始化，只执行一次
+        """
+        cls.servers = list()
+        for _port, _use_event_loop in ((9516, False), (9517, True)):
+            _server = HttpService(
+                logger=logging.getLogger(), self_tag='UnitTestKeepAlive', log_level=simple_log.DEBUG,
+                server_http_deal_fun=cls.server_http_deal_fun
+            )
+            _server_opts = HttpService.generate_server_opts(
+                ip='127.0.0.1', port=_port, recv_timeout=2000, use_event_loop=_use_event_loop
+            )
+            _server.start_server(server_opts=_server_opts, is_wait=True)
+            cls.servers.append((_server, _server_opts))
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        结束测试类执行的销毁，只执行一次
+        """
+        for _server, _server_opts in cls.servers:
+            _server.stop_server(is_wait=True, overtime=30)
+
+    def test_keep_alive(self):
+        """
+        测试一个连接流水线发送多个请求
+        """
+        for _server, _server_opts in self.servers:
+            _net_info = HttpService.connect_server(_server_opts).net_info
+            # 一次发送多个请求(包括分块传输的请求), 最后一个请求要求关闭连接
+            TcpIpService.send_data(_net_info, (
+                b'POST /a HTTP/1.1\r\nContent-Length: 3\r\n\r\nabc'
+                b'POST /b HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n'
+                b'3\r\nxyz\r\n2;ext=1\r\n12\r\n0\r\nTrailer: 1\r\n\r\n'
+                b'GET /stream HTTP/1.1\r\n\r\n'
+                b'GET /c HTTP/1.1\r\nConnection: close\r\n\r\n'
+            ), {})
+
+            _bodys = list()
+            for _i in range(4):
+                _result = HttpService.recv_data(_net_info, {})
+                self.assertTrue(_result.is_success(), '[客户端]获取返回报文失败: %s' % _result.code)
+                if isinstance(_result.data[1], HttpChunkedReader):
+                    # 分块返回的报文体需读取完成才能获取下一个返回报文
+                    _bodys.append(list(_result.data[1]))
+                else:
+                    _bodys.append(_result.data[1])
+                if _i == 3:
+                    self.assertTrue(_result.data[0].get_value('Connection') == 'close', '未返回关闭连接')
+
+            self.assertTrue(
+                _bodys == [b'echo:abc', b'echo:chunks:xyz|12', [b'AAA', b'BB'], b'echo:'],
+                '[客户端]返回报文错误: %s' % str(_bodys)
+            )
+            # 服务端已关闭连接
+            _result = HttpService.recv_http_head(_net_info, {})
+            self.assertTrue(_result.code == '20405', '服务端未关闭连接: %s' % _result.code)
+            HttpService.close_connect(_net_info)
+
+    def test_send_parts_and_recv_empty(self):
+        """
+        测试报文体分段发送, 以及获取失败时是否收到数据的判断
+        """
+        _rsock, _wsock = socket.socketpair()
+        _rsock.setblocking(False)
+        _wsock.setblocking(False)
+        _send_info = NullObj()
+        _send_info.csocket = _wsock
+        _send_info.send_timeout = 2000
+        _recv_info = NullObj()
+        _recv_info.csocket = _rsock
+        _recv_info.recv_timeout = 500
+        try:
+            # tuple分段与list一样直接发送, 不使用分块传输
+            _proto_msg = MsgHTTP('HTTP/1.1 200 OK', obj_type=EnumMsgObjType.String)
+            _result = HttpService.send_data(_send_info, (_proto_msg, (b'ab', b'c')))
+            self.assertTrue(_result.is_success(), '分段发送失败: %s' % _result.msg)
+            _result = HttpService.recv_data(_recv_info, {})
+            self.assertTrue(
+                _result.is_success() and _result.data[0].get_value('Content-Length') == '3' and
+                _result.data[1] == b'abc', '分段发送的报文错误'
+            )
+
+            # 没有收到数据的超时
+            _result = HttpService.recv_data(_recv_info, {})
+            self.assertTrue(_result.code == '20403' and _result.is_recv_empty, '空闲超时判断错误')
+
+            # 收到部分报文头后对端关闭
+            TcpIpService.send_data(_send_info, b'GET / HTTP/1.1\r\nHost', {})
+            _wsock.close()
+            _result = HttpService.recv_data(_recv_info, {})
+            self.assertTrue(_result.code == '20405' and not _result.is_recv_empty, '部分报文关闭判断错误')
+        finally:
+            _rsock.close()
+            _wsock.close()
+
+
 if __name__ == '__main__':
     # 当程序自己独立运行时执行的操作
     unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+测试msg_json模块
+@module test_msg_json
+@file test_msg_json.py
+"""
+
+import os
+import sys
+import unittest
+# 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+from HiveNetLib.interface_tool.msg_json import MsgJSON
+
+
+__MOUDLE__ = 'test_msg_json'  # 模块名
+__DESCRIPT__ = u'测试msg_json模块'  # 模块描述
+__VERSION__ = '0.1.0'  # 版本
+__AUTHOR__ = u'黎慧剑'  # 作者
+__PUBLISH__ = '2026.10.19'  # 发布日期
+
+
+TEST_JSON_STR = (
+    '{"head": {"id": "001", "tags": ["a", "b"], "name": "abc"}, '
+    '"body": {"list": [{"val": 1}, {"val": 2}], "x-y": 3}}'
+)
+
+
+class TestMsgJSON(unittest.TestCase):
+    """
+    测试msg_json模块
+    """
+
+    def setUp(self):
+        """
+        启动测试执行的初始化
+        """
+        MsgJSON.clear_jsonpath_cache()
+
+    def tearDown(self):
+        """
+        结束测试执行的销毁
+        """
+        pass
+
+    def test_get_value(self):
+        """
+        测试获取报文内容
+        """
+        print('测试MsgJSON - 简单路径获取')
+        _msg = MsgJSON(TEST_JSON_STR)
+        self.assertTrue(_msg.get_value('head.id') == '001', '失败：简单路径获取字段值')
+        self.assertTrue(_msg.get_value('$.body.list[1].val') == 2, '失败：简单路径获取列表值')
+        self.assertTrue(_msg.get_value('body.x-y') == 3, '失败：简单路径获取带-的字段值')
+        self.assertTrue(_msg.get_value('head.name[0]') == 'a', '失败：简单路径对字符串取索引')
+        with self.assertRaises(NameError):
+            _msg.get_value('head.tags[5]')
+        with self.assertRaises(NameError):
+            _msg.get_value('head.none')
+
+        print('测试MsgJSON - jsonpath路径获取')
+        self.assertTrue(_msg.get_value('body.list[*].val') == 1, '失败：jsonpath通配符获取')
+        self.assertTrue(_msg.get_value('$..val') == 1, '失败：jsonpath递归获取')
+
+        print('测试MsgJSON - 路径缓存')
+        _msg.get_value('head.id')
+        self.assertTrue(MsgJSON._jsonpath_cache['head.id'] == ('head', 'id'), '失败：简单路径缓存')
+        self.assertTrue(type(MsgJSON._jsonpath_cache['$..val']) != tuple, '失败：jsonpath路径缓存')
+
+        # 简单路径无法直接遍历时，回退处理的jsonpath对象同样缓存
+        _msg.get_value('head.name[0]')
+        _jsonpath_obj = MsgJSON._jsonpath_cache[('head.name[0]', )]
+        self.assertTrue(type(_jsonpath_obj) != tuple, '失败：回退jsonpath路径缓存')
+        _msg.get_value('head.name[0]')
+        self.assertTrue(
+            MsgJSON._jsonpath_cache[('head.name[0]', )] is _jsonpath_obj
+            and MsgJSON._jsonpath_cache['head.name[0]'] == ('head', 'name', 0),
+            '失败：回退jsonpath路径缓存复用'
+        )
+
+        _old_size = MsgJSON.JSONPATH_CACHE_SIZE
+        try:
+            MsgJSON.JSONPATH_CACHE_SIZE = 2
+            MsgJSON.clear_jsonpath_cache()
+            _msg.get_value('head.id')
+            _msg.get_value('head.tags')
+            _msg.get_value('head.id')
+            _msg.get_value('body.list')
+            self.assertTrue(
+                list(MsgJSON._jsonpath_cache.keys()) == ['head.id', 'body.list'],
+                '失败：路径缓存按LRU淘汰'
+            )
+        finally:
+            MsgJSON.JSONPATH_CACHE_SIZE = _old_size
+
+    def test_set_value(self):
+        """
+        测试设置报文内容
+        """
+        print('测试MsgJSON - 简单路径设置')
+        _msg = MsgJSON(TEST_JSON_STR)
+        _msg.set_value('head.id', 2)
+        self.assertTrue(_msg.base_object['head']['id'] == '2', '失败：简单路径设置字段值')
+        _msg.set_value('body.list[0].val', 'v')
+        self.assertTrue(_msg.base_object['body']['list'][0]['val'] == 'v', '失败：简单路径设置列表值')
+        with self.assertRaises(NameError):
+            _msg.set_value('head.none', 'v')
+
+        print('测试MsgJSON - jsonpath路径设置')
+        _msg.set_value('body.list[*].val', 'all')
+        self.assertTrue(
+            [_item['val'] for _item in _msg.base_object['body']['list']] == ['all', 'all'],
+            '失败：jsonpath设置所有匹配节点'
+        )
+
+        print('测试MsgJSON - 添加子报文')
+        _msg.append_submsg_by_base_object({'sub': 1}, 'head.tags[1]')
+        self.assertTrue(_msg.base_object['head']['tags'][1] == {'sub': 1}, '失败：添加子报文')
+
+
+if __name__ == '__main__':
+    unittest.main()
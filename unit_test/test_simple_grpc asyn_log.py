@@ -562,6 +562,8 @@ class TestSimpleGRpc(unittest.TestCase):
         """
         启动测试类执行的初始化，只执行一次
         """
+        # 临时目录不纳入版本管理，需自行创建
+        FileTool.create_dir(_TEMP_DIR, exist_ok=True)
         # 初始化日志类
         DebugTool.set_debug(False)
         try:
@@ -13,7 +13,11 @@ import time
 import copy
 import unittest
 import json
+import zlib
 import queue
+import threading
+import asyncio
+import logging
 import grpc
 from grpc_health.v1 import health_pb2
 # 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
@@ -25,8 +29,13 @@ from HiveNetLib.base_tools.string_tool import StringTool
 from HiveNetLib.base_tools.file_tool import FileTool
 from HiveNetLib.base_tools.debug_tool import DebugTool
 from HiveNetLib.base_tools.run_tool import RunTool
-from HiveNetLib.simple_grpc.grpc_server import SimpleGRpcServer, SimpleGRpcServicer
-from HiveNetLib.simple_grpc.grpc_tool import SimpleGRpcTools, EnumCallMode
+from HiveNetLib.base_tools.trace_context import TraceContext
+from HiveNetLib.simple_grpc.grpc_server import SimpleGRpcServer, SimpleGRpcServicer, \
+    AIOSimpleGRpcServer, AIOSimpleGRpcServicer
+from HiveNetLib.simple_grpc.grpc_client import SimpleGRpcConnection, AIOSimpleGRpcConnection
+from HiveNetLib.simple_grpc.grpc_tool import SimpleGRpcTools, EnumCallMode, SimpleGRpcChannelRegistry, \
+    SimpleGRpcCallChainLogWriter
+from HiveNetLib.simple_grpc.grpc_codec import SimpleGRpcBinCodec
 
 
 _TEMP_DIR = os.path.abspath(os.path.dirname(__file__) + '/' +
@@ -561,6 +570,8 @@ class TestSimpleGRpc(unittest.TestCase):
         """
         启动测试类执行的初始化，只执行一次
         """
+        # 临时目录不纳入版本管理，需自行创建
+        FileTool.create_dir(_TEMP_DIR, exist_ok=True)
         # 初始化日志类
         DebugTool.set_debug(False)
         try:
@@ -964,6 +975,454 @@ class TestSimpleGRpc(unittest.TestCase):
         )
 
 
+class TestSimpleGRpcServicerDispatch(unittest.TestCase):
+    """
+    测试SimpleGRpcServicer的服务函数分发
+    """
+
+    def test_call_service_fun(self):
+        """
+        测试按调用计划绑定参数并执行服务函数
+        """
+        _servicer = SimpleGRpcServicer(logger=None, is_use_global_logger=False)
+        _servicer.add_service(EnumCallMode.Simple, 'service_simple_call_para', service_simple_call_para)
+        _call_plan = _servicer._simple_service_list['service_simple_call_para'][3]
+        self.assertTrue(_call_plan.has_var_keyword, '调用计划未识别**kwargs参数')
+
+        # 位置参数、动态位置参数、关键字参数及字节数组
+        _para_obj = SimpleGRpcTools.parameters_to_json(
+            [['', 'a1'], ['', 'b1'], ['', 'arg1'], ['c', 5], ['e', b'bytes']], is_support_bytes=True
+        )
+        _request = SimpleGRpcTools.generate_request_obj(
+            'service_simple_call_para', para_json=_para_obj.para_json,
+            has_para_bytes=_para_obj.has_para_bytes, para_bytes=_para_obj.para_bytes,
+            trace_id='trace1', trace_level=2
+        )
+        _trace_info = _servicer._get_trace_info(_request, None)
+        _ret = _servicer._call_service_fun(_call_plan, _request, json.loads(_request.para_json), _trace_info)
+        self.assertTrue(
+            _ret == ['a1', 'b1', ('arg1', ), 5, {'d1': 'd1value'}, {'e': b'bytes'}],
+            '参数绑定错误: %s' % str(_ret)
+        )
+
+        # 有**kwargs的函数自动传入调用链参数及流模式标识
+        _ret = _servicer._call_service_fun(
+            _servicer._generate_call_plan(lambda **kwargs: kwargs), _request, [], _trace_info, False
+        )
+        self.assertTrue(
+            _ret == {
+                'has_next_stream_data': False, 'trace_id': 'trace1',
+                'parent_id': _trace_info.call_id, 'trace_level': 3
+            }, '调用链参数传入错误: %s' % str(_ret)
+        )
+
+        # 无**kwargs的函数不传入调用链参数
+        _ret = _servicer._call_service_fun(
+            _servicer._generate_call_plan(lambda a, b=1: [a, b]), _request, [['', 1]], _trace_info
+        )
+        self.assertTrue(_ret == [1, 1], '无**kwargs函数调用错误: %s' % str(_ret))
+
+        # 执行服务函数期间设置调用链上下文，执行后恢复
+        def _get_trace(*args, **kwargs):
+            return tuple(TraceContext.get_trace_info())
+
+        def _iter_trace(*args, **kwargs):
+            for _i in range(2):
+                yield tuple(TraceContext.get_trace_info())
+
+        _servicer.add_service(EnumCallMode.Simple, 'get_trace', _get_trace)
+        _servicer.add_service(EnumCallMode.ServerSideStream, 'iter_trace', _iter_trace)
+        _request = SimpleGRpcTools.generate_request_obj('get_trace', trace_id='trace1', trace_level=2)
+        _trace_info = _servicer._get_trace_info(_request, None)
+        self.assertTrue(TraceContext.get_trace_info() is None, '获取调用链信息不应设置上下文')
+        _call_result, _ret = _servicer._call_service(_servicer._simple_service_list, _request, _trace_info)
+        self.assertTrue(
+            _call_result.is_success() and _ret == ('trace1', _trace_info.call_id, [3]),
+            '服务函数调用链上下文错误: %s' % str(_ret)
+        )
+        self.assertTrue(TraceContext.get_trace_info() is None, '调用结束未恢复调用链上下文')
+
+        _request = SimpleGRpcTools.generate_request_obj('iter_trace', trace_id='trace1', trace_level=2)
+        _call_result, _iterator = _servicer._call_service(
+            _servicer._server_side_stream_service_list, _request, _trace_info
+        )
+        for _ret in _servicer._iter_with_trace_info(_iterator, _trace_info):
+            self.assertTrue(_ret[0:2] == ('trace1', _trace_info.call_id), '迭代调用链上下文错误: %s' % str(_ret))
+            self.assertTrue(TraceContext.get_trace_info() is None, '迭代返回值后未恢复调用链上下文')
+
+    def test_bin_codec_call(self):
+        """
+        测试使用二进制编码的请求及响应
+        """
+        # 编解码支持嵌套及多个字节数组
+        _obj = {
+            'a': [1, -2, 1 << 70, 1.5, None, True, False, 'str中文'],
+            'key': (b'v1', bytearray(b'v2')), 'b': {'c': [b'', b'x' * 100]}
+        }
+        _ret = SimpleGRpcBinCodec.loads(SimpleGRpcBinCodec.dumps(_obj))
+        self.assertTrue(
+            _ret == {
+                'a': [1, -2, 1 << 70, 1.5, None, True, False, 'str中文'],
+                'key': [b'v1', b'v2'], 'b': {'c': [b'', b'x' * 100]}
+            }, '编解码错误: %s' % str(_ret)
+        )
+        with self.assertRaises(ValueError):
+            SimpleGRpcBinCodec.loads(SimpleGRpcBinCodec.dumps(_obj)[0: -3])
+        with self.assertRaises(TypeError):
+            SimpleGRpcBinCodec.dumps({1, 2})
+
+        # 服务端识别二进制编码请求，并以二进制编码返回
+        _servicer = SimpleGRpcServicer(logger=None, is_use_global_logger=False)
+        _servicer.add_service(EnumCallMode.Simple, 'service_bytes', lambda a, b, c=None: {
+            'a': a, 'b': b, 'c': c
+        })
+        _para_obj = SimpleGRpcTools.parameters_to_bin(
+            [['', b'a1'], ['', [b'b1', '{$SIMPLEGRPC_BYTES$}']], ['c', {'d': b'c1'}]]
+        )
+        _request = SimpleGRpcTools.generate_request_obj(
+            'service_bytes', para_json=_para_obj.para_json,
+            has_para_bytes=_para_obj.has_para_bytes, para_bytes=_para_obj.para_bytes
+        )
+        _cresult = SimpleGRpcTools.response_obj_to_cresult(_servicer.GRpcCallSimple(_request, None))
+        self.assertTrue(_cresult.is_success(), '调用失败: %s' % str(_cresult))
+        self.assertTrue(_cresult.return_json == '', '返回值未使用二进制编码')
+        _cresult = SimpleGRpcTools.return_json_to_obj(_cresult)
+        self.assertTrue(
+            _cresult.return_obj == {'a': b'a1', 'b': [b'b1', '{$SIMPLEGRPC_BYTES$}'], 'c': {'d': b'c1'}},
+            '返回值错误: %s' % str(_cresult.return_obj)
+        )
+
+        # json编码的请求仍以json返回
+        _para_obj = SimpleGRpcTools.parameters_to_json([['', 'a1'], ['', 'b1']])
+        _request = SimpleGRpcTools.generate_request_obj('service_bytes', para_json=_para_obj.para_json)
+        _cresult = SimpleGRpcTools.return_json_to_obj(
+            SimpleGRpcTools.response_obj_to_cresult(_servicer.GRpcCallSimple(_request, None))
+        )
+        self.assertTrue(
+            _cresult.return_json != '' and _cresult.return_obj == {'a': 'a1', 'b': 'b1', 'c': None},
+            'json返回值错误: %s' % str(_cresult.return_obj)
+        )
+
+
+async def service_aio_simple_call(a, b, **kwargs):
+    """
+    asyncio模式的简单调用服务函数
+    """
+    await asyncio.sleep(0.01)
+    return [a, b]
+
+
+async def service_aio_server_side_stream(n, **kwargs):
+    """
+    asyncio模式的服务端流服务函数（异步生成器）
+    """
+    for _i in range(n):
+        await asyncio.sleep(0)
+        yield _i
+
+
+class TestSimpleGRpcAIO(unittest.TestCase):
+    """
+    测试asyncio模式的服务端及客户端
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        启动测试类执行的初始化，只执行一次
+        """
+        cls.servicer = AIOSimpleGRpcServicer(logger=None, is_use_global_logger=False)
+        cls.servicer.add_service(EnumCallMode.Simple, 'service_aio_simple_call', service_aio_simple_call)
+        cls.servicer.add_service(
+            EnumCallMode.ServerSideStream, 'service_aio_server_side_stream', service_aio_server_side_stream
+        )
+        cls.server = AIOSimpleGRpcServer(server_name='ServerAIO', logger=logging.getLogger())
+        cls.server.start_server(
+            AIOSimpleGRpcServer.generate_server_opts(ip='127.0.0.1', port=50061, is_health_check=True),
+            servicer_list={'servicer_aio': cls.servicer}, is_wait=True
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        结束测试类执行的销毁，只执行一次
+        """
+        cls.server.stop_server(is_wait=True)
+
+    def test_aio_call(self):
+        """
+        测试asyncio模式的调用
+        """
+        _connect_para = SimpleGRpcConnection.generate_connect_para(
+            ip='127.0.0.1', port=50061, servicer_name='servicer_aio', test_use_health_check=True,
+            is_use_global_logger=False
+        )
+
+        def _request(service_name, *args):
+            return SimpleGRpcTools.generate_request_obj(
+                service_name, para_json=SimpleGRpcTools.parameters_to_json([['', _arg] for _arg in args]).para_json
+            )
+
+        async def _main():
+            async with AIOSimpleGRpcConnection(_connect_para) as _connection:
+                # 单连接并发调用
+                _cresults = await asyncio.gather(*[
+                    _connection.call(_request('service_aio_simple_call', _i, 'b')) for _i in range(50)
+                ])
+                for _i in range(50):
+                    self.assertTrue(
+                        _cresults[_i].is_success() and json.loads(_cresults[_i].return_json) == [_i, 'b'],
+                        '并发调用结果错误: %s' % str(_cresults[_i])
+                    )
+
+                # 服务端流
+                _iterator = await _connection.call(
+                    _request('service_aio_server_side_stream', 3), call_mode=EnumCallMode.ServerSideStream
+                )
+                _rets = [json.loads(_cresult.return_json) async for _cresult in _iterator]
+                self.assertTrue(_rets == [0, 1, 2], '服务端流结果错误: %s' % str(_rets))
+
+                # 服务不存在
+                _cresult = await _connection.call(_request('service_not_exists'))
+                self.assertTrue(_cresult.code == '11403', '服务不存在返回错误: %s' % _cresult.code)
+
+        asyncio.run(_main())
+
+        # 调用链日志的服务端地址使用启动时登记的监听地址
+        self.assertTrue(
+            self.servicer._get_context_host(None) == '127.0.0.1:50061',
+            '服务端地址错误: %s' % self.servicer._get_context_host(None)
+        )
+
+        # 原有同步客户端可正常访问
+        _connection = SimpleGRpcConnection(_connect_para)
+        try:
+            _cresult = _connection.call(_request('service_aio_simple_call', 'a', 'b'))
+            self.assertTrue(json.loads(_cresult.return_json) == ['a', 'b'], '同步客户端调用错误')
+        finally:
+            _connection.close()
+
+
+class TestSimpleGRpcChannelRegistry(unittest.TestCase):
+    """
+    测试共享通道登记表及单通道并发调用
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        启动测试类执行的初始化，只执行一次
+        """
+        cls.servicer = SimpleGRpcServicer(logger=None, is_use_global_logger=False)
+        cls.servicer.add_service(EnumCallMode.Simple, 'service_simple_call_return', service_simple_call_return)
+        cls.server = SimpleGRpcServer(server_name='ServerRegistry', logger=logging.getLogger())
+        cls.server.start_server(
+            SimpleGRpcServer.generate_server_opts(ip='127.0.0.1', port=50062, max_workers=4, max_connect=200),
+            servicer_list={'servicer_registry': cls.servicer}, is_wait=True
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        结束测试类执行的销毁，只执行一次
+        """
+        SimpleGRpcChannelRegistry.close_all()
+        cls.server.stop_server(is_wait=True)
+
+    def test_channel_registry(self):
+        """
+        测试共享通道的复用、并发调用及空闲关闭
+        """
+        _connect_para = SimpleGRpcTools.generate_connect_para(ip='127.0.0.1', port=50062)
+
+        def _request(obj):
+            return SimpleGRpcTools.generate_request_obj(
+                'service_simple_call_return',
+                para_json=SimpleGRpcTools.parameters_to_json([['', obj]]).para_json
+            )
+
+        # 相同连接参数复用同一个通道
+        SimpleGRpcChannelRegistry.close_all()
+        for _i in range(3):
+            _cresult = SimpleGRpcTools.grpc_call(_connect_para, _request(_i))
+            self.assertTrue(json.loads(_cresult.return_json) == _i, '调用结果错误: %s' % str(_cresult))
+        with SimpleGRpcChannelRegistry.use_channel(
+            SimpleGRpcTools.generate_connect_para(ip='127.0.0.1', port=50062)
+        ) as _channel_info:
+            self.assertTrue(SimpleGRpcChannelRegistry.channel_count() == 1, '通道未复用')
+            _channel = _channel_info.channel
+
+        # 单通道并发调用，结果顺序与请求一致
+        _cresults = SimpleGRpcTools.grpc_call_many(_connect_para, [_request(_i) for _i in range(100)])
+        self.assertTrue(
+            [json.loads(_cresult.return_json) for _cresult in _cresults] == list(range(100)),
+            '并发调用结果错误'
+        )
+        _cresults = SimpleGRpcTools.grpc_call_many(
+            _connect_para, [_request(_i) for _i in range(10)] + [
+                SimpleGRpcTools.generate_request_obj('service_not_exists')
+            ], max_concurrent=3
+        )
+        self.assertTrue(
+            [json.loads(_cresult.return_json) for _cresult in _cresults[0: 10]] == list(range(10)) and
+            _cresults[10].code == '11403', '分批并发调用结果错误'
+        )
+
+        # 连接对象的并发调用
+        _connection = SimpleGRpcConnection(SimpleGRpcConnection.generate_connect_para(
+            ip='127.0.0.1', port=50062, is_use_global_logger=False
+        ))
+        try:
+            _cresults = _connection.call_many([_request(_i) for _i in range(20)])
+            self.assertTrue(
+                [json.loads(_cresult.return_json) for _cresult in _cresults] == list(range(20)),
+                '连接对象并发调用结果错误'
+            )
+        finally:
+            _connection.close()
+
+        # 空闲超时关闭
+        SimpleGRpcChannelRegistry.set_para(idle_timeout=0, check_interval=0.1)
+        try:
+            for _i in range(50):
+                if SimpleGRpcChannelRegistry.channel_count() == 0:
+                    break
+                time.sleep(0.1)
+            self.assertTrue(SimpleGRpcChannelRegistry.channel_count() == 0, '空闲通道未关闭')
+            _cresult = SimpleGRpcTools.grpc_call(_connect_para, _request('new'))
+            self.assertTrue(json.loads(_cresult.return_json) == 'new', '通道关闭后重新创建调用错误')
+        finally:
+            SimpleGRpcChannelRegistry.set_para(idle_timeout=300, check_interval=10)
+
+        # 不复用通道的调用方式
+        _cresult = SimpleGRpcTools.grpc_call(_connect_para, _request('once'), is_reuse_channel=False)
+        self.assertTrue(json.loads(_cresult.return_json) == 'once', '不复用通道调用错误')
+        self.assertTrue(_channel is not None, '通道信息错误')
+
+
+class ListLogHandler(logging.Handler):
+    """
+    将日志记录保存在列表中的日志处理器
+    """
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.records = list()
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class TestSimpleGRpcCallChainLogWriter(unittest.TestCase):
+    """
+    测试调用链日志的异步批量写入
+    """
+
+    def test_log_writer(self):
+        """
+        测试服务端及客户端通过异步批量写入调用链日志
+        """
+        _handler = ListLogHandler()
+        _logger = logging.getLogger('test_simple_grpc_log_writer')
+        _logger.setLevel(logging.INFO)
+        _logger.propagate = False
+        _logger.addHandler(_handler)
+
+        _writer = SimpleGRpcCallChainLogWriter(_logger, flush_interval=0.01)
+        _servicer = SimpleGRpcServicer(logger=_writer, log_level=logging.INFO)
+        _servicer.add_service(EnumCallMode.Simple, 'service_simple_call_return', service_simple_call_return)
+        _server = SimpleGRpcServer(server_name='ServerLogWriter', logger=logging.getLogger())
+        _server.start_server(
+            SimpleGRpcServer.generate_server_opts(ip='127.0.0.1', port=50063),
+            servicer_list={'servicer_log': _servicer}, is_wait=True
+        )
+        try:
+            _connection = SimpleGRpcConnection(SimpleGRpcConnection.generate_connect_para(
+                ip='127.0.0.1', port=50063, logger=_writer, log_level=logging.INFO
+            ))
+            try:
+                for _i in range(5):
+                    _cresult = _connection.call(SimpleGRpcTools.generate_request_obj(
+                        'service_simple_call_return',
+                        para_json=SimpleGRpcTools.parameters_to_json([['', _i]]).para_json
+                    ))
+                    self.assertTrue(json.loads(_cresult.return_json) == _i, '调用结果错误')
+            finally:
+                _connection.close()
+        finally:
+            _server.stop_server(is_wait=True)
+            _writer.stop()
+
+        # 客户端SEND/BACK及服务端RECV/RESP各5条
+        self.assertTrue(_writer.written_count == 20, '写入日志数错误: %d' % _writer.written_count)
+        self.assertTrue(len(_handler.records) == 20, '日志记录数错误: %d' % len(_handler.records))
+
+        # 抽样及限流
+        _writer = SimpleGRpcCallChainLogWriter(_logger, sample_rate=0, auto_start=False)
+        _info_dict = {'trace_id': 'trace1', 'error': None}
+        SimpleGRpcTools.write_api_call_chain_log(_writer, _info_dict)
+        self.assertTrue(_writer.sampled_out_count == 1 and _writer.pending_count() == 0, '抽样处理错误')
+        _info_dict['error'] = 'error'
+        SimpleGRpcTools.write_api_call_chain_log(_writer, _info_dict)
+        self.assertTrue(_writer.pending_count() == 1, '异常日志应不受抽样限制')
+
+        # 抽样结果按trace_id稳定（不受进程的hash随机化影响）
+        _writer = SimpleGRpcCallChainLogWriter(_logger, sample_rate=0.5, auto_start=False)
+        _kept = [_i for _i in range(100) if _writer.push({'trace_id': 'trace%d' % _i, 'error': None})]
+        self.assertTrue(_kept == [
+            _i for _i in range(100) if (zlib.crc32(('trace%d' % _i).encode('utf-8')) & 0xFFFF) < 0x8000
+        ], '抽样结果不稳定')
+        self.assertTrue(_writer.sampled_out_count == 100 - len(_kept), '抽样计数错误')
+
+        # 限流，避免跨越1秒的时间窗口
+        while time.monotonic() % 1 > 0.5:
+            time.sleep(0.05)
+        _writer = SimpleGRpcCallChainLogWriter(_logger, max_per_second=3, auto_start=False)
+        for _i in range(10):
+            _writer.push({'trace_id': str(_i), 'error': None})
+        self.assertTrue(
+            _writer.pending_count() == 3 and _writer.dropped_count == 7,
+            '限流处理错误: %d, %d' % (_writer.pending_count(), _writer.dropped_count)
+        )
+
+        # 队列满
+        _writer = SimpleGRpcCallChainLogWriter(_logger, ring_size=5, auto_start=False)
+        for _i in range(10):
+            _writer.push({'trace_id': str(_i), 'error': None})
+        self.assertTrue(
+            _writer.pending_count() == 5 and _writer.dropped_count == 5,
+            '队列满处理错误: %d, %d' % (_writer.pending_count(), _writer.dropped_count)
+        )
+
+        # 积压达到wakeup_size时立即唤醒后台线程
+        _writer = SimpleGRpcCallChainLogWriter(_logger, flush_interval=60, wakeup_size=4)
+        try:
+            time.sleep(0.1)
+            for _i in range(4):
+                _writer.push({'trace_id': str(_i), 'error': None})
+            _start = time.time()
+            while _writer.written_count < 4 and time.time() - _start < 5:
+                time.sleep(0.01)
+            self.assertTrue(_writer.written_count == 4, '积压未唤醒后台线程: %d' % _writer.written_count)
+        finally:
+            _writer.stop()
+
+        # 多线程flush与后台线程并发写入，写入计数不丢失
+        _writer = SimpleGRpcCallChainLogWriter(_logger, batch_size=8, flush_interval=0.001, wakeup_size=1)
+        try:
+            for _i in range(2000):
+                _writer.push({'trace_id': str(_i), 'error': None})
+            _threads = [threading.Thread(target=_writer.flush) for _i in range(4)]
+            for _thread in _threads:
+                _thread.start()
+            for _thread in _threads:
+                _thread.join()
+            _writer.flush()
+            self.assertTrue(_writer.written_count == 2000, '并发写入计数错误: %d' % _writer.written_count)
+        finally:
+            _writer.stop()
+
+
 if __name__ == '__main__':
     # 当程序自己独立运行时执行的操作
     unittest.main()
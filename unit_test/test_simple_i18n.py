@@ -120,6 +120,33 @@ class TestSimpleI18N(unittest.TestCase):
         s6 = _('my name is $1, i am $2 years old. haha！', 'lhj', 30)
         self.assertTrue(s6 == 'my name is lhj, i am 30 years old. haha！', '翻译6失败')
 
+    def test_replace_paras(self):
+        """
+        测试占位符替换
+        """
+        self.assertTrue(SimpleI18N.replace_paras('no para', ('a', )) == 'no para', '替换1失败')
+        self.assertTrue(
+            SimpleI18N.replace_paras('[$2]("$1") $3', ('a', 'b')) == '[b]("a") $3', '替换2失败'
+        )
+        # 重复使用缓存的模版
+        self.assertTrue(
+            SimpleI18N.replace_paras('[$2]("$1") $3', (1, 'c', 3)) == '[c]("1") 3', '替换3失败'
+        )
+        # $10会被当作$1处理, 与逐个替换的方式保持一致
+        self.assertTrue(
+            SimpleI18N.replace_paras('$1 $10', tuple(range(1, 11))) == '1 10', '替换4失败'
+        )
+        # 特殊字符
+        self.assertTrue(
+            SimpleI18N.replace_paras('path $1', ('C:\\temp\\d', )) == 'path C:\\temp\\d', '替换5失败'
+        )
+        # 变量中有占位符, 按顺序逐个替换
+        self.assertTrue(
+            SimpleI18N.replace_paras('$1 $2', ('cost $2', 'x')) == 'cost x x', '替换6失败'
+        )
+        self.assertTrue(
+            SimpleI18N.replace_paras('$$1 $3', ('3', 'x', 'y')) == 'y y', '替换7失败'
+        )
 
 if __name__ == '__main__':
     # 当程序自己独立运行时执行的操作
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+测试simple_parallel
+@module test_simple_parallel
+@file test_simple_parallel.py
+"""
+
+import os
+import sys
+import time
+import datetime
+import unittest
+from concurrent.futures import wait
+# 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+from HiveNetLib.simple_parallel import ParallelPool, ThreadParallel, ProcessParallel, ProcessParallelShareDict, \
+    ProcessParallelControlBlock, ProcessParallelShareSlot, ParallelCpuPlacement, NotRunning
+import HiveNetLib.base_tools.affinity as affinity
+
+
+__MOUDLE__ = 'test_simple_parallel'  # 模块名
+__DESCRIPT__ = u'测试simple_parallel'  # 模块描述
+__VERSION__ = '0.1.0'  # 版本
+__AUTHOR__ = u'黎慧剑'  # 作者
+__PUBLISH__ = '2026.10.19'  # 发布日期
+
+
+def _multiply_fun(a, b=1):
+    """
+    测试用的任务函数(多进程需定义在模块级别)
+    """
+    if a is None:
+        raise ValueError('a is None')
+    return a * b
+
+
+def _sleep_fun(a, seconds=0.5):
+    """
+    测试用的耗时任务函数
+    """
+    time.sleep(seconds)
+    return a
+
+
+class TestParallelPool(unittest.TestCase):
+    """
+    测试ParallelPool类
+    """
+
+    def setUp(self):
+        """
+        启动测试执行的初始化
+        """
+        pass
+
+    def tearDown(self):
+        """
+        结束测试执行的销毁
+        """
+        pass
+
+    def test_thread_submit(self):
+        """
+        测试线程池任务提交模式
+        """
+        _pool = ParallelPool(
+            None, parallel_class=ThreadParallel, maxsize=4, is_use_global_logger=False,
+            daemon_thread_time=1, task_get_timeout=0.1
+        )
+        _pool.start()
+        try:
+            _futures = [_pool.submit(_multiply_fun, _i, b=2) for _i in range(20)]
+            _rets = [_future.result(timeout=10) for _future in _futures]
+            self.assertTrue(_rets == [_i * 2 for _i in range(20)], '线程池提交任务结果错误: %s' % str(_rets))
+
+            _ex = _pool.submit(_multiply_fun, None).exception(timeout=10)
+            self.assertTrue(isinstance(_ex, ValueError), '线程池提交任务异常返回错误: %s' % str(_ex))
+        finally:
+            _pool.stop(overtime=10)
+
+        self.assertTrue(_pool.is_stop, '线程池停止失败')
+
+    def test_process_submit(self):
+        """
+        测试进程池任务提交模式
+        """
+        _pool = ParallelPool(
+            None, parallel_class=ProcessParallel, maxsize=2, is_use_global_logger=False,
+            sharedict_class=ProcessParallelShareDict, task_get_timeout=0.1
+        )
+        _pool.start()
+        try:
+            _futures = [_pool.submit(_multiply_fun, _i, b=3) for _i in range(10)]
+            _rets = [_future.result(timeout=30) for _future in _futures]
+            self.assertTrue(_rets == [_i * 3 for _i in range(10)], '进程池提交任务结果错误: %s' % str(_rets))
+
+            _ex = _pool.submit(_multiply_fun, None).exception(timeout=30)
+            self.assertTrue(isinstance(_ex, ValueError), '进程池提交任务异常返回错误: %s' % str(_ex))
+        finally:
+            _pool.stop(overtime=30)
+
+    def test_process_control_block(self):
+        """
+        测试进程池使用共享内存控制块
+        """
+        _block = ProcessParallelControlBlock(2, ('status', 'freebegin'), datetime_keys=('freebegin', ))
+        _slot1 = _block.alloc_slot()
+        _slot2 = _block.alloc_slot()
+        self.assertTrue(_block.alloc_slot() is None, '控制块槽位已用完仍可分配')
+        _now = datetime.datetime.now()
+        _slot1['status'] = 3
+        _slot1['freebegin'] = _now
+        _slot2['status'] += 1
+        self.assertTrue(_slot1['status'] == 3 and _slot2['status'] == 1, '控制块槽位取值错误')
+        self.assertTrue(_slot1['freebegin'] == _now, '控制块时间字段取值错误: %s' % str(_slot1['freebegin']))
+        self.assertTrue(type(_slot1['status']) is int, '控制块槽位取值类型错误')
+        _slot2['status'] = True
+        self.assertTrue(_slot2['status'] is True, '控制块bool字段取值类型错误')
+        _slot2['status'] = 0.5
+        self.assertTrue(_slot2['status'] == 0.5, '控制块float字段取值错误')
+        _block.free_slot(_slot1)
+        self.assertTrue(_block.alloc_slot()['status'] == 0, '控制块重新分配的槽位未初始化')
+
+        # 进程任务的运行状态返回bool值
+        _task = ProcessParallel(_multiply_fun, run_args=(1, ))
+        self.assertTrue(_task.is_running is False, '进程任务运行状态类型错误')
+
+        # 任务池的工作任务状态使用控制块槽位
+        _pool = ParallelPool(
+            None, parallel_class=ProcessParallel, maxsize=2, is_use_global_logger=False,
+            task_get_timeout=0.1
+        )
+        _pool.start()
+        try:
+            _futures = [_pool.submit(_multiply_fun, _i) for _i in range(4)]
+            [_future.result(timeout=30) for _future in _futures]
+            for _worker in list(_pool._workers.values()):
+                self.assertTrue(isinstance(_worker[1], ProcessParallelShareSlot), '工作任务未使用控制块槽位')
+        finally:
+            _pool.stop(overtime=30)
+
+    def test_map(self):
+        """
+        测试map及imap批量处理
+        """
+        for _parallel_class in (ThreadParallel, ProcessParallel):
+            _pool = ParallelPool(
+                None, parallel_class=_parallel_class, maxsize=2, is_use_global_logger=False,
+                task_get_timeout=0.1
+            )
+            _pool.start()
+            try:
+                _rets = _pool.map(_multiply_fun, range(1000), chunksize=100)
+                self.assertTrue(_rets == list(range(1000)), '%s map结果错误' % _parallel_class.__name__)
+
+                _rets = sorted(_pool.imap(_multiply_fun, range(100), chunksize=7, ordered=False))
+                self.assertTrue(_rets == list(range(100)), '%s imap无序结果错误' % _parallel_class.__name__)
+
+                # 延迟提交, 可处理无法一次性加载的可迭代对象
+                _iter = _pool.imap(_multiply_fun, iter(range(10 ** 9)), chunksize=10)
+                self.assertTrue([next(_iter), next(_iter)] == [0, 1], 'imap延迟提交结果错误')
+                _iter.close()
+
+                with self.assertRaises(ValueError):
+                    _pool.map(_multiply_fun, [1, None, 3])
+
+                # 调用时即检查批次大小, 无需等到开始迭代
+                with self.assertRaises(ValueError):
+                    _pool.imap(_multiply_fun, range(10), chunksize=0)
+            finally:
+                _pool.stop(overtime=30)
+
+    def test_cpu_placement(self):
+        """
+        测试工作任务的CPU分配策略
+        """
+        # 2个物理CPU, 每个物理CPU 2核心, 每核心2个超线程
+        _topology = {
+            0: (0, 0), 1: (0, 1), 2: (1, 0), 3: (1, 1),
+            4: (0, 0), 5: (0, 1), 6: (1, 0), 7: (1, 1)
+        }
+        _order = ParallelCpuPlacement._get_spread_order(_topology)
+        self.assertTrue(_order == [0, 2, 1, 3, 4, 6, 5, 7], 'spread分配顺序错误: %s' % str(_order))
+
+        # 指定清单, 按最少分配优先, 释放后替代任务重新使用该CPU
+        _placement = ParallelCpuPlacement([3, 5])
+        self.assertTrue([_placement.alloc('t1'), _placement.alloc('t2')] == [3, 5], '指定清单分配错误')
+        _placement.free('t1')
+        self.assertTrue(_placement.alloc('t3') == 3, '替代任务分配错误')
+
+        _placement = ParallelCpuPlacement('round_robin', cpus=[0, 1])
+        _cpus = [_placement.alloc('t%d' % _i) for _i in range(3)]
+        self.assertTrue(_cpus == [0, 1, 0], 'round_robin分配错误: %s' % str(_cpus))
+
+        with self.assertRaises(ValueError):
+            ParallelCpuPlacement('unknown')
+
+        # 进程池创建工作任务时绑定CPU
+        _cpu = affinity.get_available_cpus()[-1]
+        _pool = ParallelPool(
+            None, parallel_class=ProcessParallel, maxsize=2, is_use_global_logger=False,
+            task_get_timeout=0.1, cpu_placement=[_cpu]
+        )
+        _pool.start()
+        try:
+            _futures = [_pool.submit(affinity.get_process_affinity_mask, 0) for _i in range(4)]
+            for _future in _futures:
+                self.assertTrue(_future.result(timeout=30) == (1 << _cpu), '工作进程未绑定CPU')
+        finally:
+            _pool.stop(overtime=30)
+
+    def test_stop_pending_submit(self):
+        """
+        测试停止并发池时取消未执行的提交任务, 以及停止后不允许提交任务
+        """
+        for _parallel_class in (ThreadParallel, ProcessParallel):
+            _pool = ParallelPool(
+                None, parallel_class=_parallel_class, maxsize=1, is_use_global_logger=False,
+                sharedict_class=ProcessParallelShareDict, daemon_thread_time=0.1, task_get_timeout=0.1
+            )
+            with self.assertRaises(NotRunning):
+                _pool.submit(_sleep_fun, 0)
+
+            _pool.start()
+            _futures = [_pool.submit(_sleep_fun, _i, seconds=2) for _i in range(5)]
+            time.sleep(1)  # 等待第1个任务开始执行
+            _pool.stop(overtime=30)
+
+            _done, _not_done = wait(_futures, timeout=10)
+            self.assertTrue(
+                len(_not_done) == 0, '%s停止后存在未完成的Future: %d' % (_parallel_class.__name__, len(_not_done))
+            )
+            self.assertTrue(_futures[0].result() == 0, '%s已执行任务结果错误' % _parallel_class.__name__)
+            self.assertTrue(
+                all(_future.cancelled() for _future in _futures[2:]),
+                '%s未执行任务未取消' % _parallel_class.__name__
+            )
+
+            with self.assertRaises(NotRunning):
+                _pool.submit(_sleep_fun, 0)
+
+    def test_submit_not_support(self):
+        """
+        测试非任务提交模式不支持submit
+        """
+        _pool = ParallelPool(_multiply_fun, parallel_class=ThreadParallel, is_use_global_logger=False)
+        with self.assertRaises(RuntimeError):
+            _pool.submit(_multiply_fun, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
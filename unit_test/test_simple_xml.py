@@ -13,6 +13,7 @@ import unittest
 import lxml.etree as ET
 # 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+from HiveNetLib.base_tools.file_tool import FileTool
 from HiveNetLib.simple_xml import EnumXmlObjType, SimpleXml
 
 
@@ -38,6 +39,8 @@ class TestSimpleXml(unittest.TestCase):
         """
         self.file_path = os.path.abspath(os.path.dirname(__file__) + '/' +
                                          '../test_data/simple_xml/')
+        # 临时目录不纳入版本管理，需自行创建
+        FileTool.create_dir(_TEMP_DIR, exist_ok=True)
 
     def tearDown(self):
         """
@@ -122,6 +125,107 @@ class TestSimpleXml(unittest.TestCase):
         self.assertTrue(_text == '新值',
                         '失败：测试命名空间处理 - 新增节点 - 值错误：%s' % _text)
 
+    def test_xml_get_values(self):
+        """
+        测试批量获取值及xpath预编译缓存
+        """
+        print('测试SimpleXml - 批量获取值')
+        SimpleXml.clear_xpath_cache()
+        _xml = '<data><a>a1</a><b t="1">b1</b><b t="2">b2</b><c/></data>'
+        for _use_xpath2 in (False, True):
+            _pfile = SimpleXml(_xml, obj_type=EnumXmlObjType.String, use_xpath2=_use_xpath2)
+            _values = _pfile.get_values(['/data/a', 'b[@t="2"]', 'c', 'd'], default='None')
+            self.assertTrue(_values == ['a1', 'b2', 'None', 'None'],
+                            '失败：测试SimpleXml - 批量获取值 - xpath2=%s：%s' % (_use_xpath2, str(_values)))
+            self.assertTrue(_pfile.get_attr('b[2]', 't') == '2',
+                            '失败：测试SimpleXml - 批量获取值 - 获取属性 - xpath2=%s' % _use_xpath2)
+
+        print('测试SimpleXml - xpath预编译缓存')
+        self.assertTrue(('/data/a', None, False) in SimpleXml._xpath_cache and
+                        ('/data/a', None, True) in SimpleXml._xpath_cache,
+                        '失败：测试SimpleXml - xpath预编译缓存 - 按xpath版本缓存')
+        _text = SimpleXml.get_value_on_node(_pfile.root, 'b[1]')
+        self.assertTrue(_text == 'b1', '失败：测试SimpleXml - xpath预编译缓存 - 节点检索：%s' % _text)
+
+        _ns = {'p': 'http://people.example.com'}
+        _pfile = SimpleXml(
+            '<p:data xmlns:p="http://people.example.com"><p:a>v</p:a></p:data>',
+            obj_type=EnumXmlObjType.String
+        )
+        self.assertTrue(_pfile.get_values(['p:a'], namespaces=_ns) == ['v'],
+                        '失败：测试SimpleXml - xpath预编译缓存 - 命名空间')
+        self.assertTrue(('p:a', tuple(_ns.items()), False) in SimpleXml._xpath_cache,
+                        '失败：测试SimpleXml - xpath预编译缓存 - 按命名空间缓存')
+
+    def test_xml_iter_records(self):
+        """
+        测试流式获取记录
+        """
+        print('测试SimpleXml - 流式获取记录')
+        _xml = (
+            '<?xml version="1.0" encoding="gbk"?><data><head><n>头信息</n></head><records>' +
+            ''.join(
+                '<record><id type="int">%d</id><name>名称%d</name></record>' % (_i, _i)
+                for _i in range(100)
+            ) + '</records><record><id>x</id></record></data>'
+        ).encode('gbk')
+        _records = list(SimpleXml.iter_records(
+            _xml, 'records/record', obj_type=EnumXmlObjType.Bytes))
+        self.assertTrue(len(_records) == 100 and _records[99] == {'id': 99, 'name': '名称99'},
+                        '失败：测试SimpleXml - 流式获取记录 - 相对路径：%s' % str(_records[-1:]))
+        _records = list(SimpleXml.iter_records(
+            _xml, '/data/record', obj_type=EnumXmlObjType.Bytes))
+        self.assertTrue(_records == [{'id': 'x'}],
+                        '失败：测试SimpleXml - 流式获取记录 - 绝对路径：%s' % str(_records))
+        _records = list(SimpleXml.iter_records(_xml, 'record', obj_type=EnumXmlObjType.Bytes))
+        self.assertTrue(len(_records) == 101,
+                        '失败：测试SimpleXml - 流式获取记录 - 标签：%d' % len(_records))
+
+        print('测试SimpleXml - 流式获取记录 - 类型提示')
+        _type_hints = dict()
+        _records = list(SimpleXml.iter_records(
+            '<data><r><tags><t>a</t></tags></r><r><tags><t>b</t><t>c</t></tags></r></data>',
+            'r', obj_type=EnumXmlObjType.String, type_hints=_type_hints
+        ))
+        self.assertTrue(_records == [{'tags': {'t': 'a'}}, {'tags': ['b', 'c']}],
+                        '失败：测试SimpleXml - 流式获取记录 - 类型提示：%s' % str(_records))
+        self.assertTrue(_type_hints == {'r/tags': 'list'},
+                        '失败：测试SimpleXml - 流式获取记录 - 类型提示推断：%s' % str(_type_hints))
+
+        print('测试SimpleXml - 流式获取记录 - 采样范围之后才出现非ascii字符')
+        _xml = (
+            '<data>' + ''.join('<record><id>%d</id></record>' % _i for _i in range(4000)) +
+            '<record><id>中文</id></record></data>'
+        ).encode('utf-8')
+        self.assertTrue(len(_xml) > SimpleXml.ENCODING_DETECT_SIZE, '失败：测试数据长度')
+        _records = list(SimpleXml.iter_records(_xml, 'record', obj_type=EnumXmlObjType.Bytes))
+        self.assertTrue(len(_records) == 4001 and _records[-1] == {'id': '中文'},
+                        '失败：测试SimpleXml - 流式获取记录 - 采样后的非ascii字符：%s' % str(_records[-1:]))
+        _pxml = SimpleXml(_xml, obj_type=EnumXmlObjType.Bytes, encoding=None)
+        self.assertTrue(_pxml.encoding == 'utf-8' and _pxml.get_value('/data/record[last()]/id') == '中文',
+                        '失败：测试SimpleXml - 装载 - 采样后的非ascii字符：%s' % _pxml.encoding)
+
+        print('测试SimpleXml - 流式获取记录 - 命名空间')
+        _ns = {'p': 'http://people.example.com'}
+        _records = list(SimpleXml.iter_records(
+            '<p:data xmlns:p="http://people.example.com"><p:r><p:a>v</p:a></p:r></p:data>',
+            'p:data/p:r', obj_type=EnumXmlObjType.String, namespaces=_ns
+        ))
+        self.assertTrue(_records == [{'{http://people.example.com}a': 'v'}],
+                        '失败：测试SimpleXml - 流式获取记录 - 命名空间：%s' % str(_records))
+
+        print('测试SimpleXml - 未定义的命名空间前缀')
+        for _namespaces in (None, {'q': 'http://q.example.com'}):
+            with self.assertRaisesRegex(ValueError, r'unknown namespace prefix \[p\]'):
+                list(SimpleXml.iter_records(
+                    '<data/>', 'data/p:r', obj_type=EnumXmlObjType.String, namespaces=_namespaces
+                ))
+            _pxml = SimpleXml('<data/>', obj_type=EnumXmlObjType.String)
+            with self.assertRaisesRegex(ValueError, r'unknown namespace prefix \[p\]'):
+                _pxml.append_path_node('/data/p:r', namespaces=_namespaces)
+            with self.assertRaisesRegex(ValueError, r'unknown namespace prefix \[p\]'):
+                _pxml.append_empty_node('/data', 'r', prefix='p', namespaces=_namespaces)
+
     def test_xml_to_dict(self):
         """
         测试xml转换为字典的情况
@@ -142,6 +246,27 @@ class TestSimpleXml(unittest.TestCase):
         self.assertTrue(_dict['data'][1]['list'][0]['b1'] == 'b1',
                         '失败：测试SimpleXml - to_dict - 检查3：%s' % str(_dict['data'][1]['list'][0]['b1']))
 
+        print('测试SimpleXml - to_dict - 类型提示')
+        _pfile = SimpleXml(
+            '<data><a><b>1</b></a><c type="tuple"><d>1</d><d type="int">2</d></c>'
+            '<e><f>1</f><f>2</f></e></data>',
+            obj_type=EnumXmlObjType.String
+        )
+        _type_hints = {'data/a': 'list'}
+        _dict = _pfile.to_dict(type_hints=_type_hints)
+        self.assertTrue(_dict == {'data': {'a': ['1'], 'c': ('1', 2), 'e': ['1', '2']}},
+                        '失败：测试SimpleXml - to_dict - 类型提示：%s' % str(_dict))
+        self.assertTrue(_type_hints == {'data/a': 'list', 'data/e': 'list'},
+                        '失败：测试SimpleXml - to_dict - 类型提示推断：%s' % str(_type_hints))
+
+        print('测试SimpleXml - to_dict - 深层节点')
+        _pfile = SimpleXml('<a>' * 1500 + 'v' + '</a>' * 1500, obj_type=EnumXmlObjType.String,
+                           huge_tree=True)
+        _value = _pfile.to_dict()
+        for _i in range(1500):
+            _value = _value['a']
+        self.assertTrue(_value == 'v', '失败：测试SimpleXml - to_dict - 深层节点：%s' % str(_value))
+
 
 if __name__ == '__main__':
     # 当程序自己独立运行时执行的操作
@@ -10,10 +10,14 @@
 import os
 import sys
 import time
+import socket
+import logging
+import threading
 import unittest
 # 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
-from HiveNetLib.net_service.tcpip_service import TcpIpService
+from HiveNetLib.net_service.tcpip_service import TcpIpService, SocketFileRegion
+from HiveNetLib.generic import NullObj
 import HiveNetLib.simple_log as simple_log
 from HiveNetLib.base_tools.string_tool import StringTool
 from HiveNetLib.base_tools.file_tool import FileTool
@@ -255,6 +259,276 @@ class TestTcpIpService(unittest.TestCase):
                          + '\n'.join(['%s:%s' % item for item in _close_result.__dict__.items()])))
 
 
+class TestTcpIpServiceEventLoop(unittest.TestCase):
+    """
+    测试TcpIpService类的事件循环模式
+    """
+
+    @classmethod
+    def server_connect_deal_fun(cls, thread_id, server_opts, net_info, self_tag):
+        # 长连接回显处理, 每次只处理一个请求
+        _read_result = TcpIpService.recv_data(net_info, {'recv_len': 4})
+        if not _read_result.is_success():
+            TcpIpService.close_connect(net_info)
+            return
+        _next_read = int.from_bytes(_read_result.data, byteorder='big', signed=False)
+        _read_result = TcpIpService.recv_data(net_info, {'recv_len': _next_read})
+        if not _read_result.is_success():
+            TcpIpService.close_connect(net_info)
+            return
+        if _read_result.data == b'close':
+            TcpIpService.close_connect(net_info)
+            return
+        cls.thread_ids.add(thread_id)
+        _send_body = _read_result.data * 2
+        TcpIpService.send_data(net_info, len(_send_body).to_bytes(4, byteorder='big') + _send_body, {})
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        启动测试类执行的初始化，只执行一次
+        """
+        cls.thread_ids = set()
+        cls.server = TcpIpService(
+            logger=logging.getLogger(),
+            server_connect_deal_fun=cls.server_connect_deal_fun,
+            self_tag='UnitTestEventLoop',
+            log_level=simple_log.DEBUG
+        )
+        cls.server_opts = TcpIpService.generate_server_opts(
+            ip='127.0.0.1', port=9515, max_connect=200, recv_timeout=2000, use_event_loop=True, worker_num=2
+        )
+        cls.server.start_server(server_opts=cls.server_opts, is_wait=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        结束测试类执行的销毁，只执行一次
+        """
+        cls.server.stop_server(is_wait=True, overtime=30)
+
+    def test_event_loop(self):
+        """
+        测试事件循环模式下多个长连接的处理
+        """
+        _net_infos = list()
+        for _i in range(50):
+            _connect_result = TcpIpService.connect_server(self.server_opts)
+            self.assertTrue(_connect_result.is_success(), '[客户端]连接服务器失败: %s' % _connect_result.msg)
+            _net_infos.append(_connect_result.net_info)
+
+        # 每个连接发送多次请求, 连接处理完成后保持
+        for _round in range(3):
+            for _i in range(len(_net_infos)):
+                _body = ('%04d' % _i).encode('utf-8')
+                TcpIpService.send_data(_net_infos[_i], len(_body).to_bytes(4, byteorder='big') + _body, {})
+                _result = TcpIpService.recv_data(_net_infos[_i], {'recv_len': 12})
+                self.assertTrue(_result.is_success(), '[客户端]获取返回数据失败: %s' % _result.code)
+                self.assertTrue(_result.data[4:] == _body * 2, '[客户端]返回数据错误: %s' % str(_result.data))
+        self.assertTrue(len(self.thread_ids) == len(_net_infos), '连接ID错误: %s' % str(self.thread_ids))
+
+        # 服务端关闭连接, 客户端收到对端关闭
+        TcpIpService.send_data(_net_infos[0], (5).to_bytes(4, byteorder='big') + b'close', {})
+        _result = TcpIpService.recv_data(_net_infos[0], {'recv_len': 4})
+        self.assertTrue(_result.code == '20405', '[客户端]未检测到连接关闭: %s' % _result.code)
+
+        for _net_info in _net_infos:
+            TcpIpService.close_connect(_net_info)
+
+    def test_event_loop_max_connect(self):
+        """
+        测试事件循环模式达到最大连接数时暂停接受连接
+        """
+        _server = TcpIpService(
+            logger=logging.getLogger(),
+            server_connect_deal_fun=self.server_connect_deal_fun,
+            self_tag='UnitTestMaxConnect',
+            log_level=simple_log.DEBUG
+        )
+        _server_opts = TcpIpService.generate_server_opts(
+            ip='127.0.0.1', port=9518, max_connect=2, recv_timeout=2000, use_event_loop=True, worker_num=2
+        )
+        _server.start_server(server_opts=_server_opts, is_wait=True)
+        _net_infos = list()
+        try:
+            for _i in range(3):
+                _connect_result = TcpIpService.connect_server(_server_opts)
+                self.assertTrue(_connect_result.is_success(), '[客户端]连接服务器失败: %s' % _connect_result.msg)
+                _net_infos.append(_connect_result.net_info)
+
+            # 第3个连接在监听队列中等待, 未被处理
+            _body = b'0002'
+            TcpIpService.send_data(_net_infos[2], len(_body).to_bytes(4, byteorder='big') + _body, {})
+            _result = TcpIpService.recv_data(_net_infos[2], {'recv_len': 12, 'overtime': 500})
+            self.assertTrue(_result.code == '20403', '超过最大连接数仍接受连接: %s' % _result.code)
+
+            # 关闭一个连接后恢复接受连接
+            TcpIpService.close_connect(_net_infos[0])
+            _result = TcpIpService.recv_data(_net_infos[2], {'recv_len': 12})
+            self.assertTrue(
+                _result.is_success() and _result.data[4:] == _body * 2, '连接关闭后未恢复接受连接: %s' % _result.code
+            )
+        finally:
+            for _net_info in _net_infos:
+                TcpIpService.close_connect(_net_info)
+            _server.stop_server(is_wait=True, overtime=30)
+
+    @classmethod
+    def loop_connect_deal_fun(cls, thread_id, server_opts, net_info, self_tag):
+        # 原有的长连接处理方式, 在处理函数中循环处理连接的所有请求
+        while True:
+            _read_result = TcpIpService.recv_data(net_info, {'recv_len': 4})
+            if _read_result.code == '20403':
+                # 超时, 继续等待下一个请求
+                continue
+            if not _read_result.is_success():
+                TcpIpService.close_connect(net_info)
+                return
+            _next_read = int.from_bytes(_read_result.data, byteorder='big', signed=False)
+            _read_result = TcpIpService.recv_data(net_info, {'recv_len': _next_read})
+            if not _read_result.is_success():
+                TcpIpService.close_connect(net_info)
+                return
+            _send_body = _read_result.data * 2
+            TcpIpService.send_data(net_info, len(_send_body).to_bytes(4, byteorder='big') + _send_body, {})
+
+    def test_event_loop_loop_handler(self):
+        """
+        测试事件循环模式下循环处理长连接的处理函数不会占满工作线程池
+        """
+        _server = TcpIpService(
+            logger=logging.getLogger(),
+            server_connect_deal_fun=self.loop_connect_deal_fun,
+            self_tag='UnitTestLoopHandler',
+            log_level=simple_log.DEBUG
+        )
+        _server_opts = TcpIpService.generate_server_opts(
+            ip='127.0.0.1', port=9519, max_connect=10, recv_timeout=500, use_event_loop=True, worker_num=2
+        )
+        _server.start_server(server_opts=_server_opts, is_wait=True)
+        _net_infos = list()
+        try:
+            # 连接数超过工作线程数, 每个连接的处理函数都不返回
+            for _i in range(5):
+                _connect_result = TcpIpService.connect_server(_server_opts)
+                self.assertTrue(_connect_result.is_success(), '[客户端]连接服务器失败: %s' % _connect_result.msg)
+                _net_infos.append(_connect_result.net_info)
+                _body = ('%04d' % _i).encode('utf-8')
+                TcpIpService.send_data(_net_infos[_i], len(_body).to_bytes(4, byteorder='big') + _body, {})
+                _result = TcpIpService.recv_data(_net_infos[_i], {'recv_len': 12, 'overtime': 10000})
+                self.assertTrue(
+                    _result.is_success() and _result.data[4:] == _body * 2,
+                    '[客户端]连接%d未被处理, 工作线程池被占满: %s' % (_i, _result.code)
+                )
+
+            # 原有连接继续在处理函数中处理
+            _body = b'next'
+            TcpIpService.send_data(_net_infos[0], len(_body).to_bytes(4, byteorder='big') + _body, {})
+            _result = TcpIpService.recv_data(_net_infos[0], {'recv_len': 12, 'overtime': 10000})
+            self.assertTrue(
+                _result.is_success() and _result.data[4:] == _body * 2, '[客户端]长连接处理错误: %s' % _result.code
+            )
+        finally:
+            for _net_info in _net_infos:
+                TcpIpService.close_connect(_net_info)
+            _server.stop_server(is_wait=True, overtime=30)
+
+
+class TestTcpIpServiceRecv(unittest.TestCase):
+    """
+    测试TcpIpService的数据接收处理
+    """
+
+    def test_recv_data(self):
+        """
+        测试接收缓存及直接写入缓冲区
+        """
+        _rsock, _wsock = socket.socketpair()
+        _rsock.setblocking(False)
+        _net_info = NullObj()
+        _net_info.csocket = _rsock
+        _net_info.recv_timeout = 2000
+        try:
+            # 流水线的多个小报文, 一次预读后剩余数据保留在接收缓存
+            _wsock.sendall(b'0005hello0005world')
+            _datas = [TcpIpService.recv_data(_net_info, {'recv_len': _len}).data for _len in (4, 5, 4, 5)]
+            self.assertTrue(_datas == [b'0005', b'hello', b'0005', b'world'], '流水线报文获取错误: %s' % str(_datas))
+            self.assertTrue(len(_net_info.recv_buffer) == 0, '接收缓存未读完')
+
+            # 大报文直接写入调用方缓冲区
+            _payload = os.urandom(1024 * 1024 + 3)
+            _buffer = bytearray(len(_payload) + 10)
+            _sender = threading.Thread(target=_wsock.sendall, args=(b'abc' + _payload, ))
+            _sender.start()
+            _result = TcpIpService.recv_data(_net_info, {'recv_len': 3})
+            self.assertTrue(_result.data == b'abc', '报文头获取错误')
+            _result = TcpIpService.recv_data(_net_info, {'recv_len': len(_payload), 'buffer': _buffer})
+            _sender.join()
+            self.assertTrue(_result.is_success() and _result.data == _payload, '大报文获取错误: %s' % _result.code)
+            self.assertTrue(_result.data.obj is _buffer, '未直接写入调用方缓冲区')
+
+            # 超时及对端关闭
+            _result = TcpIpService.recv_data(_net_info, {'recv_len': 1, 'overtime': 100})
+            self.assertTrue(_result.code == '20403', '超时返回错误: %s' % _result.code)
+            _wsock.sendall(b'12')
+            _wsock.close()
+            _result = TcpIpService.recv_data(_net_info, {'recv_len': 4})
+            self.assertTrue(_result.code == '20405' and _result.data == b'12', '对端关闭返回错误: %s' % _result.code)
+        finally:
+            _rsock.close()
+            _wsock.close()
+
+    def test_send_data(self):
+        """
+        测试多段数据及文件区域发送
+        """
+        _rsock, _wsock = socket.socketpair()
+        _wsock.setblocking(False)
+        _net_info = NullObj()
+        _net_info.csocket = _wsock
+        _net_info.send_timeout = 10000
+        _file_path = os.path.join(_TEMP_DIR, 'send_file_region.bin')
+        if not os.path.exists(_TEMP_DIR):
+            FileTool.create_dir(_TEMP_DIR)
+        _file_data = os.urandom(3 * 1024 * 1024)
+        with open(_file_path, 'wb') as _f:
+            _f.write(_file_data)
+
+        _recv_datas = list()
+        _payload = os.urandom(2 * 1024 * 1024)
+
+        def _recv_fun(length):
+            _data = bytearray()
+            while len(_data) < length:
+                _data += _rsock.recv(1024 * 1024)
+            _recv_datas.append(bytes(_data))
+
+        try:
+            with open(_file_path, 'rb') as _f:
+                _parts = [
+                    b'head', bytearray(b'|'), memoryview(_payload), b'',
+                    SocketFileRegion(_f, offset=10, count=1024 * 1024), b'tail', SocketFileRegion(_f)
+                ]
+                _length = sum([len(_part) for _part in _parts])
+                _receiver = threading.Thread(target=_recv_fun, args=(_length, ))
+                _receiver.start()
+                _result = TcpIpService.send_data(_net_info, _parts, {})
+                _receiver.join()
+            self.assertTrue(_result.is_success(), '多段数据发送失败: %s' % _result.code)
+            self.assertTrue(
+                _recv_datas[0] == b'head|' + _payload + _file_data[10:10 + 1024 * 1024] + b'tail' + _file_data,
+                '多段数据发送内容错误'
+            )
+
+            # 对端不接收时发送超时
+            _result = TcpIpService.send_data(_net_info, _payload * 8, {'overtime': 200})
+            self.assertTrue(_result.code == '20404', '发送超时返回错误: %s' % _result.code)
+        finally:
+            _rsock.close()
+            _wsock.close()
+            os.remove(_file_path)
+
+
 if __name__ == '__main__':
     # 当程序自己独立运行时执行的操作
     unittest.main()
@@ -10,6 +10,7 @@
 import os
 import sys
 import time
+import datetime
 import unittest
 # 根据当前文件路径将包路径纳入，在非安装的情况下可以引用到
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
@@ -22,6 +23,7 @@ SWITCH = {
     'test_validate_rule': True,
     'test_dict_validate': True,
     'test_pre_obj_id': True,
+    'test_compile_rule': True,
 }
 
 
@@ -705,6 +707,100 @@ class TestValidateTool(unittest.TestCase):
         self.assertTrue(_result.i18n_msg_paras[1] == 'c->c2',
                         '测试 测试obj_id的显示 - 规则%d 失败 - %s' % (_i, _result.i18n_msg_paras[1]))
 
+    def test_compile_rule(self):
+        """
+        测试预编译规则的实例对象校验
+        """
+        if not SWITCH['test_compile_rule']:
+            return
+
+        print("测试预编译规则")
+
+        def test_fun(obj, a, b=1):
+            if obj == 'except':
+                raise ValueError('test except')
+            return obj == a
+
+        _rule = {
+            'a': ('str_is_datetime', 'yyyy/MM/dd hh24:mm:ss'),
+            'b': ('str_check_regex', ('^[a-z]+$', 're.I')),
+            'c': ('Or', [('str_is_int', ), ('str_is_email', ), ('str_len', (3, 4))]),
+            'd': ('check_time_btween', ('2019-01-01', None), {'is_eq_min': False}),
+            'e': [('str_is_float', ), (test_fun, ('x', ), {'b': 2}, '自定义错误$4 - $2 - $5'), (test_fun, 'y')],
+            'f': {
+                'f1': ('List', [('str_not_null', ), ('str_check_date', None, {'format_str': 'yyyyMMdd'})]),
+                'f2': ('And', ['not_null', ('check_in_enum', (['A', 'B'], ))])
+            },
+            'g': [{'g1': ('str_not_null', )}]
+        }
+        _option_rule = {
+            'a': ['M', None],
+            'f': ['O', {'f2': ['M', None]}]
+        }
+        _datas = [
+            {
+                'a': '2019/10/11 23:59:59', 'b': 'abC', 'c': 'a@b.com', 'd': datetime.datetime(2019, 5, 1),
+                'e': ['1.5', 'x', 'y'], 'f': {'f1': [['a', '20190228'], ['b', '']], 'f2': 'A'}
+            },
+            {'a': '2019/10/11 24:00:00'},
+            {'a': '2019/02/30 10:00:00'},
+            {'a': '', 'b': 'ab1'},
+            {'a': '', 'c': 'ab'},
+            {'a': '', 'c': '12345'},
+            {'a': '', 'd': '2019-01-01'},
+            {'a': '', 'd': '2019-1-1x'},
+            {'a': '', 'e': ['1.5', 'y']},
+            {'a': '', 'e': ['1.5', 'except']},
+            {'a': '', 'e': ['1.5', 'x', 'except']},
+            {'a': '', 'f': {'f1': [['a', '20190230']], 'f2': 'A'}},
+            {'a': '', 'f': {'f1': [['a', '20190228']]}},
+            {'a': '', 'f': [{'f1': [['a', '20190228']]}, {'f2': 'C'}]},
+            {'a': '', 'f': 'not dict'},
+            {'b': 'abc'},
+            [{'a': ''}, {'a': '', 'b': '1'}],
+            {'a': '', 'b': 'abc', 'c': '123', 'd': '2019-05-01', 'e': ['1.5', 'x', 'y'],
+             'f': {'f1': [['a', '20190228']], 'f2': 'A'}, 'g': [{'g2': 'extra'}]},
+        ]
+        for _ignore_extra_keys in (True, False):
+            for _is_use_pre_obj_id in (True, False):
+                _validate = ValidateTool(
+                    _rule, ignore_extra_keys=_ignore_extra_keys, option_rule=_option_rule,
+                    is_use_pre_obj_id=_is_use_pre_obj_id
+                )
+                for _i in range(len(_datas)):
+                    _result_c = _validate.check(_datas[_i], obj_id='my_obj%d' % _i)
+                    _result_r = ValidateTool.check_by_rule(
+                        _rule, _datas[_i], obj_id='my_obj%d' % _i, ignore_extra_keys=_ignore_extra_keys,
+                        option_rule=_option_rule, is_use_pre_obj_id=_is_use_pre_obj_id
+                    )
+                    self.assertTrue(
+                        (_result_c.code, _result_c.msg) == (_result_r.code, _result_r.msg),
+                        '测试 预编译规则 - 数据%d 失败: %s != %s' % (_i, _result_c.msg, _result_r.msg)
+                    )
+
+        print("测试 列表中的字典规则固定忽略不存在的key ============>")
+        for _is_compile in (True, False):
+            _validate = ValidateTool(_rule, ignore_extra_keys=False, option_rule=_option_rule, is_compile=_is_compile)
+            _result = _validate.check(_datas[-1])
+            self.assertTrue(
+                _result.code == '00000', '测试 列表中的字典规则 - is_compile=%s 失败: %s' % (_is_compile, _result.msg)
+            )
+
+        print("测试 成功结果共享 ============>")
+        _validate = ValidateTool(_rule, option_rule=_option_rule)
+        _result = _validate.check(_datas[0])
+        self.assertTrue(_result.is_success(), '测试 成功结果共享 - 检查失败: %s' % _result.msg)
+        self.assertTrue(_validate.check(_datas[0]) is _result, '测试 成功结果共享 - 非共享对象')
+
+        print("测试 不预编译 ============>")
+        _validate = ValidateTool(_rule, option_rule=_option_rule, is_compile=False)
+        self.assertTrue(_validate.check(_datas[0]).is_success(), '测试 不预编译 - 数据0 失败')
+        self.assertTrue(not _validate.check(_datas[3]).is_success(), '测试 不预编译 - 数据3 失败')
+
+        print("测试 错误的校验函数名 ============>")
+        with self.assertRaises(AttributeError):
+            ValidateTool({'a': 'not_exists_fun'})
+
 
 if __name__ == '__main__':
     unittest.main()